@@ -11,6 +11,7 @@ from workers.scheduler import setup_scheduler
 from db import database
 from db.config import settings
 from db.redis_database import REDIS_ASYNC_CLIENT
+from db.schemas.config import StreamTemplate
 from utils import torrent
 from utils.lock import (
     acquire_redis_lock,
@@ -19,7 +20,11 @@ from utils.lock import (
     release_redis_lock,
     release_scheduler_lock,
 )
+from utils.ptt_pool import shutdown_parse_pool
+from utils.request_tracker import flush_request_metrics, run_request_metrics_flusher
 from utils.telegram_bot import telegram_content_bot
+from utils.template_engine import prewarm_template_cache
+from workers.providers.http_pool import close_shared_sessions
 
 TELEGRAM_COMMANDS_REGISTERED_KEY = "mediafusion:telegram:commands:registered:v1"
 TELEGRAM_COMMANDS_REGISTER_LOCK_KEY = "mediafusion:telegram:commands:register-lock"
@@ -84,6 +89,7 @@ async def lifespan(_: FastAPI):
     Handles:
     - Database initialization
     - Tracker initialization
+    - Stream template cache prewarm
     - Telegram bot commands registration
     - Scheduler setup with distributed locking
     - Graceful shutdown
@@ -94,6 +100,9 @@ async def lifespan(_: FastAPI):
 
     await torrent.init_best_trackers()
 
+    default_template = StreamTemplate()
+    prewarm_template_cache([default_template.title, default_template.description])
+
     # Register Telegram bot commands if enabled
     if settings.telegram_bot_token:
         try:
@@ -104,6 +113,10 @@ async def lifespan(_: FastAPI):
     scheduler = None
     scheduler_lock = None
     heartbeat_task = None
+    request_metrics_task = None
+
+    if settings.enable_request_metrics:
+        request_metrics_task = asyncio.create_task(run_request_metrics_flusher())
 
     if not settings.disable_all_scheduler:
         acquired, scheduler_lock = await acquire_scheduler_lock()
@@ -127,6 +140,14 @@ async def lifespan(_: FastAPI):
         except asyncio.CancelledError:
             logging.info("Heartbeat task cancelled")
 
+    if request_metrics_task:
+        request_metrics_task.cancel()
+        try:
+            await request_metrics_task
+        except asyncio.CancelledError:
+            pass
+        await flush_request_metrics()
+
     if scheduler:
         try:
             scheduler.shutdown(wait=False)
@@ -135,4 +156,7 @@ async def lifespan(_: FastAPI):
         finally:
             await release_scheduler_lock(scheduler_lock)
 
+    await close_shared_sessions()
+    # Admin inline runs of the ingest jobs may have started the parse pool here
+    shutdown_parse_pool()
     await REDIS_ASYNC_CLIENT.aclose()
@@ -13,6 +13,7 @@ from fastapi.responses import Response
 from pydantic import BaseModel
 
 from reference.routers.user.auth import require_role
+from db.crud.stream_cache import invalidate_cleared_stream_cache_keys
 from db.enums import UserRole
 from db.models import User
 from db.redis_database import REDIS_ASYNC_CLIENT
@@ -349,6 +350,7 @@ async def clear_cache_by_type(cache_type: str) -> int:
 
     cache_info = CACHE_PATTERNS[cache_type]
     deleted = 0
+    deleted_keys: list[str] = []
 
     for pattern in cache_info["patterns"]:
         # For sorted sets, delete the set itself
@@ -366,10 +368,13 @@ async def clear_cache_by_type(cache_type: str) -> int:
                     for key in keys:
                         key_str = key.decode() if isinstance(key, bytes) else key
                         await REDIS_ASYNC_CLIENT.delete(key_str)
+                        deleted_keys.append(key_str)
                         deleted += 1
             except Exception as e:
                 logger.error(f"Failed to clear cache pattern {pattern}: {e}")
 
+    # Workers' in-process stream L1s only drop payloads once the media's generation moves on
+    await invalidate_cleared_stream_cache_keys(deleted_keys)
     return deleted
 
 
@@ -379,16 +384,19 @@ async def clear_cache_by_pattern(pattern: str) -> int:
         return 0
 
     deleted = 0
+    deleted_keys: list[str] = []
     try:
         keys = await REDIS_ASYNC_CLIENT.keys(pattern)
         if keys:
             for key in keys:
                 key_str = key.decode() if isinstance(key, bytes) else key
                 await REDIS_ASYNC_CLIENT.delete(key_str)
+                deleted_keys.append(key_str)
                 deleted += 1
     except Exception as e:
         logger.error(f"Failed to clear cache pattern {pattern}: {e}")
 
+    await invalidate_cleared_stream_cache_keys(deleted_keys)
     return deleted
 
 
@@ -778,6 +786,7 @@ async def delete_cache_key(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Key '{key}' not found",
             )
+        await invalidate_cleared_stream_cache_keys([key])
 
         return {
             "success": True,
@@ -34,6 +34,7 @@ from db.models import (
     WatchHistory,
 )
 from db.redis_database import REDIS_ASYNC_CLIENT
+from workers.providers.cache_helpers import SHARD_COUNT, get_legacy_cache_key, get_shard_key
 from workers.scrapers.base_scraper import (
     SCRAPER_METRICS_AGGREGATED_KEY,
     SCRAPER_METRICS_HISTORY_KEY,
@@ -255,8 +256,12 @@ async def get_debrid_cache_metrics() -> dict[str, Any]:
 
     try:
         for service in debrid_services:
-            cache_key = f"debrid_cache:{service}"
-            cache_size = await REDIS_ASYNC_CLIENT.hlen(cache_key)
+            # Shards plus the pre-sharding hash, counted in one round trip
+            pipe = REDIS_ASYNC_CLIENT.pipeline(transaction=False)
+            for shard in range(SHARD_COUNT):
+                pipe.hlen(get_shard_key(service, f"{shard:02x}"))
+            pipe.hlen(get_legacy_cache_key(service))
+            cache_size = sum(await pipe.execute())
             if cache_size > 0:
                 metrics["services"][service] = {"cached_torrents": cache_size}
 
@@ -865,8 +865,9 @@ async def run_scheduler_job_inline(
             result_data = {"status": "completed"}
 
         elif job_id == "update_seeders":
-            await update_torrent_seeders.fn(crontab_expression=crontab)
-            result_data = {"status": "completed"}
+            # Runs in pages across several worker runs; queue it rather than block the request
+            await update_torrent_seeders.async_send(crontab_expression=crontab)
+            result_data = {"status": "queued"}
 
         elif job_id == "cleanup_expired_scraper_task":
             await cleanup_expired_scraper_task.fn(crontab_expression=crontab)
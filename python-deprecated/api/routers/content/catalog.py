@@ -64,7 +64,13 @@ from db.schemas import (
     YouTubeStreamData,
 )
 from workers.providers import mapper
-from workers.providers.cache_helpers import get_cached_status, store_cached_info_hashes
+from workers.providers.cache_helpers import (
+    get_cache_service_name,
+    get_cached_status,
+    is_global_cache_check_provider,
+    store_cached_info_hashes,
+)
+from workers.providers.negative_cache import check_recently_uncached, record_lookup_results
 from workers.providers.usenet_compatibility import is_usenet_stream_compatible
 from utils.authenticated_playback_secret import resolve_playback_secret_str_for_ui
 from utils.const import (
@@ -1808,8 +1814,15 @@ async def get_catalog_item_streams(
 
         # For streams not found in Redis cache, use provider's cache check
         uncached_hashes = [h for h in info_hashes if not cached_statuses.get(h, False)]
+        cache_update_function = mapper.CACHE_UPDATE_FUNCTIONS.get(selected_provider_obj.service)
+        # Service-wide checks can skip hashes the provider recently reported uncached
+        negative = None
+        if uncached_hashes and cache_update_function and is_global_cache_check_provider(selected_provider_obj):
+            negative = await check_recently_uncached(
+                "provider", get_cache_service_name(selected_provider_obj), uncached_hashes
+            )
+            uncached_hashes = [h for h in uncached_hashes if h not in negative.skipped]
         if uncached_hashes:
-            cache_update_function = mapper.CACHE_UPDATE_FUNCTIONS.get(selected_provider_obj.service)
             if cache_update_function:
                 try:
                     # Build a minimal stream data structure for the cache check
@@ -1829,10 +1842,11 @@ async def get_catalog_item_streams(
                                 resolution=stream.resolution,
                                 quality=stream.quality,
                                 seeders=stream.torrent_stream.seeders,
-                                cached=False,
                             )
                             # Set id attribute for cache functions (uses extra="allow")
                             stream_data.id = stream.torrent_stream.info_hash
+                            # None until the provider answers, so a failed lookup is not recorded as uncached
+                            stream_data.cached = None
                             uncached_streams.append(stream_data)
 
                     if uncached_streams:
@@ -1845,9 +1859,16 @@ async def get_catalog_item_streams(
                         )
 
                         # Update cached_statuses with results and store in Redis
-                        cached_info_hashes = [s.id for s in uncached_streams if getattr(s, "cached", False)]
+                        cached_info_hashes = [s.id for s in uncached_streams if s.cached]
                         for s in uncached_streams:
-                            cached_statuses[s.id] = getattr(s, "cached", False)
+                            cached_statuses[s.id] = bool(s.cached)
+                        if negative is not None:
+                            await record_lookup_results(
+                                "provider",
+                                get_cache_service_name(selected_provider_obj),
+                                {s.id: s.cached for s in uncached_streams},
+                                negative.audited,
+                            )
 
                         if cached_info_hashes:
                             await store_cached_info_hashes(
@@ -8,7 +8,6 @@ from datetime import datetime
 from typing import Any
 
 import httpx
-import PTT
 import pytz
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
 from fastapi.responses import Response
@@ -40,6 +39,7 @@ from utils.nzb import generate_nzb_hash, parse_nzb_content
 from utils.nzb_storage import get_nzb_storage, verify_nzb_signature
 from utils.notification_registry import send_pending_contribution_notification
 from utils.parser import convert_bytes_to_readable
+from utils.ptt_cache import parse_title_cached
 from utils.url_safety import sanitize_nzb_url
 from utils.zyclops import submit_nzb_to_zyclops
 
@@ -164,7 +164,7 @@ async def _analyze_nzb_content(
     size_readable = convert_bytes_to_readable(total_size) if total_size > 0 else "Unknown"
 
     nzb_title = nzb_data.title or fallback_title
-    parsed = PTT.parse_title(nzb_title)
+    parsed = parse_title_cached(nzb_title)
 
     matches = []
     search_title = parsed.get("title", nzb_title)
@@ -539,7 +539,7 @@ async def import_nzb_file(
             pub_date=nzb_data.date,
             password=nzb_data.password,
         )
-        parsed = PTT.parse_title(nzb_title)
+        parsed = parse_title_cached(nzb_title)
 
         # Parse file_data if provided
         parsed_file_data = []
@@ -728,7 +728,7 @@ async def import_nzb_url(
 
         # Parse title with PTT
         nzb_title = nzb_data.title or "Unknown"
-        parsed = PTT.parse_title(nzb_title)
+        parsed = parse_title_cached(nzb_title)
 
         # Forward NZB to Zyclops health API (fire-and-forget)
         submit_nzb_to_zyclops(
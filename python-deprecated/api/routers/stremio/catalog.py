@@ -1,6 +1,7 @@
 """Stremio catalog routes."""
 
 import logging
+from collections.abc import Awaitable, Callable
 
 from fastapi import APIRouter, BackgroundTasks, Depends, Request, Response
 from pydantic import ValidationError
@@ -18,6 +19,7 @@ from utils import const, wrappers
 from utils.network import get_request_namespace, get_user_data, get_user_public_ip
 from utils.parser import fetch_downloaded_info_hashes
 from utils.runtime_const import DELETE_ALL_META
+from utils.swr_cache import is_stale, schedule_stale_refresh, set_with_soft_expiry, split_soft_expiry
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -195,10 +197,29 @@ async def get_catalog(
         sort,
         sort_dir,
     )
+
+    async def _load_metas(tasks: BackgroundTasks) -> public_schemas.Metas | None:
+        return await _load_catalog_metas(
+            catalog_type,
+            catalog_id,
+            skip,
+            genre,
+            user_data,
+            namespace,
+            is_watchlist_catalog,
+            info_hashes,
+            sort,
+            sort_dir,
+            tasks,
+        )
+
     if cache_key:
         response.headers.update(const.CACHE_HEADERS)
         cached_data = await REDIS_ASYNC_CLIENT.get(cache_key)
         if cached_data:
+            cached_data, soft_expires_at = split_soft_expiry(cached_data)
+            if is_stale(soft_expires_at):
+                schedule_stale_refresh("catalog", cache_key, lambda: _refresh_catalog_cache(cache_key, _load_metas))
             needs_rpdb_poster_mutation = bool(
                 user_data.rpdb_config and catalog_type in {MediaType.MOVIE, MediaType.SERIES}
             )
@@ -216,6 +237,65 @@ async def get_catalog(
     else:
         response.headers.update(const.NO_CACHE_HEADERS)
 
+    metas = await _load_metas(background_tasks)
+    if metas is None:
+        return public_schemas.Metas(metas=[])
+
+    # Cache result if applicable
+    if cache_key:
+        await _store_catalog_cache(cache_key, metas)
+
+    # Handle watchlist special case: add "Delete All" option for providers that support it
+    # (watchlists are never cached)
+    if (
+        is_watchlist_catalog
+        and catalog_type == MediaType.MOVIE
+        and metas.metas
+        and watchlist_provider
+        and mapper.DELETE_ALL_WATCHLIST_FUNCTIONS.get(watchlist_provider.service)
+    ):
+        delete_all_meta = DELETE_ALL_META.model_copy()
+        delete_all_meta.id = delete_all_meta.id.format(watchlist_provider.service)
+        metas.metas.insert(0, delete_all_meta)
+
+    return await update_rpdb_posters(metas, user_data, catalog_type)
+
+
+async def _store_catalog_cache(cache_key: str, metas: public_schemas.Metas) -> None:
+    await set_with_soft_expiry(
+        cache_key,
+        metas.model_dump_json(exclude_none=True),
+        settings.catalog_cache_soft_ttl,
+        settings.catalog_cache_hard_ttl,
+    )
+
+
+async def _refresh_catalog_cache(
+    cache_key: str,
+    load_metas: Callable[[BackgroundTasks], Awaitable[public_schemas.Metas | None]],
+) -> None:
+    tasks = BackgroundTasks()
+    metas = await load_metas(tasks)
+    if metas is not None:
+        await _store_catalog_cache(cache_key, metas)
+    # Side jobs queued by the loaders (e.g. MDBList imports) would normally run after the response
+    await tasks()
+
+
+async def _load_catalog_metas(
+    catalog_type: MediaType,
+    catalog_id: str,
+    skip: int,
+    genre: str | None,
+    user_data: UserData,
+    namespace: str,
+    is_watchlist_catalog: bool,
+    info_hashes,
+    sort: str | None,
+    sort_dir: str | None,
+    background_tasks: BackgroundTasks,
+) -> public_schemas.Metas | None:
+    """Load catalog metas from the database (or MDBList); None when the catalog cannot be resolved."""
     # Handle MDBList catalogs specially
     if catalog_id.startswith("mdblist_") and user_data.mdblist_config:
         # Parse mdblist ID from catalog_id (format: mdblist_{type}_{id})
@@ -223,7 +303,7 @@ async def get_catalog(
         if len(parts) >= 3:
             raw_mdblist_id = parts[-1].split(".", 1)[0]
             if not raw_mdblist_id.isdigit():
-                return public_schemas.Metas(metas=[])
+                return None
             mdblist_id = int(raw_mdblist_id)  # Last part is the list ID
             # Find matching list config
             list_config = next(
@@ -263,17 +343,9 @@ async def get_catalog(
                         exc,
                     ),
                 )
-                metas = public_schemas.Metas(metas=meta_list)
-                # Cache result if applicable
-                if cache_key:
-                    await REDIS_ASYNC_CLIENT.set(
-                        cache_key,
-                        metas.model_dump_json(exclude_none=True),
-                        ex=settings.meta_cache_ttl,
-                    )
-                return await update_rpdb_posters(metas, user_data, catalog_type)
+                return public_schemas.Metas(metas=meta_list)
         # If parsing failed, return empty
-        return public_schemas.Metas(metas=[])
+        return None
 
     # Get metadata list with sorting preferences
     async def _get_catalog_meta_list_with_session(session):
@@ -299,7 +371,7 @@ async def get_catalog(
         async with get_async_session_context() as session:
             return await _get_catalog_meta_list_with_session(session)
 
-    metas = await run_db_read_with_primary_fallback(
+    return await run_db_read_with_primary_fallback(
         _get_catalog_meta_list_from_read_replica,
         _get_catalog_meta_list_from_primary,
         operation_name=f"stremio catalog {catalog_type.value}:{catalog_id}",
@@ -310,25 +382,3 @@ async def get_catalog(
             exc,
         ),
     )
-
-    # Handle watchlist special case: add "Delete All" option for providers that support it
-    if (
-        is_watchlist_catalog
-        and catalog_type == MediaType.MOVIE
-        and metas.metas
-        and watchlist_provider
-        and mapper.DELETE_ALL_WATCHLIST_FUNCTIONS.get(watchlist_provider.service)
-    ):
-        delete_all_meta = DELETE_ALL_META.model_copy()
-        delete_all_meta.id = delete_all_meta.id.format(watchlist_provider.service)
-        metas.metas.insert(0, delete_all_meta)
-
-    # Cache result if applicable
-    if cache_key:
-        await REDIS_ASYNC_CLIENT.set(
-            cache_key,
-            metas.model_dump_json(exclude_none=True),
-            ex=settings.meta_cache_ttl,
-        )
-
-    return await update_rpdb_posters(metas, user_data, catalog_type)
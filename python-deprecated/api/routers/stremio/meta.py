@@ -12,6 +12,7 @@ from db.enums import MediaType
 from db.redis_database import REDIS_ASYNC_CLIENT
 from db.retry_utils import run_db_read_with_primary_fallback
 from utils import const, wrappers
+from utils.swr_cache import is_stale, schedule_stale_refresh, set_with_soft_expiry, split_soft_expiry
 
 META_CACHE_PREFIX = "meta:"
 
@@ -89,10 +90,41 @@ async def get_meta(
     cache_key = f"{META_CACHE_PREFIX}{catalog_type.value}:{meta_id}"
     cached_data = await REDIS_ASYNC_CLIENT.get(cache_key)
     if cached_data:
+        payload, soft_expires_at = split_soft_expiry(cached_data)
         try:
-            return public_schemas.MetaItem.model_validate_json(cached_data)
+            meta_item = public_schemas.MetaItem.model_validate_json(payload)
         except ValidationError:
             pass
+        else:
+            if is_stale(soft_expires_at):
+                schedule_stale_refresh("meta", cache_key, lambda: _refresh_meta_cache(cache_key, catalog_type, meta_id))
+            return meta_item
+
+    meta_item = await _build_meta_item(catalog_type, meta_id)
+    if meta_item is None:
+        raise HTTPException(status_code=404, detail="Metadata not found")
+
+    await _store_meta_cache(cache_key, meta_item)
+    return meta_item
+
+
+async def _store_meta_cache(cache_key: str, meta_item: public_schemas.MetaItem) -> None:
+    await set_with_soft_expiry(
+        cache_key,
+        meta_item.model_dump_json(exclude_none=True),
+        settings.meta_cache_ttl,
+        settings.meta_cache_hard_ttl,
+    )
+
+
+async def _refresh_meta_cache(cache_key: str, catalog_type: MediaType, meta_id: str) -> None:
+    meta_item = await _build_meta_item(catalog_type, meta_id)
+    if meta_item is not None:
+        await _store_meta_cache(cache_key, meta_item)
+
+
+async def _build_meta_item(catalog_type: MediaType, meta_id: str) -> public_schemas.MetaItem | None:
+    """Build the Stremio meta item from the database; None if the media does not exist."""
 
     async def _fetch_meta_and_canonical_id_with_session(session):
         # Use the appropriate CRUD function that loads relationships
@@ -133,7 +165,7 @@ async def get_meta(
     )
 
     if not media:
-        raise HTTPException(status_code=404, detail="Metadata not found")
+        return None
 
     # Get IMDb rating from MediaRating table
     imdb_rating = None
@@ -215,13 +247,4 @@ async def get_meta(
     else:
         meta_response = public_schemas.Meta(**base_meta)
 
-    meta_item = public_schemas.MetaItem(meta=meta_response)
-
-    # Cache the result in Redis
-    await REDIS_ASYNC_CLIENT.set(
-        cache_key,
-        meta_item.model_dump_json(exclude_none=True),
-        ex=settings.meta_cache_ttl,
-    )
-
-    return meta_item
+    return public_schemas.MetaItem(meta=meta_response)
@@ -15,7 +15,6 @@ from typing import Any
 import pytz
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from pydantic import BaseModel
-from PTT import parse_title
 from sqlalchemy.orm import selectinload
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -49,6 +48,7 @@ from utils.network import get_user_public_ip
 from utils.notification_registry import send_pending_contribution_notification
 from utils.profile_context import ProfileDataProvider
 from utils.profile_crypto import profile_crypto
+from utils.ptt_cache import parse_title_cached
 from utils.sports_parser import clean_sports_context_title, detect_sports_category, parse_sports_title
 
 logger = logging.getLogger(__name__)
@@ -482,7 +482,7 @@ async def prepare_import_item(
 ) -> ImportPreparationResult:
     try:
         torrent_name = torrent.get("filename", "")
-        parsed = parse_title(torrent_name, True) if torrent_name else {}
+        parsed = parse_title_cached(torrent_name, True) if torrent_name else {}
 
         if override:
             if override.title:
@@ -1124,7 +1124,7 @@ async def get_missing_torrents(
 
         # Parse torrent name for metadata
         torrent_name = torrent.get("filename", "")
-        parsed = parse_title(torrent_name, True) if torrent_name else {}
+        parsed = parse_title_cached(torrent_name, True) if torrent_name else {}
 
         # Convert files to response format (video-only, sample excluded)
         video_files = _collect_video_files(torrent.get("files", []))
@@ -1586,7 +1586,7 @@ async def advanced_import_torrents(
 
         try:
             torrent_name = torrent.get("filename", "")
-            parsed = parse_title(torrent_name, True) if torrent_name else {}
+            parsed = parse_title_cached(torrent_name, True) if torrent_name else {}
 
             # Build file_data from annotations or from torrent files
             file_data = []
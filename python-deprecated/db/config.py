@@ -157,6 +157,7 @@ class Settings(BaseSettings):
         if isinstance(v, str) and v.startswith("postgresql://"):
             return v.replace("postgresql://", "postgresql+asyncpg://", 1)
         return v
+
     # Set to True when postgres_uri points at PgBouncer in transaction mode.
     # Disables asyncpg's prepared-statement cache which is incompatible with
     # PgBouncer transaction pooling (causes "cached statement ... cannot be
@@ -176,6 +177,10 @@ class Settings(BaseSettings):
     requests_proxy_url: str | None = None
     # Do not route these debrid/streaming API clients through requests_proxy_url (direct egress).
     requests_proxy_exclude_debrid_providers: list[str] = Field(default_factory=list)
+    # Pooled keep-alive connections shared by all debrid clients in a process
+    debrid_http_pool_limit: int = 100
+    debrid_http_pool_limit_per_host: int = 20
+    debrid_http_keepalive_timeout: int = 60
     scrapling_proxy_url: str | None = None
     scrapling_cdp_url: str | None = None
     scrapling_headless: bool = True
@@ -228,6 +233,14 @@ class Settings(BaseSettings):
     mediafusion_url: str = "https://mediafusion.elfhosted.com"
     mediafusion_api_password: str | None = None
     sync_debrid_cache_streams: bool = False
+    debrid_cache_cleanup_shards_per_run: int = 256  # shards (of 256) per service scanned per cleanup run
+    debrid_cache_migration_batch_size: int = 200000  # legacy entries moved into shards per service per run
+    debrid_negative_cache_enabled: bool = True  # skip remote lookups of hashes recently confirmed uncached
+    debrid_negative_cache_window_seconds: int = 21600
+    debrid_negative_cache_partitions: int = 3  # time buckets per window; whole buckets expire
+    debrid_negative_cache_bits: int = 8388608  # Bloom filter bits per bucket (1 MiB)
+    debrid_negative_cache_hashes: int = 7
+    debrid_negative_cache_audit_rate: float = 0.01  # share of positives looked up anyway to measure accuracy
     rss_feed_scrape_interval_hour: int = 3
 
     # Zilean Settings
@@ -305,6 +318,8 @@ class Settings(BaseSettings):
 
     background_search_interval_hours: int = 72
     background_search_crontab: str = "*/3 * * * *"
+    # "redis" shares each scraper's request budget across all workers instead of per process
+    scraper_rate_limit_backend: Literal["local", "redis"] = "local"
 
     # Premiumize Settings
     premiumize_oauth_client_id: str | None = None
@@ -370,10 +385,46 @@ class Settings(BaseSettings):
 
     # Raw stream list Redis cache (keys stream_data:* in db/crud/stream_services.py)
     stream_raw_redis_cache_enabled: bool = True
+    # Hard TTL of the Redis key; past the soft TTL entries are served stale and refreshed in the background
     stream_raw_redis_cache_ttl_seconds: int = Field(default=900, ge=60)
+    stream_raw_redis_cache_soft_ttl_seconds: int = Field(default=600, ge=1)
+    # Blob codec (utils/stream_cache_codec.py); zstd, lz4 and msgpack need the stream-cache-codecs extra
+    stream_raw_redis_cache_codec: Literal["zlib", "zstd", "lz4", "plain"] = "zlib"
+    stream_raw_redis_cache_serializer: Literal["json", "msgpack"] = "json"
+    stream_raw_redis_cache_zstd_level: int = Field(default=3, ge=1, le=22)
+    # Dictionary trained by scripts/train_stream_cache_dictionary.py; must be the same file on every worker
+    stream_raw_redis_cache_zstd_dict_path: str | None = None
+    # Legacy switch: False with the zlib codec stores plain JSON
     stream_raw_redis_cache_zlib_compress: bool = True
     # If > 0, skip caching when the stored blob (after compression) would exceed this size
     stream_raw_redis_cache_max_stored_bytes: int = Field(default=0, ge=0)
+    # Per-worker L1 of decoded stream_data / media_ids payloads; stream_data entries are
+    # revalidated against the Redis generation on every lookup, media_ids entries by TTL only
+    stream_l1_cache_enabled: bool = True
+    stream_l1_cache_max_entries: int = Field(default=1024, ge=0)
+    # Budget in serialized JSON bytes (an estimate of the decoded size)
+    stream_l1_cache_max_bytes: int = Field(default=64 * 1024 * 1024, ge=0)
+    stream_l1_cache_ttl_seconds: int = Field(default=60, ge=1)
+    # Single-flight for stream cache misses: one DB fill per key; other nodes wait up to
+    # stream_cache_fill_wait_seconds for the lease holder before fetching themselves
+    stream_cache_fill_lease_seconds: int = Field(default=15, ge=1)
+    stream_cache_fill_wait_seconds: float = Field(default=3.0, ge=0)
+
+    # Memoized PTT title parsing (utils/ptt_cache.py); 0 disables the per-process LRU
+    ptt_parse_cache_max_entries: int = Field(default=50000, ge=0)
+    # Optional second tier shared between processes: SQLite file per host or Redis (off-event-loop only)
+    ptt_parse_cache_tier: Literal["none", "disk", "redis"] = "none"
+    ptt_parse_cache_disk_path: str = "/tmp/mediafusion_ptt_cache.sqlite3"
+    ptt_parse_cache_disk_max_entries: int = Field(default=1_000_000, ge=1)
+    ptt_parse_cache_redis_ttl_seconds: int = Field(default=7 * 86400, ge=60)
+    # Process pool for batched title parsing on bulk ingest paths (utils/ptt_pool.py)
+    ptt_parse_pool_enabled: bool = True
+    ptt_parse_pool_workers: int = Field(default=0, ge=0)  # 0 = CPU count - 1, capped at 4
+    ptt_parse_pool_chunk_size: int = Field(default=256, ge=1)
+    ptt_parse_pool_min_batch: int = Field(default=64, ge=0)  # smaller batches are parsed inline
+    # COPY-staged set-based inserts for large new-stream batches (db/crud/stream_bulk_ingest.py)
+    stream_bulk_insert_enabled: bool = True
+    stream_bulk_insert_min_batch: int = Field(default=200, ge=1)  # smaller batches use the ORM path
 
     # API profiling / metrics endpoint / rate limiting (used by the deprecated Python API layer)
     enable_profiler: bool = False
@@ -387,6 +438,8 @@ class Settings(BaseSettings):
     enable_exception_tracking: bool = False
     exception_tracking_ttl: int = 259200  # 3 days in seconds
     exception_tracking_max_entries: int = 500
+    exception_tracking_queue_size: int = 10000  # records buffered before new ones are dropped
+    exception_tracking_flush_interval: float = 2.0  # seconds between batched writes to Redis
 
     # Request Metrics Tracking
     enable_request_metrics: bool = True
@@ -394,6 +447,7 @@ class Settings(BaseSettings):
     request_metrics_recent_ttl: int = 3600  # 1 hour for individual request logs
     request_metrics_max_recent: int = 1000  # max individual requests to keep
     request_metrics_latency_window: int = 1000  # samples per endpoint for percentiles
+    request_metrics_flush_interval: float = 5.0  # seconds between buffered writes to Redis
 
     # NZB File Import Settings
     nzb_file_storage_backend: Literal["local", "s3"] = "local"  # Where to store uploaded NZB files
@@ -445,7 +499,14 @@ class Settings(BaseSettings):
     adult_content_filter_in_torrent_title: bool = True
 
     # Time-related Settings
+    # Meta / catalog response caches: past the soft TTL (meta_cache_ttl, catalog_cache_soft_ttl)
+    # entries are served stale and refreshed in the background; the hard TTL drops them
     meta_cache_ttl: int = 1800  # 30 minutes in seconds
+    meta_cache_hard_ttl: int = 21600  # 6 hours
+    catalog_cache_soft_ttl: int = 1800
+    catalog_cache_hard_ttl: int = 21600
+    # One worker refreshes a stale entry at a time (lease under swr_refresh:{key})
+    stale_refresh_lease_seconds: int = 60
     enable_worker_memory_metrics: bool = True
     worker_memory_metrics_history_size: int = 1000
 
@@ -481,6 +542,8 @@ class Settings(BaseSettings):
     disable_dlhd_scheduler: bool = True
     update_seeders_crontab: str = "0 0 * * 3"
     disable_update_seeders: bool = True
+    # Torrents scraped per keyset page (one tracker announce per URL and one bulk UPDATE per page)
+    update_seeders_batch_size: int = 500
     arab_torrents_scheduler_crontab: str = "0 0 * * *"
     disable_arab_torrents_scheduler: bool = True
     x1337_scheduler_crontab: str = "0 */6 * * *"
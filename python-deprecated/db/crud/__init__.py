@@ -275,6 +275,8 @@ from db.crud.streams import (
     update_stream_files,
     update_telegram_stream_file_id,
     update_torrent_seeders,
+    bulk_update_torrent_seeders,
+    get_torrents_for_seeder_refresh,
     update_torrent_stream,
     update_tracker_status,
     update_usenet_stream,
@@ -419,6 +421,8 @@ __all__ = [
     "get_torrent_by_info_hash",
     "create_torrent_stream",
     "update_torrent_seeders",
+    "bulk_update_torrent_seeders",
+    "get_torrents_for_seeder_refresh",
     "update_torrent_stream",
     "update_stream_files",
     "delete_torrent_by_info_hash",
@@ -16,7 +16,7 @@ from typing import Any
 
 import pytz
 from sqlalchemy import delete as sa_delete
-from sqlalchemy import func, or_
+from sqlalchemy import String, column, func, values
 from sqlalchemy import update as sa_update
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import noload, selectinload
@@ -90,8 +90,11 @@ from db.models import (
     TVMetadata,
     WatchHistory,
 )
+from db.config import settings
+from db.crud.stream_bulk_ingest import PreparedTorrentStream, bulk_insert_torrent_streams
 from db.crud.stream_cache import invalidate_media_stream_cache
 from db.redis_database import REDIS_ASYNC_CLIENT
+from utils.title_classifier import classify_stream_title
 from utils.url_safety import sanitize_nzb_url
 
 logger = logging.getLogger(__name__)
@@ -1212,53 +1215,47 @@ async def _batch_resolve_external_ids(
         return {}
 
     # Parse all external IDs to get provider/external_id pairs
-    provider_map: dict[tuple, list[str]] = {}  # (provider, ext_id) -> [original_external_ids]
+    provider_map: dict[tuple[str, str], list[str]] = {}  # (provider, ext_id) -> [original_external_ids]
     mf_ids: list[int] = []
 
     for ext_id in external_ids:
         if ext_id.startswith("mf:"):
             try:
                 mf_ids.append(int(ext_id[3:]))
-                provider_map[(ext_id, None)] = [ext_id]  # Track original
             except ValueError:
                 pass
         else:
             provider, provider_ext_id = parse_external_id(ext_id)
             if provider and provider_ext_id:
-                key = (provider, provider_ext_id)
-                if key not in provider_map:
-                    provider_map[key] = []
-                provider_map[key].append(ext_id)
+                provider_map.setdefault((provider, provider_ext_id), []).append(ext_id)
 
     result_map: dict[str, Media] = {}
 
-    # Handle MediaFusion internal IDs (direct PK lookup)
+    # Handle MediaFusion internal IDs (one primary key lookup for all of them)
     if mf_ids:
-        for mf_id in mf_ids:
-            media = await session.get(Media, mf_id)
-            if media:
-                result_map[f"mf:{mf_id}"] = media
+        result = await session.exec(select(Media).where(Media.id.in_(mf_ids)))
+        for media in result.all():
+            result_map[f"mf:{media.id}"] = media
 
-    # Batch query by provider/external_id pairs
+    # Join against a VALUES list of the wanted pairs rather than one OR branch per pair
     if provider_map:
-        conditions = []
-        for (provider, ext_id), orig_ids in provider_map.items():
-            if provider and ext_id:
-                conditions.append((MediaExternalID.provider == provider) & (MediaExternalID.external_id == ext_id))
-
-        if conditions:
-            query = (
-                select(Media, MediaExternalID)
-                .join(MediaExternalID, Media.id == MediaExternalID.media_id)
-                .where(or_(*conditions))
+        wanted = values(column("provider", String), column("external_id", String), name="wanted_external_ids")
+        wanted = wanted.data(list(provider_map))
+        query = (
+            select(Media, MediaExternalID)
+            .join(MediaExternalID, Media.id == MediaExternalID.media_id)
+            .join(
+                wanted,
+                (MediaExternalID.provider == wanted.c.provider) & (MediaExternalID.external_id == wanted.c.external_id),
             )
-            result = await session.exec(query)
+        )
+        result = await session.exec(query)
 
-            # Map results back to original external IDs
-            for media, ext_id_row in result.all():
-                key = (ext_id_row.provider, ext_id_row.external_id)
-                for orig_id in provider_map.get(key, []):
-                    result_map[orig_id] = media
+        # Map results back to original external IDs
+        for media, ext_id_row in result.all():
+            key = (ext_id_row.provider, ext_id_row.external_id)
+            for orig_id in provider_map.get(key, []):
+                result_map[orig_id] = media
 
     return result_map
 
@@ -1345,6 +1342,143 @@ def _normalize_string_values(value: Any) -> list[str]:
     return []
 
 
+def _torrent_stream_columns(stream_data: dict[str, Any]) -> dict[str, Any]:
+    """Stream column values for a scraped torrent."""
+    stream_name = stream_data.get("torrent_name", stream_data.get("name", ""))
+    title_flags = classify_stream_title(stream_name)
+    return {
+        "name": stream_name,
+        "source": stream_data.get("source", "unknown"),
+        "resolution": stream_data.get("resolution"),
+        "codec": stream_data.get("codec"),
+        "quality": stream_data.get("quality"),
+        "bit_depth": stream_data.get("bit_depth"),
+        "uploader": stream_data.get("uploader"),
+        "uploader_user_id": stream_data.get("uploader_user_id"),
+        "release_group": stream_data.get("release_group"),
+        # Boolean flags
+        "is_remastered": stream_data.get("is_remastered", False),
+        "is_upscaled": stream_data.get("is_upscaled", False),
+        "is_proper": stream_data.get("is_proper", False),
+        "is_repack": stream_data.get("is_repack", False),
+        "is_extended": stream_data.get("is_extended", False),
+        "is_complete": stream_data.get("is_complete", False),
+        "is_dubbed": stream_data.get("is_dubbed", False),
+        "is_subbed": stream_data.get("is_subbed", False),
+        # Title classification, persisted so request-time filters skip the parser
+        "is_adult": title_flags.is_adult,
+        "is_non_video": title_flags.is_non_video,
+    }
+
+
+def _torrent_columns(stream_data: dict[str, Any]) -> dict[str, Any]:
+    """TorrentStream column values (besides stream_id and info_hash) for a scraped torrent."""
+    torrent_type_str = stream_data.get("torrent_type", "public")
+    return {
+        "total_size": stream_data.get("size", 0) or stream_data.get("total_size", 0) or 0,
+        "torrent_type": TorrentType(torrent_type_str) if torrent_type_str else TorrentType.PUBLIC,
+        "seeders": stream_data.get("seeders", 0),
+        "leechers": stream_data.get("leechers"),
+        "uploaded_at": _parse_datetime_field(stream_data.get("uploaded_at") or stream_data.get("created_at")),
+        "torrent_file": stream_data.get("torrent_file"),
+        "file_count": len(stream_data.get("files", [])) or 1,
+    }
+
+
+def _torrent_file_rows(files: list[Any] | None) -> list[dict[str, Any]]:
+    """StreamFile and FileMediaLink values for a torrent's `files` (StreamFileData dumps).
+
+    Files with episode info link to that episode (season and episode default to 1);
+    other files get a plain primary link (season/episode None).
+    """
+    rows: list[dict[str, Any]] = []
+    used_file_indexes: set[int] = set()
+    for idx, file_info in enumerate(files or []):
+        if not isinstance(file_info, dict):
+            continue
+        try:
+            file_type = FileType(file_info.get("file_type", "video"))
+        except ValueError:
+            file_type = FileType.VIDEO
+
+        # Ensure file_index is unique per stream.
+        raw_file_index = file_info.get("file_index")
+        try:
+            file_index = int(raw_file_index) if raw_file_index is not None else idx
+        except (TypeError, ValueError):
+            file_index = idx
+        while file_index in used_file_indexes:
+            file_index += 1
+        used_file_indexes.add(file_index)
+
+        season_number = file_info.get("season_number")
+        episode_number = file_info.get("episode_number")
+        has_episode = season_number is not None or episode_number is not None
+        rows.append(
+            {
+                "file_index": file_index,
+                "filename": file_info.get("filename", ""),
+                "file_path": file_info.get("file_path"),
+                "size": file_info.get("size", 0),
+                "file_type": file_type,
+                "season_number": (season_number or 1) if has_episode else None,
+                "episode_number": (episode_number or 1) if has_episode else None,
+                "episode_end": file_info.get("episode_end") if has_episode else None,
+                "episode_title": file_info.get("episode_title"),
+            }
+        )
+    return rows
+
+
+def _reference_ids(reference_map: dict[str, Any], names: Sequence[str] | None) -> list[int]:
+    """Ids of the known reference rows for `names`, without duplicates."""
+    return list(dict.fromkeys(reference_map[name].id for name in names or () if name in reference_map))
+
+
+async def _orm_insert_torrent_streams(session: AsyncSession, prepared: list[PreparedTorrentStream]) -> set[str]:
+    """ORM counterpart of `bulk_insert_torrent_streams` for small batches."""
+    for row in prepared:
+        stream = Stream(stream_type=StreamType.TORRENT, **row.stream)
+        session.add(stream)
+        await session.flush()
+
+        session.add(TorrentStream(stream_id=stream.id, info_hash=row.info_hash, **row.torrent))
+        session.add(StreamMediaLink(stream_id=stream.id, media_id=row.media_id))
+        for language_id in row.language_ids:
+            session.add(StreamLanguageLink(stream_id=stream.id, language_id=language_id))
+        for audio_format_id in row.audio_format_ids:
+            session.add(StreamAudioLink(stream_id=stream.id, audio_format_id=audio_format_id))
+        for channel_id in row.channel_ids:
+            session.add(StreamChannelLink(stream_id=stream.id, channel_id=channel_id))
+        for hdr_format_id in row.hdr_format_ids:
+            session.add(StreamHDRLink(stream_id=stream.id, hdr_format_id=hdr_format_id))
+
+        for file_row in row.files:
+            stream_file = StreamFile(
+                stream_id=stream.id,
+                file_index=file_row["file_index"],
+                filename=file_row["filename"],
+                file_path=file_row["file_path"],
+                size=file_row["size"],
+                file_type=file_row["file_type"],
+            )
+            session.add(stream_file)
+            await session.flush()
+            session.add(
+                FileMediaLink(
+                    file_id=stream_file.id,
+                    media_id=row.media_id,
+                    season_number=file_row["season_number"],
+                    episode_number=file_row["episode_number"],
+                    episode_end=file_row["episode_end"],
+                    is_primary=True,
+                    link_source=LinkSource.PTT_PARSER,
+                    confidence=1.0,
+                )
+            )
+    return {row.info_hash for row in prepared}
+
+
 async def store_new_torrent_streams(
     session: AsyncSession,
     streams_data: list[dict[str, Any]],
@@ -1355,6 +1489,8 @@ async def store_new_torrent_streams(
     Store multiple torrent streams from scraped data.
 
     Optimized version that uses batch operations to eliminate N+1 queries.
+    Batches of at least ``stream_bulk_insert_min_batch`` new streams are written
+    set-based through db/crud/stream_bulk_ingest.py instead of the ORM.
 
     Args:
         streams_data: List of stream dictionaries with torrent data
@@ -1406,10 +1542,8 @@ async def store_new_torrent_streams(
     all_channels = set()
     all_hdr_formats = set()
     all_catalogs = set()
-    media_ids_to_update = set()
 
     streams_to_create = []
-    media_latest_stream_time: dict[int, datetime] = {}
 
     for info_hash, meta_id, stream_data in valid_streams:
         # Skip if stream already exists
@@ -1421,8 +1555,6 @@ async def store_new_torrent_streams(
         if not media:
             continue
 
-        media_ids_to_update.add(media.id)
-
         # Collect reference data names
         languages = _normalize_string_values(stream_data.get("languages"))
         if languages:
@@ -1452,100 +1584,36 @@ async def store_new_torrent_streams(
     hdr_format_map = await _batch_get_or_create_reference_data(session, HDRFormat, list(all_hdr_formats), "hdr_format")
     catalog_map = await _batch_get_or_create_reference_data(session, Catalog, list(all_catalogs), "catalog")
 
-    # Step 6: Create all streams and links
-    stored = 0
-    catalog_links_to_insert = []
-
-    for info_hash, meta_id, stream_data, media in streams_to_create:
-        # Create base stream
-        stream = Stream(
-            stream_type=StreamType.TORRENT,
-            name=stream_data.get("torrent_name", stream_data.get("name", "")),
-            source=stream_data.get("source", "unknown"),
-            resolution=stream_data.get("resolution"),
-            codec=stream_data.get("codec"),
-            quality=stream_data.get("quality"),
-            bit_depth=stream_data.get("bit_depth"),
-            uploader=stream_data.get("uploader"),
-            uploader_user_id=stream_data.get("uploader_user_id"),
-            release_group=stream_data.get("release_group"),
-            # Boolean flags
-            is_remastered=stream_data.get("is_remastered", False),
-            is_upscaled=stream_data.get("is_upscaled", False),
-            is_proper=stream_data.get("is_proper", False),
-            is_repack=stream_data.get("is_repack", False),
-            is_extended=stream_data.get("is_extended", False),
-            is_complete=stream_data.get("is_complete", False),
-            is_dubbed=stream_data.get("is_dubbed", False),
-            is_subbed=stream_data.get("is_subbed", False),
-        )
-        session.add(stream)
-        await session.flush()
-
-        # Create torrent-specific data
-        torrent_type_str = stream_data.get("torrent_type", "public")
-        torrent_type = TorrentType(torrent_type_str) if torrent_type_str else TorrentType.PUBLIC
-
-        torrent = TorrentStream(
-            stream_id=stream.id,
+    # Step 6: Create all streams and links, set-based for large batches
+    prepared_streams = [
+        PreparedTorrentStream(
             info_hash=info_hash,
-            total_size=stream_data.get("size", 0) or stream_data.get("total_size", 0) or 0,
-            torrent_type=torrent_type,
-            seeders=stream_data.get("seeders", 0),
-            leechers=stream_data.get("leechers"),
-            uploaded_at=_parse_datetime_field(stream_data.get("uploaded_at") or stream_data.get("created_at")),
-            torrent_file=stream_data.get("torrent_file"),
-            file_count=len(stream_data.get("files", [])) or 1,
-        )
-        session.add(torrent)
-
-        # Link to media
-        link = StreamMediaLink(
-            stream_id=stream.id,
             media_id=media.id,
-            season=stream_data.get("season"),
-            episode=stream_data.get("episode"),
+            stream=_torrent_stream_columns(stream_data),
+            torrent=_torrent_columns(stream_data),
+            files=_torrent_file_rows(stream_data.get("files")),
+            language_ids=_reference_ids(language_map, _normalize_string_values(stream_data.get("languages"))),
+            audio_format_ids=_reference_ids(audio_format_map, stream_data.get("audio_formats")),
+            channel_ids=_reference_ids(channel_map, stream_data.get("channels")),
+            hdr_format_ids=_reference_ids(hdr_format_map, stream_data.get("hdr_formats")),
         )
-        session.add(link)
-        link_created_at = link.created_at or datetime.now(pytz.UTC)
-        current_latest = media_latest_stream_time.get(media.id)
-        if current_latest is None or link_created_at > current_latest:
-            media_latest_stream_time[media.id] = link_created_at
-
-        # Media stream counts will be updated in batch at the end
-
-        # Add languages (using pre-fetched map)
-        languages = _normalize_string_values(stream_data.get("languages"))
-        if languages:
-            for lang_name in languages:
-                lang = language_map.get(lang_name)
-                if lang:
-                    lang_link = StreamLanguageLink(stream_id=stream.id, language_id=lang.id)
-                    session.add(lang_link)
-
-        # Add audio formats (using pre-fetched map)
-        if audio_formats := stream_data.get("audio_formats"):
-            for af_name in audio_formats:
-                af = audio_format_map.get(af_name)
-                if af:
-                    af_link = StreamAudioLink(stream_id=stream.id, audio_format_id=af.id)
-                    session.add(af_link)
+        for info_hash, _, stream_data, media in streams_to_create
+    ]
+    if settings.stream_bulk_insert_enabled and len(prepared_streams) >= settings.stream_bulk_insert_min_batch:
+        stored_info_hashes = await bulk_insert_torrent_streams(session, prepared_streams)
+    else:
+        stored_info_hashes = await _orm_insert_torrent_streams(session, prepared_streams)
+    stored_at = datetime.now(pytz.UTC)
 
-        # Add audio channels (using pre-fetched map)
-        if channels := stream_data.get("channels"):
-            for ch_name in channels:
-                ch = channel_map.get(ch_name)
-                if ch:
-                    ch_link = StreamChannelLink(stream_id=stream.id, channel_id=ch.id)
-                    session.add(ch_link)
+    catalog_links_to_insert = []
+    media_stream_counts = Counter()
+    # (season_number, episode_number) -> episode_title per series media
+    series_episode_info: dict[int, tuple[Media, dict[tuple[int, int], str]]] = {}
 
-        # Add HDR formats (using pre-fetched map)
-        if hdr_formats := stream_data.get("hdr_formats"):
-            for hdr_name in hdr_formats:
-                hdr = hdr_format_map.get(hdr_name)
-                if hdr:
-                    hdr_link = StreamHDRLink(stream_id=stream.id, hdr_format_id=hdr.id)
-                    session.add(hdr_link)
+    for (info_hash, _, stream_data, media), prepared in zip(streams_to_create, prepared_streams):
+        if info_hash not in stored_info_hashes:
+            continue
+        media_stream_counts[media.id] += 1
 
         # Collect catalog links for batch insert
         if catalogs := stream_data.get("catalogs"):
@@ -1562,89 +1630,28 @@ async def store_new_torrent_streams(
                             }
                         )
 
-        # Add stream files and episode links (v5 schema)
-        # `files` is a list of StreamFileData with embedded episode info
-        # Maps (season_number, episode_number) -> episode_title
-        episode_info: dict[tuple[int, int], str] = {}
-        if files := stream_data.get("files"):
-            used_file_indexes: set[int] = set()
-            for idx, file_info in enumerate(files):
-                if isinstance(file_info, dict):
-                    # Create StreamFile
-                    file_type_str = file_info.get("file_type", "video")
-                    try:
-                        file_type = FileType(file_type_str)
-                    except ValueError:
-                        file_type = FileType.VIDEO
-
-                    # Ensure file_index is unique per stream.
-                    raw_file_index = file_info.get("file_index")
-                    try:
-                        file_index = int(raw_file_index) if raw_file_index is not None else idx
-                    except (TypeError, ValueError):
-                        file_index = idx
-                    while file_index in used_file_indexes:
-                        file_index += 1
-                    used_file_indexes.add(file_index)
-
-                    stream_file = StreamFile(
-                        stream_id=stream.id,
-                        file_index=file_index,
-                        filename=file_info.get("filename", ""),
-                        file_path=file_info.get("file_path"),
-                        size=file_info.get("size", 0),
-                        file_type=file_type,
-                    )
-                    session.add(stream_file)
-                    await session.flush()
-
-                    # Create FileMediaLink if file has episode info
-                    season_number = file_info.get("season_number")
-                    episode_number = file_info.get("episode_number")
-
-                    if season_number is not None or episode_number is not None:
-                        s_num = season_number or 1
-                        e_num = episode_number or 1
-                        file_link = FileMediaLink(
-                            file_id=stream_file.id,
-                            media_id=media.id,
-                            season_number=s_num,
-                            episode_number=e_num,
-                            episode_end=file_info.get("episode_end"),
-                            link_source=LinkSource.PTT_PARSER,
-                            confidence=1.0,
-                        )
-                        session.add(file_link)
-                        key = (s_num, e_num)
-                        if key not in episode_info:
-                            ep_title = file_info.get("episode_title") or f"Episode {e_num}"
-                            episode_info[key] = ep_title
-                    else:
-                        # For movies - create a simple media link without episode info
-                        file_link = FileMediaLink(
-                            file_id=stream_file.id,
-                            media_id=media.id,
-                            is_primary=True,
-                            link_source=LinkSource.PTT_PARSER,
-                            confidence=1.0,
-                        )
-                        session.add(file_link)
-
-        # Ensure Season/Episode metadata records exist for series
-        if episode_info and media.type == MediaType.SERIES:
-            sm_result = await session.exec(select(SeriesMetadata).where(SeriesMetadata.media_id == media.id))
-            sm = sm_result.first()
-            if sm:
-                for (s_num, e_num), ep_title in episode_info.items():
-                    season_obj = await get_or_create_season(session, sm.id, s_num)
-                    await get_or_create_episode(
-                        session,
-                        season_obj.id,
-                        e_num,
-                        title=ep_title,
-                    )
-
-        stored += 1
+        if media.type == MediaType.SERIES:
+            for file_row in prepared.files:
+                if file_row["episode_number"] is None:
+                    continue
+                episode_info = series_episode_info.setdefault(media.id, (media, {}))[1]
+                key = (file_row["season_number"], file_row["episode_number"])
+                if key not in episode_info:
+                    episode_info[key] = file_row["episode_title"] or f"Episode {file_row['episode_number']}"
+
+    # Ensure Season/Episode metadata records exist for series
+    for media, episode_info in series_episode_info.values():
+        sm_result = await session.exec(select(SeriesMetadata).where(SeriesMetadata.media_id == media.id))
+        sm = sm_result.first()
+        if sm:
+            for (s_num, e_num), ep_title in episode_info.items():
+                season_obj = await get_or_create_season(session, sm.id, s_num)
+                await get_or_create_episode(
+                    session,
+                    season_obj.id,
+                    e_num,
+                    title=ep_title,
+                )
 
     # Step 7: Batch insert catalog links
     if catalog_links_to_insert:
@@ -1652,38 +1659,27 @@ async def store_new_torrent_streams(
         await session.exec(stmt)
 
     # Step 8: Batch update media stream counts
-    if media_ids_to_update:
-        # Count streams per media from the links we just created
-        media_stream_counts = Counter()
-        for _, _, _, media in streams_to_create:
-            media_stream_counts[media.id] += 1
-
-        # Update each media's stream count
-        for media_id, count in media_stream_counts.items():
-            latest_stream_time = media_latest_stream_time.get(media_id, datetime.now(pytz.UTC))
-            await session.exec(
-                sa_update(Media)
-                .where(Media.id == media_id)
-                .values(
-                    total_streams=Media.total_streams + count,
-                    last_stream_added=func.greatest(
-                        func.coalesce(Media.last_stream_added, latest_stream_time),
-                        latest_stream_time,
-                    ),
-                )
+    for media_id, count in media_stream_counts.items():
+        await session.exec(
+            sa_update(Media)
+            .where(Media.id == media_id)
+            .values(
+                total_streams=Media.total_streams + count,
+                last_stream_added=func.greatest(func.coalesce(Media.last_stream_added, stored_at), stored_at),
             )
+        )
 
     await session.flush()
 
     # Invalidate stream cache for all affected media (after commit when deferred)
-    if media_ids_to_update:
+    if media_stream_counts:
         if deferred_cache_invalidation is not None:
-            deferred_cache_invalidation.update(media_ids_to_update)
+            deferred_cache_invalidation.update(media_stream_counts)
         else:
-            for media_id in media_ids_to_update:
+            for media_id in media_stream_counts:
                 await invalidate_media_stream_cache(media_id)
 
-    return stored
+    return len(stored_info_hashes)
 
 
 async def store_new_usenet_streams(
@@ -1797,10 +1793,12 @@ async def store_new_usenet_streams(
     # Create all streams
     media_latest_stream_time: dict[int, datetime] = {}
     for nzb_guid, meta_id, stream_data, media in streams_to_create:
+        stream_name = stream_data.get("name", "")
+        title_flags = classify_stream_title(stream_name)
         # Create base Stream
         stream = Stream(
             stream_type=StreamType.USENET,
-            name=stream_data.get("name", ""),
+            name=stream_name,
             source=stream_data.get("source") or stream_data.get("indexer", ""),
             total_size=stream_data.get("size") or stream_data.get("total_size", 0),
             resolution=stream_data.get("resolution"),
@@ -1813,6 +1811,8 @@ async def store_new_usenet_streams(
             is_extended=stream_data.get("is_extended", False),
             is_dubbed=stream_data.get("is_dubbed", False),
             is_subbed=stream_data.get("is_subbed", False),
+            is_adult=title_flags.is_adult,
+            is_non_video=title_flags.is_non_video,
         )
         session.add(stream)
         await session.flush()
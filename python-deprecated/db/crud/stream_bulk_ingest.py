@@ -0,0 +1,283 @@
+"""
+Set-based insert path for large batches of new torrent streams.
+
+The ORM path in ``store_new_torrent_streams`` flushes once per stream and once per
+file, so a DMM hashlist commit or RSS feed with thousands of new streams costs
+thousands of round trips. ``bulk_insert_torrent_streams`` stages the prepared rows
+with asyncpg ``COPY`` into temporary tables and moves them into the real tables with
+one ``INSERT ... SELECT ... ON CONFLICT DO NOTHING`` per table, so a batch costs a
+fixed number of statements whatever its size.
+
+Stream ids are drawn from the ``stream`` sequence while staging, so file and link
+rows reference them without reading streams back. When a concurrent writer stored
+one of the info hashes first, its ``torrent_stream`` insert is skipped and the
+matching ``stream`` row is deleted again in the same statement.
+
+Everything runs inside the caller's transaction; the staging tables are dropped at
+the end (and on commit, should the batch fail half way).
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any
+
+from sqlalchemy import text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from utils.prometheus_metrics import STREAM_BULK_INSERT_STAGE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Staged columns and their types. Keys of PreparedTorrentStream.stream / .torrent and
+# of each file row must match these.
+STREAM_COLUMNS = {
+    "name": "varchar",
+    "source": "varchar",
+    "resolution": "varchar",
+    "codec": "varchar",
+    "quality": "varchar",
+    "bit_depth": "varchar",
+    "uploader": "varchar",
+    "uploader_user_id": "integer",
+    "release_group": "varchar",
+    "is_remastered": "boolean",
+    "is_upscaled": "boolean",
+    "is_proper": "boolean",
+    "is_repack": "boolean",
+    "is_extended": "boolean",
+    "is_complete": "boolean",
+    "is_dubbed": "boolean",
+    "is_subbed": "boolean",
+    "is_adult": "boolean",
+    "is_non_video": "boolean",
+}
+TORRENT_COLUMNS = {
+    "total_size": "bigint",
+    "torrent_type": "torrenttype",
+    "seeders": "integer",
+    "leechers": "integer",
+    "uploaded_at": "timestamptz",
+    "torrent_file": "bytea",
+    "file_count": "integer",
+}
+FILE_COLUMNS = {
+    "file_index": "integer",
+    "filename": "varchar",
+    "file_path": "varchar",
+    "size": "bigint",
+    "file_type": "filetype",
+    "season_number": "integer",
+    "episode_number": "integer",
+    "episode_end": "integer",
+}
+
+# Reference link table and its id column per PreparedTorrentStream attribute
+_REFERENCE_LINKS = {
+    "language_ids": ("stream_language_link", "language_id"),
+    "audio_format_ids": ("stream_audio_link", "audio_format_id"),
+    "channel_ids": ("stream_channel_link", "channel_id"),
+    "hdr_format_ids": ("stream_hdr_link", "hdr_format_id"),
+}
+
+_STREAM_STAGE = "bulk_stream_stage"
+_FILE_STAGE = "bulk_stream_file_stage"
+_REFERENCE_STAGE = "bulk_stream_reference_stage"
+
+_STREAM_STAGE_COLUMNS = ["ord", "media_id", "info_hash", *STREAM_COLUMNS, *TORRENT_COLUMNS]
+_FILE_STAGE_COLUMNS = ["ord", *FILE_COLUMNS]
+_REFERENCE_STAGE_COLUMNS = ["ord", "kind", "ref_id"]
+
+
+def _column_definitions(columns: dict[str, str]) -> str:
+    return ", ".join(f"{name} {pg_type}" for name, pg_type in columns.items())
+
+
+_CREATE_STAGE_TABLES = (
+    f"""
+    CREATE TEMPORARY TABLE {_STREAM_STAGE} (
+        ord integer PRIMARY KEY,
+        stream_id integer NOT NULL DEFAULT nextval(pg_get_serial_sequence('stream', 'id')),
+        media_id integer NOT NULL,
+        info_hash varchar NOT NULL,
+        {_column_definitions(STREAM_COLUMNS)},
+        {_column_definitions(TORRENT_COLUMNS)}
+    ) ON COMMIT DROP
+    """,
+    f"CREATE TEMPORARY TABLE {_FILE_STAGE} (ord integer NOT NULL, {_column_definitions(FILE_COLUMNS)}) ON COMMIT DROP",
+    f"CREATE TEMPORARY TABLE {_REFERENCE_STAGE} (ord integer NOT NULL, kind varchar NOT NULL, ref_id integer NOT NULL) "
+    "ON COMMIT DROP",
+)
+
+_INSERT_STREAMS = f"""
+    INSERT INTO stream (id, stream_type, created_at, is_active, is_blocked, is_public, playback_count, {", ".join(STREAM_COLUMNS)})
+    SELECT stream_id, 'TORRENT', now(), true, false, true, 0, {", ".join(STREAM_COLUMNS)}
+    FROM {_STREAM_STAGE}
+    ORDER BY ord
+"""
+
+# Streams whose info hash a concurrent writer stored first lose the torrent_stream
+# insert; drop them from the stage and delete their stream rows again.
+_INSERT_TORRENTS = f"""
+    WITH inserted AS (
+        INSERT INTO torrent_stream (stream_id, info_hash, created_at, {", ".join(TORRENT_COLUMNS)})
+        SELECT stream_id, info_hash, now(), {", ".join(TORRENT_COLUMNS)}
+        FROM {_STREAM_STAGE}
+        ORDER BY ord
+        ON CONFLICT DO NOTHING
+        RETURNING stream_id, info_hash
+    ), lost AS (
+        DELETE FROM {_STREAM_STAGE} staged
+        WHERE NOT EXISTS (SELECT 1 FROM inserted WHERE inserted.stream_id = staged.stream_id)
+        RETURNING staged.stream_id
+    ), orphaned AS (
+        DELETE FROM stream WHERE id IN (SELECT stream_id FROM lost)
+    )
+    SELECT info_hash FROM inserted
+"""
+
+_INSERT_MEDIA_LINKS = f"""
+    INSERT INTO stream_media_link (stream_id, media_id, is_primary, is_verified, created_at)
+    SELECT stream_id, media_id, true, false, now()
+    FROM {_STREAM_STAGE}
+    ORDER BY ord
+"""
+
+_INSERT_REFERENCE_LINKS = {
+    kind: f"""
+    INSERT INTO {table} (stream_id, {id_column}{", language_type" if kind == "language_ids" else ""})
+    SELECT staged.stream_id, reference.ref_id{", 'audio'" if kind == "language_ids" else ""}
+    FROM {_REFERENCE_STAGE} reference
+    JOIN {_STREAM_STAGE} staged USING (ord)
+    WHERE reference.kind = '{kind}'
+    ON CONFLICT DO NOTHING
+    """
+    for kind, (table, id_column) in _REFERENCE_LINKS.items()
+}
+
+# Files and their media links in one statement: the file ids come from RETURNING
+_INSERT_FILES = f"""
+    WITH inserted AS (
+        INSERT INTO stream_file (stream_id, file_index, filename, file_path, size, file_type, is_archive)
+        SELECT staged.stream_id, f.file_index, f.filename, f.file_path, f.size, f.file_type, false
+        FROM {_FILE_STAGE} f
+        JOIN {_STREAM_STAGE} staged USING (ord)
+        ON CONFLICT DO NOTHING
+        RETURNING id, stream_id, file_index
+    )
+    INSERT INTO file_media_link (
+        file_id, media_id, season_number, episode_number, episode_end, is_primary, confidence, link_source, created_at
+    )
+    SELECT inserted.id, staged.media_id, f.season_number, f.episode_number, f.episode_end, true, 1.0, 'PTT_PARSER', now()
+    FROM inserted
+    JOIN {_STREAM_STAGE} staged ON staged.stream_id = inserted.stream_id
+    JOIN {_FILE_STAGE} f ON f.ord = staged.ord AND f.file_index = inserted.file_index
+    ON CONFLICT DO NOTHING
+"""
+
+_DROP_STAGE_TABLES = f"DROP TABLE IF EXISTS {_STREAM_STAGE}, {_FILE_STAGE}, {_REFERENCE_STAGE}"
+
+
+@dataclass(slots=True)
+class PreparedTorrentStream:
+    """Column values of one new torrent stream, shared by the ORM and bulk insert paths."""
+
+    info_hash: str
+    media_id: int
+    stream: dict[str, Any]
+    torrent: dict[str, Any]
+    files: list[dict[str, Any]] = field(default_factory=list)
+    language_ids: list[int] = field(default_factory=list)
+    audio_format_ids: list[int] = field(default_factory=list)
+    channel_ids: list[int] = field(default_factory=list)
+    hdr_format_ids: list[int] = field(default_factory=list)
+
+
+def _copy_value(value: Any) -> Any:
+    # PostgreSQL enum labels are the Python member names (see the v5 schema migration)
+    return value.name if isinstance(value, Enum) else value
+
+
+def _staged_records(
+    prepared: list[PreparedTorrentStream],
+) -> tuple[list[tuple], list[tuple], list[tuple]]:
+    stream_records: list[tuple] = []
+    file_records: list[tuple] = []
+    reference_records: list[tuple] = []
+    for ord_, row in enumerate(prepared):
+        stream_records.append(
+            (
+                ord_,
+                row.media_id,
+                row.info_hash,
+                *(_copy_value(row.stream[column]) for column in STREAM_COLUMNS),
+                *(_copy_value(row.torrent[column]) for column in TORRENT_COLUMNS),
+            )
+        )
+        file_records.extend(
+            (ord_, *(_copy_value(file_row[column]) for column in FILE_COLUMNS)) for file_row in row.files
+        )
+        for kind in _REFERENCE_LINKS:
+            reference_records.extend((ord_, kind, ref_id) for ref_id in dict.fromkeys(getattr(row, kind)))
+    return stream_records, file_records, reference_records
+
+
+async def bulk_insert_torrent_streams(session: AsyncSession, prepared: list[PreparedTorrentStream]) -> set[str]:
+    """Insert new torrent streams with their files and links; returns the stored info hashes.
+
+    Info hashes that already exist are skipped. Media counters, catalog links and
+    season / episode records are left to the caller, as on the ORM path.
+    """
+    if not prepared:
+        return set()
+
+    timings: dict[str, float] = {}
+    clock = time.perf_counter()
+
+    def lap(stage: str) -> None:
+        nonlocal clock
+        now = time.perf_counter()
+        timings[stage] = now - clock
+        STREAM_BULK_INSERT_STAGE_SECONDS.labels(stage=stage).observe(now - clock)
+        clock = now
+
+    stream_records, file_records, reference_records = _staged_records(prepared)
+    # Executing through the session first also begins the transaction COPY joins
+    for statement in _CREATE_STAGE_TABLES:
+        await session.execute(text(statement))
+    connection = await session.connection()
+    driver_connection = (await connection.get_raw_connection()).driver_connection
+    await driver_connection.copy_records_to_table(_STREAM_STAGE, records=stream_records, columns=_STREAM_STAGE_COLUMNS)
+    if file_records:
+        await driver_connection.copy_records_to_table(_FILE_STAGE, records=file_records, columns=_FILE_STAGE_COLUMNS)
+    if reference_records:
+        await driver_connection.copy_records_to_table(
+            _REFERENCE_STAGE, records=reference_records, columns=_REFERENCE_STAGE_COLUMNS
+        )
+    lap("stage")
+
+    await session.execute(text(_INSERT_STREAMS))
+    stored = set((await session.execute(text(_INSERT_TORRENTS))).scalars().all())
+    lap("streams")
+
+    if stored:
+        await session.execute(text(_INSERT_MEDIA_LINKS))
+        for kind in dict.fromkeys(record[1] for record in reference_records):
+            await session.execute(text(_INSERT_REFERENCE_LINKS[kind]))
+    lap("links")
+
+    if stored and file_records:
+        await session.execute(text(_INSERT_FILES))
+    lap("files")
+
+    await session.execute(text(_DROP_STAGE_TABLES))
+
+    logger.info(
+        "Bulk inserted %s/%s torrent streams (%s files): %s",
+        len(stored),
+        len(prepared),
+        len(file_records),
+        " ".join(f"{stage}={seconds * 1000:.0f}ms" for stage, seconds in timings.items()),
+    )
+    return stored
@@ -2,39 +2,325 @@
 Stream cache invalidation helpers.
 
 Extracted here to avoid circular imports between stream_services.py and streams.py.
+
+Cached stream payloads are versioned per media: every ``stream_data:`` key ends with
+the media's current generation (``...:g{generation}``), kept in ``stream_gen:{media_id}``.
+Invalidation bumps the generation, so readers move on to new keys and the old entries
+simply expire, instead of SCANning the keyspace for every key of the media.
+
+Each worker also keeps an in-process L1 of decoded payloads (``stream_l1_cache``). An
+L1 entry remembers the generation it was read at and is only served after the Redis
+read confirms that generation is still current, so an invalidation on any node is
+seen by every worker on its next lookup. Deleting ``stream_data:`` keys directly (the
+admin cache clear) therefore has to bump the generations as well
+(``invalidate_cleared_stream_cache_keys``), or the L1s keep serving the old payloads.
+
+Misses are filled single-flight: concurrent requests in a worker share one in-flight
+future per versioned key (``inflight_stream_fills``), and a short Redis lease
+(``stream_fill:{versioned_key}``) lets one node query the database while the others
+wait for the payload it stores.
 """
 
+import asyncio
 import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
 
+from db.config import settings
 from db.redis_database import REDIS_ASYNC_CLIENT
+from utils.prometheus_metrics import (
+    STREAM_CACHE_LOOKUPS_TOTAL,
+    STREAM_L1_CACHE_BYTES,
+    STREAM_L1_CACHE_ENTRIES,
+    STREAM_L1_CACHE_EVICTIONS_TOTAL,
+)
 
 logger = logging.getLogger(__name__)
 
 STREAM_CACHE_PREFIX = "stream_data:"
+STREAM_CACHE_GENERATION_PREFIX = "stream_gen:"
+STREAM_CACHE_FILL_LEASE_PREFIX = "stream_fill:"
+# Generation counters outlive every cached payload; an expired counter reads as generation 0 again.
+STREAM_CACHE_GENERATION_TTL = 7 * 24 * 3600
+# Generation bumps sent per pipeline when invalidating many media at once
+_BULK_INVALIDATION_CHUNK = 1000
+
+# Bump a media's generation. A counter that does not exist yet is seeded from the server
+# clock (microseconds), so a counter that expired and comes back never repeats a generation
+# whose payloads may still be cached.
+_BUMP_GENERATION_SCRIPT = """
+local generation = redis.call('INCR', KEYS[1])
+if generation == 1 then
+    local now = redis.call('TIME')
+    generation = redis.call('INCRBY', KEYS[1], tonumber(now[1]) * 1000000 + tonumber(now[2]))
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return generation
+"""
+
+
+class StreamL1Cache:
+    """Per-process LRU of decoded stream cache payloads, bounded by count, bytes and TTL.
+
+    ``size`` is the serialized JSON length of a payload, used as an estimate of its
+    decoded footprint. Entries may carry the Redis generation they were read at.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.total_bytes = 0
+        self._entries: OrderedDict[str, tuple[float, str | None, Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> tuple[str | None, Any] | None:
+        """Return ``(generation, payload)`` for a live entry, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, generation, payload, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self._update_gauges()
+                return None
+            self._entries.move_to_end(key)
+            return generation, payload
+
+    def put(self, key: str, generation: str | None, payload: Any, size: int) -> None:
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, generation, payload, size)
+            self.total_bytes += size
+            while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                _, (_, _, _, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                STREAM_L1_CACHE_EVICTIONS_TOTAL.inc()
+            self._update_gauges()
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+            self._update_gauges()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+            self._update_gauges()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[3]
+
+    def _update_gauges(self) -> None:
+        STREAM_L1_CACHE_ENTRIES.set(len(self._entries))
+        STREAM_L1_CACHE_BYTES.set(self.total_bytes)
+
+
+stream_l1_cache = StreamL1Cache(
+    settings.stream_l1_cache_max_entries,
+    settings.stream_l1_cache_max_bytes,
+    settings.stream_l1_cache_ttl_seconds,
+)
+
+# Fills running in this worker, keyed by versioned cache key; resolved with the payload.
+inflight_stream_fills: dict[str, asyncio.Future] = {}
+
+
+@dataclass(slots=True)
+class StreamCacheLookup:
+    """Result of a versioned stream cache read for one unversioned cache key.
+
+    ``payload`` is set when the L1 entry is current; otherwise ``blob`` holds the Redis
+    payload (None on a miss). ``versioned_key`` is None when the generation could not be
+    read (Redis unavailable), in which case callers must not store the fetched payload.
+    """
+
+    cache_key: str
+    versioned_key: str | None = None
+    generation: str | None = None
+    blob: bytes | None = None
+    payload: Any = None
+
+
+def _generation_key(media_id: int) -> str:
+    return f"{STREAM_CACHE_GENERATION_PREFIX}{media_id}"
+
+
+async def get_versioned_stream_cache(media_ids: list[int], cache_keys: list[str]) -> list[StreamCacheLookup]:
+    """Resolve cache keys to their current versioned keys, serving current L1 entries.
+
+    Reads the generations first and then only the payloads the L1 cannot serve, so every
+    key is named in the command that reads it (no key names built inside a script).
+    """
+    use_l1 = settings.stream_l1_cache_enabled
+    held = [stream_l1_cache.get(key) if use_l1 else None for key in cache_keys]
+    generations = await REDIS_ASYNC_CLIENT.mget([_generation_key(media_id) for media_id in media_ids])
+    if not generations:
+        return [StreamCacheLookup(cache_key) for cache_key in cache_keys]
+
+    lookups = []
+    to_read: list[StreamCacheLookup] = []
+    for index, cache_key in enumerate(cache_keys):
+        generation = generations[index] or b"0"
+        if isinstance(generation, bytes):
+            generation = generation.decode()
+        lookup = StreamCacheLookup(cache_key, f"{cache_key}:g{generation}", generation)
+        entry = held[index]
+        if entry is not None and entry[0] == generation:
+            lookup.payload = entry[1]
+            STREAM_CACHE_LOOKUPS_TOTAL.labels(cache="stream_data", tier="l1", result="hit").inc()
+        else:
+            if entry is not None:
+                stream_l1_cache.discard(cache_key)
+            if use_l1:
+                STREAM_CACHE_LOOKUPS_TOTAL.labels(cache="stream_data", tier="l1", result="miss").inc()
+            to_read.append(lookup)
+        lookups.append(lookup)
+
+    if to_read:
+        # A failed read answers [], leaving every blob None (a miss)
+        blobs = await REDIS_ASYNC_CLIENT.mget([lookup.versioned_key for lookup in to_read])
+        for lookup, blob in zip(to_read, blobs):
+            lookup.blob = blob
+    return lookups
+
+
+def remember_stream_payload(lookup: StreamCacheLookup, payload: Any, size: int) -> None:
+    """Keep a decoded payload in the L1 under the generation it was read or stored at."""
+    if settings.stream_l1_cache_enabled and lookup.generation is not None:
+        stream_l1_cache.put(lookup.cache_key, lookup.generation, payload, size)
+
+
+async def acquire_stream_fill_leases(versioned_keys: list[str]) -> list[bool]:
+    """Try to take the cross-worker fill lease for each key.
+
+    If Redis is unavailable every lease counts as acquired, so callers fall back to
+    filling on their own.
+    """
+    try:
+        pipe = REDIS_ASYNC_CLIENT.pipeline(transaction=False)
+        for key in versioned_keys:
+            pipe.set(
+                f"{STREAM_CACHE_FILL_LEASE_PREFIX}{key}",
+                "1",
+                ex=settings.stream_cache_fill_lease_seconds,
+                nx=True,
+            )
+        return [bool(acquired) for acquired in await pipe.execute()]
+    except Exception as exc:
+        logger.debug("Stream cache fill lease failed: %s", exc)
+        return [True] * len(versioned_keys)
+
+
+async def release_stream_fill_leases(versioned_keys: list[str]) -> None:
+    if not versioned_keys:
+        return
+    try:
+        await REDIS_ASYNC_CLIENT.delete(*(f"{STREAM_CACHE_FILL_LEASE_PREFIX}{key}" for key in versioned_keys))
+    except Exception as exc:
+        logger.debug("Stream cache fill lease release failed: %s", exc)
+
+
+async def wait_for_stream_fills(versioned_keys: list[str]) -> list[bytes | None]:
+    """Wait for payloads stored by other workers holding the fill leases.
+
+    Polls with backoff for at most ``stream_cache_fill_wait_seconds``. A key whose lease
+    disappears without a payload (the holder failed) stops being waited for, and stays None.
+    """
+    n = len(versioned_keys)
+    blobs: list[bytes | None] = [None] * n
+    pending = list(range(n))
+    deadline = time.monotonic() + settings.stream_cache_fill_wait_seconds
+    delay = 0.025
+    while pending:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        await asyncio.sleep(min(delay, remaining))
+        delay = min(delay * 2, 0.2)
+        try:
+            found = await REDIS_ASYNC_CLIENT.mget(
+                [
+                    *(versioned_keys[i] for i in pending),
+                    *(f"{STREAM_CACHE_FILL_LEASE_PREFIX}{versioned_keys[i]}" for i in pending),
+                ]
+            )
+        except Exception as exc:
+            logger.debug("Stream cache fill wait failed: %s", exc)
+            break
+        if not found:
+            # The wrapper answers [] when Redis is unavailable
+            break
+        still_pending = []
+        for offset, index in enumerate(pending):
+            blob, lease = found[offset], found[len(pending) + offset]
+            if blob:
+                blobs[index] = blob
+            elif lease:
+                still_pending.append(index)
+        pending = still_pending
+    return blobs
 
 
 async def invalidate_media_stream_cache(media_id: int) -> None:
-    """Delete all cached stream data for a media.
+    """Invalidate all cached stream data for a media.
 
-    Called when streams are added to or removed from a media entry.
-    Clears both movie and series cache keys for the given media_id.
+    Called when streams are added to or removed from a media entry. Bumping the
+    generation covers movie and series keys in every visibility scope at once.
     """
     try:
-        legacy_movie_key = f"{STREAM_CACHE_PREFIX}movie:{media_id}"
-        await REDIS_ASYNC_CLIENT.delete(legacy_movie_key)
-
-        movie_pattern = f"{STREAM_CACHE_PREFIX}movie:{media_id}:*"
-        movie_keys = []
-        async for key in REDIS_ASYNC_CLIENT.scan_iter(match=movie_pattern, count=100):
-            movie_keys.append(key)
-        if movie_keys:
-            await REDIS_ASYNC_CLIENT.delete(*movie_keys)
-
-        pattern = f"{STREAM_CACHE_PREFIX}series:{media_id}:*"
-        keys = []
-        async for key in REDIS_ASYNC_CLIENT.scan_iter(match=pattern, count=100):
-            keys.append(key)
-        if keys:
-            await REDIS_ASYNC_CLIENT.delete(*keys)
+        await REDIS_ASYNC_CLIENT.eval(
+            _BUMP_GENERATION_SCRIPT, 1, _generation_key(media_id), STREAM_CACHE_GENERATION_TTL
+        )
     except Exception as e:
         logger.warning(f"Error invalidating stream cache for media_id={media_id}: {e}")
+
+
+async def invalidate_media_stream_caches(media_ids: Iterable[int]) -> None:
+    """Invalidate the cached stream data of many media, pipelining the generation bumps."""
+    media_ids = list(media_ids)
+    try:
+        for start in range(0, len(media_ids), _BULK_INVALIDATION_CHUNK):
+            pipe = REDIS_ASYNC_CLIENT.pipeline(transaction=False)
+            for media_id in media_ids[start : start + _BULK_INVALIDATION_CHUNK]:
+                pipe.eval(_BUMP_GENERATION_SCRIPT, 1, _generation_key(media_id), STREAM_CACHE_GENERATION_TTL)
+            await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Error invalidating stream cache for {len(media_ids)} media: {e}")
+
+
+def stream_cache_media_id(key: str) -> int | None:
+    """Media id of a ``stream_data:`` payload key or ``stream_gen:`` counter, None for other keys."""
+    if key.startswith(STREAM_CACHE_PREFIX):
+        # stream_data:{movie|series}:{media_id}:...
+        parts = key[len(STREAM_CACHE_PREFIX) :].split(":")
+        media_id = parts[1] if len(parts) > 1 else ""
+    elif key.startswith(STREAM_CACHE_GENERATION_PREFIX):
+        media_id = key[len(STREAM_CACHE_GENERATION_PREFIX) :]
+    else:
+        return None
+    return int(media_id) if media_id.isdigit() else None
+
+
+async def invalidate_cleared_stream_cache_keys(keys: Iterable[str]) -> None:
+    """Bump the generation of every media whose stream cache keys were deleted directly.
+
+    Call after the keys are gone: a deleted counter is then reseeded past every
+    generation the L1s may still hold.
+    """
+    media_ids = {media_id for key in keys if (media_id := stream_cache_media_id(key)) is not None}
+    if media_ids:
+        await invalidate_media_stream_caches(media_ids)
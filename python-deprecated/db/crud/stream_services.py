@@ -18,7 +18,7 @@ from dataclasses import dataclass
 from datetime import date
 
 import orjson
-from collections.abc import Awaitable
+from collections.abc import Awaitable, Callable
 from typing import Any, cast
 
 from fastapi import BackgroundTasks
@@ -62,10 +62,28 @@ from db.schemas import (
     UserData,
     YouTubeStreamData,
 )
-from db.crud.stream_cache import STREAM_CACHE_PREFIX
+from db.crud.stream_cache import (
+    STREAM_CACHE_PREFIX,
+    StreamCacheLookup,
+    acquire_stream_fill_leases,
+    get_versioned_stream_cache,
+    inflight_stream_fills,
+    release_stream_fill_leases,
+    remember_stream_payload,
+    stream_l1_cache,
+    wait_for_stream_fills,
+)
 from db.schemas.media import HTTPStreamData, TelegramStreamData, UsenetStreamData
 from utils.network import encode_mediaflow_acestream_url
 from utils.parser import parse_stream_data
+from utils.prometheus_metrics import STREAM_CACHE_FILLS_TOTAL, STREAM_CACHE_LOOKUPS_TOTAL
+from utils.stream_cache_codec import (
+    CODEC_MAGIC as STREAM_CACHE_CODEC_MAGIC,
+    LEGACY_ZLIB_MAGIC,
+    decode_payload as decode_stream_cache_payload,
+    encode_payload as encode_stream_cache_payload,
+)
+from utils.swr_cache import is_stale, schedule_stale_refresh, soft_expiry_of, split_soft_expiry, wrap_with_soft_expiry
 from utils.usenet_url_resolver import apply_user_scoped_nzb_urls
 from utils.youtube import format_geo_restriction_label
 
@@ -109,11 +127,21 @@ class _CachedMedia:
 
 async def _media_ids_redis_get(video_id: str, media_type: MediaType) -> "tuple[_CachedMedia, list[int]] | None":
     key = f"{_MEDIA_ID_REDIS_PREFIX}{media_type.value}:{video_id}"
+    use_l1 = settings.stream_l1_cache_enabled
+    if use_l1:
+        held = stream_l1_cache.get(key)
+        if held is not None:
+            STREAM_CACHE_LOOKUPS_TOTAL.labels(cache="media_ids", tier="l1", result="hit").inc()
+            media, related_ids = held[1]
+            # Callers extend the id list in place; the cached tuple stays untouched
+            return media, list(related_ids)
+        STREAM_CACHE_LOOKUPS_TOTAL.labels(cache="media_ids", tier="l1", result="miss").inc()
     try:
         raw = await REDIS_ASYNC_CLIENT.get(key)
     except Exception:
         return None
     if raw is None:
+        STREAM_CACHE_LOOKUPS_TOTAL.labels(cache="media_ids", tier="redis", result="miss").inc()
         return None
     try:
         data = orjson.loads(raw)
@@ -124,9 +152,13 @@ async def _media_ids_redis_get(video_id: str, media_type: MediaType) -> "tuple[_
             year=data.get("year"),
             release_date=date.fromisoformat(data["release_date"]) if data.get("release_date") else None,
         )
-        return media, data["related_ids"]
+        related_ids = data["related_ids"]
     except Exception:
         return None
+    STREAM_CACHE_LOOKUPS_TOTAL.labels(cache="media_ids", tier="redis", result="hit").inc()
+    if use_l1:
+        stream_l1_cache.put(key, None, (media, tuple(related_ids)), len(raw))
+    return media, list(related_ids)
 
 
 async def _media_ids_redis_set(video_id: str, media_type: MediaType, media: Media, related_ids: list[int]) -> None:
@@ -148,7 +180,7 @@ async def _media_ids_redis_set(video_id: str, media_type: MediaType, media: Medi
 
 
 # Redis cache for raw stream payloads (see settings.stream_raw_redis_cache_*)
-_STREAM_CACHE_MAGIC = b"\x01MFsc1"  # zlib-compressed JSON blob prefix
+_STREAM_CACHE_MAGIC = LEGACY_ZLIB_MAGIC  # zlib-compressed JSON blob prefix (default codec)
 LIVE_TORRENT_FALLBACK_CACHE_TTL = 180  # 3 minutes
 LIVE_TORRENT_FALLBACK_CACHE_PREFIX = "live_torrent_fallback:"
 
@@ -162,16 +194,16 @@ logger = logging.getLogger(__name__)
 
 def _encode_stream_cache_blob(data: dict) -> bytes | None:
     """Serialize stream cache payload for Redis. Returns None if over max_stored_bytes."""
-    raw = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS, default=str)
-    if settings.stream_raw_redis_cache_zlib_compress:
-        # Level 1: fastest compression; cache blobs are short-lived so ratio matters less than CPU cost
-        body = _STREAM_CACHE_MAGIC + zlib.compress(raw, 1)
-    else:
-        body = raw
+    return _encode_stream_cache_blob_with_size(data)[0]
+
+
+def _encode_stream_cache_blob_with_size(data: dict) -> tuple[bytes | None, int]:
+    """Like _encode_stream_cache_blob, also returning the serialized payload size."""
+    body, raw_size = encode_stream_cache_payload(data)
     max_b = settings.stream_raw_redis_cache_max_stored_bytes
     if max_b > 0 and len(body) > max_b:
-        return None
-    return body
+        return None, raw_size
+    return body, raw_size
 
 
 # Zlib wrappers typically start with CMF 0x78; FLG is commonly 0x01 / 0x5E / 0x9C / 0xDA (RFC 1950).
@@ -182,34 +214,65 @@ def _decode_stream_cache_blob(blob: bytes | memoryview | str | None) -> dict | N
     """Parse stream cache payload from Redis (compressed or legacy JSON string/bytes).
 
     Never raises: returns None if the blob is missing, empty, or not decodable JSON.
-    Handles: MF magic+zlib, raw zlib-wrapped JSON, gzip, and plain UTF-8 JSON bytes.
+    Handles: codec registry blobs (utils/stream_cache_codec.py), MF magic+zlib, raw
+    zlib-wrapped JSON, gzip, and plain UTF-8 JSON bytes, each optionally behind the
+    soft-expiry header (utils/swr_cache.py).
     """
-    if blob is None:
-        return None
-    if isinstance(blob, str):
-        try:
-            return orjson.loads(blob)
-        except Exception:
-            return None
-    if isinstance(blob, memoryview):
-        blob = bytes(blob)
-    if not blob:
-        return None
+    return _decode_stream_cache_blob_with_size(blob)[0]
 
-    def _loads_utf8_json(raw: bytes) -> dict | None:
+
+def _decode_stream_cache_blob_with_size(blob: bytes | memoryview | str | None) -> tuple[dict | None, int]:
+    """Like _decode_stream_cache_blob, also returning the decoded JSON size (0 when unreadable)."""
+    raw_size = 0
+
+    def _loads_utf8_json(raw: bytes | str) -> dict | None:
+        nonlocal raw_size
         try:
-            return orjson.loads(raw)
+            parsed = orjson.loads(raw)
         except Exception:
             return None
+        raw_size = len(raw)
+        return parsed
 
-    if blob.startswith(_STREAM_CACHE_MAGIC):
-        try:
-            raw = zlib.decompress(blob[len(_STREAM_CACHE_MAGIC) :])
-        except zlib.error:
+    def _decode(blob: bytes | memoryview | str | None) -> dict | None:
+        nonlocal raw_size
+        if blob is None:
+            return None
+        if isinstance(blob, str):
+            return _loads_utf8_json(blob)
+        if isinstance(blob, memoryview):
+            blob = bytes(blob)
+        if not blob:
             return None
-        return _loads_utf8_json(raw)
 
-    if len(blob) >= 2 and blob[0] == 0x78 and blob[1] in _ZLIB_FLG_BYTES:
+        if blob.startswith(STREAM_CACHE_CODEC_MAGIC):
+            try:
+                parsed, raw_size = decode_stream_cache_payload(blob)
+            except Exception:
+                return None
+            return parsed
+
+        if blob.startswith(_STREAM_CACHE_MAGIC):
+            try:
+                raw = zlib.decompress(blob[len(_STREAM_CACHE_MAGIC) :])
+            except zlib.error:
+                return None
+            return _loads_utf8_json(raw)
+
+        if len(blob) >= 2 and blob[0] == 0x78 and blob[1] in _ZLIB_FLG_BYTES:
+            try:
+                raw = zlib.decompress(blob)
+            except zlib.error:
+                raw = None
+            if raw is not None:
+                parsed = _loads_utf8_json(raw)
+                if parsed is not None:
+                    return parsed
+
+        parsed = _loads_utf8_json(blob)
+        if parsed is not None:
+            return parsed
+
         try:
             raw = zlib.decompress(blob)
         except zlib.error:
@@ -219,27 +282,18 @@ def _decode_stream_cache_blob(blob: bytes | memoryview | str | None) -> dict | N
             if parsed is not None:
                 return parsed
 
-    parsed = _loads_utf8_json(blob)
-    if parsed is not None:
-        return parsed
-
-    try:
-        raw = zlib.decompress(blob)
-    except zlib.error:
-        raw = None
-    if raw is not None:
-        parsed = _loads_utf8_json(raw)
-        if parsed is not None:
-            return parsed
+        try:
+            raw = gzip.decompress(blob)
+        except (OSError, EOFError):
+            raw = None
+        if raw is not None:
+            return _loads_utf8_json(raw)
 
-    try:
-        raw = gzip.decompress(blob)
-    except (OSError, EOFError):
-        raw = None
-    if raw is not None:
-        return _loads_utf8_json(raw)
+        return None
 
-    return None
+    blob, _ = split_soft_expiry(blob)
+    parsed = _decode(blob)
+    return parsed, raw_size if parsed is not None else 0
 
 
 async def _store_stream_cache(cache_key: str, data: dict) -> None:
@@ -252,27 +306,29 @@ async def _store_stream_cache(cache_key: str, data: dict) -> None:
             return
         await REDIS_ASYNC_CLIENT.set(
             cache_key,
-            blob,
+            wrap_with_soft_expiry(blob, settings.stream_raw_redis_cache_soft_ttl_seconds),
             ex=settings.stream_raw_redis_cache_ttl_seconds,
         )
     except Exception as exc:
         logger.warning("Stream cache SET failed for %s: %s", cache_key, exc)
 
 
-async def _store_stream_cache_bulk(pairs: list[tuple[str, dict]]) -> None:
-    """Store multiple stream cache entries in a single Redis pipeline."""
+async def _store_stream_cache_bulk(pairs: list[tuple[StreamCacheLookup, dict]]) -> None:
+    """Store multiple stream cache entries in a single Redis pipeline and in the L1."""
     if not settings.stream_raw_redis_cache_enabled or not pairs:
         return
     ttl = settings.stream_raw_redis_cache_ttl_seconds
+    soft_ttl = settings.stream_raw_redis_cache_soft_ttl_seconds
     try:
         pipe = REDIS_ASYNC_CLIENT.pipeline(transaction=False)
         stored = 0
-        for cache_key, data in pairs:
-            blob = _encode_stream_cache_blob(data)
+        for lookup, data in pairs:
+            blob, size = _encode_stream_cache_blob_with_size(data)
+            remember_stream_payload(lookup, data, size)
             if blob is None:
-                logger.debug("Stream cache skip SET (oversize): %s", cache_key)
+                logger.debug("Stream cache skip SET (oversize): %s", lookup.versioned_key)
                 continue
-            pipe.set(cache_key, blob, ex=ttl)
+            pipe.set(lookup.versioned_key, wrap_with_soft_expiry(blob, soft_ttl), ex=ttl)
             stored += 1
         if stored:
             await pipe.execute()
@@ -280,6 +336,105 @@ async def _store_stream_cache_bulk(pairs: list[tuple[str, dict]]) -> None:
         logger.warning("Stream cache pipeline SET failed: %s", exc)
 
 
+async def _fill_stream_cache_misses(
+    lookups: list[StreamCacheLookup],
+    media_ids: list[int],
+    miss_indices: list[int],
+    fetch_batch: Callable[[list[int]], Awaitable[dict[int, dict]]],
+) -> dict[int, dict]:
+    """Fill stream cache misses with at most one DB fetch per key across concurrent requests.
+
+    Keys already being filled in this worker join that fill's future. For the rest, a
+    Redis lease elects one filler across workers; the others wait briefly for the payload
+    it stores and fetch on their own only if it does not show up.
+    """
+    loop = asyncio.get_running_loop()
+    filled: dict[int, dict] = {}
+    joined: list[tuple[int, asyncio.Future]] = []
+    owned: dict[int, asyncio.Future] = {}
+    unkeyed: list[int] = []
+    for idx in miss_indices:
+        key = lookups[idx].versioned_key
+        if key is None:
+            unkeyed.append(idx)
+        elif key in inflight_stream_fills:
+            joined.append((idx, inflight_stream_fills[key]))
+        else:
+            owned[idx] = inflight_stream_fills[key] = loop.create_future()
+
+    async def _fetch_and_store(indices: list[int]) -> None:
+        batch = await fetch_batch([media_ids[idx] for idx in indices])
+        # Store all misses in a single pipeline instead of N serial SETs
+        await _store_stream_cache_bulk(
+            [(lookups[idx], batch[media_ids[idx]]) for idx in indices if lookups[idx].versioned_key]
+        )
+        STREAM_CACHE_FILLS_TOTAL.labels(source="db").inc(len(indices))
+        for idx in indices:
+            filled[idx] = batch[media_ids[idx]]
+
+    leased: list[int] = []
+    try:
+        if owned:
+            owned_indices = list(owned)
+            acquired = await acquire_stream_fill_leases([lookups[idx].versioned_key for idx in owned_indices])
+            leased = [idx for idx, ok in zip(owned_indices, acquired) if ok]
+            contended = [idx for idx, ok in zip(owned_indices, acquired) if not ok]
+            if contended:
+                blobs = await wait_for_stream_fills([lookups[idx].versioned_key for idx in contended])
+                for idx, blob in zip(contended, blobs):
+                    parsed, size = _decode_stream_cache_blob_with_size(blob)
+                    if parsed is not None:
+                        remember_stream_payload(lookups[idx], parsed, size)
+                        STREAM_CACHE_FILLS_TOTAL.labels(source="remote").inc()
+                        filled[idx] = parsed
+        to_fetch = [idx for idx in owned if idx not in filled] + unkeyed
+        if to_fetch:
+            await _fetch_and_store(to_fetch)
+    except BaseException as exc:
+        for idx, future in owned.items():
+            inflight_stream_fills.pop(lookups[idx].versioned_key, None)
+            if not future.done():
+                future.set_exception(RuntimeError(f"stream cache fill failed: {exc!r}"))
+                # Waiters fall back to their own fetch; do not log it as unretrieved
+                future.exception()
+        raise
+    finally:
+        await release_stream_fill_leases([lookups[idx].versioned_key for idx in leased])
+
+    for idx, future in owned.items():
+        inflight_stream_fills.pop(lookups[idx].versioned_key, None)
+        future.set_result(filled[idx])
+
+    retry: list[int] = []
+    for idx, future in joined:
+        try:
+            filled[idx] = await asyncio.shield(future)
+        except Exception:
+            retry.append(idx)
+            continue
+        STREAM_CACHE_FILLS_TOTAL.labels(source="local").inc()
+    if retry:
+        await _fetch_and_store(retry)
+    return filled
+
+
+def _schedule_stream_cache_refresh(
+    lookups: list[StreamCacheLookup],
+    media_ids: list[int],
+    indices: list[int],
+    fetch_batch: Callable[[list[int]], Awaitable[dict[int, dict]]],
+) -> None:
+    """Refetch soft-expired stream cache entries in the background; the stale payloads are served meanwhile."""
+    for idx in indices:
+        lookup, media_id = lookups[idx], media_ids[idx]
+
+        async def _refresh(lookup: StreamCacheLookup = lookup, media_id: int = media_id) -> None:
+            batch = await fetch_batch([media_id])
+            await _store_stream_cache_bulk([(lookup, batch[media_id])])
+
+        schedule_stale_refresh("stream_data", lookup.versioned_key, _refresh)
+
+
 _scraper_tasks_module = None
 LIVE_SEARCH_EXTERNAL_PROVIDERS = {"tmdb", "tvdb", "mal", "kitsu"}
 
@@ -1117,19 +1272,57 @@ async def _get_cached_movie_streams_bulk(
     out: list[dict | None] = [None] * n
     miss_indices: list[int] = []
 
-    # Single MGET round-trip instead of N sequential GETs
+    async def _fetch_movie_batch(ids_to_fetch: list[int]) -> dict[int, dict]:
+        batch_op_name = f"movie stream batch fetch media_ids={ids_to_fetch}"
+        t0 = time.monotonic()
+
+        async def _run_movie_batch_read():
+            return await _fetch_movie_raw_streams_batch(ids_to_fetch, visibility_filter)
+
+        async def _run_movie_batch_primary():
+            async def _fetch_one_primary(mid: int) -> tuple[int, dict]:
+                async with get_async_session_context() as s:
+                    return mid, await _fetch_movie_raw_streams_in_session(s, mid, visibility_filter)
+
+            results = await asyncio.gather(*(_fetch_one_primary(mid) for mid in ids_to_fetch))
+            return dict(results)
+
+        batch = await run_db_read_with_primary_fallback(
+            _run_movie_batch_read,
+            _run_movie_batch_primary,
+            operation_name=batch_op_name,
+            on_fallback=lambda exc: logger.warning(
+                "Falling back to primary for %s after replica error: %s", batch_op_name, exc
+            ),
+        )
+        elapsed = time.monotonic() - t0
+        logger.info("DB batch fetch for movie media_ids=%s took %.3fs", ids_to_fetch, elapsed)
+        return batch
+
+    # Keys are versioned by the media's stream cache generation (see db/crud/stream_cache.py);
+    # one MGET reads the generations and a second reads only the payloads the L1 cannot
+    # serve (those already decoded by this worker at the current generation).
+    lookups = [StreamCacheLookup(cache_key) for cache_key in cache_keys]
+    soft_expired_indices: list[int] = []
     if settings.stream_raw_redis_cache_enabled:
         try:
-            cached_blobs = await REDIS_ASYNC_CLIENT.mget(*cache_keys)
+            lookups = await get_versioned_stream_cache(media_ids, cache_keys)
         except Exception as exc:
-            logger.warning("Stream cache MGET failed: %s", exc)
-            cached_blobs = [None] * n
+            logger.warning("Stream cache read failed: %s", exc)
 
         stale_keys_to_evict: list[str] = []
-        for i, (cached, cache_key) in enumerate(zip(cached_blobs, cache_keys)):
-            if cached:
-                parsed = _decode_stream_cache_blob(cached)
+        for i, lookup in enumerate(lookups):
+            if lookup.payload is not None:
+                out[i] = lookup.payload
+                continue
+            cache_key = lookup.versioned_key
+            if lookup.blob:
+                parsed, size = _decode_stream_cache_blob_with_size(lookup.blob)
                 if parsed is not None:
+                    STREAM_CACHE_LOOKUPS_TOTAL.labels(cache="stream_data", tier="redis", result="hit").inc()
+                    remember_stream_payload(lookup, parsed, size)
+                    if is_stale(soft_expiry_of(lookup.blob)):
+                        soft_expired_indices.append(i)
                     logger.debug("Stream cache HIT for movie media_id=%s", media_ids[i])
                     out[i] = parsed
                     continue
@@ -1139,6 +1332,7 @@ async def _get_cached_movie_streams_bulk(
                     cache_key,
                 )
                 stale_keys_to_evict.append(cache_key)
+            STREAM_CACHE_LOOKUPS_TOTAL.labels(cache="stream_data", tier="redis", result="miss").inc()
             miss_indices.append(i)
 
         if stale_keys_to_evict:
@@ -1146,41 +1340,16 @@ async def _get_cached_movie_streams_bulk(
                 await REDIS_ASYNC_CLIENT.delete(*stale_keys_to_evict)
             except Exception as exc:
                 logger.debug("Stream cache evict failed: %s", exc)
+        if soft_expired_indices:
+            _schedule_stream_cache_refresh(lookups, media_ids, soft_expired_indices, _fetch_movie_batch)
     else:
         miss_indices = list(range(n))
 
     if miss_indices:
-        ids_to_fetch = [media_ids[i] for i in miss_indices]
-        batch_op_name = f"movie stream batch fetch media_ids={ids_to_fetch}"
-        logger.debug("Stream cache MISS for movie media_ids=%s", ids_to_fetch)
-        t0 = time.monotonic()
-
-        async def _run_movie_batch_read():
-            return await _fetch_movie_raw_streams_batch(ids_to_fetch, visibility_filter)
-
-        async def _run_movie_batch_primary():
-            async def _fetch_one_primary(mid: int) -> tuple[int, dict]:
-                async with get_async_session_context() as s:
-                    return mid, await _fetch_movie_raw_streams_in_session(s, mid, visibility_filter)
-
-            results = await asyncio.gather(*(_fetch_one_primary(mid) for mid in ids_to_fetch))
-            return dict(results)
-
-        batch = await run_db_read_with_primary_fallback(
-            _run_movie_batch_read,
-            _run_movie_batch_primary,
-            operation_name=batch_op_name,
-            on_fallback=lambda exc: logger.warning(
-                "Falling back to primary for %s after replica error: %s", batch_op_name, exc
-            ),
-        )
-        elapsed = time.monotonic() - t0
-        logger.info("DB batch fetch for movie media_ids=%s took %.3fs", ids_to_fetch, elapsed)
-
-        # Store all misses in a single pipeline instead of N serial SETs
-        await _store_stream_cache_bulk([(cache_keys[idx], batch[media_ids[idx]]) for idx in miss_indices])
+        logger.debug("Stream cache MISS for movie media_ids=%s", [media_ids[i] for i in miss_indices])
+        filled = await _fill_stream_cache_misses(lookups, media_ids, miss_indices, _fetch_movie_batch)
         for idx in miss_indices:
-            out[idx] = batch[media_ids[idx]]
+            out[idx] = filled[idx]
 
     if any(x is None for x in out):
         raise RuntimeError("incomplete movie stream cache bulk fetch")
@@ -1430,19 +1599,57 @@ async def _get_cached_series_streams_bulk(
     out: list[dict | None] = [None] * n
     miss_indices: list[int] = []
 
-    # Single MGET round-trip instead of N sequential GETs
+    async def _fetch_series_batch(ids_to_fetch: list[int]) -> dict[int, dict]:
+        batch_op_name = f"series stream batch fetch S{season}E{episode} media_ids={ids_to_fetch}"
+        t0 = time.monotonic()
+
+        async def _run_series_batch_read():
+            return await _fetch_series_raw_streams_batch(ids_to_fetch, season, episode, visibility_filter)
+
+        async def _run_series_batch_primary():
+            async def _fetch_one_primary(mid: int) -> tuple[int, dict]:
+                async with get_async_session_context() as s:
+                    return mid, await _fetch_series_raw_streams_in_session(s, mid, season, episode, visibility_filter)
+
+            results = await asyncio.gather(*(_fetch_one_primary(mid) for mid in ids_to_fetch))
+            return dict(results)
+
+        batch = await run_db_read_with_primary_fallback(
+            _run_series_batch_read,
+            _run_series_batch_primary,
+            operation_name=batch_op_name,
+            on_fallback=lambda exc: logger.warning(
+                "Falling back to primary for %s after replica error: %s", batch_op_name, exc
+            ),
+        )
+        elapsed = time.monotonic() - t0
+        logger.info("DB batch fetch for series media_ids=%s S%sE%s took %.3fs", ids_to_fetch, season, episode, elapsed)
+        return batch
+
+    # Keys are versioned by the media's stream cache generation (see db/crud/stream_cache.py);
+    # one MGET reads the generations and a second reads only the payloads the L1 cannot
+    # serve (those already decoded by this worker at the current generation).
+    lookups = [StreamCacheLookup(cache_key) for cache_key in cache_keys]
+    soft_expired_indices: list[int] = []
     if settings.stream_raw_redis_cache_enabled:
         try:
-            cached_blobs = await REDIS_ASYNC_CLIENT.mget(*cache_keys)
+            lookups = await get_versioned_stream_cache(media_ids, cache_keys)
         except Exception as exc:
-            logger.warning("Stream cache MGET failed: %s", exc)
-            cached_blobs = [None] * n
+            logger.warning("Stream cache read failed: %s", exc)
 
         stale_keys_to_evict: list[str] = []
-        for i, (cached, cache_key) in enumerate(zip(cached_blobs, cache_keys)):
-            if cached:
-                parsed = _decode_stream_cache_blob(cached)
+        for i, lookup in enumerate(lookups):
+            if lookup.payload is not None:
+                out[i] = lookup.payload
+                continue
+            cache_key = lookup.versioned_key
+            if lookup.blob:
+                parsed, size = _decode_stream_cache_blob_with_size(lookup.blob)
                 if parsed is not None:
+                    STREAM_CACHE_LOOKUPS_TOTAL.labels(cache="stream_data", tier="redis", result="hit").inc()
+                    remember_stream_payload(lookup, parsed, size)
+                    if is_stale(soft_expiry_of(lookup.blob)):
+                        soft_expired_indices.append(i)
                     logger.debug(
                         "Stream cache HIT for series media_id=%s S%sE%s",
                         media_ids[i],
@@ -1459,6 +1666,7 @@ async def _get_cached_series_streams_bulk(
                     cache_key,
                 )
                 stale_keys_to_evict.append(cache_key)
+            STREAM_CACHE_LOOKUPS_TOTAL.labels(cache="stream_data", tier="redis", result="miss").inc()
             miss_indices.append(i)
 
         if stale_keys_to_evict:
@@ -1466,41 +1674,18 @@ async def _get_cached_series_streams_bulk(
                 await REDIS_ASYNC_CLIENT.delete(*stale_keys_to_evict)
             except Exception as exc:
                 logger.debug("Stream cache evict failed: %s", exc)
+        if soft_expired_indices:
+            _schedule_stream_cache_refresh(lookups, media_ids, soft_expired_indices, _fetch_series_batch)
     else:
         miss_indices = list(range(n))
 
     if miss_indices:
-        ids_to_fetch = [media_ids[i] for i in miss_indices]
-        batch_op_name = f"series stream batch fetch S{season}E{episode} media_ids={ids_to_fetch}"
-        logger.debug("Stream cache MISS for series media_ids=%s S%sE%s", ids_to_fetch, season, episode)
-        t0 = time.monotonic()
-
-        async def _run_series_batch_read():
-            return await _fetch_series_raw_streams_batch(ids_to_fetch, season, episode, visibility_filter)
-
-        async def _run_series_batch_primary():
-            async def _fetch_one_primary(mid: int) -> tuple[int, dict]:
-                async with get_async_session_context() as s:
-                    return mid, await _fetch_series_raw_streams_in_session(s, mid, season, episode, visibility_filter)
-
-            results = await asyncio.gather(*(_fetch_one_primary(mid) for mid in ids_to_fetch))
-            return dict(results)
-
-        batch = await run_db_read_with_primary_fallback(
-            _run_series_batch_read,
-            _run_series_batch_primary,
-            operation_name=batch_op_name,
-            on_fallback=lambda exc: logger.warning(
-                "Falling back to primary for %s after replica error: %s", batch_op_name, exc
-            ),
+        logger.debug(
+            "Stream cache MISS for series media_ids=%s S%sE%s", [media_ids[i] for i in miss_indices], season, episode
         )
-        elapsed = time.monotonic() - t0
-        logger.info("DB batch fetch for series media_ids=%s S%sE%s took %.3fs", ids_to_fetch, season, episode, elapsed)
-
-        # Store all misses in a single pipeline instead of N serial SETs
-        await _store_stream_cache_bulk([(cache_keys[idx], batch[media_ids[idx]]) for idx in miss_indices])
+        filled = await _fill_stream_cache_misses(lookups, media_ids, miss_indices, _fetch_series_batch)
         for idx in miss_indices:
-            out[idx] = batch[media_ids[idx]]
+            out[idx] = filled[idx]
 
     if any(x is None for x in out):
         raise RuntimeError("incomplete series stream cache bulk fetch")
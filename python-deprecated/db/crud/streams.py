@@ -15,6 +15,7 @@ from datetime import datetime
 from typing import Any
 
 import pytz
+from sqlalchemy import Integer, column, values
 from sqlalchemy import delete as sa_delete
 from sqlalchemy import update as sa_update
 from sqlalchemy.dialects.postgresql import insert as pg_insert
@@ -364,6 +365,60 @@ async def update_torrent_seeders(
     return result.rowcount > 0
 
 
+async def get_torrents_for_seeder_refresh(
+    session: AsyncSession,
+    after_id: int,
+    limit: int,
+    stale_before: datetime,
+) -> list[tuple[int, str, list[str]]]:
+    """Get the next keyset page of torrents without seeders, with their tracker URLs.
+
+    Pages by ``TorrentStream.id`` so every page is an index range scan, however
+    deep into the table the refresh is. Returns ``(id, info_hash, tracker_urls)``.
+    """
+    query = (
+        select(TorrentStream.id, TorrentStream.info_hash)
+        .where(TorrentStream.id > after_id)
+        .where(TorrentStream.seeders.is_(None))
+        .where(TorrentStream.updated_at < stale_before)
+        .order_by(TorrentStream.id)
+        .limit(limit)
+    )
+    rows = (await session.exec(query)).all()
+    if not rows:
+        return []
+
+    tracker_urls: dict[int, list[str]] = {torrent_id: [] for torrent_id, _ in rows}
+    tracker_query = (
+        select(TorrentTrackerLink.torrent_id, Tracker.url)
+        .join(Tracker, Tracker.id == TorrentTrackerLink.tracker_id)
+        .where(TorrentTrackerLink.torrent_id.in_(list(tracker_urls)))
+    )
+    for torrent_id, url in (await session.exec(tracker_query)).all():
+        tracker_urls[torrent_id].append(url)
+
+    return [(torrent_id, info_hash, tracker_urls[torrent_id]) for torrent_id, info_hash in rows]
+
+
+async def bulk_update_torrent_seeders(
+    session: AsyncSession,
+    seeders_by_id: dict[int, int],
+) -> int:
+    """Update seeders for many torrents with a single UPDATE ... FROM (VALUES ...)."""
+    if not seeders_by_id:
+        return 0
+    seeders_values = values(
+        column("id", Integer),
+        column("seeders", Integer),
+        name="seeders_values",
+    ).data(list(seeders_by_id.items()))
+    result = await session.exec(
+        sa_update(TorrentStream).where(TorrentStream.id == seeders_values.c.id).values(seeders=seeders_values.c.seeders)
+    )
+    await session.flush()
+    return result.rowcount
+
+
 async def update_torrent_stream(
     session: AsyncSession,
     info_hash: str,
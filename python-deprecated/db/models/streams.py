@@ -193,6 +193,10 @@ class Stream(TimestampMixin, table=True):
     is_dubbed: bool = Field(default=False)  # Dubbed audio
     is_subbed: bool = Field(default=False)  # Has subtitles
 
+    # Title classification computed at ingest (NULL = stored before classification)
+    is_adult: bool | None = Field(default=None)  # Adult parser matched the name
+    is_non_video: bool | None = Field(default=None)  # Name matches the non-video blocklist
+
     # =========================================================================
     # MULTI-VALUE RELATIONSHIPS (Normalized for flexibility)
     # =========================================================================
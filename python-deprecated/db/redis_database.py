@@ -329,9 +329,9 @@ class RedisWrapper:
             kwargs["count"] = count
         return self._create_method("hscan", (0, {}))(name, cursor, **kwargs)
 
-    def zadd(self, name: str, mapping: dict):
-        """Redis ZADD operation."""
-        return self._create_method("zadd", 0)(name, mapping)
+    def zadd(self, name: str, mapping: dict, **kwargs):
+        """Redis ZADD operation (supports nx/xx/gt/lt flags)."""
+        return self._create_method("zadd", 0)(name, mapping, **kwargs)
 
     def zscore(self, name: str, value: Any):
         """Redis ZSCORE operation."""
@@ -341,6 +341,25 @@ class RedisWrapper:
         """Redis ZREMRANGEBYSCORE operation."""
         return self._create_method("zremrangebyscore", 0)(name, min_score, max_score)
 
+    def zrangebyscore(
+        self,
+        name: str,
+        min_score: float,
+        max_score: float,
+        start: int = None,
+        num: int = None,
+        withscores: bool = False,
+    ):
+        """Redis ZRANGEBYSCORE operation."""
+        kwargs = {}
+        if start is not None:
+            kwargs["start"] = start
+        if num is not None:
+            kwargs["num"] = num
+        if withscores:
+            kwargs["withscores"] = withscores
+        return self._create_method("zrangebyscore", [])(name, min_score, max_score, **kwargs)
+
     def zrevrangebyscore(
         self,
         name: str,
@@ -424,6 +443,10 @@ class RedisWrapper:
         """Redis EXECUTE operation."""
         return self._create_method("execute", None)(*args, **kwargs)
 
+    def eval(self, script: str, numkeys: int, *keys_and_args):
+        """Redis EVAL operation (server-side Lua script)."""
+        return self._create_method("eval", None)(script, numkeys, *keys_and_args)
+
     def incr(self, name: str):
         """Redis INCR operation."""
         return self._create_method("incr", 0)(name)
@@ -34,6 +34,7 @@ from db.schemas.config import (
     NewznabIndexerConfig,
     NZBGetConfig,
     QBittorrentConfig,
+    ReadOnlyUserData,
     RPDBConfig,
     SABnzbdConfig,
     SortingOption,
@@ -145,6 +146,7 @@ __all__ = [
     "CatalogConfig",
     "StreamTemplate",
     "UserData",
+    "ReadOnlyUserData",
     "AuthorizeData",
     # Usenet Config
     "NewznabIndexerConfig",
@@ -1,10 +1,11 @@
 """Configuration schemas for streaming providers and user settings."""
 
+import copy
 import math
 import re
-from typing import Literal
+from typing import Any, Literal
 
-from pydantic import BaseModel, ConfigDict, Field, HttpUrl, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl, PrivateAttr, field_validator, model_validator
 
 from db.config import settings
 from db.enums import IntegrationType, NudityStatus, SyncDirection
@@ -636,6 +637,9 @@ class UserData(BaseModel):
     stream_name_filter_patterns: list[str] = Field(default_factory=list, alias="snfp")
     stream_name_filter_use_regex: bool = Field(default=False, alias="snfr")
 
+    # Compiled utils.filter_plan.StreamFilterPlan; attached lazily, never serialized
+    _filter_plan: Any = PrivateAttr(default=None)
+
     @field_validator("selected_resolutions", mode="after")
     def validate_selected_resolutions(cls, v):
         for resolution in v:
@@ -772,6 +776,10 @@ class UserData(BaseModel):
 
         return self
 
+    def mutable_copy(self) -> "UserData":
+        """Return an independent deep copy as a plain, mutable UserData."""
+        return UserData.model_construct(_fields_set=set(self.model_fields_set), **copy.deepcopy(dict(self)))
+
     def is_sorting_option_present(self, key: str) -> bool:
         return any(sort.key == key for sort in self.torrent_sorting_priority)
 
@@ -920,6 +928,23 @@ class UserData(BaseModel):
     model_config = ConfigDict(extra="ignore", populate_by_name=True)
 
 
+class ReadOnlyUserData(UserData):
+    """Shared, read-only UserData served from the in-process decrypt cache.
+
+    Attribute assignment raises. Nested configs and lists are shared with the cache
+    entry, so they must not be mutated either; use ``mutable_copy()`` to edit.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    @classmethod
+    def from_user_data(cls, user_data: UserData) -> "ReadOnlyUserData":
+        """Wrap already-validated UserData without re-running validators."""
+        read_only = cls.model_construct(_fields_set=set(user_data.model_fields_set), **dict(user_data))
+        read_only._filter_plan = user_data._filter_plan
+        return read_only
+
+
 class AuthorizeData(BaseModel):
     """Device code authorization data."""
 
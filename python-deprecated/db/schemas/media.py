@@ -877,6 +877,10 @@ class TorrentStreamData(BaseModel):
     is_dubbed: bool = False
     is_subbed: bool = False
 
+    # Title classification from ingest (None for streams not yet backfilled)
+    is_adult: bool | None = None
+    is_non_video: bool | None = None
+
     # Stream status
     is_active: bool = True
     is_blocked: bool = False
@@ -1016,6 +1020,8 @@ class TorrentStreamData(BaseModel):
             is_complete=stream.is_complete if stream else False,
             is_dubbed=stream.is_dubbed if stream else False,
             is_subbed=stream.is_subbed if stream else False,
+            is_adult=stream.is_adult if stream else None,
+            is_non_video=stream.is_non_video if stream else None,
             # Status
             is_active=stream.is_active if stream else True,
             is_blocked=stream.is_blocked if stream else False,
@@ -1091,6 +1097,10 @@ class UsenetStreamData(BaseModel):
     is_dubbed: bool = False
     is_subbed: bool = False
 
+    # Title classification from ingest (None for streams not yet backfilled)
+    is_adult: bool | None = None
+    is_non_video: bool | None = None
+
     # Stream status
     is_active: bool = True
     is_blocked: bool = False
@@ -1208,6 +1218,8 @@ class UsenetStreamData(BaseModel):
             is_complete=stream.is_complete,
             is_dubbed=stream.is_dubbed,
             is_subbed=stream.is_subbed,
+            is_adult=stream.is_adult,
+            is_non_video=stream.is_non_video,
             is_active=stream.is_active,
             is_blocked=stream.is_blocked,
             created_at=stream.created_at,
@@ -0,0 +1,30 @@
+"""add stream title classification flags
+
+Revision ID: b7c1d9e2f3a4
+Revises: 61c656b49136
+Create Date: 2026-10-16 09:12:41.503118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7c1d9e2f3a4"
+down_revision: Union[str, None] = "61c656b49136"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Nullable without defaults: existing rows are classified by scripts/backfill_stream_title_flags.py
+    op.add_column("stream", sa.Column("is_adult", sa.Boolean(), nullable=True))
+    op.add_column("stream", sa.Column("is_non_video", sa.Boolean(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("stream", "is_non_video")
+    op.drop_column("stream", "is_adult")
@@ -0,0 +1,179 @@
+"""
+Backfill stream adult / non-video title flags for streams stored before ingest-time classification.
+
+Default mode is dry-run. Use --apply to persist changes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import sys
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import or_
+from sqlalchemy import update as sa_update
+from sqlmodel import select
+
+# Add project root to import path.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from db.database import get_async_session_context
+from db.models import Stream
+from utils.title_classifier import classify_stream_title
+
+logger = logging.getLogger("backfill_stream_title_flags")
+
+
+@dataclass
+class TitleFlagsCandidate:
+    stream_id: int
+    source: str
+    name: str
+    is_adult: bool
+    is_non_video: bool
+
+
+async def _load_batch(args: argparse.Namespace, after_id: int) -> list[tuple[int, str, str]]:
+    query = select(Stream.id, Stream.source, Stream.name).where(Stream.id > after_id)
+    if not args.reclassify:
+        query = query.where(or_(Stream.is_adult.is_(None), Stream.is_non_video.is_(None)))
+    if args.last_days:
+        query = query.where(Stream.created_at >= datetime.now(UTC) - timedelta(days=args.last_days))
+    if args.sources:
+        query = query.where(Stream.source.in_(args.sources))
+    query = query.order_by(Stream.id).limit(args.batch_size)
+
+    async with get_async_session_context() as session:
+        return list((await session.exec(query)).all())
+
+
+def _classify(rows: list[tuple[int, str, str]]) -> list[TitleFlagsCandidate]:
+    candidates = []
+    for stream_id, source, name in rows:
+        flags = classify_stream_title(name or "")
+        candidates.append(
+            TitleFlagsCandidate(
+                stream_id=stream_id,
+                source=source or "unknown",
+                name=name or "",
+                is_adult=flags.is_adult,
+                is_non_video=flags.is_non_video,
+            )
+        )
+    return candidates
+
+
+async def _apply_backfill(candidates: list[TitleFlagsCandidate]) -> tuple[int, int]:
+    try:
+        async with get_async_session_context() as session:
+            # ORM bulk UPDATE by primary key: one executemany per batch
+            await session.execute(
+                sa_update(Stream),
+                [{"id": c.stream_id, "is_adult": c.is_adult, "is_non_video": c.is_non_video} for c in candidates],
+            )
+            await session.commit()
+    except Exception as error:
+        logger.warning("Failed batch starting at stream_id=%s: %s", candidates[0].stream_id, error)
+        return 0, len(candidates)
+    return len(candidates), 0
+
+
+async def run(args: argparse.Namespace) -> None:
+    scanned = adult = non_video = updated = failed = 0
+    previewed = 0
+    after_id = 0
+
+    while True:
+        rows = await _load_batch(args, after_id)
+        if not rows:
+            break
+        after_id = rows[-1][0]
+        candidates = _classify(rows)
+        scanned += len(candidates)
+        adult += sum(c.is_adult for c in candidates)
+        non_video += sum(c.is_non_video for c in candidates)
+
+        for candidate in candidates:
+            if previewed >= args.preview:
+                break
+            if candidate.is_adult or candidate.is_non_video:
+                previewed += 1
+                logger.info(
+                    "stream_id=%s source=%s adult=%s non_video=%s name=%s",
+                    candidate.stream_id,
+                    candidate.source,
+                    candidate.is_adult,
+                    candidate.is_non_video,
+                    candidate.name,
+                )
+
+        if args.apply:
+            batch_updated, batch_failed = await _apply_backfill(candidates)
+            updated += batch_updated
+            failed += batch_failed
+            logger.info("Processed up to stream_id=%s (updated=%s failed=%s)", after_id, updated, failed)
+
+        if args.limit and scanned >= args.limit:
+            break
+
+    logger.info("Scanned %s streams: adult=%s non_video=%s", scanned, adult, non_video)
+    if not args.apply:
+        logger.info("Dry-run complete. Re-run with --apply to persist changes.")
+        return
+    logger.info("Backfill complete: updated=%s failed=%s", updated, failed)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Backfill stream adult / non-video flags from stream names.")
+    parser.add_argument(
+        "--apply",
+        action="store_true",
+        help="Persist changes. Default is dry-run.",
+    )
+    parser.add_argument(
+        "--reclassify",
+        action="store_true",
+        help="Also re-evaluate streams that already have flags (e.g. after keyword list changes).",
+    )
+    parser.add_argument(
+        "--last-days",
+        type=int,
+        default=0,
+        help="Only consider streams created within the last N days (0 = all streams).",
+    )
+    parser.add_argument(
+        "--sources",
+        type=str,
+        default="",
+        help="Comma-separated source filter (e.g. TamilMV,TamilBlasters).",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=5000,
+        help="Streams classified and updated per batch.",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=0,
+        help="Stop after scanning roughly N streams (0 = no limit).",
+    )
+    parser.add_argument(
+        "--preview",
+        type=int,
+        default=25,
+        help="How many flagged rows to print.",
+    )
+    parsed = parser.parse_args()
+    parsed.sources = [source.strip() for source in parsed.sources.split(",") if source.strip()]
+    return parsed
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
+    asyncio.run(run(parse_args()))
@@ -23,7 +23,6 @@ from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import Any
 
-import PTT
 from sqlalchemy.orm import selectinload
 from sqlmodel import select
 
@@ -44,6 +43,7 @@ from db.database import get_async_session_context
 from db.models import Stream, TorrentStream
 from db.models.links import StreamAudioLink, StreamChannelLink, StreamHDRLink, StreamLanguageLink
 from db.models.streams import StreamType
+from utils.ptt_pool import parse_titles_batch
 
 logger = logging.getLogger("backfill_torrent_ptt_details")
 
@@ -152,14 +152,6 @@ def _normalize_ptt_text_value(raw_value: Any) -> str | None:
     return cleaned or None
 
 
-def _safe_parse_ptt(stream_name: str) -> dict[str, Any]:
-    try:
-        parsed = PTT.parse_title(stream_name or "", True)
-        return parsed if isinstance(parsed, dict) else {}
-    except Exception:
-        return {}
-
-
 def _pick_relation_additions(
     *,
     parsed_values: list[str],
@@ -422,9 +414,11 @@ async def _scan_and_maybe_apply(args: argparse.Namespace) -> tuple[dict[str, int
                 remaining -= len(streams)
 
             batch_planned = 0
-            for stream in streams:
+            # Parse the batch in the process pool; failed parses come back empty
+            parsed_titles = await parse_titles_batch([stream.name or "" for stream in streams], True)
+            for stream, parsed_title in zip(streams, parsed_titles):
                 discovery_stats["scanned"] += 1
-                parsed = _safe_parse_ptt(stream.name or "")
+                parsed = parsed_title.parsed
                 if not parsed:
                     discovery_stats["parse_failed_or_empty"] += 1
                     continue
@@ -0,0 +1,150 @@
+"""
+Benchmark the debrid cached-hash layouts: one hash per service vs. sharded hashes.
+
+Loads ``--count`` synthetic info hashes into both layouts under a throwaway service
+name and measures memory, batched ``get_cached_status``-style lookups (one HMGET
+vs. one pipelined HMGET per shard) and cleanup (HSCAN of the whole hash vs. one
+run's share of shards). Keys are deleted afterwards. Loading 10M hashes takes a
+few GB of Redis memory, so point it at a scratch instance.
+
+Usage:
+    python scripts/benchmark_debrid_cache_layout.py --redis-url redis://localhost:6379/15
+    python scripts/benchmark_debrid_cache_layout.py --count 1000000 --batch 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+import redis.asyncio as redis
+
+# Add project root to import path.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from workers.providers.cache_helpers import EXPIRY_SECONDS, SHARD_COUNT, get_shard_key, group_by_shard
+
+SERVICE = "benchmark"
+LEGACY_KEY = f"debrid_cache:{SERVICE}"
+LOAD_CHUNK = 20_000
+
+
+def _info_hashes(count: int, seed: int = 11) -> list[str]:
+    rng = random.Random(seed)
+    return [f"{rng.getrandbits(160):040x}" for _ in range(count)]
+
+
+async def _used_memory(client: redis.Redis) -> int:
+    return (await client.info("memory"))["used_memory"]
+
+
+async def _load(client: redis.Redis, info_hashes: list[str], sharded: bool, field_ttl: bool) -> float:
+    expiry = int(datetime.now(tz=UTC).timestamp()) + EXPIRY_SECONDS
+    start = time.perf_counter()
+    for offset in range(0, len(info_hashes), LOAD_CHUNK):
+        chunk = info_hashes[offset : offset + LOAD_CHUNK]
+        pipe = client.pipeline(transaction=False)
+        if sharded:
+            for shard_key, hashes in group_by_shard(SERVICE, chunk).items():
+                pipe.hset(shard_key, mapping=dict.fromkeys(hashes, expiry))
+                if field_ttl:
+                    pipe.hexpire(shard_key, EXPIRY_SECONDS, *hashes)
+        else:
+            pipe.hset(LEGACY_KEY, mapping=dict.fromkeys(chunk, expiry))
+        await pipe.execute()
+    return time.perf_counter() - start
+
+
+async def _lookup_legacy(client: redis.Redis, batch: list[str]) -> None:
+    await client.hmget(LEGACY_KEY, batch)
+
+
+async def _lookup_sharded(client: redis.Redis, batch: list[str]) -> None:
+    pipe = client.pipeline(transaction=False)
+    for shard_key, hashes in group_by_shard(SERVICE, batch).items():
+        pipe.hmget(shard_key, hashes)
+    await pipe.execute()
+
+
+async def _time_lookups(lookup, client: redis.Redis, batches: list[list[str]]) -> list[float]:
+    timings = []
+    for batch in batches:
+        start = time.perf_counter()
+        await lookup(client, batch)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def _scan_all(client: redis.Redis, key: str) -> tuple[float, float]:
+    """Full HSCAN of one hash; returns (total seconds, slowest single HSCAN call)."""
+    cursor, slowest, start = 0, 0.0, time.perf_counter()
+    while True:
+        call_start = time.perf_counter()
+        cursor, _ = await client.hscan(key, cursor, count=1000)
+        slowest = max(slowest, time.perf_counter() - call_start)
+        if cursor == 0:
+            return time.perf_counter() - start, slowest
+
+
+def _report(name: str, timings: list[float]) -> None:
+    timings = sorted(timings)
+    p99 = timings[int(len(timings) * 0.99) - 1]
+    print(f"  {name:<8} p50 {statistics.median(timings) * 1e3:7.3f} ms  p99 {p99 * 1e3:7.3f} ms")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    parser.add_argument("--count", type=int, default=10_000_000)
+    parser.add_argument("--batch", type=int, default=200, help="Info hashes per lookup (one stream request)")
+    parser.add_argument("--lookups", type=int, default=500)
+    parser.add_argument("--cleanup-shards", type=int, default=16, help="Shards scanned in the timed cleanup run")
+    args = parser.parse_args()
+
+    client = redis.Redis.from_url(args.redis_url)
+    version = (await client.info("server"))["redis_version"]
+    field_ttl = tuple(int(part) for part in version.split(".")[:2]) >= (7, 4)
+    shard_keys = [get_shard_key(SERVICE, f"{shard:02x}") for shard in range(SHARD_COUNT)]
+    info_hashes = _info_hashes(args.count)
+    rng = random.Random(3)
+    # Half known, half unknown hashes, like a typical stream list
+    unknown = _info_hashes(args.batch * args.lookups, seed=12)
+    batches = [
+        rng.sample(info_hashes, args.batch // 2) + unknown[i * args.batch : i * args.batch + args.batch // 2]
+        for i in range(args.lookups)
+    ]
+
+    print(f"{args.count} info hashes, Redis {version} (field TTLs: {'yes' if field_ttl else 'no'})")
+    try:
+        for sharded in (False, True):
+            name = "sharded" if sharded else "legacy"
+            before = await _used_memory(client)
+            load_time = await _load(client, info_hashes, sharded, field_ttl and sharded)
+            memory = await _used_memory(client) - before
+            print(f"{name}: loaded in {load_time:.1f} s, {memory / 1024**2:.0f} MiB")
+            lookup = _lookup_sharded if sharded else _lookup_legacy
+            _report("lookup", await _time_lookups(lookup, client, batches))
+            if sharded:
+                total, slowest = 0.0, 0.0
+                for key in shard_keys[: args.cleanup_shards]:
+                    shard_total, shard_slowest = await _scan_all(client, key)
+                    total, slowest = total + shard_total, max(slowest, shard_slowest)
+                print(f"  cleanup  {args.cleanup_shards} shards in {total:.2f} s, slowest HSCAN {slowest * 1e3:.2f} ms")
+            else:
+                total, slowest = await _scan_all(client, LEGACY_KEY)
+                print(f"  cleanup  whole hash in {total:.2f} s, slowest HSCAN {slowest * 1e3:.2f} ms")
+    finally:
+        await client.unlink(LEGACY_KEY)
+        for offset in range(0, SHARD_COUNT, 64):
+            await client.unlink(*shard_keys[offset : offset + 64])
+        await client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+"""
+Benchmark title parsing throughput with and without the PTT parse cache.
+
+Runs the corpus ``--passes`` times (scrapers see the same release names on every
+re-scrape) through plain ``PTT.parse_title``, then through ``parse_title_cached``
+with only the in-process LRU and with a fresh disk tier. The disk tier is also timed
+from a cold LRU, as a new worker process sharing the host's file would see it.
+
+The corpus is a text file with one release name per line (e.g. exported indexer
+results), or the newest ``--from-db`` stream names.
+
+Usage:
+    python scripts/benchmark_ptt_cache.py --corpus titles.txt
+    python scripts/benchmark_ptt_cache.py --from-db 20000 --passes 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import PTT
+from sqlmodel import select
+
+# Add project root to import path.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from db.config import settings
+from db.database import get_async_session_context
+from db.models import Stream
+from utils import ptt_cache
+
+
+async def _titles_from_db(count: int) -> list[str]:
+    async with get_async_session_context() as session:
+        rows = await session.exec(select(Stream.name).order_by(Stream.id.desc()).limit(count))
+        return [name for name in rows.all() if name]
+
+
+def _load_corpus(args: argparse.Namespace) -> list[str]:
+    if args.corpus:
+        return [line.strip() for line in Path(args.corpus).read_text().splitlines() if line.strip()]
+    return asyncio.run(_titles_from_db(args.from_db))
+
+
+def _run(parse, titles: list[str], passes: int) -> float:
+    start = time.perf_counter()
+    for _ in range(passes):
+        for title in titles:
+            parse(title, True)
+    return time.perf_counter() - start
+
+
+def _report(label: str, elapsed: float, parsed: int, baseline_rate: float | None = None) -> float:
+    rate = parsed / elapsed
+    speedup = f"  ({rate / baseline_rate:5.1f}x)" if baseline_rate else ""
+    print(f"{label:<28} {elapsed:8.2f}s  {rate:12,.0f} titles/s{speedup}")
+    return rate
+
+
+def main() -> None:
+    args = parse_args()
+    titles = _load_corpus(args)
+    if not titles:
+        raise SystemExit("Empty corpus")
+    parsed = len(titles) * args.passes
+    print(f"{len(titles)} titles ({len(set(titles))} unique) x {args.passes} passes\n")
+
+    baseline = _report("PTT.parse_title", _run(PTT.parse_title, titles, args.passes), parsed)
+
+    settings.ptt_parse_cache_max_entries = max(len(titles), 1)
+    settings.ptt_parse_cache_tier = "none"
+    ptt_cache._memory_cache = ptt_cache.ParsedTitleCache(settings.ptt_parse_cache_max_entries)
+    ptt_cache._second_tier.cache_clear()
+    _report("parse_title_cached (LRU)", _run(ptt_cache.parse_title_cached, titles, args.passes), parsed, baseline)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        settings.ptt_parse_cache_tier = "disk"
+        settings.ptt_parse_cache_disk_path = str(Path(tmp_dir) / "ptt_cache.sqlite3")
+        ptt_cache._second_tier.cache_clear()
+        ptt_cache.clear_parse_cache()
+        _report("LRU + disk (empty disk)", _run(ptt_cache.parse_title_cached, titles, args.passes), parsed, baseline)
+
+        # A new process: disk populated, LRU cold
+        ptt_cache.clear_parse_cache()
+        _report("LRU + disk (warm disk)", _run(ptt_cache.parse_title_cached, titles, 1), len(titles), baseline)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the PTT title parse cache.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--corpus", type=str, help="Text file with one release name per line.")
+    source.add_argument("--from-db", type=int, help="Use the newest N stream names from the database.")
+    parser.add_argument("--passes", type=int, default=3, help="Times the corpus is parsed per variant.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main()
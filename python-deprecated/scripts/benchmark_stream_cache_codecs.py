@@ -0,0 +1,133 @@
+"""
+Benchmark stream cache codecs: stored size, encode and decode time per payload.
+
+Payloads come from live ``stream_data:*`` keys (``--source redis``) or from a synthetic
+generator shaped like real movie payloads. When zstandard is installed, a dictionary is
+trained on half of the payloads and ``zstd+dict`` is measured on the other half (the
+other codecs are measured on that same half).
+
+Usage:
+    python scripts/benchmark_stream_cache_codecs.py
+    python scripts/benchmark_stream_cache_codecs.py --source redis --samples 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to import path.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.train_stream_cache_dictionary import sample_stream_cache_payloads, train_dictionary
+from utils.stream_cache_codec import (
+    CODEC_MAGIC,
+    Lz4Codec,
+    PlainCodec,
+    ZlibCodec,
+    ZstdCodec,
+    decode_payload,
+    encode_payload,
+    loads_payload,
+    lz4_frame,
+    msgpack,
+    zstandard,
+)
+
+RELEASE_GROUPS = ["FLUX", "NTb", "SPARKS", "RARBG", "YIFY", "QxR", "TEPES", "CMRG"]
+SOURCES = ["Torrentio", "Prowlarr", "Zilean", "Jackett", "BT4G"]
+
+
+def _synthetic_payloads(count: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    payloads = []
+    for index in range(count):
+        torrents = []
+        for stream in range(rng.randint(20, 200)):
+            resolution = rng.choice(["2160p", "1080p", "720p"])
+            group = rng.choice(RELEASE_GROUPS)
+            torrents.append(
+                {
+                    "info_hash": f"{rng.getrandbits(160):040x}",
+                    "name": f"Movie.Title.{2000 + index % 25}.{resolution}.WEB-DL.DDP5.1.x265-{group}",
+                    "size": rng.randint(300_000_000, 80_000_000_000),
+                    "source": rng.choice(SOURCES),
+                    "resolution": resolution,
+                    "quality": rng.choice(["WEB-DL", "BluRay", "WEBRip"]),
+                    "codec": rng.choice(["x264", "x265", "AV1"]),
+                    "audio_formats": rng.sample(["DDP", "AAC", "TrueHD", "DTS"], 2),
+                    "languages": rng.sample(["English", "Hindi", "Tamil", "Spanish"], rng.randint(1, 3)),
+                    "seeders": rng.randint(0, 500),
+                    "created_at": f"2025-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}T00:00:00+00:00",
+                    "files": [{"file_index": 0, "filename": f"Movie.{stream}.mkv", "size": 1}],
+                }
+            )
+        payloads.append(
+            {"torrents": torrents, "usenet": [], "telegram": [], "http": [], "acestream": [], "youtube": []}
+        )
+    return payloads
+
+
+def _measure(name: str, payloads: list[dict], codec, serializer: str, rounds: int) -> None:
+    blobs = [encode_payload(payload, codec, serializer)[0] for payload in payloads]
+    encode_times, decode_times = [], []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for payload in payloads:
+            encode_payload(payload, codec, serializer)
+        encode_times.append((time.perf_counter() - start) / len(payloads))
+        start = time.perf_counter()
+        for blob in blobs:
+            if blob.startswith(CODEC_MAGIC):
+                decode_payload(blob)
+            else:
+                # Pre-registry formats (zlib / plain JSON) go through the legacy path
+                loads_payload(codec.decompress(blob[len(codec.legacy_prefix) :]), serializer)
+        decode_times.append((time.perf_counter() - start) / len(payloads))
+    raw_size = sum(encode_payload(payload, PlainCodec(), serializer)[1] for payload in payloads)
+    stored = sum(len(blob) for blob in blobs)
+    print(
+        f"  {name:<16} {stored / len(payloads) / 1024:9.1f} KiB  ratio {raw_size / stored:5.2f}"
+        f"  encode {statistics.median(encode_times) * 1e6:8.1f} us  decode {statistics.median(decode_times) * 1e6:8.1f} us"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", choices=["synthetic", "redis"], default="synthetic")
+    parser.add_argument("--samples", type=int, default=400)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--level", type=int, default=3, help="zstd level")
+    parser.add_argument("--serializer", choices=["json", "msgpack"], default="json")
+    args = parser.parse_args()
+
+    if args.serializer == "msgpack" and msgpack is None:
+        sys.exit("msgpack is not installed. Run: pip install msgpack")
+    if args.source == "redis":
+        payloads = await sample_stream_cache_payloads(args.samples)
+    else:
+        payloads = _synthetic_payloads(args.samples)
+    if len(payloads) < 2:
+        sys.exit("Not enough payloads to benchmark")
+
+    training, evaluation = payloads[: len(payloads) // 2], payloads[len(payloads) // 2 :]
+    codecs = [("plain", PlainCodec()), ("zlib", ZlibCodec())]
+    if lz4_frame is not None:
+        codecs.append(("lz4", Lz4Codec()))
+    if zstandard is not None:
+        dictionary = zstandard.ZstdCompressionDict(train_dictionary(training, 112640, args.serializer))
+        codecs.append(("zstd", ZstdCodec(args.level)))
+        codecs.append(("zstd+dict", ZstdCodec(args.level, dictionary)))
+
+    print(f"{len(evaluation)} {args.source} payloads, {args.serializer} serializer (per payload, median of rounds)")
+    for name, codec in codecs:
+        _measure(name, evaluation, codec, args.serializer, args.rounds)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,135 @@
+"""
+Benchmark for building Stremio stream entries (template rendering included).
+
+Runs ``utils.parser._build_stream_entries`` over a synthetic payload of torrent
+streams for a debrid provider and reports per-response latency plus memory
+allocation figures from ``tracemalloc`` (peak traced bytes and the number of
+allocation sites / blocks live at the peak of one response build).
+
+Usage:
+    python scripts/benchmark_stream_entries.py --streams 500 --rounds 20
+    python scripts/benchmark_stream_entries.py --streams 500 --series
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+# Add project root to import path.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from db.config import settings
+from db.schemas import UserData
+from db.schemas.media import StreamFileData, TorrentStreamData
+from utils.parser import _build_stream_entries
+
+RESOLUTIONS = ["2160p", "1080p", "720p", "480p", None]
+QUALITIES = ["WEB-DL", "BluRay", "WEBRip", "HDTV", None]
+LANGUAGES = ["English", "Hindi", "Tamil", "Spanish", "French", "Japanese"]
+
+
+def _build_streams(count: int, series: bool, seed: int = 11) -> list[TorrentStreamData]:
+    rng = random.Random(seed)
+    now = datetime.now(UTC)
+    streams = []
+    for index in range(count):
+        size = rng.randint(300_000_000, 80_000_000_000)
+        if series:
+            files = [
+                StreamFileData(
+                    file_index=episode,
+                    filename=f"Show/Season 01/Show.S01E{episode:02d}.1080p.WEB-DL.mkv",
+                    size=size // 10,
+                    season_number=1,
+                    episode_number=episode,
+                )
+                for episode in range(1, 11)
+            ]
+        else:
+            files = [StreamFileData(file_index=0, filename=f"Movie.2024.{index}/Movie.2024.{index}.mkv", size=size)]
+        stream = TorrentStreamData(
+            info_hash=f"{index:040x}",
+            name=f"Some.Title.2024.{index}.1080p.WEB-DL.DDP5.1.x265-GRP",
+            size=size,
+            source=rng.choice(["Torrentio", "Prowlarr", "Zilean"]),
+            resolution=rng.choice(RESOLUTIONS),
+            quality=rng.choice(QUALITIES),
+            codec=rng.choice(["x264", "x265", "AV1", None]),
+            audio_formats=rng.sample(["DDP", "AAC", "TrueHD", "DTS"], rng.randint(0, 2)),
+            channels=rng.sample(["5.1", "7.1", "2.0"], rng.randint(0, 1)),
+            hdr_formats=rng.sample(["HDR10", "HDR10+", "DV"], rng.randint(0, 2)),
+            languages=rng.sample(LANGUAGES, rng.randint(1, 3)),
+            seeders=rng.randint(0, 500),
+            uploader=rng.choice([None, "uploader"]),
+            created_at=now - timedelta(hours=rng.randint(1, 5000)),
+            meta_id="tt1234567",
+            files=files,
+        )
+        stream.filtered_hdr_formats = stream.hdr_formats
+        stream.cached = rng.random() < 0.5
+        streams.append(stream)
+    return streams
+
+
+def _build(streams: list[TorrentStreamData], user_data: UserData, series: bool):
+    provider = user_data.get_primary_provider()
+    return _build_stream_entries(
+        filtered_streams=streams,
+        user_data=user_data,
+        secret_str="benchmark-secret",
+        season=1 if series else None,
+        episode=3 if series else None,
+        is_series=series,
+        is_usenet=False,
+        is_telegram=False,
+        is_http=False,
+        is_youtube=False,
+        return_rich=False,
+        has_streaming_provider=True,
+        current_provider=provider,
+        streaming_provider_name="RD",
+        addon_name=settings.addon_name,
+        base_proxy_url_template=f"{settings.host_url}/streaming_provider/benchmark-secret/playback/rd/{{}}",
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--streams", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--series", action="store_true", help="Use 10-episode season packs")
+    args = parser.parse_args()
+
+    user_data = UserData.model_validate({"sps": [{"n": "rd", "sv": "realdebrid", "tk": "x" * 52}]})
+    streams = _build_streams(args.streams, args.series)
+    entries = _build(streams, user_data, args.series)  # warm caches (templates, byte formatting)
+
+    timings = []
+    for _ in range(args.rounds):
+        start = time.perf_counter()
+        _build(streams, user_data, args.series)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    result = _build(streams, user_data, args.series)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    live_blocks = sum(stat.count for stat in snapshot.statistics("lineno"))
+
+    print(f"{len(entries)} entries from {args.streams} streams ({'series' if args.series else 'movie'})")
+    print(f"  latency  median {statistics.median(timings):7.2f} ms   min {min(timings):7.2f} ms")
+    print(f"  memory   peak {peak_bytes / 1024:8.1f} KiB   live blocks after build {live_blocks}")
+    assert len(result) == len(entries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Micro-benchmark for stream template rendering.
+
+Renders the stock title and description templates over a synthetic response of
+streams with both the closure-compiled path (``CompiledTemplate.render``) and the
+AST-interpreting path that re-parses conditions per render
+(``CompiledTemplate.render_interpreted``), checking that the outputs match.
+
+Usage:
+    python scripts/benchmark_template_render.py --streams 200 --rounds 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to import path.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from db.schemas.config import StreamTemplate
+from utils.template_engine import compile_template
+
+STREAM_TYPES = ["torrent", "torrent", "torrent", "usenet", "http", "telegram", "youtube"]
+RESOLUTIONS = ["4k", "1080p", "720p", "480p", None]
+QUALITIES = ["WEB-DL", "BluRay", "WEBRip", "HDTV", None]
+LANGUAGES = ["English", "Hindi", "Tamil", "Spanish", "French"]
+
+
+def _build_contexts(count: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    contexts = []
+    for index in range(count):
+        size = rng.choice([0, rng.randint(300_000_000, 80_000_000_000)])
+        stream = {
+            "name": f"Some.Movie.2024.{index}.mkv",
+            "type": rng.choice(STREAM_TYPES),
+            "resolution": rng.choice(RESOLUTIONS),
+            "quality": rng.choice(QUALITIES),
+            "codec": rng.choice(["x264", "x265", "AV1", None]),
+            "hdr_formats": rng.sample(["HDR10", "HDR10+", "DV"], rng.randint(0, 2)),
+            "audio_formats": rng.sample(["DDP", "AAC", "TrueHD", "DTS"], rng.randint(0, 2)),
+            "channels": rng.sample(["5.1", "7.1", "2.0"], rng.randint(0, 1)),
+            "size": size,
+            "folderSize": size * rng.choice([1, 1, 3]),
+            "seeders": rng.choice([None, 0, rng.randint(1, 500)]),
+            "languages": rng.sample(LANGUAGES, rng.randint(0, 3)),
+            "source": rng.choice(["Torrentio", "Prowlarr", "Zilean"]),
+            "uploader": rng.choice([None, "uploader"]),
+        }
+        service = {"name": "Real-Debrid", "shortName": "RD", "cached": rng.random() < 0.5}
+        contexts.append({"stream": stream, "service": service, "addon": {"name": "MediaFusion"}})
+    return contexts
+
+
+def _time_render(render, contexts: list[dict], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for context in contexts:
+            render(context)
+    return (time.perf_counter() - start) / (rounds * len(contexts)) * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--streams", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    contexts = _build_contexts(args.streams)
+    stock = StreamTemplate()
+    for label, template in (("title", stock.title), ("description", stock.description)):
+        compiled = compile_template(template)
+        mismatches = sum(compiled.render(c) != compiled.render_interpreted(c) for c in contexts)
+        interpreted_us = _time_render(compiled.render_interpreted, contexts, args.rounds)
+        closure_us = _time_render(compiled.render, contexts, args.rounds)
+        print(
+            f"{label:<12} interpreted {interpreted_us:7.2f} µs/stream   closures {closure_us:7.2f} µs/stream   "
+            f"({interpreted_us / closure_us:4.1f}x, {interpreted_us * args.streams / 1000:.2f} -> "
+            f"{closure_us * args.streams / 1000:.2f} ms per {args.streams}-stream response, mismatches: {mismatches})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Micro-benchmark for decrypt-cache hits on UserData.
+
+Compares the old per-hit ``model_copy(deep=True)`` against serving the shared
+``ReadOnlyUserData`` view (and the explicit ``mutable_copy()`` opt-in) for a
+realistic multi-provider profile.
+
+Usage:
+    python scripts/benchmark_user_data_cache.py --iterations 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add project root to import path.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from db.schemas import UserData
+from utils import const
+from utils.crypto import crypto_utils
+
+
+def _build_realistic_profile() -> UserData:
+    """Three debrid providers, MediaFlow, 30 catalogs, custom sort/filters and a name filter."""
+    return UserData.model_validate(
+        {
+            "sps": [
+                {"n": "rd", "sv": "realdebrid", "tk": "x" * 52, "pr": 0},
+                {"n": "tb", "sv": "torbox", "tk": "y" * 36, "pr": 1, "oscs": True},
+                {"n": "ad", "sv": "alldebrid", "tk": "z" * 20, "pr": 2},
+            ],
+            "cc": [{"ci": f"catalog_{i}", "en": i % 3 != 0, "s": "latest"} for i in range(30)],
+            "sr": ["4k", "1080p", "720p", None],
+            "qf": ["BluRay/UHD", "WEB/HD"],
+            "ls": ["English", "Hindi", "Tamil", "Malayalam", "Telugu", None],
+            "tsp": [
+                {"k": "cached", "d": "desc"},
+                {"k": "resolution", "d": "desc"},
+                {"k": "quality", "d": "desc"},
+                {"k": "language", "d": "desc"},
+                {"k": "size", "d": "desc"},
+                {"k": "seeders", "d": "desc"},
+            ],
+            "mfc": {"pu": "https://mediaflow.example.com", "ap": "mediaflow-secret", "pip": "203.0.113.10"},
+            "snfm": "exclude",
+            "snfp": ["cam", "telesync", "hdts"],
+            "mxs": 50,
+            "mspr": 10,
+            "hf": list(const.HDR_FORMATS_FILTERS),
+        }
+    )
+
+
+def _time_per_call(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+async def _run(iterations: int) -> None:
+    user_data = _build_realistic_profile()
+    secret_str = await crypto_utils.process_user_data(user_data)
+    await crypto_utils.decrypt_user_data(secret_str)  # warm the decrypt cache
+    cached = crypto_utils._get_cached_decrypted_user_data(secret_str)
+
+    results = {
+        "deep copy per hit (old)": _time_per_call(lambda: cached.model_copy(deep=True), iterations),
+        "shared read-only view": _time_per_call(
+            lambda: crypto_utils._get_cached_decrypted_user_data(secret_str), iterations
+        ),
+        "mutable_copy() opt-in": _time_per_call(cached.mutable_copy, iterations),
+    }
+
+    print(f"Profile JSON size: {len(user_data.model_dump_json(by_alias=True))} bytes, iterations: {iterations}")
+    baseline = results["deep copy per hit (old)"]
+    for label, micros in results.items():
+        print(f"  {label:<26} {micros:8.2f} µs/request  ({baseline / micros:6.1f}x vs old)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(_run(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
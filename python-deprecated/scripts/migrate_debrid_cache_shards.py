@@ -0,0 +1,80 @@
+"""
+Move every pre-sharding debrid cache hash (``debrid_cache:{service}``) into the sharded layout.
+
+cleanup_expired_cache drains legacy hashes of the services listed in
+``debrid_cache_index:services``, ``debrid_cache_migration_batch_size`` entries per
+run. This script finds every legacy hash with SCAN (including services that are
+no longer written to), adds its service to that set and drains it. With
+``--batch-size`` it only moves that many entries per service and leaves the rest
+to cleanup_expired_cache. Reads keep checking the legacy hash, so it is safe to
+run while the app is serving traffic.
+
+Usage:
+    python scripts/migrate_debrid_cache_shards.py
+    python scripts/migrate_debrid_cache_shards.py --batch-size 100000
+    python scripts/migrate_debrid_cache_shards.py --dry-run
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to import path.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from db.redis_database import REDIS_ASYNC_CLIENT
+from workers.providers.cache_helpers import (
+    CACHE_KEY_PREFIX,
+    CACHE_SERVICES_KEY,
+    get_legacy_cache_key,
+    migrate_legacy_service_cache,
+)
+
+
+async def find_legacy_services() -> list[str]:
+    services = []
+    async for key in REDIS_ASYNC_CLIENT.scan_iter(match=f"{CACHE_KEY_PREFIX}*", count=1000):
+        name = (key.decode() if isinstance(key, bytes) else key)[len(CACHE_KEY_PREFIX) :]
+        # Shard keys are debrid_cache:{service}:{shard}
+        if ":" not in name:
+            services.append(name)
+    return services
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="Only list legacy hashes and their sizes")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Migrate at most this many entries per service; cleanup_expired_cache drains the rest",
+    )
+    args = parser.parse_args()
+    if args.batch_size is not None and args.batch_size < 1:
+        parser.error("--batch-size must be positive")
+
+    services = await find_legacy_services()
+    if not services:
+        print("No legacy debrid cache hashes found")
+        return
+
+    if not args.dry_run:
+        # Register every legacy service up front so cleanup_expired_cache keeps
+        # draining them even if this run is interrupted or bounded by --batch-size.
+        await REDIS_ASYNC_CLIENT.sadd(CACHE_SERVICES_KEY, *services)
+
+    for service in services:
+        size = await REDIS_ASYNC_CLIENT.hlen(get_legacy_cache_key(service))
+        if args.dry_run:
+            print(f"{service}: {size} entries")
+            continue
+        migrated = await migrate_legacy_service_cache(service, args.batch_size)
+        print(f"{service}: migrated {migrated} of {size} entries")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+"""
+Train a zstd dictionary for stream cache blobs from a sample of live ``stream_data:*`` keys.
+
+The payloads are decoded (any format) and re-serialized with the configured serializer,
+so the dictionary matches what the zstd codec compresses. Point
+``STREAM_RAW_REDIS_CACHE_ZSTD_DICT_PATH`` at the output on every worker and set
+``STREAM_RAW_REDIS_CACHE_CODEC=zstd``. Blobs written with a previous dictionary stop
+decoding once it is replaced and are refetched from the database, so roll a new
+dictionary out with the cache TTL in mind.
+
+Usage:
+    python scripts/train_stream_cache_dictionary.py --output stream_cache.zdict
+    python scripts/train_stream_cache_dictionary.py --samples 5000 --dict-size 131072 --output stream_cache.zdict
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to import path.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from db.config import settings
+from db.crud.stream_cache import STREAM_CACHE_PREFIX
+from db.crud.stream_services import _decode_stream_cache_blob
+from db.redis_database import REDIS_ASYNC_CLIENT
+from utils.stream_cache_codec import dumps_payload, zstandard
+
+
+async def sample_stream_cache_payloads(limit: int) -> list[dict]:
+    """Decode up to ``limit`` payloads from live stream cache keys."""
+    payloads: list[dict] = []
+    async for key in REDIS_ASYNC_CLIENT.scan_iter(match=f"{STREAM_CACHE_PREFIX}*", count=1000):
+        payload = _decode_stream_cache_blob(await REDIS_ASYNC_CLIENT.get(key))
+        if payload is not None:
+            payloads.append(payload)
+            if len(payloads) >= limit:
+                break
+    return payloads
+
+
+def train_dictionary(payloads: list[dict], dict_size: int, serializer: str) -> bytes:
+    samples = [dumps_payload(payload, serializer) for payload in payloads]
+    return zstandard.train_dictionary(dict_size, samples).as_bytes()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", required=True, type=Path)
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--dict-size", type=int, default=112640, help="Dictionary size in bytes")
+    parser.add_argument("--serializer", choices=["json", "msgpack"], default=settings.stream_raw_redis_cache_serializer)
+    args = parser.parse_args()
+
+    if zstandard is None:
+        sys.exit("zstandard is not installed. Run: pip install zstandard")
+
+    payloads = await sample_stream_cache_payloads(args.samples)
+    if len(payloads) < 10:
+        sys.exit(f"Only {len(payloads)} stream cache payloads found; need a warmer cache to train on")
+
+    dictionary = train_dictionary(payloads, args.dict_size, args.serializer)
+    args.output.write_bytes(dictionary)
+    print(f"Trained {len(dictionary)} byte dictionary from {len(payloads)} payloads -> {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,144 @@
+import json
+
+import pytest
+
+from workers.scrapers import base_scraper
+from workers.scrapers.base_scraper import BackgroundScraperManager
+
+
+class _FakeRedis:
+    """Minimal in-memory sorted-set/hash store that emulates the queue's Lua scripts."""
+
+    def __init__(self):
+        self.zsets: dict[str, dict[bytes, float]] = {}
+        self.hashes: dict[str, dict[bytes, bytes]] = {}
+
+    @staticmethod
+    def _b(value) -> bytes:
+        return value if isinstance(value, bytes) else str(value).encode()
+
+    async def eval(self, script, numkeys, *keys_and_args):
+        keys, args = keys_and_args[:numkeys], keys_and_args[numkeys:]
+        queue, leases = self.zsets.setdefault(keys[0], {}), self.zsets.setdefault(keys[1], {})
+        if script == base_scraper._CLAIM_DUE_ITEMS_SCRIPT:
+            now, limit, lease_until = float(args[0]), int(args[1]), float(args[2])
+            due = sorted((score, member) for member, score in queue.items() if score <= now)[:limit]
+            result = []
+            for score, member in due:
+                queue[member] = leases[member] = lease_until
+                result += [member, self._b(score)]
+            return result
+        if script == base_scraper._ENQUEUE_ITEM_SCRIPT:
+            now, member = float(args[0]), self._b(args[1])
+            if leases.get(member, float("-inf")) > now:
+                return 0
+            added = member not in queue
+            queue[member] = min(queue.get(member, now), now)
+            return int(added)
+        raise AssertionError("unexpected script")
+
+    async def zadd(self, name, mapping, nx=False, xx=False):
+        zset = self.zsets.setdefault(name, {})
+        added = 0
+        for member, score in mapping.items():
+            member = self._b(member)
+            if (nx and member in zset) or (xx and member not in zset):
+                continue
+            added += member not in zset
+            zset[member] = float(score)
+        return added
+
+    async def zrangebyscore(self, name, min_score, max_score, start=None, num=None, withscores=False):
+        items = sorted((score, member) for member, score in self.zsets.get(name, {}).items() if score <= max_score)
+        return [(member, score) for score, member in items][start : start + num]
+
+    async def zrem(self, name, *values):
+        zset = self.zsets.get(name, {})
+        return sum(zset.pop(self._b(value), None) is not None for value in values)
+
+    async def zremrangebyscore(self, name, min_score, max_score):
+        zset = self.zsets.get(name, {})
+        expired = [member for member, score in zset.items() if score <= max_score]
+        for member in expired:
+            del zset[member]
+        return len(expired)
+
+    async def exists(self, key):
+        return int(bool(self.hashes.get(key)))
+
+    async def hscan(self, name, cursor=0, count=None):
+        return 0, dict(self.hashes.get(name, {}))
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.hashes.pop(key, None)
+            self.zsets.pop(key, None)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = _FakeRedis()
+    monkeypatch.setattr(base_scraper, "REDIS_ASYNC_CLIENT", redis)
+    return redis
+
+
+@pytest.mark.asyncio
+async def test_claim_leases_batch_and_completion_reschedules(fake_redis, monkeypatch):
+    manager = BackgroundScraperManager()
+    manager.batch_size = 2
+    monkeypatch.setattr(base_scraper.time, "time", lambda: 1000.0)
+    for meta_id in ("tt1", "tt2", "tt3"):
+        await manager.add_movie_to_queue(meta_id)
+
+    first = await manager.get_pending_items("movie")
+    second = await manager.get_pending_items("movie")
+    third = await manager.get_pending_items("movie")
+
+    assert [item["key"] for item in first] == ["tt1", "tt2"]
+    assert [item["key"] for item in second] == ["tt3"]
+    assert third == []
+    # Re-requesting a leased item must not make it claimable by another worker.
+    await manager.add_movie_to_queue("tt1")
+    assert await manager.peek_pending_items("movie") == []
+
+    await manager.mark_as_completed("tt1", manager.movie_queue_key)
+    interval = base_scraper.settings.background_search_interval_hours * 3600
+    assert fake_redis.zsets[manager.movie_queue_key][b"tt1"] == 1000.0 + interval
+    assert b"tt1" not in fake_redis.zsets[manager.lease_keys[manager.movie_queue_key]]
+
+
+@pytest.mark.asyncio
+async def test_cleanup_reclaims_only_expired_leases(fake_redis, monkeypatch):
+    manager = BackgroundScraperManager()
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(base_scraper.time, "time", lambda: clock["now"])
+    await manager.add_series_to_queue("tt9", 1, 1)
+    await manager.get_pending_items("series")
+    clock["now"] += manager.lease_seconds / 2
+    await manager.add_series_to_queue("tt9", 1, 2)
+    await manager.get_pending_items("series")
+
+    clock["now"] = 1000.0 + manager.lease_seconds + 1
+    await manager.cleanup_stale_processing()
+
+    leases = fake_redis.zsets[manager.lease_keys[manager.series_queue_key]]
+    assert list(leases) == [b"tt9:1:2"]
+    reclaimed = await manager.get_pending_items("series")
+    assert [item["key"] for item in reclaimed] == ["tt9:1:1"]
+
+
+@pytest.mark.asyncio
+async def test_cleanup_migrates_legacy_hash_queue(fake_redis, monkeypatch):
+    manager = BackgroundScraperManager()
+    monkeypatch.setattr(base_scraper.time, "time", lambda: 1000.0)
+    fake_redis.hashes["background_search:movies"] = {
+        b"tt1": json.dumps({"last_scrape": None, "added_at": 1.0}).encode(),
+        b"tt2": json.dumps({"last_scrape": 500.0, "added_at": 1.0}).encode(),
+    }
+
+    await manager.cleanup_stale_processing()
+
+    interval = base_scraper.settings.background_search_interval_hours * 3600
+    assert fake_redis.zsets[manager.movie_queue_key] == {b"tt1": 0.0, b"tt2": 500.0 + interval}
+    assert "background_search:movies" not in fake_redis.hashes
+    assert [item["key"] for item in await manager.get_pending_items("movie")] == ["tt1"]
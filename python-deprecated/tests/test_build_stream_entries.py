@@ -0,0 +1,100 @@
+from datetime import UTC, datetime
+
+from db.schemas.config import StreamTemplate, UserData
+from db.schemas.media import StreamFileData, TorrentStreamData
+from utils.parser import _build_stream_entries, render_stream_templates_batch
+
+GB = 1024 * 1024 * 1024
+
+
+def _make_stream(index: int, files: list[StreamFileData], cached: bool = True) -> TorrentStreamData:
+    stream = TorrentStreamData(
+        info_hash=f"{index:040x}",
+        name=f"Some.Title.2024.{index}.1080p.WEB-DL",
+        size=10 * GB,
+        source="Torrentio",
+        resolution="1080p",
+        quality="WEB-DL",
+        languages=["English"],
+        seeders=12,
+        created_at=datetime.now(UTC),
+        meta_id="tt1234567",
+        files=files,
+    )
+    stream.cached = cached
+    return stream
+
+
+def _build(streams, user_data: UserData, is_series: bool = False):
+    return _build_stream_entries(
+        filtered_streams=streams,
+        user_data=user_data,
+        secret_str="secret",
+        season=1 if is_series else None,
+        episode=2 if is_series else None,
+        is_series=is_series,
+        is_usenet=False,
+        is_telegram=False,
+        is_http=False,
+        is_youtube=False,
+        return_rich=False,
+        has_streaming_provider=True,
+        current_provider=user_data.get_primary_provider(),
+        streaming_provider_name="RD",
+        addon_name="MF",
+        base_proxy_url_template="http://host/playback/{}",
+    )
+
+
+def _user_data() -> UserData:
+    return UserData.model_validate({"sps": [{"n": "rd", "sv": "realdebrid", "tk": "x" * 52}]})
+
+
+def test_batch_renders_stock_templates_per_stream():
+    streams = [
+        _make_stream(1, [StreamFileData(file_index=0, filename="Movie/Movie.1.mkv", size=GB)], cached=True),
+        _make_stream(2, [StreamFileData(file_index=0, filename="Movie/Movie.2.mkv", size=GB)], cached=False),
+    ]
+
+    entries = _build(streams, _user_data())
+
+    assert [entry.name for entry in entries] == ["MF 🧲 RD ⚡️ 1080P", "MF 🧲 RD ⏳ 1080P"]
+    assert entries[0].url == "http://host/playback/" + f"{1:040x}" + "/Movie.1.mkv?stremio=1"
+    assert entries[0].behaviorHints.filename == "Movie.1.mkv"
+
+
+def test_series_variants_get_their_own_file_fields():
+    files = [
+        StreamFileData(file_index=index, filename=name, size=GB, season_number=1, episode_number=2)
+        for index, name in enumerate(["Show.S01E02.mkv", "Show.S01E02.Extended.MKV"])
+    ]
+    user_data = _user_data()
+    user_data.stream_template = StreamTemplate(
+        t="{stream.filename}", d="{stream.extension} {stream.season}x{stream.episode}"
+    )
+
+    entries = _build([_make_stream(3, files)], user_data, is_series=True)
+
+    assert [entry.name for entry in entries] == ["Show.S01E02.mkv", "Show.S01E02.Extended.MKV"]
+    assert [entry.description for entry in entries] == ["mkv 1x2", "mkv 1x2"]
+    assert entries[1].url.endswith("/1/2/Show.S01E02.Extended.MKV?stremio=1")
+
+
+def test_failed_template_falls_back_to_hardcoded_format():
+    user_data = _user_data()
+    user_data.stream_template = StreamTemplate(t="{stream.name|bytes}", d="{stream.name}")
+    streams = [_make_stream(4, [StreamFileData(file_index=0, filename="Movie.4.mkv", size=GB)])]
+
+    entries = _build(streams, user_data)
+
+    assert entries[0].name == "MF 🧲 RD 1080P ⚡️"
+    assert entries[0].description == "📺 WEB-DL\n💾 10.0 GB 👤 12\n🌐 English\n🔗 Torrentio"
+
+
+def test_render_batch_isolates_failures():
+    contexts = [{"stream": {"name": "ok", "size": 1}}, {"stream": {"name": "bad", "size": "x"}}]
+
+    rendered = render_stream_templates_batch("{stream.size|bytes}", "{stream.name}", contexts)
+
+    assert rendered[0] == ("1.0 B", "ok")
+    assert rendered[1] is None
@@ -0,0 +1,47 @@
+import pytest
+from pydantic import ValidationError
+
+from db.schemas import ReadOnlyUserData, UserData
+from utils.crypto import CryptoUtils
+
+
+@pytest.mark.asyncio
+async def test_decrypt_cache_hit_returns_shared_read_only_view():
+    crypto = CryptoUtils()
+    secret_str = await crypto.process_user_data(UserData(sr=["1080p"], mxs=40))
+
+    first = await crypto.decrypt_user_data(secret_str)
+    second = await crypto.decrypt_user_data(secret_str)
+
+    assert isinstance(first, ReadOnlyUserData)
+    assert first is second
+    assert first._filter_plan is not None
+    with pytest.raises(ValidationError):
+        first.max_streams = 5
+
+
+@pytest.mark.asyncio
+async def test_mutable_opt_in_returns_independent_copy():
+    crypto = CryptoUtils()
+    secret_str = await crypto.process_user_data(UserData(sr=["1080p"]))
+
+    shared = await crypto.decrypt_user_data(secret_str)
+    editable = await crypto.decrypt_user_data(secret_str, mutable=True)
+    editable.selected_resolutions.append("720p")
+    editable.max_streams = 5
+
+    assert type(editable) is UserData
+    assert shared.selected_resolutions == ["1080p"]
+    assert shared.max_streams != 5
+    assert editable.model_dump(by_alias=True, exclude_unset=True)["sr"] == ["1080p", "720p"]
+
+
+@pytest.mark.asyncio
+async def test_invalidate_prefix_drops_cached_view():
+    crypto = CryptoUtils()
+    secret_str = await crypto.process_user_data(UserData())
+    first = await crypto.decrypt_user_data(secret_str)
+
+    crypto._invalidate_decrypt_cache_prefix(secret_str[:2])
+
+    assert await crypto.decrypt_user_data(secret_str) is not first
@@ -0,0 +1,148 @@
+from datetime import UTC, datetime
+
+import pytest
+
+from db.schemas import StreamingProvider
+from workers.providers import cache_helpers
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+
+        return queue
+
+    async def execute(self):
+        self.redis.round_trips += 1
+        return [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+class _FakeRedis:
+    def __init__(self, version="7.2.4"):
+        self.hashes: dict[str, dict[str, object]] = {}
+        self.sets: dict[str, set[str]] = {}
+        self.strings: dict[str, object] = {}
+        self.field_ttls: dict[tuple[str, str], int] = {}
+        self.version = version
+        self.round_trips = 0
+
+    def pipeline(self, transaction=False):
+        return _FakePipeline(self)
+
+    async def info(self, section=None):
+        return {"redis_version": self.version}
+
+    async def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    async def hmget(self, key, fields):
+        stored = self.hashes.get(key, {})
+        return [None if stored.get(field) is None else str(stored[field]).encode() for field in fields]
+
+    async def hdel(self, key, *fields):
+        for field in fields:
+            self.hashes.get(key, {}).pop(field.decode() if isinstance(field, bytes) else field, None)
+
+    async def hexpire(self, key, seconds, *fields):
+        for field in fields:
+            self.field_ttls[(key, field)] = seconds
+
+    async def hscan(self, key, cursor, count=None):
+        return 0, {field.encode(): str(value).encode() for field, value in self.hashes.get(key, {}).items()}
+
+    async def exists(self, key):
+        return int(bool(self.hashes.get(key)))
+
+    async def expire(self, key, seconds):
+        return True
+
+    async def sadd(self, key, *values):
+        self.sets.setdefault(key, set()).update(values)
+
+    async def get(self, key):
+        return self.strings.get(key)
+
+    async def set(self, key, value):
+        self.strings[key] = value
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = _FakeRedis()
+    monkeypatch.setattr(cache_helpers, "REDIS_ASYNC_CLIENT", redis)
+    monkeypatch.setattr(cache_helpers, "_hash_field_ttl_supported", None)
+    monkeypatch.setattr(cache_helpers.settings, "sync_debrid_cache_streams", False)
+    return redis
+
+
+def _hashes(count):
+    return [f"{index:040x}" for index in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_store_and_lookup_use_shards_in_one_round_trip(fake_redis):
+    provider = StreamingProvider(service="torbox", token="x")
+    cached = _hashes(50)
+    await cache_helpers.store_cached_info_hashes(provider, cached)
+
+    assert cache_helpers.get_legacy_cache_key("torbox") not in fake_redis.hashes
+    assert len(fake_redis.hashes) > 1
+    assert all(key.startswith("debrid_cache:torbox:") for key in fake_redis.hashes)
+    assert fake_redis.sets[cache_helpers.CACHE_SERVICES_KEY] == {"torbox"}
+    assert not fake_redis.field_ttls
+
+    fake_redis.round_trips = 0
+    status = await cache_helpers.get_cached_status(provider, cached + ["f" * 40])
+
+    assert fake_redis.round_trips == 1
+    assert all(status[info_hash] for info_hash in cached)
+    assert status["f" * 40] is False
+
+
+@pytest.mark.asyncio
+async def test_field_ttls_are_set_on_redis_7_4(fake_redis):
+    fake_redis.version = "7.4.1"
+    await cache_helpers.store_cached_info_hashes(StreamingProvider(service="torbox", token="x"), _hashes(3))
+
+    assert len(fake_redis.field_ttls) == 3
+    assert all(ttl > cache_helpers.EXPIRY_SECONDS - 5 for ttl in fake_redis.field_ttls.values())
+
+
+@pytest.mark.asyncio
+async def test_legacy_hash_is_read_and_migrated(fake_redis):
+    provider = StreamingProvider(service="realdebrid", token="x")
+    now = int(datetime.now(tz=UTC).timestamp())
+    legacy_key = cache_helpers.get_legacy_cache_key("realdebrid")
+    fake_redis.hashes[legacy_key] = {"a" * 40: now + 3600, "b" * 40: now - 10}
+
+    status = await cache_helpers.get_cached_status(provider, ["a" * 40])
+    assert status == {"a" * 40: True}
+
+    assert await cache_helpers.migrate_legacy_service_cache("realdebrid") == 2
+    assert not fake_redis.hashes[legacy_key]
+    shard_key = cache_helpers.get_shard_key("realdebrid", cache_helpers.get_cache_shard("a" * 40))
+    assert fake_redis.hashes[shard_key] == {"a" * 40: now + 3600}
+    assert "b" * 40 not in fake_redis.hashes.get(
+        cache_helpers.get_shard_key("realdebrid", cache_helpers.get_cache_shard("b" * 40)), {}
+    )
+
+
+@pytest.mark.asyncio
+async def test_cleanup_is_bounded_and_resumes(fake_redis, monkeypatch):
+    monkeypatch.setattr(cache_helpers.settings, "debrid_cache_cleanup_shards_per_run", 4)
+    now = int(datetime.now(tz=UTC).timestamp())
+    for shard in range(cache_helpers.SHARD_COUNT):
+        fake_redis.hashes[cache_helpers.get_shard_key("torbox", f"{shard:02x}")] = {"x": now - 1, "y": now + 60}
+
+    await cache_helpers.cleanup_service_cache("torbox")
+    await cache_helpers.cleanup_service_cache("torbox")
+
+    cleaned = [key for key, fields in fake_redis.hashes.items() if "x" not in fields]
+    assert len(cleaned) == 8
+    assert all(fields.get("y") for fields in fake_redis.hashes.values())
+    assert fake_redis.strings[f"{cache_helpers.CACHE_CLEANUP_CURSOR_PREFIX}torbox"] == 8
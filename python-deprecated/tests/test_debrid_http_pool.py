@@ -0,0 +1,77 @@
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from utils.prometheus_metrics import DEBRID_HTTP_CONNECTIONS_CREATED_TOTAL, DEBRID_HTTP_CONNECTIONS_REUSED_TOTAL
+from workers.providers import http_pool
+from workers.providers.debrid_client import DebridClient
+
+
+class _PooledDummyClient(DebridClient):
+    debrid_proxy_provider_id = "_pool_dummy"
+
+    async def _handle_service_specific_errors(self, error_data: dict, status_code: int):
+        return
+
+    async def initialize_headers(self):
+        self.headers = {"Authorization": f"Bearer {self.token}"}
+
+    async def disable_access_token(self):
+        return
+
+    async def get_torrent_info(self, torrent_id: str) -> dict:
+        return {}
+
+
+@pytest.fixture
+async def json_server():
+    async def handler(request):
+        return web.json_response({"auth": request.headers.get("Authorization")})
+
+    app = web.Application()
+    app.router.add_get("/info", handler)
+    server = TestServer(app)
+    await server.start_server()
+    yield server
+    await server.close()
+    await http_pool.close_shared_sessions()
+
+
+@pytest.mark.asyncio
+async def test_clients_share_pooled_session_and_reuse_connections(json_server):
+    url = str(json_server.make_url("/info"))
+    created = DEBRID_HTTP_CONNECTIONS_CREATED_TOTAL.labels(provider="_pool_dummy")
+    reused = DEBRID_HTTP_CONNECTIONS_REUSED_TOTAL.labels(provider="_pool_dummy")
+    created_before, reused_before = created._value.get(), reused._value.get()
+
+    responses = []
+    sessions = set()
+    for token in ("user-a", "user-b", "user-c"):
+        async with _PooledDummyClient(token=token) as client:
+            sessions.add(id(client.session))
+            responses.append(await client._make_request("GET", url))
+
+    assert [response["auth"] for response in responses] == ["Bearer user-a", "Bearer user-b", "Bearer user-c"]
+    assert len(sessions) == 1
+    assert not http_pool.get_shared_session("_pool_dummy", None).closed
+    assert created._value.get() - created_before == 1
+    assert reused._value.get() - reused_before == 2
+
+
+@pytest.mark.asyncio
+async def test_pool_is_keyed_by_provider_and_proxy(json_server):
+    direct = http_pool.get_shared_session("_pool_dummy", None)
+
+    assert http_pool.get_shared_session("_pool_dummy", None) is direct
+    assert http_pool.get_shared_session("_pool_other", None) is not direct
+    assert http_pool.get_shared_session("_pool_dummy", "socks5://127.0.0.1:1080") is not direct
+
+
+def test_per_task_loop_closes_its_sessions_before_the_loop_ends():
+    async def task():
+        return http_pool.get_shared_session("_pool_dummy", None)
+
+    session = http_pool.run_with_shared_sessions(task())
+
+    assert session.closed
+    assert all(pooled is not session for _, pooled in http_pool._sessions.values())
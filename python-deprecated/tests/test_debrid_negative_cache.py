@@ -0,0 +1,137 @@
+from types import SimpleNamespace
+
+import pytest
+
+from workers.providers import negative_cache
+from workers.providers.exceptions import ProviderException
+from workers.providers.torbox import utils as torbox_utils
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+
+        return queue
+
+    async def execute(self):
+        return [getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.bitmaps: dict[str, set[int]] = {}
+        self.counters: dict[str, int] = {}
+
+    def pipeline(self, transaction=False):
+        return _FakePipeline(self)
+
+    def execute_command(self, command, key, *args):
+        assert command == "BITFIELD"
+        bits = self.bitmaps.setdefault(key, set())
+        replies = []
+        for index in range(0, len(args), 3 if args[0] == "GET" else 4):
+            if args[index] == "GET":
+                replies.append(int(args[index + 2] in bits))
+            else:
+                bits.add(args[index + 2])
+        return replies
+
+    def expire(self, key, seconds):
+        return True
+
+    def incrby(self, key, amount):
+        self.counters[key] = self.counters.get(key, 0) + amount
+        return self.counters[key]
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = _FakeRedis()
+    monkeypatch.setattr(negative_cache, "REDIS_ASYNC_CLIENT", redis)
+    monkeypatch.setattr(negative_cache.settings, "debrid_negative_cache_enabled", True)
+    monkeypatch.setattr(negative_cache.settings, "debrid_negative_cache_audit_rate", 0.0)
+    return redis
+
+
+@pytest.mark.asyncio
+async def test_recorded_uncached_hashes_are_skipped(fake_redis):
+    uncached, cached, unknown = "a" * 40, "b" * 40, "c" * 40
+    await negative_cache.record_lookup_results("remote", "torbox", {uncached: False, cached: True})
+
+    check = await negative_cache.check_recently_uncached("remote", "torbox", [uncached, cached, unknown])
+
+    assert check.skipped == {uncached}
+    assert not check.audited
+    # Scopes and services are separate filters
+    assert not (await negative_cache.check_recently_uncached("provider", "torbox", [uncached])).skipped
+    assert not (await negative_cache.check_recently_uncached("remote", "premiumize", [uncached])).skipped
+
+
+@pytest.mark.asyncio
+async def test_old_partitions_age_out(fake_redis, monkeypatch):
+    clock = [1_000_000.0]
+    monkeypatch.setattr(negative_cache.time, "time", lambda: clock[0])
+    await negative_cache.record_uncached("remote", "torbox", ["a" * 40])
+
+    clock[0] += negative_cache.settings.debrid_negative_cache_window_seconds - negative_cache._partition_seconds()
+    assert (await negative_cache.check_recently_uncached("remote", "torbox", ["a" * 40])).skipped
+
+    clock[0] += 2 * negative_cache._partition_seconds()
+    assert not (await negative_cache.check_recently_uncached("remote", "torbox", ["a" * 40])).skipped
+
+
+@pytest.mark.asyncio
+async def test_audited_positives_are_looked_up_and_counted(fake_redis, monkeypatch):
+    monkeypatch.setattr(negative_cache.settings, "debrid_negative_cache_audit_rate", 1.0)
+    audits = negative_cache.DEBRID_NEGATIVE_CACHE_AUDITS_TOTAL.labels(scope="remote", result="false_positive")
+    before = audits._value.get()
+    await negative_cache.record_uncached("remote", "torbox", ["a" * 40])
+
+    check = await negative_cache.check_recently_uncached("remote", "torbox", ["a" * 40])
+    assert check.audited == {"a" * 40} and not check.skipped
+
+    await negative_cache.record_lookup_results("remote", "torbox", {"a" * 40: True}, check.audited)
+    assert audits._value.get() - before == 1
+
+
+@pytest.mark.asyncio
+async def test_unanswered_hashes_are_neither_recorded_nor_audited(fake_redis):
+    audits = negative_cache.DEBRID_NEGATIVE_CACHE_AUDITS_TOTAL.labels(scope="provider", result="confirmed")
+    before = audits._value.get()
+
+    # A failed provider call leaves every status None
+    await negative_cache.record_lookup_results("provider", "torbox", {"a" * 40: None, "b" * 40: None}, {"a" * 40})
+
+    assert not (await negative_cache.check_recently_uncached("provider", "torbox", ["a" * 40, "b" * 40])).skipped
+    assert audits._value.get() == before
+
+
+def test_estimated_false_positive_rate_grows_with_inserts():
+    assert negative_cache.estimated_false_positive_rate(0) == 0
+    assert 0.005 < negative_cache.estimated_false_positive_rate(800_000) < 0.02
+
+
+@pytest.mark.asyncio
+async def test_torbox_chunk_is_uncached_on_empty_answer_and_unanswered_on_failure():
+    class _Client:
+        def __init__(self, answer):
+            self.answer = answer
+
+        async def get_torrent_instant_availability(self, info_hashes):
+            if isinstance(self.answer, Exception):
+                raise self.answer
+            return self.answer
+
+    answered = [SimpleNamespace(info_hash="a" * 40, cached=None)]
+    failed = [SimpleNamespace(info_hash="b" * 40, cached=None)]
+
+    await torbox_utils.update_chunk_cache_status(_Client([]), answered)
+    await torbox_utils.update_chunk_cache_status(_Client(ProviderException("down", "error.mp4")), failed)
+
+    assert answered[0].cached is False
+    assert failed[0].cached is None
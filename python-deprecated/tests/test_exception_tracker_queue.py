@@ -0,0 +1,99 @@
+import logging
+import sys
+import threading
+
+import pytest
+
+from utils import exception_tracker
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+
+        return queue
+
+    def execute(self):
+        self.redis.executed.append(self.commands)
+        return [None] * len(self.commands)
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.executed = []
+        self.calling_threads = set()
+        # Index members beyond exception_tracking_max_entries
+        self.overflow = []
+
+    def pipeline(self, transaction=False):
+        self.calling_threads.add(threading.current_thread().name)
+        return _FakePipeline(self)
+
+    def zrange(self, name, start, end, withscores=False):
+        return self.overflow
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = _FakeRedis()
+    monkeypatch.setattr(exception_tracker, "REDIS_SYNC_CLIENT", redis)
+    monkeypatch.setattr(exception_tracker.settings, "enable_exception_tracking", True)
+    monkeypatch.setattr(exception_tracker.settings, "exception_tracking_flush_interval", 0.05)
+    return redis
+
+
+def _error_record(message="boom"):
+    try:
+        raise ValueError(message)
+    except ValueError:
+        return logging.LogRecord("test", logging.ERROR, __file__, 1, "failed", None, sys.exc_info())
+
+
+def test_emit_queues_and_writer_aggregates_by_fingerprint(fake_redis):
+    handler = exception_tracker.RedisExceptionHandler()
+    for _ in range(5):
+        handler.emit(_error_record())
+    handler.close()
+
+    assert fake_redis.calling_threads == {"exception-tracker-writer"}
+    commands = [command for batch in fake_redis.executed for command in batch]
+    counts = [args[2] for name, args, _ in commands if name == "hincrby"]
+    assert sum(counts) == 5
+    # One fingerprint: details are formatted once and written with the aggregated count
+    assert len({args[0] for name, args, _ in commands if name == "hincrby"}) == 1
+    details = [kwargs["mapping"] for name, _, kwargs in commands if name == "hset" and "type" in kwargs["mapping"]]
+    assert details and details[0]["type"] == "ValueError"
+    assert "ValueError: boom" in details[0]["traceback"]
+
+
+def test_full_queue_drops_records(fake_redis, monkeypatch):
+    monkeypatch.setattr(exception_tracker.settings, "exception_tracking_queue_size", 2)
+    dropped = exception_tracker.EXCEPTION_TRACKER_DROPPED_TOTAL.labels(reason="queue_full")
+    before = dropped._value.get()
+    handler = exception_tracker.RedisExceptionHandler()
+    # Stop the writer from draining so the queue fills up
+    release = threading.Event()
+    monkeypatch.setattr(handler, "_run_writer", lambda records: release.wait())
+
+    for _ in range(5):
+        handler.emit(_error_record())
+
+    assert dropped._value.get() - before == 3
+    release.set()
+
+
+def test_flush_trims_fingerprints_beyond_cap(fake_redis, monkeypatch):
+    monkeypatch.setattr(exception_tracker.settings, "exception_tracking_max_entries", 1)
+    fake_redis.overflow = [b"old1", b"old2"]
+
+    exception_tracker._flush_pending({"new": exception_tracker._PendingException(1, 1.0, 1.0, None)})
+
+    assert fake_redis.executed[-1] == [
+        ("delete", ("exc:old1", "exc:old2"), {}),
+        ("zrem", ("exc:index", b"old1", b"old2"), {}),
+    ]
@@ -25,6 +25,8 @@ import pytest
 
 from db.schemas.config import UserData
 from db.schemas.media import StreamFileData, TorrentStreamData
+from utils import parser
+from utils.filter_plan import get_filter_plan
 from utils.parser import filter_and_sort_streams
 
 
@@ -733,3 +735,78 @@ class TestIntegration:
         # Within 1080p: 100 seeders > 10 seeders
         # Within 720p: 50 seeders > 5 seeders
         assert names == ["C.1080p.100s", "B.1080p.10s", "A.720p.50s", "D.720p.5s"]
+
+    @pytest.mark.asyncio
+    async def test_each_stream_counted_under_first_failing_reason(self):
+        """A stream failing several filters is counted once, under the earliest filter."""
+        streams = [
+            make_stream(name="A.4k.CAM", resolution="4k", quality="CAM", size=80 * GB),
+            make_stream(name="B.1080p.CAM", resolution="1080p", quality="CAM", size=80 * GB),
+            make_stream(name="C.1080p.CAM", resolution="1080p", quality="CAM"),
+            make_stream(name="D.1080p.French", resolution="1080p", languages=["French"]),
+            make_stream(name="E.1080p.OK", resolution="1080p"),
+        ]
+        user_data = make_user_data(sr=["1080p"], qf=["WEB/HD"], ms=50 * GB)
+        result, reasons = await filter_and_sort_streams(streams, user_data, "tt1234567:1:1")
+
+        assert [s.name for s in result] == ["E.1080p.OK"]
+        assert reasons["Resolution Not Selected"] == 1
+        assert reasons["Max Size Exceeded"] == 1
+        assert reasons["Quality Not Selected"] == 1
+        assert reasons["Language Not Selected"] == 1
+        assert sum(reasons.values()) + len(result) == len(streams)
+
+    @pytest.mark.asyncio
+    async def test_input_streams_are_not_mutated(self):
+        streams = [make_stream(name="S.1080p", resolution="1080p", languages=["Klingon", "English"])]
+        result, _ = await filter_and_sort_streams(streams, make_user_data(), "tt1234567:1:1")
+
+        assert result[0] is not streams[0]
+        assert result[0].filtered_resolution == "1080p"
+        assert result[0].filtered_languages == ["English"]
+        assert "filtered_resolution" not in (streams[0].model_extra or {})
+
+
+# ---------------------------------------------------------------------------
+# Precompiled filter plan
+# ---------------------------------------------------------------------------
+
+
+class TestFilterPlan:
+    @pytest.mark.asyncio
+    async def test_plan_compiled_once_per_user_data(self):
+        user_data = make_user_data(snfm="include", snfp=["web"], snfr=False)
+        plan = get_filter_plan(user_data)
+
+        await filter_and_sort_streams([make_stream(name="A.WEB")], user_data, "tt1234567:1:1")
+
+        assert get_filter_plan(user_data) is plan
+        assert plan.name_patterns == ("web",)
+
+    def test_plan_not_serialized(self):
+        user_data = make_user_data()
+        get_filter_plan(user_data)
+        assert "_filter_plan" not in user_data.model_dump()
+
+
+# ---------------------------------------------------------------------------
+# Adult filter
+# ---------------------------------------------------------------------------
+
+
+class TestAdultFilter:
+    @pytest.mark.asyncio
+    async def test_persisted_flag_skips_parser(self, monkeypatch):
+        monkeypatch.setattr(parser.settings, "adult_content_filter_in_torrent_title", True)
+        parsed = []
+        monkeypatch.setattr(parser, "detect_adult_title", lambda title: parsed.append(title) or False)
+        streams = [make_stream(name="Flagged.1080p"), make_stream(name="Clean.1080p"), make_stream(name="Old.1080p")]
+        streams[0].is_adult = True
+        streams[1].is_adult = False
+
+        result, reasons = await filter_and_sort_streams(streams, make_user_data(), "tt1234567:1:1")
+
+        assert sorted(s.name for s in result) == ["Clean.1080p", "Old.1080p"]
+        assert reasons["Strict 18+ Keyword Filter"] == 1
+        # Only the stream without a persisted flag falls back to the parser
+        assert parsed == ["Old.1080p"]
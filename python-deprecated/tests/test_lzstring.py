@@ -0,0 +1,154 @@
+import json
+import random
+
+import pytest
+
+from utils import lzstring
+
+DMM_PAYLOAD = (
+    "N4IgLglmA2CmIC4QHUCG0DWEB2BzABACayqEgA04A9gE42zZgDOiA2qAGYRzaoC28JABUAFrHxpMOAgBES"
+    "hfAGUSTKtnwAWfAAoAjAAYAHPoAO+AB4AmAGwBWfACkqATwCUFECNRMRiEAE5YXVQAZgAjAGNbf39bW0sI"
+    "1F1-DmsQ2wiNS11rWAB2MNh0vI0Q3UJDXQiPMOcwWBYEQ0NbUpj-a10AXwBdLqA"
+)
+
+
+def compress_to_encoded_uri_component(text: str) -> str:
+    """Port of lz-string ``compressToEncodedURIComponent`` (BMP text only) used to build fixtures."""
+    output: list[str] = []
+    data_val = 0
+    data_position = 0
+
+    def write(value: int, bit_count: int) -> None:
+        nonlocal data_val, data_position
+        for _ in range(bit_count):
+            data_val = (data_val << 1) | (value & 1)
+            value >>= 1
+            if data_position == 5:
+                output.append(lzstring._URI_SAFE_ALPHABET[data_val])
+                data_val = 0
+                data_position = 0
+            else:
+                data_position += 1
+
+    dictionary: dict[str, int] = {}
+    to_create: set[str] = set()
+    dict_size, num_bits, enlarge_in = 3, 2, 2
+    w = ""
+
+    def emit(phrase: str) -> None:
+        nonlocal dict_size, num_bits, enlarge_in
+        if phrase in to_create:
+            code_point = ord(phrase[0])
+            if code_point < 256:
+                write(0, num_bits)
+                write(code_point, 8)
+            else:
+                write(1, num_bits)
+                write(code_point, 16)
+            enlarge_in -= 1
+            if enlarge_in == 0:
+                enlarge_in, num_bits = 1 << num_bits, num_bits + 1
+            to_create.discard(phrase)
+        else:
+            write(dictionary[phrase], num_bits)
+        enlarge_in -= 1
+        if enlarge_in == 0:
+            enlarge_in, num_bits = 1 << num_bits, num_bits + 1
+
+    for c in text:
+        if c not in dictionary:
+            dictionary[c] = dict_size
+            dict_size += 1
+            to_create.add(c)
+        if w + c in dictionary:
+            w += c
+            continue
+        emit(w)
+        dictionary[w + c] = dict_size
+        dict_size += 1
+        w = c
+    if w:
+        emit(w)
+    write(2, num_bits)
+    while True:
+        data_val <<= 1
+        if data_position == 5:
+            output.append(lzstring._URI_SAFE_ALPHABET[data_val])
+            break
+        data_position += 1
+    return "".join(output)
+
+
+def reference_decompress(compressed: str) -> str:
+    normalized = compressed.replace(" ", "+")
+    return lzstring._decompress(
+        len(normalized), 32, lambda index: lzstring._get_base_value(lzstring._URI_SAFE_ALPHABET, normalized[index])
+    )
+
+
+def outcome(decode, payload: str) -> tuple[str, str]:
+    try:
+        return "ok", decode(payload)
+    except Exception as exc:
+        return "error", type(exc).__name__
+
+
+def hashlist_json(rng: random.Random, rows: int) -> str:
+    torrents = [
+        {
+            "filename": f"Show.Name.S{rng.randint(1, 12):02d}E{rng.randint(1, 24):02d}.1080p.WEB-DL.x264-GRP{index}",
+            "hash": "".join(rng.choice("0123456789abcdef") for _ in range(40)),
+            "bytes": rng.randint(10**8, 10**11),
+        }
+        for index in range(rows)
+    ]
+    return json.dumps({"title": "Hashlist — Amélie 東京", "torrents": torrents})
+
+
+def test_known_dmm_payload_matches_reference():
+    decoded = lzstring.decompress_from_encoded_uri_component(DMM_PAYLOAD)
+
+    assert decoded == reference_decompress(DMM_PAYLOAD)
+    assert "9e1a3bc599552ca19f635c4216e7be357431d81c" in decoded
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["a", "aaaaaaaaaaaaaaaa", "abababababab ab", "Ünïcödé — 東京 ✓", json.dumps({"torrents": []})],
+)
+def test_round_trips_match_reference(text):
+    payload = compress_to_encoded_uri_component(text)
+
+    assert lzstring.decompress_from_encoded_uri_component(payload) == text
+    assert reference_decompress(payload) == text
+
+
+def test_large_hashlist_round_trip_matches_reference():
+    text = hashlist_json(random.Random(7), rows=2000)
+    payload = compress_to_encoded_uri_component(text)
+
+    assert lzstring.decompress_from_encoded_uri_component(payload) == text
+    # Spaces stand in for "+" when the fragment went through URL decoding
+    assert lzstring.decompress_from_encoded_uri_component(payload.replace("+", " ")) == text
+
+
+def test_arbitrary_payloads_match_reference():
+    rng = random.Random(23)
+    for _ in range(2000):
+        payload = "".join(rng.choice(lzstring._URI_SAFE_ALPHABET) for _ in range(rng.randint(1, 40)))
+        fast = outcome(lzstring.decompress_from_encoded_uri_component, payload)
+        reference = outcome(reference_decompress, payload)
+        if reference[0] == "error":
+            # The public function wraps decoder errors
+            assert fast == ("error", "ValueError"), payload
+        else:
+            assert fast == reference, payload
+
+
+def test_characters_outside_the_alphabet_fall_back_to_reference():
+    payload = compress_to_encoded_uri_component("hello hello")
+
+    # Trailing junk after the end marker is never read
+    assert lzstring.decompress_from_encoded_uri_component(payload + "#é") == "hello hello"
+    with pytest.raises(ValueError):
+        lzstring.decompress_from_encoded_uri_component("#" + payload)
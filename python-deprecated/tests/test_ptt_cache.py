@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from utils import ptt_cache
+
+
+@pytest.fixture
+def parse_calls(monkeypatch):
+    calls = []
+
+    def fake_parse(title, translate_langs=False):
+        calls.append((title, translate_langs))
+        return {"title": title.split(".")[0], "seasons": [1], "languages": ["en"] if translate_langs else []}
+
+    monkeypatch.setattr(ptt_cache.PTT, "parse_title", fake_parse)
+    monkeypatch.setattr(ptt_cache, "_memory_cache", ptt_cache.ParsedTitleCache(max_entries=2))
+    monkeypatch.setattr(ptt_cache, "_second_tier", lambda: None)
+    return calls
+
+
+def test_repeated_titles_are_parsed_once(parse_calls):
+    first = ptt_cache.parse_title_cached("Show.S01.1080p", True)
+    first["seasons"].append(2)
+    second = ptt_cache.parse_title_cached("Show.S01.1080p", True)
+
+    assert parse_calls == [("Show.S01.1080p", True)]
+    # Every call gets its own dict, so callers can mutate results
+    assert second == {"title": "Show", "seasons": [1], "languages": ["en"]}
+    # translate_langs is part of the key
+    assert ptt_cache.parse_title_cached("Show.S01.1080p")["languages"] == []
+    assert len(parse_calls) == 2
+
+
+def test_lru_is_bounded(parse_calls):
+    for title in ("A.1", "B.1", "C.1", "A.1"):
+        ptt_cache.parse_title_cached(title)
+
+    assert len(ptt_cache._memory_cache) == 2
+    assert [title for title, _ in parse_calls] == ["A.1", "B.1", "C.1", "A.1"]
+
+
+def test_disk_tier_is_shared_across_processes(parse_calls, monkeypatch, tmp_path):
+    tier = ptt_cache.DiskTier(str(tmp_path / "ptt.sqlite3"), max_entries=100)
+    monkeypatch.setattr(ptt_cache, "_second_tier", lambda: tier)
+    hits = ptt_cache.PTT_PARSE_CACHE_LOOKUPS_TOTAL.labels(tier="disk", result="hit")
+    before = hits._value.get()
+
+    ptt_cache.parse_title_cached("Movie.2024.2160p")
+    # A fresh process starts with an empty LRU but reads the host's disk tier
+    ptt_cache.clear_parse_cache()
+    result = ptt_cache.parse_title_cached("Movie.2024.2160p")
+
+    assert result["title"] == "Movie"
+    assert len(parse_calls) == 1
+    assert hits._value.get() - before == 1
+
+
+def test_redis_tier_is_skipped_on_the_event_loop(monkeypatch):
+    stored = {}
+    monkeypatch.setattr(ptt_cache.REDIS_SYNC_CLIENT, "get", stored.get)
+    monkeypatch.setattr(ptt_cache.REDIS_SYNC_CLIENT, "set", lambda key, value, ex=None: stored.update({key: value}))
+    tier = ptt_cache.RedisTier(ttl_seconds=60)
+
+    tier.set(b"k", b"{}")
+    assert tier.get(b"k") == b"{}"
+
+    async def on_loop():
+        return tier.get(b"k")
+
+    assert asyncio.run(on_loop()) is None
+
+
+def test_redis_tier_errors_fall_back_to_parsing(parse_calls, monkeypatch):
+    def unavailable(*_args, **_kwargs):
+        raise RedisTimeoutError("Timeout reading from socket")
+
+    monkeypatch.setattr(ptt_cache.REDIS_SYNC_CLIENT, "get", unavailable)
+    monkeypatch.setattr(ptt_cache.REDIS_SYNC_CLIENT, "set", unavailable)
+    tier = ptt_cache.RedisTier(ttl_seconds=60)
+    monkeypatch.setattr(ptt_cache, "_second_tier", lambda: tier)
+
+    assert ptt_cache.parse_title_cached("Movie.2024.2160p")["title"] == "Movie"
+    assert parse_calls == [("Movie.2024.2160p", False)]
@@ -0,0 +1,71 @@
+import pytest
+
+from utils import lzstring, ptt_cache, ptt_pool
+
+
+@pytest.fixture
+def pool_settings(monkeypatch):
+    monkeypatch.setattr(ptt_cache, "_memory_cache", ptt_cache.ParsedTitleCache(max_entries=100))
+    monkeypatch.setattr(ptt_cache, "_second_tier", lambda: None)
+    monkeypatch.setattr(ptt_pool.settings, "ptt_parse_pool_enabled", True)
+    monkeypatch.setattr(ptt_pool.settings, "ptt_parse_pool_workers", 1)
+    monkeypatch.setattr(ptt_pool.settings, "ptt_parse_pool_chunk_size", 2)
+    monkeypatch.setattr(ptt_pool.settings, "adult_content_filter_in_torrent_title", True)
+    yield monkeypatch
+    ptt_pool.shutdown_parse_pool()
+
+
+@pytest.mark.asyncio
+async def test_small_batches_parse_inline_in_order(pool_settings):
+    pool_settings.setattr(ptt_pool.settings, "ptt_parse_pool_min_batch", 100)
+    pool_settings.setattr(ptt_cache.PTT, "parse_title", lambda title, translate_langs=False: {"title": title})
+    pool_settings.setattr("utils.title_classifier.detect_adult_title", lambda title: title == "b")
+
+    results = await ptt_pool.parse_titles_batch(["a", "b", "a"], check_adult=True)
+
+    assert [result.parsed["title"] for result in results] == ["a", "b", "a"]
+    assert [result.is_adult for result in results] == [False, True, False]
+    assert ptt_pool._pool is None
+
+
+@pytest.mark.asyncio
+async def test_pool_results_are_ordered_and_seed_the_parse_cache(pool_settings):
+    pool_settings.setattr(ptt_pool.settings, "ptt_parse_pool_min_batch", 0)
+    titles = [
+        "The.Matrix.1999.1080p.BluRay.x264",
+        "Breaking.Bad.S01E02.720p.HDTV",
+        "Dune.Part.Two.2024.2160p.WEB-DL",
+        "The.Matrix.1999.1080p.BluRay.x264",
+    ]
+
+    results = await ptt_pool.parse_titles_batch(titles, True)
+
+    assert [result.parsed for result in results] == [ptt_cache.PTT.parse_title(title, True) for title in titles]
+    # Parsed in the pool, then seeded into this process's LRU
+    assert ptt_cache.peek_parsed_title(titles[2], True) is not None
+
+
+@pytest.mark.asyncio
+async def test_failed_parses_come_back_empty(pool_settings):
+    pool_settings.setattr(ptt_pool.settings, "ptt_parse_pool_min_batch", 100)
+
+    def flaky_parse(title, translate_langs=False):
+        if title == "bad":
+            raise ValueError("unparseable")
+        return {"title": title}
+
+    pool_settings.setattr(ptt_cache.PTT, "parse_title", flaky_parse)
+
+    results = await ptt_pool.parse_titles_batch(["ok", "bad"])
+
+    assert [result.parsed for result in results] == [{"title": "ok"}, {}]
+
+
+@pytest.mark.asyncio
+async def test_run_in_parse_pool_runs_other_ingest_work(pool_settings):
+    decoded = await ptt_pool.run_in_parse_pool(
+        lzstring.decompress_from_encoded_uri_component, "N4IgLg9gTlCmB2YDOIBcACA2iADhCANiALoC+QA"
+    )
+
+    assert decoded == '{"torrents": ["pool"]}'
+    assert ptt_pool._pool is not None
@@ -0,0 +1,114 @@
+import pytest
+
+from utils import request_tracker
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+
+        return queue
+
+    async def execute(self):
+        self.redis.executed.append(self.commands)
+        return [None] * len(self.commands)
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.executed = []
+        self.recent_overflow = []
+
+    def pipeline(self, transaction=False):
+        return _FakePipeline(self)
+
+    async def zrange(self, name, start, end):
+        return self.recent_overflow
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = _FakeRedis()
+    monkeypatch.setattr(request_tracker, "REDIS_ASYNC_CLIENT", redis)
+    monkeypatch.setattr(request_tracker.settings, "enable_request_metrics", True)
+    monkeypatch.setattr(request_tracker, "request_metrics_buffer", request_tracker.RequestMetricsBuffer())
+    return redis
+
+
+async def _record(process_time, status_code=200, client_ip="1.2.3.4", path="/stream/movie/tt1.json"):
+    await request_tracker.record_request(
+        method="GET",
+        path=path,
+        route_template="/stream/{type}/{id}.json",
+        status_code=status_code,
+        process_time=process_time,
+        client_ip=client_ip,
+    )
+
+
+def _commands(redis, name, key=None):
+    return [
+        (args, kwargs)
+        for batch in redis.executed
+        for command, args, kwargs in batch
+        if command == name and (key is None or args[0] == key)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_requests_are_buffered_until_flush(fake_redis):
+    await _record(0.2)
+    await _record(0.05, status_code=404, client_ip="5.6.7.8")
+    await _record(0.4, status_code=500)
+    await _record(0.1, path="/health")
+
+    assert fake_redis.executed == []
+    await request_tracker.flush_request_metrics()
+
+    assert len(fake_redis.executed) == 1
+    agg_key = "req_metrics:agg:GET:/stream/{type}/{id}.json"
+    hincrby = {args[1]: args[2] for args, _ in _commands(fake_redis, "hincrby", agg_key)}
+    assert hincrby == {"total_requests": 3, "status_2xx": 1, "status_4xx": 1, "status_5xx": 1, "error_count": 2}
+    ((args, _),) = _commands(fake_redis, "hincrbyfloat", agg_key)
+    assert args[2] == pytest.approx(0.65)
+    ((args, _),) = _commands(fake_redis, "eval")[:1]
+    assert args[2:] == (agg_key, "0.05", "0.4")
+
+    ((args, _),) = _commands(fake_redis, "zadd", "req_metrics:latency:GET:/stream/{type}/{id}.json")
+    assert sorted(float(member.split(":")[0]) for member in args[1]) == [0.05, 0.2, 0.4]
+    ((args, _),) = _commands(fake_redis, "pfadd", "req_metrics:uv:global")
+    assert len(args) == 3
+    assert len(_commands(fake_redis, "hset")) == 1 + 3  # last_seen + one hash per recent request
+
+
+@pytest.mark.asyncio
+async def test_flush_swaps_buffer_and_skips_when_empty(fake_redis):
+    await request_tracker.flush_request_metrics()
+    assert fake_redis.executed == []
+
+    await _record(0.2)
+    await request_tracker.flush_request_metrics()
+    await request_tracker.flush_request_metrics()
+
+    assert len(fake_redis.executed) == 1
+    assert len(request_tracker.request_metrics_buffer) == 0
+
+
+@pytest.mark.asyncio
+async def test_flush_trims_recent_requests_beyond_cap(fake_redis, monkeypatch):
+    monkeypatch.setattr(request_tracker.settings, "request_metrics_max_recent", 1)
+    fake_redis.recent_overflow = [b"old-1", b"old-2"]
+
+    await _record(0.2)
+    await request_tracker.flush_request_metrics()
+
+    assert len(fake_redis.executed) == 2
+    ((args, _),) = _commands(fake_redis, "delete")
+    assert args == ("req_metrics:req:old-1", "req_metrics:req:old-2")
+    ((args, _),) = _commands(fake_redis, "zrem")
+    assert args == ("req_metrics:recent", b"old-1", b"old-2")
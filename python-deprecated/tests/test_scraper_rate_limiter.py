@@ -0,0 +1,75 @@
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+
+from utils import rate_limiter
+from utils.rate_limiter import LocalRateLimiter
+from workers.scrapers.base_scraper import BaseScraper
+
+
+def test_local_limiter_allows_burst_then_spaces_calls():
+    limiter = LocalRateLimiter(calls=4, period=0.4)
+
+    waits = [limiter.reserve() for _ in range(6)]
+
+    assert waits[:4] == [0.0, 0.0, 0.0, 0.0]
+    assert waits[4] == pytest.approx(0.1, abs=0.01)
+    assert waits[5] == pytest.approx(0.2, abs=0.01)
+
+
+@pytest.mark.asyncio
+async def test_local_limiter_waits_without_blocking_event_loop():
+    limiter = LocalRateLimiter(calls=1, period=0.1)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticker_task = asyncio.create_task(ticker())
+    start = time.monotonic()
+    await asyncio.gather(*(limiter.acquire() for _ in range(3)))
+    elapsed = time.monotonic() - start
+    ticker_task.cancel()
+
+    assert elapsed == pytest.approx(0.2, abs=0.08)
+    assert ticks >= 10
+
+
+class _DummyScraper(BaseScraper):
+    def __init__(self):
+        super().__init__(cache_key_prefix="dummy_rate_limited", logger_name=__name__)
+
+    async def _scrape_and_parse(self, *args, **kwargs):
+        return []
+
+    @BaseScraper.rate_limit(calls=2, period=timedelta(seconds=0.2))
+    async def fetch(self, value):
+        return value
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_decorator_records_wait_metrics(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "_limiters", {})
+    scraper = _DummyScraper()
+
+    results = await asyncio.gather(*(scraper.fetch(i) for i in range(3)))
+
+    assert results == [0, 1, 2]
+    summary = scraper.metrics.get_rate_limit_summary()
+    assert summary["acquires"] == 3
+    assert summary["waits"] == 1
+    assert summary["max_wait_seconds"] == pytest.approx(0.1, abs=0.02)
+    assert scraper.metrics.get_summary()["rate_limit"] == summary
+
+
+def test_redis_limiters_keep_separate_state_per_budget():
+    one_per_second = rate_limiter.RedisRateLimiter("indexer", calls=1, period=1.0)
+    ten_per_minute = rate_limiter.RedisRateLimiter("indexer", calls=10, period=60)
+
+    assert one_per_second.key == "rate_limit:scraper:indexer:1:1"
+    assert ten_per_minute.key == "rate_limit:scraper:indexer:10:60"
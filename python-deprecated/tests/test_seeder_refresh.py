@@ -0,0 +1,180 @@
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from workers.scrapers import trackers
+
+TORRENTS = [
+    (1, "a" * 40, ["udp://one:1337/announce", "udp://two:6969/announce"]),
+    (2, "b" * 40, ["udp://one:1337/announce"]),
+    (3, "c" * 40, []),
+]
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.cursor_history = []
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value):
+        self.cursor_history.append(value)
+        self.store[key] = str(value).encode()
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+
+class _FakeSession:
+    async def commit(self):
+        return None
+
+
+@asynccontextmanager
+async def _fake_session():
+    yield _FakeSession()
+
+
+@pytest.fixture(autouse=True)
+def fake_lock(monkeypatch):
+    state = {"held": False, "acquired": 0}
+
+    async def acquire(key, timeout=60, block=False):
+        assert key == trackers.SEEDER_REFRESH_LOCK_KEY and not block
+        if state["held"]:
+            return False, None
+        state["held"] = True
+        state["acquired"] += 1
+        return True, key
+
+    async def release(lock):
+        state["held"] = False
+
+    monkeypatch.setattr(trackers, "acquire_redis_lock", acquire)
+    monkeypatch.setattr(trackers, "release_redis_lock", release)
+    return state
+
+
+def test_group_info_hashes_by_tracker_falls_back_to_default_trackers(monkeypatch):
+    monkeypatch.setattr(trackers, "TRACKERS", ["udp://default:80/announce"])
+
+    grouped = trackers.group_info_hashes_by_tracker(TORRENTS)
+
+    assert grouped == {
+        "udp://one:1337/announce": ["a" * 40, "b" * 40],
+        "udp://two:6969/announce": ["a" * 40],
+        "udp://default:80/announce": ["c" * 40],
+    }
+
+
+@pytest.mark.asyncio
+async def test_refresh_pages_by_id_and_bulk_updates_each_page(monkeypatch):
+    redis = _FakeRedis()
+    scraped_trackers = []
+    pages = []
+    updates = []
+
+    async def fake_get_torrents(_session, after_id, limit, _stale_before):
+        pages.append(after_id)
+        return [torrent for torrent in TORRENTS if torrent[0] > after_id][:limit]
+
+    async def fake_bulk_update(_session, seeders_by_id):
+        updates.append(seeders_by_id)
+        return len(seeders_by_id)
+
+    async def fake_scrape(info_hashes, tracker_list, timeout):
+        scraped_trackers.append(tuple(tracker_list))
+        return {info_hash.upper(): [{"seeders": len(info_hash) + len(tracker_list)}] for info_hash in info_hashes}
+
+    async def fail_resend(**_kwargs):
+        raise AssertionError("refresh should finish within one run")
+
+    monkeypatch.setattr(trackers, "REDIS_ASYNC_CLIENT", redis)
+    monkeypatch.setattr(trackers, "TRACKERS", ["udp://default:80/announce"])
+    monkeypatch.setattr(trackers, "get_background_session", _fake_session)
+    monkeypatch.setattr(trackers, "scrape_info_hashes", fake_scrape)
+    monkeypatch.setattr(trackers.crud, "get_torrents_for_seeder_refresh", fake_get_torrents)
+    monkeypatch.setattr(trackers.crud, "bulk_update_torrent_seeders", fake_bulk_update)
+    monkeypatch.setattr(trackers.update_torrent_seeders, "async_send_with_options", fail_resend)
+
+    await trackers.update_torrent_seeders.fn(batch_size=2)
+
+    assert pages == [0, 2, 3]
+    assert updates == [{1: 41, 2: 41}, {3: 41}]
+    assert sorted(scraped_trackers) == [
+        ("udp://default:80/announce",),
+        ("udp://one:1337/announce",),
+        ("udp://two:6969/announce",),
+    ]
+    assert redis.cursor_history == [2, 3]
+    assert trackers.SEEDER_REFRESH_CURSOR_KEY not in redis.store
+
+
+@pytest.mark.asyncio
+async def test_refresh_resumes_from_stored_cursor(monkeypatch):
+    redis = _FakeRedis()
+    redis.store[trackers.SEEDER_REFRESH_CURSOR_KEY] = b"2"
+    pages = []
+
+    async def fake_get_torrents(_session, after_id, limit, _stale_before):
+        pages.append(after_id)
+        return []
+
+    monkeypatch.setattr(trackers, "REDIS_ASYNC_CLIENT", redis)
+    monkeypatch.setattr(trackers.crud, "get_torrents_for_seeder_refresh", fake_get_torrents)
+    monkeypatch.setattr(trackers, "get_background_session", _fake_session)
+
+    await trackers.update_torrent_seeders.fn()
+
+    assert pages == [2]
+
+
+@pytest.mark.asyncio
+async def test_refresh_is_skipped_while_another_run_holds_the_lock(monkeypatch, fake_lock):
+    async def fail_get_torrents(*_args):
+        raise AssertionError("a skipped run must not touch the cursor")
+
+    monkeypatch.setattr(trackers.crud, "get_torrents_for_seeder_refresh", fail_get_torrents)
+    fake_lock["held"] = True
+
+    await trackers.update_torrent_seeders.fn()
+
+    assert fake_lock["acquired"] == 0
+
+
+@pytest.mark.asyncio
+async def test_unfinished_refresh_releases_the_lock_before_requeueing(monkeypatch, fake_lock):
+    redis = _FakeRedis()
+    resent = []
+    clock = [0.0]
+
+    async def fake_get_torrents(_session, after_id, limit, _stale_before):
+        return [torrent for torrent in TORRENTS if torrent[0] > after_id][:limit]
+
+    async def fake_bulk_update(_session, seeders_by_id):
+        # Past the deadline after the first page
+        clock[0] += trackers.SEEDER_REFRESH_RUN_SECONDS
+        return len(seeders_by_id)
+
+    async def fake_scrape(info_hashes, tracker_list, timeout):
+        return {}
+
+    async def resend(**kwargs):
+        resent.append((kwargs, fake_lock["held"]))
+
+    monkeypatch.setattr(trackers, "REDIS_ASYNC_CLIENT", redis)
+    monkeypatch.setattr(trackers, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+    monkeypatch.setattr(trackers, "get_background_session", _fake_session)
+    monkeypatch.setattr(trackers, "scrape_info_hashes", fake_scrape)
+    monkeypatch.setattr(trackers.crud, "get_torrents_for_seeder_refresh", fake_get_torrents)
+    monkeypatch.setattr(trackers.crud, "bulk_update_torrent_seeders", fake_bulk_update)
+    monkeypatch.setattr(trackers.update_torrent_seeders, "async_send_with_options", resend)
+
+    await trackers.update_torrent_seeders.fn(batch_size=2)
+
+    assert resent == [({"kwargs": {"batch_size": 2}, "delay": 60000}, False)]
+    assert redis.cursor_history == [2]
@@ -0,0 +1,140 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from scrapy.statscollectors import MemoryStatsCollector
+
+from workers.scrapy.pipelines import store_pipelines
+from workers.scrapy.pipelines.store_pipelines import MovieStorePipeline, QueueBasedPipeline
+
+
+class _FakeSession:
+    def __init__(self):
+        self.commits = 0
+        self.rolled_back_savepoints = 0
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        try:
+            yield
+        except Exception:
+            self.rolled_back_savepoints += 1
+            raise
+
+    async def commit(self):
+        self.commits += 1
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.members = []
+
+    async def sadd(self, key, value):
+        self.members.append((key, value))
+
+
+def _movie_item(info_hash: str, imdb_id: str | None = "tt1", title: str = "Movie") -> dict:
+    return {
+        "type": "movie",
+        "title": title,
+        "year": 2024,
+        "imdb_id": imdb_id,
+        "info_hash": info_hash,
+        "torrent_name": f"{title}.{info_hash}",
+        "scraped_info_hash_key": "movie_hashes",
+    }
+
+
+@pytest.fixture
+def batch_env(monkeypatch):
+    session = _FakeSession()
+    store_calls = []
+    media_lookups = []
+
+    @asynccontextmanager
+    async def session_context():
+        yield session
+
+    async def get_or_create_media(self, session, item):
+        media_lookups.append(item["title"])
+        if item["title"] == "Broken":
+            return None
+        return SimpleNamespace(id=len(media_lookups))
+
+    async def store(session, streams, *, deferred_cache_invalidation=None):
+        store_calls.append([stream["id"] for stream in streams])
+        if any(stream["id"] == "bad" for stream in streams):
+            raise RuntimeError("constraint violation")
+        return len(streams)
+
+    monkeypatch.setattr(store_pipelines, "get_async_session_context", session_context)
+    monkeypatch.setattr(store_pipelines.crud, "store_new_torrent_streams", store)
+    monkeypatch.setattr(MovieStorePipeline, "_get_or_create_media", get_or_create_media)
+    return SimpleNamespace(session=session, store_calls=store_calls, media_lookups=media_lookups)
+
+
+@pytest.mark.asyncio
+async def test_batch_shares_media_lookup_store_and_commit(batch_env):
+    pipeline = MovieStorePipeline()
+    pipeline.redis = _FakeRedis()
+
+    failed = await pipeline.process_batch(
+        [
+            _movie_item("a"),
+            _movie_item("b"),
+            _movie_item("c", imdb_id=None, title="Broken"),
+            {**_movie_item("d"), "type": "series"},
+        ]
+    )
+
+    assert failed == 1
+    assert batch_env.media_lookups == ["Movie", "Broken"]
+    assert batch_env.store_calls == [["a", "b"]]
+    assert batch_env.session.commits == 1
+    assert batch_env.session.rolled_back_savepoints == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_store_falls_back_to_single_items(batch_env):
+    pipeline = MovieStorePipeline()
+    pipeline.redis = _FakeRedis()
+
+    failed = await pipeline.process_batch([_movie_item("a"), _movie_item("bad"), _movie_item("c")])
+
+    assert failed == 1
+    assert batch_env.store_calls == [["a", "bad", "c"], ["a"], ["bad"], ["c"]]
+    assert batch_env.session.commits == 1
+
+
+class _RecordingPipeline(QueueBasedPipeline):
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    async def process_batch(self, items):
+        self.batches.append(list(items))
+        return sum(item == "fail" for item in items)
+
+
+@pytest.mark.asyncio
+async def test_queue_is_drained_in_bounded_batches_with_stats():
+    crawler = SimpleNamespace(spider=None, settings=SimpleNamespace(getbool=lambda *args: False))
+    pipeline = _RecordingPipeline()
+    pipeline.batch_size = 3
+    pipeline.batch_max_wait = 0.05
+    pipeline.stats = MemoryStatsCollector(crawler)
+
+    for item in ["a", "b", "c", "d", "fail"]:
+        await pipeline.queue.put(item)
+    await pipeline.init()
+    await asyncio.wait_for(pipeline.queue.join(), timeout=1)
+    pipeline.processing_task.cancel()
+
+    assert pipeline.batches == [["a", "b", "c"], ["d", "fail"]]
+    stats = pipeline.stats.get_stats()
+    assert stats["store_pipeline/_RecordingPipeline/batches"] == 2
+    assert stats["store_pipeline/_RecordingPipeline/items"] == 5
+    assert stats["store_pipeline/_RecordingPipeline/items_failed"] == 1
+    assert stats["store_pipeline/_RecordingPipeline/max_batch_size"] == 3
+    assert stats["store_pipeline/_RecordingPipeline/peak_items_per_second"] > 0
@@ -0,0 +1,104 @@
+from types import SimpleNamespace
+
+import pytest
+
+from db.crud import scraper_helpers, stream_bulk_ingest
+from db.crud.scraper_helpers import _torrent_columns, _torrent_file_rows, _torrent_stream_columns
+from db.crud.stream_bulk_ingest import PreparedTorrentStream
+from db.enums import MediaType, TorrentType
+from db.models import FileType
+
+
+def test_file_rows_link_episodes_and_keep_indexes_unique() -> None:
+    rows = _torrent_file_rows(
+        [
+            {"filename": "Show.S01E01.mkv", "file_index": 0, "season_number": 1, "episode_number": 1},
+            "not-a-file",
+            {"filename": "Show.S01E02.mkv", "file_index": 0, "episode_number": 2, "file_type": "bogus"},
+            {"filename": "Extras.mkv", "size": 10},
+        ]
+    )
+
+    assert [row["file_index"] for row in rows] == [0, 1, 3]
+    assert [(row["season_number"], row["episode_number"]) for row in rows] == [(1, 1), (1, 2), (None, None)]
+    assert rows[1]["file_type"] is FileType.VIDEO
+
+
+def test_staged_records_follow_the_stage_columns() -> None:
+    stream_data = {"torrent_name": "Movie.2024.1080p", "size": 5, "torrent_type": "private", "files": []}
+    prepared = PreparedTorrentStream(
+        info_hash="a" * 40,
+        media_id=7,
+        stream=_torrent_stream_columns(stream_data),
+        torrent=_torrent_columns(stream_data),
+        files=_torrent_file_rows([{"filename": "Movie.mkv", "file_type": "video"}]),
+        language_ids=[3, 3, 4],
+    )
+
+    stream_records, file_records, reference_records = stream_bulk_ingest._staged_records([prepared])
+
+    staged = dict(zip(stream_bulk_ingest._STREAM_STAGE_COLUMNS, stream_records[0], strict=True))
+    assert staged["media_id"] == 7
+    assert staged["name"] == "Movie.2024.1080p"
+    # Enum columns are staged with the PostgreSQL labels (member names)
+    assert staged["torrent_type"] == TorrentType.PRIVATE.name
+    assert staged["file_count"] == 1
+    assert file_records == [(0, 0, "Movie.mkv", None, 0, "VIDEO", None, None, None)]
+    assert reference_records == [(0, "language_ids", 3), (0, "language_ids", 4)]
+
+
+class _FakeSession:
+    def __init__(self):
+        self.statements = []
+
+    async def exec(self, statement):
+        self.statements.append(statement)
+
+    async def flush(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_large_batches_take_the_bulk_path_and_count_only_stored_streams(monkeypatch) -> None:
+    media = SimpleNamespace(id=11, type=MediaType.MOVIE)
+    streams = [{"info_hash": f"{i:040x}", "meta_id": "tt1", "torrent_name": f"Movie.{i}"} for i in range(3)]
+    calls = []
+
+    async def no_existing(session, info_hashes):
+        return {}
+
+    async def resolve(session, external_ids):
+        return {"tt1": media}
+
+    async def no_references(session, model_class, names, cache_prefix):
+        return {}
+
+    async def bulk_insert(session, prepared):
+        calls.append(("bulk", len(prepared)))
+        # A concurrent writer stored the last info hash first
+        return {row.info_hash for row in prepared[:2]}
+
+    async def orm_insert(session, prepared):
+        calls.append(("orm", len(prepared)))
+        return {row.info_hash for row in prepared}
+
+    monkeypatch.setattr(scraper_helpers, "_batch_get_existing_streams", no_existing)
+    monkeypatch.setattr(scraper_helpers, "_batch_resolve_external_ids", resolve)
+    monkeypatch.setattr(scraper_helpers, "_batch_get_or_create_reference_data", no_references)
+    monkeypatch.setattr(scraper_helpers, "bulk_insert_torrent_streams", bulk_insert)
+    monkeypatch.setattr(scraper_helpers, "_orm_insert_torrent_streams", orm_insert)
+    monkeypatch.setattr(scraper_helpers.settings, "stream_bulk_insert_enabled", True)
+    monkeypatch.setattr(scraper_helpers.settings, "stream_bulk_insert_min_batch", 3)
+    session = _FakeSession()
+    invalidate: set[int] = set()
+
+    stored = await scraper_helpers.store_new_torrent_streams(session, streams, deferred_cache_invalidation=invalidate)
+
+    assert calls == [("bulk", 3)]
+    assert stored == 2
+    assert invalidate == {11}
+    # One counter update for the media, carrying the two stored streams
+    assert session.statements[-1].compile().params["total_streams_1"] == 2
+
+    await scraper_helpers.store_new_torrent_streams(session, streams[:2], deferred_cache_invalidation=invalidate)
+    assert calls[-1] == ("orm", 2)
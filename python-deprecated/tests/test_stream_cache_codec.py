@@ -0,0 +1,54 @@
+import pytest
+
+from db.crud import stream_services
+from utils import stream_cache_codec
+from utils.stream_cache_codec import CODEC_MAGIC, LEGACY_ZLIB_MAGIC, PlainCodec, ZlibCodec
+
+PAYLOAD = {"torrents": [{"info_hash": "a" * 40, "name": "Movie.2024.1080p.WEB-DL-GRP", "size": 1}], "usenet": []}
+
+
+def test_default_codec_keeps_writing_legacy_zlib_blobs():
+    blob, size = stream_cache_codec.encode_payload(PAYLOAD, ZlibCodec(), "json")
+
+    assert blob.startswith(LEGACY_ZLIB_MAGIC)
+    assert stream_services._decode_stream_cache_blob_with_size(blob) == (PAYLOAD, size)
+
+
+def test_plain_json_is_readable_as_legacy_blob():
+    blob, _ = stream_cache_codec.encode_payload(PAYLOAD, PlainCodec(), "json")
+
+    assert stream_services._decode_stream_cache_blob(blob) == PAYLOAD
+
+
+@pytest.mark.parametrize("module, codec_name", [("lz4.frame", "lz4"), ("zstandard", "zstd")])
+def test_registry_codecs_round_trip_through_stream_decoder(module, codec_name):
+    pytest.importorskip(module)
+    codec = stream_cache_codec._codec_by_name(codec_name)
+
+    blob, size = stream_cache_codec.encode_payload(PAYLOAD, codec, "json")
+
+    assert blob.startswith(CODEC_MAGIC)
+    assert stream_services._decode_stream_cache_blob_with_size(blob) == (PAYLOAD, size)
+
+
+def test_zstd_dictionary_mismatch_reads_as_unreadable():
+    zstandard = pytest.importorskip("zstandard")
+    samples = [
+        stream_cache_codec.dumps_payload(
+            {"torrents": [{"info_hash": f"{n:040x}", "name": f"Show.S01E{n}.1080p"}]}, "json"
+        )
+        for n in range(2000)
+    ]
+    dictionary = zstandard.train_dictionary(1024, samples)
+    blob, _ = stream_cache_codec.encode_payload(PAYLOAD, stream_cache_codec.ZstdCodec(3, dictionary), "json")
+
+    assert stream_services._decode_stream_cache_blob(blob) is None
+
+
+def test_msgpack_serializer_round_trip():
+    pytest.importorskip("msgpack")
+
+    blob, _ = stream_cache_codec.encode_payload(PAYLOAD, ZlibCodec(), "msgpack")
+
+    assert blob.startswith(CODEC_MAGIC)
+    assert stream_services._decode_stream_cache_blob(blob) == PAYLOAD
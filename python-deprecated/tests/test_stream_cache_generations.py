@@ -0,0 +1,278 @@
+import asyncio
+
+import pytest
+
+from db.crud import stream_cache, stream_services
+from utils import swr_cache
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.ops.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        return [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.ops]
+
+
+class _FakeRedis:
+    """Emulates the Redis calls of the stream cache, with the generation bump script by identity."""
+
+    def __init__(self):
+        self.store = {}
+        self.fail_reads = False
+        self.versioned_reads = 0
+
+    async def eval(self, script, numkeys, *keys_and_args):
+        keys = keys_and_args[:numkeys]
+        if script == stream_cache._BUMP_GENERATION_SCRIPT:
+            generation = int(self.store.get(keys[0], 0)) + 1
+            self.store[keys[0]] = str(generation).encode()
+            return generation
+        raise AssertionError("unexpected script")
+
+    def pipeline(self, transaction=False):
+        return _FakePipeline(self)
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    async def mget(self, keys):
+        # Same signature as RedisWrapper.mget: one list of keys
+        if self.fail_reads and any(key.startswith(stream_cache.STREAM_CACHE_GENERATION_PREFIX) for key in keys):
+            # The wrapper answers [] when Redis is unavailable
+            return []
+        if keys and all(key.startswith(stream_cache.STREAM_CACHE_PREFIX) for key in keys):
+            self.versioned_reads += 1
+        return [self.store.get(key) for key in keys]
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = _FakeRedis()
+    monkeypatch.setattr(stream_cache, "REDIS_ASYNC_CLIENT", redis)
+    monkeypatch.setattr(stream_services, "REDIS_ASYNC_CLIENT", redis)
+    monkeypatch.setattr(swr_cache, "REDIS_ASYNC_CLIENT", redis)
+    monkeypatch.setattr(stream_services.settings, "stream_raw_redis_cache_enabled", True)
+    monkeypatch.setattr(stream_services.settings, "stream_l1_cache_enabled", True)
+    stream_cache.stream_l1_cache.clear()
+    yield redis
+    stream_cache.stream_l1_cache.clear()
+
+
+@pytest.fixture
+def db_fetches(monkeypatch):
+    fetches = []
+
+    async def fake_movie_batch(media_ids, visibility_filter):
+        fetches.append(("movie", list(media_ids)))
+        return {media_id: {"streams": [f"movie-{media_id}-{len(fetches)}"]} for media_id in media_ids}
+
+    async def fake_series_batch(media_ids, season, episode, visibility_filter):
+        fetches.append(("series", list(media_ids)))
+        return {media_id: {"streams": [f"series-{media_id}-{len(fetches)}"]} for media_id in media_ids}
+
+    monkeypatch.setattr(stream_services, "_fetch_movie_raw_streams_batch", fake_movie_batch)
+    monkeypatch.setattr(stream_services, "_fetch_series_raw_streams_batch", fake_series_batch)
+    return fetches
+
+
+@pytest.mark.asyncio
+async def test_invalidation_bumps_generation_for_every_scope(fake_redis, db_fetches):
+    await stream_services._get_cached_movie_streams_bulk([1, 2], None)
+    await stream_services._get_cached_movie_streams_bulk([1], None, user_id=7)
+    await stream_services._get_cached_series_streams_bulk([1], 1, 2, None)
+    assert "stream_data:movie:1:public:g0" in fake_redis.store
+
+    cached = await stream_services._get_cached_movie_streams_bulk([1, 2], None)
+    assert cached == [{"streams": ["movie-1-1"]}, {"streams": ["movie-2-1"]}]
+    assert len(db_fetches) == 3
+
+    await stream_cache.invalidate_media_stream_cache(1)
+
+    public = await stream_services._get_cached_movie_streams_bulk([1, 2], None)
+    user = await stream_services._get_cached_movie_streams_bulk([1], None, user_id=7)
+    series = await stream_services._get_cached_series_streams_bulk([1], 1, 2, None)
+
+    assert public == [{"streams": ["movie-1-4"]}, {"streams": ["movie-2-1"]}]
+    assert user == [{"streams": ["movie-1-5"]}]
+    assert series == [{"streams": ["series-1-6"]}]
+    assert db_fetches[3:] == [("movie", [1]), ("movie", [1]), ("series", [1])]
+    assert "stream_data:movie:1:public:g1" in fake_redis.store
+
+
+@pytest.mark.asyncio
+async def test_unreadable_generation_skips_cache_store(fake_redis, db_fetches):
+    fake_redis.fail_reads = True
+
+    rows = await stream_services._get_cached_movie_streams_bulk([5], None)
+
+    assert rows == [{"streams": ["movie-5-1"]}]
+    assert not any(key.startswith("stream_data:") for key in fake_redis.store)
+
+
+@pytest.mark.asyncio
+async def test_l1_serves_payload_while_generation_is_current(fake_redis, db_fetches):
+    first = await stream_services._get_cached_movie_streams_bulk([1], None)
+    fake_redis.store["stream_data:movie:1:public:g0"] = b"not-a-payload"
+
+    second = await stream_services._get_cached_movie_streams_bulk([1], None)
+
+    assert second == first == [{"streams": ["movie-1-1"]}]
+    assert len(db_fetches) == 1
+    # The L1 hit only reads the generation, not the payload
+    assert fake_redis.versioned_reads == 1
+
+
+@pytest.mark.asyncio
+async def test_l1_entry_is_dropped_after_invalidation_elsewhere(fake_redis, db_fetches):
+    await stream_services._get_cached_series_streams_bulk([3], 1, 1, None)
+    # Another worker invalidates and refills the cache at the next generation
+    fake_redis.store["stream_gen:3"] = b"1"
+    fake_redis.store["stream_data:series:3:1:1:public:g1"] = stream_services._encode_stream_cache_blob(
+        {"streams": ["refilled"]}
+    )
+
+    rows = await stream_services._get_cached_series_streams_bulk([3], 1, 1, None)
+
+    assert rows == [{"streams": ["refilled"]}]
+    assert len(db_fetches) == 1
+    assert stream_cache.stream_l1_cache.get("stream_data:series:3:1:1:public") == ("1", {"streams": ["refilled"]})
+
+
+@pytest.mark.asyncio
+async def test_admin_clear_of_payload_keys_drops_l1_entries(fake_redis, db_fetches):
+    await stream_services._get_cached_movie_streams_bulk([4], None)
+    cleared = [key for key in fake_redis.store if key.startswith(stream_cache.STREAM_CACHE_PREFIX)]
+    await fake_redis.delete(*cleared)
+
+    await stream_cache.invalidate_cleared_stream_cache_keys([*cleared, "catalog:movie:1"])
+    rows = await stream_services._get_cached_movie_streams_bulk([4], None)
+
+    assert rows == [{"streams": ["movie-4-2"]}]
+    assert len(db_fetches) == 2
+
+
+def test_stream_cache_media_id_parses_payload_and_generation_keys():
+    assert stream_cache.stream_cache_media_id("stream_data:movie:12:public:g3") == 12
+    assert stream_cache.stream_cache_media_id("stream_data:series:7:1:2:user:5:g0") == 7
+    assert stream_cache.stream_cache_media_id("stream_gen:9") == 9
+    assert stream_cache.stream_cache_media_id("stream_fill:stream_data:movie:12:public:g3") is None
+    assert stream_cache.stream_cache_media_id("stream_data:movie:abc") is None
+
+
+def test_l1_evicts_least_recent_entries_over_byte_budget():
+    cache = stream_cache.StreamL1Cache(max_entries=10, max_bytes=100, ttl_seconds=60)
+    cache.put("a", "0", {"a": 1}, 60)
+    cache.put("b", "0", {"b": 1}, 30)
+    cache.get("a")
+    cache.put("c", "0", {"c": 1}, 30)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == ("0", {"a": 1})
+    assert cache.total_bytes == 90
+
+
+@pytest.mark.asyncio
+async def test_media_ids_l1_returns_independent_id_lists(fake_redis):
+    media = stream_services._CachedMedia(id=4, title="T", original_title=None, year=2020, release_date=None)
+    await stream_services._media_ids_redis_set("tt4", stream_services.MediaType.MOVIE, media, [4, 5])
+
+    media_a, related_a = await stream_services._media_ids_redis_get("tt4", stream_services.MediaType.MOVIE)
+    related_a.insert(0, 9)
+    fake_redis.store.clear()
+    media_b, related_b = await stream_services._media_ids_redis_get("tt4", stream_services.MediaType.MOVIE)
+
+    assert media_b.id == media_a.id == 4
+    assert related_b == [4, 5]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_db_fetch(fake_redis, monkeypatch):
+    fetches = []
+    release = asyncio.Event()
+
+    async def slow_series_batch(media_ids, season, episode, visibility_filter):
+        fetches.append(list(media_ids))
+        await release.wait()
+        return {media_id: {"streams": [f"series-{media_id}"]} for media_id in media_ids}
+
+    monkeypatch.setattr(stream_services, "_fetch_series_raw_streams_batch", slow_series_batch)
+
+    requests = [asyncio.create_task(stream_services._get_cached_series_streams_bulk([8], 1, 1, None)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*requests)
+
+    assert fetches == [[8]]
+    assert results == [[{"streams": ["series-8"]}]] * 5
+    assert not stream_cache.inflight_stream_fills
+    assert not any(key.startswith(stream_cache.STREAM_CACHE_FILL_LEASE_PREFIX) for key in fake_redis.store)
+
+
+@pytest.mark.asyncio
+async def test_contended_lease_waits_for_the_other_workers_fill(fake_redis, db_fetches):
+    cache_key = "stream_data:movie:6:public:g0"
+    fake_redis.store[f"{stream_cache.STREAM_CACHE_FILL_LEASE_PREFIX}{cache_key}"] = b"1"
+
+    async def other_worker_fill():
+        await asyncio.sleep(0.03)
+        fake_redis.store[cache_key] = stream_services._encode_stream_cache_blob({"streams": ["remote"]})
+
+    filler = asyncio.create_task(other_worker_fill())
+    rows = await stream_services._get_cached_movie_streams_bulk([6], None)
+    await filler
+
+    assert rows == [{"streams": ["remote"]}]
+    assert db_fetches == []
+
+
+@pytest.mark.asyncio
+async def test_abandoned_lease_falls_back_to_own_fetch(fake_redis, db_fetches):
+    cache_key = "stream_data:movie:6:public:g0"
+    lease_key = f"{stream_cache.STREAM_CACHE_FILL_LEASE_PREFIX}{cache_key}"
+    fake_redis.store[lease_key] = b"1"
+
+    async def other_worker_gives_up():
+        await asyncio.sleep(0.03)
+        del fake_redis.store[lease_key]
+
+    giver = asyncio.create_task(other_worker_gives_up())
+    rows = await stream_services._get_cached_movie_streams_bulk([6], None)
+    await giver
+
+    assert rows == [{"streams": ["movie-6-1"]}]
+    assert db_fetches == [("movie", [6])]
+
+
+@pytest.mark.asyncio
+async def test_soft_expired_payload_is_served_and_refreshed(fake_redis, db_fetches, monkeypatch):
+    monkeypatch.setattr(stream_services.settings, "stream_l1_cache_enabled", False)
+    fake_redis.store["stream_data:movie:2:public:g0"] = swr_cache.wrap_with_soft_expiry(
+        stream_services._encode_stream_cache_blob({"streams": ["old"]}), -1
+    )
+
+    rows = await stream_services._get_cached_movie_streams_bulk([2], None)
+    await asyncio.gather(*swr_cache._refresh_tasks)
+    refreshed = await stream_services._get_cached_movie_streams_bulk([2], None)
+
+    assert rows == [{"streams": ["old"]}]
+    assert refreshed == [{"streams": ["movie-2-1"]}]
+    assert db_fetches == [("movie", [2])]
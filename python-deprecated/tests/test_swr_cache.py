@@ -0,0 +1,75 @@
+import asyncio
+import time
+
+import pytest
+
+from utils import swr_cache
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = _FakeRedis()
+    monkeypatch.setattr(swr_cache, "REDIS_ASYNC_CLIENT", redis)
+    return redis
+
+
+def test_soft_expiry_header_round_trip():
+    blob = swr_cache.wrap_with_soft_expiry('{"metas": []}', 60)
+
+    payload, soft_expires_at = swr_cache.split_soft_expiry(blob)
+
+    assert payload == b'{"metas": []}'
+    assert soft_expires_at == pytest.approx(time.time() + 60, abs=5)
+    assert not swr_cache.is_stale(soft_expires_at)
+    assert swr_cache.is_stale(swr_cache.soft_expiry_of(swr_cache.wrap_with_soft_expiry(b"{}", -1)))
+
+
+def test_values_without_header_are_fresh():
+    assert swr_cache.split_soft_expiry(b'{"meta": {}}') == (b'{"meta": {}}', None)
+    assert not swr_cache.is_stale(swr_cache.soft_expiry_of(b"{}"))
+
+
+@pytest.mark.asyncio
+async def test_stale_hits_trigger_one_refresh(fake_redis):
+    refreshes = []
+
+    async def refresh():
+        refreshes.append(1)
+        await asyncio.sleep(0.01)
+
+    for _ in range(3):
+        swr_cache.schedule_stale_refresh("meta", "meta:movie:tt1", refresh)
+    await asyncio.gather(*swr_cache._refresh_tasks)
+    # The lease taken by the first refresh keeps other workers (and late readers) out
+    swr_cache.schedule_stale_refresh("meta", "meta:movie:tt1", refresh)
+    await asyncio.gather(*swr_cache._refresh_tasks)
+
+    assert refreshes == [1]
+    assert f"{swr_cache.STALE_REFRESH_LEASE_PREFIX}meta:movie:tt1" in fake_redis.store
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_releases_lease(fake_redis):
+    async def refresh():
+        raise RuntimeError("db down")
+
+    swr_cache.schedule_stale_refresh("catalog", "catalog:movie:top", refresh)
+    await asyncio.gather(*swr_cache._refresh_tasks)
+
+    assert not fake_redis.store
+    assert not swr_cache._refreshing_keys
@@ -0,0 +1,97 @@
+import pytest
+
+from db.schemas.config import StreamTemplate
+from utils.prometheus_metrics import TEMPLATE_CACHE_EVICTIONS_TOTAL, TEMPLATE_CACHE_HITS_TOTAL
+from utils.template_engine import TemplateCache, compile_template
+
+STOCK_TEMPLATES = [StreamTemplate().title, StreamTemplate().description]
+
+CONDITION_TEMPLATES = [
+    "{if stream.size > 0}big{else}empty{/if}",
+    "{if stream.size >= 1000 and stream.seeders < 10}a{elif stream.seeders > 5}b{else}c{/if}",
+    "{if stream.type = torrent or stream.type = usenet}p2p{/if}",
+    "{if not stream.cached}slow{/if}{if NOT stream.cached}x{/if}",
+    "{if stream.name ~ 1080}hd{/if}{if stream.name $ the}start{/if}{if stream.name ^ mkv}mkv{/if}",
+    "{if stream.resolution != 4k}sd{/if}{if stream.quality = 'WEB-DL'}web{/if}",
+    "{if stream.folderSize > stream.size}pack{/if}{if stream.missing.deep > 1}m{/if}",
+    "{if stream.cached = true}yes{/if}{if stream.seeders = 1.5}f{/if}{if stream.size > abc}bad{/if}",
+    "{if addon}has-addon{/if}{if stream}{/if}{if torrent}literal{/if}{if 0}zero{/if}{if 1.2.3}x{/if}",
+    "{if stream.__class__}blocked{/if}{stream._private}{stream.__dict__.x}",
+    "{stream.languages|join(' + ')} {stream.size|bytes} {stream.name|upper|truncate(5)} {stream.hdr_formats|first}",
+    "{stream.cached} {stream.languages} {stream.name|unknown|lower} {service.shortName|replace('R', 'r')}",
+    "line one\n{if stream.cached}\n{/if}\n   \nline {stream.seeders}",
+    "{if stream.seeders}{if stream.size > 0}{stream.seeders}/{stream.size|bytes}{else}none{/if}{/if}",
+    "{if stream.type = torrent and not service.cached or stream.seeders > 100}mixed{/if}",
+]
+
+STREAM_CONTEXTS = [
+    {
+        "name": "The.Movie.2024.1080p.WEB-DL.mkv",
+        "type": "torrent",
+        "resolution": "1080p",
+        "quality": "WEB-DL",
+        "size": 4_500_000_000,
+        "folderSize": 9_000_000_000,
+        "seeders": 42,
+        "cached": True,
+        "languages": ["English", "Hindi"],
+        "hdr_formats": ["HDR10", "DV"],
+        "audio_formats": ["DDP"],
+        "channels": ["5.1"],
+        "codec": "x265",
+        "source": "Torrentio",
+        "uploader": "someone",
+    },
+    {"name": "clip", "type": "usenet", "size": 0, "seeders": None, "cached": False, "languages": []},
+    {"type": "http", "size": "123", "seeders": "1.5", "folderSize": "abc", "resolution": "4k"},
+    {},
+]
+
+
+def _contexts():
+    for stream in STREAM_CONTEXTS:
+        yield {
+            "stream": stream,
+            "service": {"shortName": "RD", "cached": stream.get("cached")},
+            "addon": {"name": "MF"},
+        }
+    yield {"stream": STREAM_CONTEXTS[0], "service": {}, "torrent": "ctx-value"}
+
+
+@pytest.mark.parametrize("template", STOCK_TEMPLATES + CONDITION_TEMPLATES)
+def test_compiled_render_matches_interpreted_render(template):
+    compiled = compile_template(template)
+    for context in _contexts():
+        assert compiled.render(context) == compiled.render_interpreted(context)
+
+
+def test_stock_title_renders_expected_output():
+    compiled = compile_template(StreamTemplate().title)
+    context = next(_contexts())
+
+    assert compiled.render(context) == "MF 🧲 RD ⚡️ 1080p"
+
+
+def test_template_cache_evicts_least_recently_used_entry():
+    cache = TemplateCache(max_entries=2, max_bytes=1024)
+    hits_before, evictions_before = TEMPLATE_CACHE_HITS_TOTAL._value.get(), TEMPLATE_CACHE_EVICTIONS_TOTAL._value.get()
+
+    first = cache.get("{stream.name}")
+    cache.get("{stream.size}")
+    assert cache.get("{stream.name}") is first
+    cache.get("{stream.type}")
+
+    assert len(cache) == 2
+    assert cache.get("{stream.name}") is first
+    assert TEMPLATE_CACHE_HITS_TOTAL._value.get() - hits_before == 2
+    assert TEMPLATE_CACHE_EVICTIONS_TOTAL._value.get() - evictions_before == 1
+
+
+def test_template_cache_respects_byte_limit():
+    cache = TemplateCache(max_entries=100, max_bytes=40)
+
+    for index in range(5):
+        cache.get(f"{{stream.name}} template number {index}")
+
+    assert cache.total_bytes <= 40
+    assert len(cache) == 1
@@ -0,0 +1,45 @@
+import pytest
+
+from utils import title_classifier
+from utils.title_classifier import (
+    NON_VIDEO_BLOCKLIST_KEYWORDS,
+    VIDEO_ALLOWLIST_KEYWORDS,
+    contains_keyword,
+    is_non_video_title,
+    keyword_pattern,
+)
+
+
+@pytest.mark.parametrize(
+    "title",
+    [
+        "Some.Game.Setup.exe",
+        "Artist - Album (2026)[FLAC 24-48]",
+        "Movie.2024.1080p.WEB-DL.x264",
+        "The Book Thief 2013 720p",
+        "",
+    ],
+)
+@pytest.mark.parametrize("keywords", [NON_VIDEO_BLOCKLIST_KEYWORDS, VIDEO_ALLOWLIST_KEYWORDS])
+def test_compiled_pattern_matches_linear_scan(title, keywords):
+    expected = any(keyword.lower() in title.lower() for keyword in keywords)
+    assert contains_keyword(title, keywords) is expected
+
+
+def test_pattern_is_compiled_once_per_keyword_list():
+    assert keyword_pattern(NON_VIDEO_BLOCKLIST_KEYWORDS) is keyword_pattern(list(NON_VIDEO_BLOCKLIST_KEYWORDS))
+    assert not contains_keyword("anything", [])
+
+
+def test_is_non_video_title():
+    assert is_non_video_title("FitGirl Repack Game")
+    assert not is_non_video_title("Movie.2024.2160p.BluRay.REMUX")
+
+
+def test_classify_stream_title_ignores_filter_setting(monkeypatch):
+    monkeypatch.setattr(title_classifier, "detect_adult_title", lambda title: title.startswith("XXX"))
+
+    flags = title_classifier.classify_stream_title("XXX Something.zip")
+
+    assert flags.is_adult and flags.is_non_video
+    assert not title_classifier.classify_stream_title(None).is_adult
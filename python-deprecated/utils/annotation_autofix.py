@@ -2,11 +2,11 @@
 
 import re
 
-import PTT
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from db.models import FileMediaLink, StreamFile
+from utils.ptt_cache import parse_title_cached
 from utils.validation_helper import is_video_file
 
 _SEASON_EPISODE_FALLBACK_REGEXES = (
@@ -49,7 +49,7 @@ def infer_episode_mapping_from_filename(filename: str) -> tuple[int | None, int
     For anime releases that omit the season (e.g. "Series - 08 (1080p)"), PTT will
     find an episode number but no season; we default such files to season 1.
     """
-    parsed = PTT.parse_title(filename, True)
+    parsed = parse_title_cached(filename, True)
     seasons = parsed.get("seasons", [])
     episodes = parsed.get("episodes", [])
 
@@ -15,7 +15,8 @@ from db.config import settings
 from db.database import get_async_session_context
 from db.models import User, UserProfile
 from db.redis_database import REDIS_ASYNC_CLIENT
-from db.schemas import UserData
+from db.schemas import ReadOnlyUserData, UserData
+from utils.filter_plan import StreamFilterPlan
 from utils.profile_context import build_user_data_from_config
 from utils.profile_crypto import profile_crypto
 
@@ -66,13 +67,14 @@ def from_urlsafe(urlsafe_str: str) -> bytes:
 class CryptoUtils:
     def __init__(self):
         self.secret_key = settings.secret_key.encode("utf-8").ljust(32)[:32]
-        self._decrypted_user_data_cache: dict[str, tuple[float, UserData]] = {}
+        # secret_str -> (expires_at, shared read-only UserData carrying its compiled filter plan)
+        self._decrypted_user_data_cache: dict[str, tuple[float, ReadOnlyUserData]] = {}
         self._decrypted_user_data_cache_mu = Lock()
         self._invalid_secret_cache: dict[str, float] = {}
         self._invalid_secret_cache_mu = Lock()
 
-    def _get_cached_decrypted_user_data(self, secret_str: str) -> UserData | None:
-        """Return cached decrypted UserData for secret_str if still valid."""
+    def _get_cached_decrypted_user_data(self, secret_str: str) -> ReadOnlyUserData | None:
+        """Return the shared read-only UserData for secret_str if still valid."""
         if not secret_str:
             return None
 
@@ -87,8 +89,7 @@ class CryptoUtils:
                 self._decrypted_user_data_cache.pop(secret_str, None)
                 return None
 
-            # Return a defensive copy so request-level code cannot mutate shared cache state.
-            return cached_user_data.model_copy(deep=True)
+            return cached_user_data
 
     def _evict_expired_decrypt_cache_entries(self, now: float) -> None:
         expired_keys = [
@@ -97,10 +98,16 @@ class CryptoUtils:
         for cache_key in expired_keys:
             self._decrypted_user_data_cache.pop(cache_key, None)
 
-    def _cache_decrypted_user_data(self, secret_str: str, user_data: UserData) -> None:
-        """Cache decrypted UserData for a short duration to reduce repeated decrypt CPU cost."""
+    def _cache_decrypted_user_data(self, secret_str: str, user_data: UserData) -> ReadOnlyUserData:
+        """Cache decrypted UserData and its compiled filter plan for a short duration.
+
+        The entry is a read-only view with the plan attached, so both expire and are
+        invalidated together. Returns the cached view.
+        """
+        user_data._filter_plan = StreamFilterPlan.from_user_data(user_data)
+        read_only_user_data = ReadOnlyUserData.from_user_data(user_data)
         if not secret_str:
-            return
+            return read_only_user_data
 
         now = time.monotonic()
         with self._decrypted_user_data_cache_mu:
@@ -114,11 +121,12 @@ class CryptoUtils:
 
             self._decrypted_user_data_cache[secret_str] = (
                 now + DECRYPT_CACHE_TTL_SECONDS,
-                user_data.model_copy(deep=True),
+                read_only_user_data,
             )
+        return read_only_user_data
 
     def _invalidate_decrypt_cache_prefix(self, secret_prefix: str) -> None:
-        """Invalidate cached decrypted payloads for all keys with the given prefix."""
+        """Invalidate cached decrypted payloads (and their filter plans) for all keys with the given prefix."""
         with self._decrypted_user_data_cache_mu:
             matching_keys = [key for key in self._decrypted_user_data_cache if key.startswith(secret_prefix)]
             for key in matching_keys:
@@ -225,11 +233,13 @@ class CryptoUtils:
             logger.error(f"Failed to process user data: {e}")
             raise ValueError("Failed to process user data")
 
-    async def decrypt_user_data(self, secret_str: str) -> UserData:
+    async def decrypt_user_data(self, secret_str: str, *, mutable: bool = False) -> UserData:
         """
         Decrypt user data from a D- (direct) or U- (profile UUID) secret.
         Args:
             secret_str: Prefixed string (D- encrypted payload or U- profile UUID).
+            mutable: Return a private deep copy that the caller may modify. By default the
+                shared ReadOnlyUserData from the decrypt cache is returned without copying.
         Returns:
             UserData object
         """
@@ -245,7 +255,7 @@ class CryptoUtils:
 
         cached_user_data = self._get_cached_decrypted_user_data(secret_str)
         if cached_user_data is not None:
-            return cached_user_data
+            return cached_user_data.mutable_copy() if mutable else cached_user_data
 
         try:
             if secret_str.startswith(REDIS_LEGACY_PREFIX):
@@ -265,14 +275,14 @@ class CryptoUtils:
                 json_str = self._decrypt_and_decompress(iv, encrypted_data)
                 user_data = UserData.model_validate_json(json_str)
                 self._clear_invalid_secret(secret_str)
-                self._cache_decrypted_user_data(secret_str, user_data)
-                return user_data
+                read_only_user_data = self._cache_decrypted_user_data(secret_str, user_data)
+                return read_only_user_data.mutable_copy() if mutable else read_only_user_data
 
             if prefix == UUID_PREFIX:
                 user_data = await self._resolve_uuid_profile(data)
                 self._clear_invalid_secret(secret_str)
-                self._cache_decrypted_user_data(secret_str, user_data)
-                return user_data
+                read_only_user_data = self._cache_decrypted_user_data(secret_str, user_data)
+                return read_only_user_data.mutable_copy() if mutable else read_only_user_data
 
             raise ValueError("Invalid prefix")
 
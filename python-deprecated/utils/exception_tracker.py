@@ -9,7 +9,8 @@ ERROR/CRITICAL log records containing exception info.  This covers:
 
 Exceptions are fingerprinted by type + file + line so duplicate occurrences
 are deduplicated with an incrementing counter.  A sorted-set index enables
-efficient paginated listing for the admin API.
+efficient paginated listing for the admin API.  The handler only queues
+records; a background thread aggregates them and writes to Redis in batches.
 
 Redis keys used:
     exc:{fingerprint}  -- hash with exception detail (TTL = settings.exception_tracking_ttl)
@@ -19,11 +20,17 @@ Redis keys used:
 import hashlib
 import json
 import logging
+import os
+import queue
+import threading
+import time
 import traceback as tb_module
+from dataclasses import dataclass
 from datetime import datetime, timezone
 
 from db.config import settings
 from db.redis_database import REDIS_ASYNC_CLIENT, REDIS_SYNC_CLIENT
+from utils.prometheus_metrics import EXCEPTION_TRACKER_DROPPED_TOTAL
 
 _logger = logging.getLogger(__name__)
 
@@ -105,21 +112,72 @@ def _generate_fingerprint_from_record(record: logging.LogRecord) -> str:
 
 
 # ============================================
-# Logging Handler (sync — uses REDIS_SYNC_CLIENT)
+# Logging Handler (queued — background writer thread)
 # ============================================
 
 
+@dataclass(slots=True)
+class _ExceptionRecord:
+    """Compact record handed from ``emit`` to the writer thread."""
+
+    fingerprint: str
+    timestamp: float
+    # Formatted detail fields; None when this fingerprint was formatted recently
+    details: dict[str, str] | None
+
+
+@dataclass(slots=True)
+class _PendingException:
+    """Occurrences of one fingerprint aggregated between flushes."""
+
+    count: int
+    first_seen: float
+    last_seen: float
+    details: dict[str, str] | None
+
+
+def _build_details(record: logging.LogRecord) -> dict[str, str]:
+    exc = record.exc_info[1]
+    primary_exc = _get_primary_exception(exc)
+    details = {
+        "source": _extract_source_from_exc(primary_exc) or f"{record.pathname}:{record.lineno}",
+        "traceback": "".join(tb_module.format_exception(*record.exc_info)),
+        "message": str(primary_exc),
+        "type": type(primary_exc).__name__,
+    }
+    if isinstance(exc, BaseExceptionGroup):
+        details["group_type"] = type(exc).__name__
+        details["group_message"] = str(exc)
+        details["sub_exceptions"] = _serialize_exception_group(exc)
+    return details
+
+
+def _isoformat(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
 class RedisExceptionHandler(logging.Handler):
     """A logging handler that stores ERROR/CRITICAL records with exc_info in Redis.
 
-    Uses the synchronous Redis client so it works from any context
-    (request handlers, background tasks, sync code).  All Redis
-    operations are wrapped in try/except so a Redis failure never
-    disrupts application logging.
+    ``emit`` never touches Redis: it fingerprints the record and puts a compact
+    record on a bounded queue. A daemon writer thread aggregates the queue by
+    fingerprint and writes the counts to Redis in one pipeline every
+    ``exception_tracking_flush_interval`` seconds, using the synchronous client
+    so it works whatever event loop (if any) the logging call came from.
+
+    Tracebacks are only formatted for the first occurrence of a fingerprint in
+    each flush interval; repeats just add to the count. When the queue is full
+    records are dropped and counted in ``EXCEPTION_TRACKER_DROPPED_TOTAL``.
     """
 
     def __init__(self, level: int = logging.ERROR):
         super().__init__(level)
+        self._queue: queue.Queue[_ExceptionRecord | None] | None = None
+        self._writer: threading.Thread | None = None
+        self._writer_pid: int | None = None
+        self._start_lock = threading.Lock()
+        # Fingerprint -> monotonic time its details were last queued
+        self._formatted_at: dict[str, float] = {}
 
     def emit(self, record: logging.LogRecord) -> None:
         if not settings.enable_exception_tracking:
@@ -129,69 +187,136 @@ class RedisExceptionHandler(logging.Handler):
         if not record.exc_info or not record.exc_info[1]:
             return
 
+        # Failures logged by the writer itself must not feed back into the queue
+        if self._writer is not None and threading.current_thread() is self._writer:
+            return
+
         try:
-            self._store(record)
+            self._enqueue(record)
         except Exception:
             # Never disrupt the logging pipeline
             pass
 
-    def _store(self, record: logging.LogRecord) -> None:
-        exc = record.exc_info[1]
-        primary_exc = _get_primary_exception(exc)
+    def _enqueue(self, record: logging.LogRecord) -> None:
+        self._ensure_writer()
         fingerprint = _generate_fingerprint_from_record(record)
-        key = f"{_KEY_PREFIX}{fingerprint}"
-        now = datetime.now(timezone.utc).isoformat()
-        now_ts = datetime.now(timezone.utc).timestamp()
-        tb_str = "".join(tb_module.format_exception(*record.exc_info))
-        source = _extract_source_from_exc(primary_exc) or f"{record.pathname}:{record.lineno}"
-        message = str(primary_exc)
-        exception_type = type(primary_exc).__name__
-        mapping_common = {
-            "source": source,
-            "traceback": tb_str,
-            "message": message,
-            "type": exception_type,
-        }
-        if isinstance(exc, BaseExceptionGroup):
-            mapping_common["group_type"] = type(exc).__name__
-            mapping_common["group_message"] = str(exc)
-            mapping_common["sub_exceptions"] = _serialize_exception_group(exc)
-
-        existing = REDIS_SYNC_CLIENT.hgetall(key)
-
-        if existing:
-            count = int(existing.get(b"count", b"1")) + 1
-            REDIS_SYNC_CLIENT.hset(
-                key,
-                mapping={
-                    "count": str(count),
-                    "last_seen": now,
-                    **mapping_common,
-                },
-            )
-        else:
-            # Enforce max-entries cap
-            total = REDIS_SYNC_CLIENT.zcard(_INDEX_KEY)
-            if total and total >= settings.exception_tracking_max_entries:
-                oldest = REDIS_SYNC_CLIENT.zrange(_INDEX_KEY, 0, 0)
-                if oldest:
-                    old_fp = oldest[0] if isinstance(oldest[0], str) else oldest[0].decode()
-                    REDIS_SYNC_CLIENT.delete(f"{_KEY_PREFIX}{old_fp}")
-                    REDIS_SYNC_CLIENT.zrem(_INDEX_KEY, old_fp)
-
-            REDIS_SYNC_CLIENT.hset(
-                key,
-                mapping={
-                    "count": "1",
-                    "first_seen": now,
-                    "last_seen": now,
-                    **mapping_common,
-                },
+        now = time.monotonic()
+        formatted_at = self._formatted_at.get(fingerprint)
+        details = None
+        if formatted_at is None or now - formatted_at >= settings.exception_tracking_flush_interval:
+            details = _build_details(record)
+        try:
+            self._queue.put_nowait(_ExceptionRecord(fingerprint, time.time(), details))
+        except queue.Full:
+            EXCEPTION_TRACKER_DROPPED_TOTAL.labels(reason="queue_full").inc()
+            return
+        if details is not None:
+            if len(self._formatted_at) >= settings.exception_tracking_queue_size:
+                self._formatted_at.clear()
+            self._formatted_at[fingerprint] = now
+
+    def _ensure_writer(self) -> None:
+        # (Re)start per process: a forked worker inherits the handler but not the thread
+        pid = os.getpid()
+        if self._writer_pid == pid:
+            return
+        with self._start_lock:
+            if self._writer_pid == pid:
+                return
+            self._queue = queue.Queue(maxsize=settings.exception_tracking_queue_size)
+            self._formatted_at.clear()
+            self._writer = threading.Thread(
+                target=self._run_writer,
+                args=(self._queue,),
+                name="exception-tracker-writer",
+                daemon=True,
             )
+            self._writer.start()
+            self._writer_pid = pid
+
+    def _run_writer(self, records: "queue.Queue[_ExceptionRecord | None]") -> None:
+        while True:
+            pending: dict[str, _PendingException] = {}
+            stopping = False
+            deadline = time.monotonic() + settings.exception_tracking_flush_interval
+            while (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    item = records.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                _aggregate(pending, item)
+            # Pick up whatever is already queued before flushing
+            while not stopping:
+                try:
+                    item = records.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                else:
+                    _aggregate(pending, item)
+            if pending:
+                try:
+                    _flush_pending(pending)
+                except Exception:
+                    EXCEPTION_TRACKER_DROPPED_TOTAL.labels(reason="flush_error").inc(
+                        sum(entry.count for entry in pending.values())
+                    )
+            if stopping:
+                return
+
+    def close(self) -> None:
+        """Flush queued records and stop the writer (called by ``logging.shutdown``)."""
+        writer = self._writer
+        if writer is not None and writer.is_alive() and self._writer_pid == os.getpid():
+            try:
+                self._queue.put(None, timeout=1)
+                writer.join(timeout=5)
+            except queue.Full:
+                pass
+        self._writer_pid = None
+        super().close()
+
+
+def _aggregate(pending: dict[str, _PendingException], item: _ExceptionRecord) -> None:
+    entry = pending.get(item.fingerprint)
+    if entry is None:
+        pending[item.fingerprint] = _PendingException(1, item.timestamp, item.timestamp, item.details)
+        return
+    entry.count += 1
+    entry.last_seen = max(entry.last_seen, item.timestamp)
+    if item.details is not None:
+        entry.details = item.details
 
-        REDIS_SYNC_CLIENT.expire(key, settings.exception_tracking_ttl)
-        REDIS_SYNC_CLIENT.zadd(_INDEX_KEY, {fingerprint: now_ts})
-        REDIS_SYNC_CLIENT.expire(_INDEX_KEY, settings.exception_tracking_ttl)
+
+def _flush_pending(pending: dict[str, _PendingException]) -> None:
+    """Write aggregated occurrences to Redis in one pipeline."""
+    pipe = REDIS_SYNC_CLIENT.pipeline(transaction=False)
+    ttl = settings.exception_tracking_ttl
+    for fingerprint, entry in pending.items():
+        key = f"{_KEY_PREFIX}{fingerprint}"
+        pipe.hincrby(key, "count", entry.count)
+        pipe.hsetnx(key, "first_seen", _isoformat(entry.first_seen))
+        pipe.hset(key, mapping={"last_seen": _isoformat(entry.last_seen), **(entry.details or {})})
+        pipe.expire(key, ttl)
+    pipe.zadd(_INDEX_KEY, {fingerprint: entry.last_seen for fingerprint, entry in pending.items()})
+    pipe.expire(_INDEX_KEY, ttl)
+    pipe.execute()
+    _trim_index()
+
+
+def _trim_index() -> None:
+    """Drop the oldest fingerprints (index members and their hashes) beyond the cap."""
+    oldest = REDIS_SYNC_CLIENT.zrange(_INDEX_KEY, 0, -(settings.exception_tracking_max_entries + 1))
+    if not oldest:
+        return
+    pipe = REDIS_SYNC_CLIENT.pipeline(transaction=False)
+    pipe.delete(*(f"{_KEY_PREFIX}{fp if isinstance(fp, str) else fp.decode()}" for fp in oldest))
+    pipe.zrem(_INDEX_KEY, *oldest)
+    pipe.execute()
 
 
 def install_exception_handler() -> None:
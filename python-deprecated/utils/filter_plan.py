@@ -0,0 +1,123 @@
+"""
+Precompiled per-profile stream filter plans.
+
+A ``StreamFilterPlan`` captures everything ``filter_and_sort_streams`` derives from
+``UserData`` (filter sets, compiled name patterns, rank maps, sort options and caps)
+so the stream hot path executes it instead of re-deriving it on every request.
+Plans are cached next to the decrypted UserData in ``utils.crypto.CryptoUtils`` and
+invalidated together with it.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+
+from db.schemas import UserData
+from db.schemas.config import MAX_STREAM_NAME_FILTER_PATTERN_LENGTH, MAX_STREAM_NAME_FILTER_PATTERNS
+from utils import const
+
+
+def _first_index_map(values: list) -> dict:
+    """Map each value to the index of its first occurrence (``list.index`` semantics)."""
+    index_map: dict = {}
+    for index, value in enumerate(values):
+        index_map.setdefault(value, index)
+    return index_map
+
+
+def _quality_rank_map(quality_filter: list[str]) -> dict[str | None, int]:
+    """Rank qualities by the user's group order; direct group-name matches take precedence."""
+    rank_map: dict[str | None, int] = {}
+    for index, group_name in enumerate(quality_filter):
+        for quality in const.QUALITY_GROUPS.get(group_name, ()):
+            rank_map.setdefault(quality, index)
+    rank_map.update(_first_index_map(quality_filter))
+    return rank_map
+
+
+def _compile_name_patterns(user_data: UserData) -> tuple:
+    """Compile the stream name filter into regexes or lowercase keywords."""
+    if user_data.stream_name_filter_mode == "disabled":
+        return ()
+    raw_filter_patterns = (user_data.stream_name_filter_patterns or [])[:MAX_STREAM_NAME_FILTER_PATTERNS]
+    safe_filter_patterns = [
+        p for p in raw_filter_patterns if isinstance(p, str) and len(p) <= MAX_STREAM_NAME_FILTER_PATTERN_LENGTH
+    ]
+    if not user_data.stream_name_filter_use_regex:
+        return tuple(p.lower() for p in safe_filter_patterns)
+
+    compiled_name_patterns: list[re.Pattern] = []
+    for pattern in safe_filter_patterns:
+        try:
+            compiled_name_patterns.append(re.compile(pattern, re.IGNORECASE))
+        except re.error:
+            logging.warning(f"Invalid regex pattern ignored: {pattern}")
+    return tuple(compiled_name_patterns)
+
+
+@dataclass(slots=True, frozen=True)
+class StreamFilterPlan:
+    """Immutable, precompiled form of a profile's stream filter and sort preferences."""
+
+    selected_resolutions: frozenset
+    quality_filter: frozenset
+    hdr_filter: frozenset
+    language_filter: frozenset
+    max_size: int | float
+    min_size: int
+    name_filter_mode: str
+    name_filter_use_regex: bool
+    name_patterns: tuple
+    resolution_ranks: dict
+    default_resolution_rank: int
+    quality_ranks: dict
+    default_quality_rank: int
+    language_ranks: dict
+    default_language_rank: int
+    # (sorting key, direction multiplier) pairs in priority order
+    sort_options: tuple[tuple[str, int], ...]
+    max_streams_per_resolution: int
+    max_streams: int
+
+    @classmethod
+    def from_user_data(cls, user_data: UserData) -> "StreamFilterPlan":
+        return cls(
+            selected_resolutions=frozenset(user_data.selected_resolutions),
+            quality_filter=frozenset(
+                quality for group in user_data.quality_filter for quality in const.QUALITY_GROUPS[group]
+            ),
+            hdr_filter=frozenset(user_data.hdr_filter),
+            language_filter=frozenset(user_data.language_sorting),
+            max_size=user_data.max_size,
+            min_size=user_data.min_size,
+            name_filter_mode=user_data.stream_name_filter_mode,
+            name_filter_use_regex=user_data.stream_name_filter_use_regex,
+            name_patterns=_compile_name_patterns(user_data),
+            resolution_ranks=_first_index_map(user_data.selected_resolutions),
+            default_resolution_rank=len(user_data.selected_resolutions),
+            quality_ranks=_quality_rank_map(user_data.quality_filter),
+            default_quality_rank=len(user_data.quality_filter),
+            language_ranks=_first_index_map(user_data.language_sorting),
+            default_language_rank=len(user_data.language_sorting),
+            sort_options=tuple(
+                (option.key, 1 if option.direction == "asc" else -1) for option in user_data.torrent_sorting_priority
+            ),
+            max_streams_per_resolution=user_data.max_streams_per_resolution,
+            max_streams=user_data.max_streams,
+        )
+
+    def matches_name(self, name: str | None) -> bool:
+        """Return True if ``name`` matches any of the configured name filter patterns."""
+        if self.name_filter_use_regex:
+            return any(p.search(name or "") for p in self.name_patterns)
+        name_lower = (name or "").lower()
+        return any(p in name_lower for p in self.name_patterns)
+
+
+def get_filter_plan(user_data: UserData) -> StreamFilterPlan:
+    """Return the plan attached to ``user_data``, compiling and attaching it on first use."""
+    plan = user_data._filter_plan
+    if plan is None:
+        plan = StreamFilterPlan.from_user_data(user_data)
+        user_data._filter_plan = plan
+    return plan
@@ -2,6 +2,11 @@
 
 This module implements compatibility with JavaScript `lz-string`
 `decompressFromEncodedURIComponent`, used by DMM hashlist payloads.
+
+`_decompress` is the bit-by-bit port of the JavaScript reference. Payloads made only
+of URI-safe characters go through `_decompress_uri_safe`, which maps the payload to
+6-bit values with one `bytes.translate` call and reads whole codes from an integer
+bit buffer; anything else falls back to the reference so errors stay identical.
 """
 
 from collections.abc import Callable
@@ -9,6 +14,24 @@ from collections.abc import Callable
 _URI_SAFE_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+-$"
 _BASE_REVERSE_DIC: dict[str, dict[str, int]] = {}
 
+_INVALID_VALUE = 0xFF
+# Payloads are read past their end with zero bits; this covers one full code plus a literal
+_ZERO_PADDING = bytes(16)
+
+
+def _build_uri_safe_table() -> bytes:
+    # Byte -> 6-bit value with its bit order reversed: lz-string reads each character
+    # most significant bit first but assembles codes least significant bit first, so
+    # reversed values can be appended to a plain little-endian bit buffer. "$" (index 64)
+    # has no bits inside a 6-bit window and reads as zeros there.
+    table = bytearray([_INVALID_VALUE]) * 256
+    for index, character in enumerate(_URI_SAFE_ALPHABET):
+        table[ord(character)] = int(f"{index & 0x3F:06b}"[::-1], 2)
+    return bytes(table)
+
+
+_URI_SAFE_TABLE = _build_uri_safe_table()
+
 
 def _get_base_value(alphabet: str, character: str) -> int:
     if alphabet not in _BASE_REVERSE_DIC:
@@ -105,6 +128,94 @@ def _decompress(length: int, reset_value: int, get_next_value: Callable[[int], i
             num_bits += 1
 
 
+def _decompress_uri_safe(values: bytes, length: int) -> str:
+    """Same output as `_decompress` for `length` characters translated with `_URI_SAFE_TABLE`."""
+    values += _ZERO_PADDING
+    end_bits = length * 6
+    buffer = 0
+    buffer_bits = 0
+    position = 0
+
+    # Refills keep more bits buffered than are read, so the character holding the next
+    # unread bit is always loaded, as in the reference.
+    while buffer_bits <= 2:
+        buffer |= values[position] << buffer_bits
+        position += 1
+        buffer_bits += 6
+    next_code = buffer & 3
+    buffer >>= 2
+    buffer_bits -= 2
+    if next_code == 2:
+        return ""
+    if next_code == 3:
+        raise ValueError("Invalid initial LZ-string code")
+
+    width = 8 << next_code
+    while buffer_bits <= width:
+        buffer |= values[position] << buffer_bits
+        position += 1
+        buffer_bits += 6
+    c = chr(buffer & ((1 << width) - 1))
+    buffer >>= width
+    buffer_bits -= width
+
+    dictionary = ["", "", "", c]
+    w = c
+    result = [c]
+    enlarge_in = 4
+    num_bits = 3
+    mask = 7
+
+    while True:
+        if position * 6 - buffer_bits >= end_bits:
+            return ""
+
+        while buffer_bits <= num_bits:
+            buffer |= values[position] << buffer_bits
+            position += 1
+            buffer_bits += 6
+        c_code = buffer & mask
+        buffer >>= num_bits
+        buffer_bits -= num_bits
+
+        if c_code < 2:
+            width = 8 << c_code
+            while buffer_bits <= width:
+                buffer |= values[position] << buffer_bits
+                position += 1
+                buffer_bits += 6
+            c_code = len(dictionary)
+            dictionary.append(chr(buffer & ((1 << width) - 1)))
+            buffer >>= width
+            buffer_bits -= width
+            enlarge_in -= 1
+        elif c_code == 2:
+            return "".join(result)
+
+        if enlarge_in == 0:
+            enlarge_in = 1 << num_bits
+            num_bits += 1
+            mask = (1 << num_bits) - 1
+
+        if c_code < len(dictionary):
+            entry = dictionary[c_code]
+        elif c_code == len(dictionary):
+            entry = w + w[0]
+        else:
+            return ""
+
+        result.append(entry)
+
+        dictionary.append(w + entry[0])
+        enlarge_in -= 1
+        w = entry
+
+        if enlarge_in == 0:
+            enlarge_in = 1 << num_bits
+            num_bits += 1
+            mask = (1 << num_bits) - 1
+
+
 def decompress_from_encoded_uri_component(compressed: str | None) -> str:
     """Decode string compressed with JS lz-string `compressToEncodedURIComponent`."""
     if compressed is None or compressed == "":
@@ -112,7 +223,12 @@ def decompress_from_encoded_uri_component(compressed: str | None) -> str:
 
     normalized = compressed.replace(" ", "+")
 
+    # Non-ASCII characters become "?", which is not in the alphabet either
+    values = normalized.encode("ascii", "replace").translate(_URI_SAFE_TABLE)
+
     try:
+        if _INVALID_VALUE not in values:
+            return _decompress_uri_safe(values, len(normalized))
         return _decompress(
             len(normalized),
             32,
@@ -4,6 +4,7 @@ import json
 import logging
 import math
 import re
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from os.path import basename
 from typing import Any, Optional, Union
@@ -19,7 +20,6 @@ from db.schemas import (
     HTTPStreamData,
     RichStream,
     RichStreamMetadata,
-    SortingOption,
     Stream,
     StreamBehaviorHints,
     StreamingProvider,
@@ -34,19 +34,29 @@ from db.schemas import (
 from workers.providers import mapper
 from workers.providers.exceptions import ProviderException
 from workers.providers.cache_helpers import (
+    get_cache_service_name,
     get_cached_status,
     is_cache_check_done,
+    is_global_cache_check_provider,
     mark_cache_check_done,
     store_cached_info_hashes,
 )
+from workers.providers.negative_cache import check_recently_uncached, record_lookup_results
 from workers.providers.usenet_compatibility import is_usenet_stream_compatible
 from utils import const
 from utils.config import config_manager
+from utils.filter_plan import StreamFilterPlan, get_filter_plan
 from utils.nzb_storage import generate_signed_nzb_url
 from utils.const import CERTIFICATION_MAPPING, STREAMING_PROVIDERS_SHORT_NAMES
 from utils.network import encode_mediaflow_proxy_url
-from utils.runtime_const import ADULT_PARSER, MANIFEST_TEMPLATE, TRACKERS
-from utils.template_engine import render_template as engine_render_template
+from utils.runtime_const import MANIFEST_TEMPLATE, TRACKERS
+from utils.title_classifier import (  # noqa: F401 - keyword lists re-exported for scrapers
+    NON_VIDEO_BLOCKLIST_KEYWORDS,
+    VIDEO_ALLOWLIST_KEYWORDS,
+    detect_adult_title,
+    is_non_video_title,
+)
+from utils.template_engine import get_compiled_template, render_template as engine_render_template
 from utils.youtube import format_geo_restriction_label
 from utils.validation_helper import validate_m3u8_or_mpd_url_with_cache
 
@@ -77,9 +87,6 @@ AnyStreamData = Union[
     CatalogFilterStreamData,
 ]
 
-MAX_STREAM_NAME_FILTER_PATTERNS = 10
-MAX_STREAM_NAME_FILTER_PATTERN_LENGTH = 120
-
 
 def _get_language_code(language: str | None) -> str | None:
     if not language:
@@ -216,6 +223,93 @@ def _sort_size_bytes_for_stream(
     return total
 
 
+@dataclass(slots=True)
+class _StreamColumns:
+    """Column-oriented view of a candidate stream list.
+
+    Built once per request so every filter runs over flat per-column lists
+    and only the surviving streams are copied and annotated.
+    """
+
+    streams: list[AnyStreamData]
+    torrent_types: list[TorrentType]
+    names: list[str]
+    sizes: list[int]
+    resolutions: list[str | None]
+    qualities: list[str | None]
+    hdr_formats: list[tuple[str, ...]]
+    languages: list[tuple[str | None, ...]]
+
+    @classmethod
+    def from_streams(cls, streams: list[AnyStreamData]) -> "_StreamColumns":
+        valid_resolutions = const.SUPPORTED_RESOLUTIONS
+        valid_qualities = const.SUPPORTED_QUALITIES
+        valid_languages = const.SUPPORTED_LANGUAGES
+        # Most candidates share a handful of HDR/language combinations; normalize each once.
+        hdr_lookup: dict[tuple[str, ...], tuple[str, ...]] = {}
+        language_lookup: dict[tuple[str, ...], tuple[str | None, ...]] = {}
+
+        torrent_types, names, sizes, resolutions, qualities, hdr_formats, languages = [], [], [], [], [], [], []
+        for stream in streams:
+            torrent_types.append(getattr(stream, "torrent_type", TorrentType.PUBLIC))
+            names.append(stream.name)
+            sizes.append(stream.size or 0)
+            resolution = getattr(stream, "resolution", None)
+            resolutions.append(resolution if resolution in valid_resolutions else None)
+            quality = getattr(stream, "quality", None)
+            qualities.append(quality if quality in valid_qualities else None)
+
+            raw_hdr = tuple(getattr(stream, "hdr_formats", []) or [])
+            normalized_hdr = hdr_lookup.get(raw_hdr)
+            if normalized_hdr is None:
+                normalized_hdr = tuple(normalized_hdr_filter_and_display(list(raw_hdr))[0])
+                hdr_lookup[raw_hdr] = normalized_hdr
+            hdr_formats.append(normalized_hdr)
+
+            raw_languages = tuple(getattr(stream, "languages", []) or [])
+            normalized_languages = language_lookup.get(raw_languages)
+            if normalized_languages is None:
+                normalized_languages = tuple(lang for lang in raw_languages if lang in valid_languages) or (None,)
+                language_lookup[raw_languages] = normalized_languages
+            languages.append(normalized_languages)
+
+        return cls(
+            streams=streams,
+            torrent_types=torrent_types,
+            names=names,
+            sizes=sizes,
+            resolutions=resolutions,
+            qualities=qualities,
+            hdr_formats=hdr_formats,
+            languages=languages,
+        )
+
+    def materialize(self, indices: list[int]) -> list[AnyStreamData]:
+        """Copy the selected streams and attach the normalized ``filtered_*`` attributes."""
+        selected = []
+        for i in indices:
+            stream = self.streams[i].model_copy()
+            stream.filtered_resolution = self.resolutions[i]
+            stream.filtered_quality = self.qualities[i]
+            stream.filtered_hdr_formats = list(self.hdr_formats[i])
+            stream.filtered_languages = list(self.languages[i])
+            stream.cached = False
+            selected.append(stream)
+        return selected
+
+
+def _apply_column_filter(
+    indices: list[int],
+    keep,
+    filtered_reasons: dict,
+    reason: str,
+) -> list[int]:
+    """Keep indices where ``keep(i)`` is truthy and count the rest under ``reason``."""
+    kept = [i for i in indices if keep(i)]
+    filtered_reasons[reason] += len(indices) - len(kept)
+    return kept
+
+
 async def filter_streams_by_user_preferences(
     streams: list[AnyStreamData],
     user_data: UserData,
@@ -226,33 +320,11 @@ async def filter_streams_by_user_preferences(
     """Apply resolution, size, quality, HDR, language, and name filters (Stremio parity).
 
     Does not perform debrid cache checks, sorting, or per-resolution/total caps.
+    Filters run in order over a column view of the candidates, so each stream is
+    counted under the first reason that rejects it.
     """
-    selected_resolutions_set = set(user_data.selected_resolutions)
-    quality_filter_set = set(quality for group in user_data.quality_filter for quality in const.QUALITY_GROUPS[group])
-    hdr_filter_set = set(user_data.hdr_filter)
-    language_filter_set = set(user_data.language_sorting)
-
-    valid_resolutions = const.SUPPORTED_RESOLUTIONS
-    valid_qualities = const.SUPPORTED_QUALITIES
-    valid_languages = const.SUPPORTED_LANGUAGES
-
-    stream_name_filter_mode = user_data.stream_name_filter_mode
-    compiled_name_patterns: list[re.Pattern] | list[str] = []
-    raw_filter_patterns = (user_data.stream_name_filter_patterns or [])[:MAX_STREAM_NAME_FILTER_PATTERNS]
-    safe_filter_patterns = [
-        p for p in raw_filter_patterns if isinstance(p, str) and len(p) <= MAX_STREAM_NAME_FILTER_PATTERN_LENGTH
-    ]
-    if stream_name_filter_mode != "disabled" and safe_filter_patterns:
-        if user_data.stream_name_filter_use_regex:
-            for pattern in safe_filter_patterns:
-                try:
-                    compiled_name_patterns.append(re.compile(pattern, re.IGNORECASE))
-                except re.error:
-                    logging.warning(f"Invalid regex pattern ignored: {pattern}")
-        else:
-            compiled_name_patterns = [p.lower() for p in safe_filter_patterns]
+    plan = get_filter_plan(user_data)
 
-    filtered_streams: list[AnyStreamData] = []
     filtered_reasons = {
         "Requires Streaming Provider": 0,
         "Requires Private Tracker Support": 0,
@@ -279,74 +351,139 @@ async def filter_streams_by_user_preferences(
                 filtered_reasons["Provider/Indexer Mismatch"] = filtered_reasons.get("Provider/Indexer Mismatch", 0) + 1
         streams = compatible_streams
 
-    for stream in streams:
-        torrent_type = getattr(stream, "torrent_type", TorrentType.PUBLIC)
-        if torrent_type != TorrentType.PUBLIC:
-            if not primary_provider:
-                filtered_reasons["Requires Streaming Provider"] += 1
-                continue
-            if (
-                torrent_type != TorrentType.WEB_SEED
-                and primary_provider.service not in const.SUPPORTED_PRIVATE_TRACKER_STREAMING_PROVIDERS
-            ):
-                filtered_reasons["Requires Private Tracker Support"] += 1
-                continue
-        stream = stream.model_copy()
-        stream.filtered_resolution = (
-            stream.resolution if getattr(stream, "resolution", None) in valid_resolutions else None
-        )
-        stream.filtered_quality = stream.quality if getattr(stream, "quality", None) in valid_qualities else None
-        stream_hdr_formats = getattr(stream, "hdr_formats", []) or []
-        stream.filtered_hdr_formats, _ = normalized_hdr_filter_and_display(stream_hdr_formats)
-        stream_languages = getattr(stream, "languages", []) or []
-        stream.filtered_languages = [lang for lang in stream_languages if lang in valid_languages] or [None]
-        stream.cached = False
-
-        if stream.filtered_resolution not in selected_resolutions_set:
-            filtered_reasons["Resolution Not Selected"] += 1
-            continue
-
-        if (stream.size or 0) > user_data.max_size:
-            filtered_reasons["Max Size Exceeded"] += 1
-            continue
-
-        if user_data.min_size > 0 and (stream.size or 0) > 0 and (stream.size or 0) < user_data.min_size:
-            filtered_reasons["Min Size Not Met"] += 1
-            continue
-
-        if stream.filtered_quality not in quality_filter_set:
-            filtered_reasons["Quality Not Selected"] += 1
-            continue
+    columns = _StreamColumns.from_streams(streams)
+    torrent_types = columns.torrent_types
+    sizes = columns.sizes
+    names = columns.names
+    indices = list(range(len(streams)))
+
+    if any(torrent_type != TorrentType.PUBLIC for torrent_type in torrent_types):
+        if not primary_provider:
+            indices = _apply_column_filter(
+                indices,
+                lambda i: torrent_types[i] == TorrentType.PUBLIC,
+                filtered_reasons,
+                "Requires Streaming Provider",
+            )
+        elif primary_provider.service not in const.SUPPORTED_PRIVATE_TRACKER_STREAMING_PROVIDERS:
+            indices = _apply_column_filter(
+                indices,
+                lambda i: torrent_types[i] in (TorrentType.PUBLIC, TorrentType.WEB_SEED),
+                filtered_reasons,
+                "Requires Private Tracker Support",
+            )
 
-        if not any(hdr in hdr_filter_set for hdr in stream.filtered_hdr_formats):
-            filtered_reasons["HDR Not Selected"] += 1
-            continue
+    indices = _apply_column_filter(
+        indices,
+        lambda i: columns.resolutions[i] in plan.selected_resolutions,
+        filtered_reasons,
+        "Resolution Not Selected",
+    )
+    max_size = plan.max_size
+    indices = _apply_column_filter(indices, lambda i: sizes[i] <= max_size, filtered_reasons, "Max Size Exceeded")
+    min_size = plan.min_size
+    if min_size > 0:
+        indices = _apply_column_filter(
+            indices,
+            lambda i: sizes[i] <= 0 or sizes[i] >= min_size,
+            filtered_reasons,
+            "Min Size Not Met",
+        )
+    indices = _apply_column_filter(
+        indices,
+        lambda i: columns.qualities[i] in plan.quality_filter,
+        filtered_reasons,
+        "Quality Not Selected",
+    )
+    indices = _apply_column_filter(
+        indices,
+        lambda i: not plan.hdr_filter.isdisjoint(columns.hdr_formats[i]),
+        filtered_reasons,
+        "HDR Not Selected",
+    )
+    indices = _apply_column_filter(
+        indices,
+        lambda i: not plan.language_filter.isdisjoint(columns.languages[i]),
+        filtered_reasons,
+        "Language Not Selected",
+    )
+    # Evaluated last among the cheap filters: streams stored before the ingest-time
+    # flag existed still fall back to the adult parser.
+    if settings.adult_content_filter_in_torrent_title:
+        indices = _apply_column_filter(
+            indices,
+            lambda i: not _is_adult_stream(columns.streams[i]),
+            filtered_reasons,
+            "Strict 18+ Keyword Filter",
+        )
 
-        if not any(lang in language_filter_set for lang in stream.filtered_languages):
-            filtered_reasons["Language Not Selected"] += 1
-            continue
+    if plan.name_filter_mode == "include" and plan.name_patterns:
+        indices = _apply_column_filter(
+            indices, lambda i: plan.matches_name(names[i]), filtered_reasons, "Stream Name Filter"
+        )
+    elif plan.name_filter_mode == "exclude" and plan.name_patterns:
+        indices = _apply_column_filter(
+            indices, lambda i: not plan.matches_name(names[i]), filtered_reasons, "Stream Name Filter"
+        )
 
-        if is_contain_18_plus_keywords(stream.name):
-            filtered_reasons["Strict 18+ Keyword Filter"] += 1
-            continue
+    return columns.materialize(indices), filtered_reasons
 
-        if stream_name_filter_mode != "disabled" and compiled_name_patterns:
-            stream_name_lower = (stream.name or "").lower()
-            if user_data.stream_name_filter_use_regex:
-                matches_any = any(p.search(stream.name or "") for p in compiled_name_patterns)
-            else:
-                matches_any = any(p in stream_name_lower for p in compiled_name_patterns)
 
-            if stream_name_filter_mode == "include" and not matches_any:
-                filtered_reasons["Stream Name Filter"] += 1
-                continue
-            if stream_name_filter_mode == "exclude" and matches_any:
-                filtered_reasons["Stream Name Filter"] += 1
-                continue
+def _created_at_sort_value(created_at: Any) -> float:
+    if isinstance(created_at, datetime):
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=UTC)
+        return created_at.timestamp()
+    if isinstance(created_at, (int, float)):
+        return created_at
+    return datetime.min.replace(tzinfo=UTC).timestamp()
 
-        filtered_streams.append(stream)
 
-    return filtered_streams, filtered_reasons
+def _build_sort_key_column(
+    streams: list[AnyStreamData],
+    key: str,
+    multiplier: int,
+    plan: StreamFilterPlan,
+    sort_season: int | None,
+    sort_episode: int | None,
+) -> list:
+    """Compute one sort-key column (already direction-adjusted) for all streams."""
+    match key:
+        case "cached":
+            return [multiplier * (1 if stream.cached else 0) for stream in streams]
+        case "resolution":
+            # Lower index in the user's order = higher priority
+            rank_map, default_rank = plan.resolution_ranks, plan.default_resolution_rank
+            return [multiplier * -rank_map.get(stream.filtered_resolution, default_rank) for stream in streams]
+        case "quality":
+            rank_map, default_rank = plan.quality_ranks, plan.default_quality_rank
+            return [multiplier * -rank_map.get(stream.filtered_quality, default_rank) for stream in streams]
+        case "size":
+            return [multiplier * _sort_size_bytes_for_stream(stream, sort_season, sort_episode) for stream in streams]
+        case "seeders":
+            return [multiplier * (getattr(stream, "seeders", 0) or 0) for stream in streams]
+        case "created_at":
+            return [multiplier * _created_at_sort_value(stream.created_at) for stream in streams]
+        case "language":
+            rank_map, default_rank = plan.language_ranks, plan.default_language_rank
+            language_filter = plan.language_filter
+            return [
+                multiplier
+                * -min(
+                    (rank_map[lang] for lang in stream.filtered_languages if lang in language_filter),
+                    default=default_rank,
+                )
+                for stream in streams
+            ]
+        case _:
+            column = []
+            for stream in streams:
+                if key in stream.model_fields_set:
+                    value = getattr(stream, key, 0)
+                    column.append(multiplier * (value if value is not None else 0))
+                else:
+                    column.append(0)
+            return column
 
 
 async def filter_and_sort_streams(
@@ -370,7 +507,7 @@ async def filter_and_sort_streams(
     sort_season, sort_episode = _season_episode_from_stremio_video_id(stremio_video_id)
 
     primary_provider = provider_override or user_data.get_primary_provider()
-    language_filter_set = set(user_data.language_sorting)
+    plan = get_filter_plan(user_data)
 
     # Step 2: Update cache status based on provider
     # Cache checking only applies to torrent streams (which have info_hash)
@@ -397,7 +534,22 @@ async def filter_and_sort_streams(
             already_checked = await is_cache_check_done(primary_provider, stremio_video_id)
             if not already_checked:
                 cache_update_function = mapper.CACHE_UPDATE_FUNCTIONS.get(service)
-                if cache_update_function:
+                # Service-wide checks can skip hashes the provider recently reported uncached
+                negative = None
+                if cache_update_function and is_global_cache_check_provider(primary_provider):
+                    negative = await check_recently_uncached(
+                        "provider",
+                        get_cache_service_name(primary_provider),
+                        [stream.info_hash for stream in uncached_streams],
+                    )
+                    uncached_streams = [
+                        stream for stream in uncached_streams if stream.info_hash not in negative.skipped
+                    ]
+                if cache_update_function and uncached_streams:
+                    # None marks hashes the provider has not answered for, so a failed
+                    # lookup is not recorded as uncached in the negative cache.
+                    for stream in uncached_streams:
+                        stream.cached = None
                     try:
                         service_name = await cache_update_function(
                             streams=uncached_streams,
@@ -405,6 +557,13 @@ async def filter_and_sort_streams(
                             user_ip=user_ip,
                             stremio_video_id=stremio_video_id,
                         )
+                        if negative is not None:
+                            await record_lookup_results(
+                                "provider",
+                                get_cache_service_name(primary_provider),
+                                {stream.info_hash: stream.cached for stream in uncached_streams},
+                                negative.audited,
+                            )
                         # Store only the cached ones in Redis
                         cached_info_hashes = [stream.info_hash for stream in uncached_streams if stream.cached]
                         if cached_info_hashes:
@@ -417,6 +576,10 @@ async def filter_and_sort_streams(
                         logging.warning("Failed to update cache status for %s: %s", service, error)
                     except Exception as error:
                         logging.exception("Unexpected cache status update error for %s: %s", service, error)
+                    finally:
+                        for stream in uncached_streams:
+                            if stream.cached is None:
+                                stream.cached = False
                 # Mark check as done regardless of results so we skip the API
                 # call on subsequent requests within the TTL window.
                 await mark_cache_check_done(primary_provider, stremio_video_id)
@@ -428,76 +591,20 @@ async def filter_and_sort_streams(
                 return filtered_streams, filtered_reasons
             filtered_streams = cached_filtered_streams
 
-    # Step 3: Dynamically sort streams based on user preferences
-    def dynamic_sort_key(torrent_stream: AnyStreamData) -> tuple:
-        def key_value(sorting_option: SortingOption) -> Any:
-            key = sorting_option.key
-            multiplier = 1 if sorting_option.direction == "asc" else -1
-
-            match key:
-                case "cached":
-                    return multiplier * (1 if torrent_stream.cached else 0)
-                case "resolution":
-                    # Use user-defined resolution order for sorting (lower index = higher priority)
-                    try:
-                        rank = user_data.selected_resolutions.index(torrent_stream.filtered_resolution)
-                    except ValueError:
-                        rank = len(user_data.selected_resolutions)
-                    return multiplier * -rank
-                case "quality":
-                    # Use user-defined quality order for sorting (lower index = higher priority)
-                    try:
-                        rank = user_data.quality_filter.index(torrent_stream.filtered_quality)
-                    except ValueError:
-                        # Try to find which group this quality belongs to
-                        rank = len(user_data.quality_filter)
-                        for i, group_name in enumerate(user_data.quality_filter):
-                            if (
-                                group_name in const.QUALITY_GROUPS
-                                and torrent_stream.filtered_quality in const.QUALITY_GROUPS[group_name]
-                            ):
-                                rank = i
-                                break
-                    return multiplier * -rank
-                case "size":
-                    return multiplier * _sort_size_bytes_for_stream(torrent_stream, sort_season, sort_episode)
-                case "seeders":
-                    return multiplier * (getattr(torrent_stream, "seeders", 0) or 0)
-                case "created_at":
-                    created_at = torrent_stream.created_at
-                    if isinstance(created_at, datetime):
-                        if created_at.tzinfo is None:
-                            created_at = created_at.replace(tzinfo=UTC)
-                        return multiplier * created_at.timestamp()
-                    elif isinstance(created_at, (int, float)):
-                        return multiplier * created_at
-                    else:
-                        return multiplier * datetime.min.replace(tzinfo=UTC).timestamp()
-                case "language":
-                    return multiplier * -min(
-                        (
-                            user_data.language_sorting.index(lang)
-                            for lang in torrent_stream.filtered_languages
-                            if lang in language_filter_set
-                        ),
-                        default=len(user_data.language_sorting),
-                    )
-                case _ if key in torrent_stream.model_fields_set:
-                    value = getattr(torrent_stream, key, 0)
-                    return multiplier * (value if value is not None else 0)
-                case _:
-                    return 0
-
-        return tuple(key_value(option) for option in user_data.torrent_sorting_priority)
-
+    # Step 3: Dynamically sort streams based on user preferences.
+    # Each sorting option becomes one key column; the columns are zipped into
+    # composite keys and the stream indices are sorted once (lexsort-style).
+    sort_keys: list[tuple] = []
     try:
-        # Sort streams based on the dynamic key
-        dynamically_sorted_streams = sorted(filtered_streams, key=dynamic_sort_key)
-
+        sort_columns = [
+            _build_sort_key_column(filtered_streams, key, multiplier, plan, sort_season, sort_episode)
+            for key, multiplier in plan.sort_options
+        ]
+        sort_keys = list(zip(*sort_columns)) if sort_columns else [()] * len(filtered_streams)
+        order = sorted(range(len(filtered_streams)), key=sort_keys.__getitem__)
+        dynamically_sorted_streams = [filtered_streams[i] for i in order]
     except Exception:
-        logging.exception(
-            f"torrent_sorting_priority: {user_data.torrent_sorting_priority}: sort data: {[dynamic_sort_key(stream) for stream in filtered_streams]}"
-        )
+        logging.exception(f"torrent_sorting_priority: {user_data.torrent_sorting_priority}: sort data: {sort_keys}")
         dynamically_sorted_streams = filtered_streams
 
     # Step 4: Limit streams per resolution based on user preference, after dynamic sorting
@@ -505,13 +612,13 @@ async def filter_and_sort_streams(
     streams_count_per_resolution = {}
     for stream in dynamically_sorted_streams:
         count = streams_count_per_resolution.get(stream.filtered_resolution, 0)
-        if count < user_data.max_streams_per_resolution:
+        if count < plan.max_streams_per_resolution:
             limited_streams.append(stream)
             streams_count_per_resolution[stream.filtered_resolution] = count + 1
 
     # Step 5: Apply total stream cap
     if not disable_total_stream_cap:
-        limited_streams = limited_streams[: user_data.max_streams]
+        limited_streams = limited_streams[: plan.max_streams]
 
     return limited_streams, filtered_reasons
 
@@ -739,6 +846,215 @@ async def parse_stream_data(
     return all_stream_list
 
 
+@dataclass(slots=True)
+class _StreamEntryFields:
+    """Per-stream values shared by every episode variant of the stream."""
+
+    stream_data: AnyStreamData
+    base_context: dict
+    service_context: dict
+    quality_detail: str
+    resolution: str
+    provider_status: str
+    seeders: int | None
+    stream_size: int
+    stream_size_display: str
+    hdr_display_formats: list[str]
+    audio_formats: list[str]
+    channels: list[str]
+    languages: list[str]
+    uploader: str | None
+    cached: bool
+    geo_restriction_label: str | None
+
+
+@dataclass(slots=True)
+class _PendingStreamEntry:
+    """A stream entry whose name and description are still to be rendered."""
+
+    fields: _StreamEntryFields
+    context: dict
+    file_name: str | None
+    file_size: int
+    size_info: str
+    stream_id: str | None
+    stream_url: str | None = None
+    nzb_direct_url: str | None = None
+    info_hash: str | None = None
+    file_idx: int | None = None
+    sources: list[str] | None = None
+
+
+def _build_stream_entry_fields(
+    stream_data: AnyStreamData,
+    has_streaming_provider: bool,
+    response_context: dict,
+    service_contexts: dict,
+    service_base: dict,
+) -> _StreamEntryFields:
+    """Resolve the per-stream display values and the template context shared by its variants."""
+    # Compute quality_detail - use getattr for attributes not present on all stream types
+    hdr_display_formats = [h for h in (getattr(stream_data, "filtered_hdr_formats", None) or []) if h != "Unknown"]
+    audio_formats = list(getattr(stream_data, "audio_formats", []) or [])
+    channels = list(getattr(stream_data, "channels", []) or [])
+    quality = getattr(stream_data, "quality", None)
+    codec = getattr(stream_data, "codec", None)
+    quality_detail = " ".join(
+        filter(
+            None,
+            [
+                f"🎨 {'|'.join(hdr_display_formats)}" if hdr_display_formats else None,
+                f"📺 {quality}" if quality else None,
+                f"🎞️ {codec}" if codec else None,
+                f"🎵 {'|'.join(audio_formats)}" if audio_formats else None,
+            ],
+        )
+    )
+
+    resolution = stream_data.resolution.upper() if stream_data.resolution else "N/A"
+    cached = getattr(stream_data, "cached", False)
+    # Only show cache status when there's a debrid provider
+    if has_streaming_provider:
+        provider_status = "⚡️" if cached else "⏳"
+    else:
+        provider_status = ""  # P2P mode - no cache status
+    # seeders is torrent-specific; usenet has grabs; telegram/http have neither
+    seeders = getattr(stream_data, "seeders", None)
+    stream_size = stream_data.size or 0
+
+    # Language names for display, flags for templates
+    languages = list(getattr(stream_data, "languages", []) or [])
+    language_flags = [flag for flag in (const.LANGUAGE_COUNTRY_FLAGS.get(lang) for lang in languages) if flag]
+    language_codes = [code for code in (_get_language_code(lang) for lang in languages) if code]
+    uploader = getattr(stream_data, "uploader", None)
+    release_group = getattr(stream_data, "release_group", None)
+    geo_restriction_label = format_geo_restriction_label(
+        getattr(stream_data, "geo_restriction_type", None),
+        getattr(stream_data, "geo_restriction_countries", None),
+    )
+    empty_list = response_context["empty_list"]
+    age, age_hours = _calculate_age_fields(getattr(stream_data, "created_at", None))
+    compatibility_duration = getattr(stream_data, "duration_seconds", None) or getattr(stream_data, "duration", None)
+    compatibility_bitrate = getattr(stream_data, "bitrate", None)
+    if compatibility_bitrate is None:
+        bitrate_kbps = getattr(stream_data, "bitrate_kbps", None)
+        if bitrate_kbps is not None:
+            compatibility_bitrate = bitrate_kbps * 1000
+
+    # Keys are listed in render-context order; the per-variant ones (filename, size,
+    # season, episode, folderName, container, extension) are filled in by the caller.
+    base_context = {
+        "name": stream_data.name,
+        "filename": None,
+        "type": response_context["type"],
+        "resolution": resolution,
+        "quality": quality,
+        "codec": codec,
+        "bit_depth": getattr(stream_data, "bit_depth", None),
+        "audio_formats": audio_formats,
+        "channels": channels,
+        "hdr_formats": hdr_display_formats,
+        "languages": languages,
+        "language_flags": language_flags,
+        "size": None,
+        "seeders": seeders,
+        "source": stream_data.source,
+        "release_group": release_group,
+        "uploader": uploader,
+        "cached": cached,
+        "geo_restriction": geo_restriction_label,
+        # AIOStreams compatibility fields (best-effort)
+        "title": stream_data.name,
+        "year": _extract_year_from_text(stream_data.name),
+        "season": None,
+        "episode": None,
+        "folderName": None,
+        "folderSize": stream_size,
+        "library": False,
+        "languageEmojis": language_flags,
+        "languageCodes": language_codes,
+        "smallLanguageCodes": [code.lower() for code in language_codes],
+        "uLanguages": empty_list,
+        "uLanguageEmojis": empty_list,
+        "uLanguageCodes": empty_list,
+        "uSmallLanguageCodes": empty_list,
+        "wedontknowwhatakilometeris": language_flags,
+        "uWedontknowwhatakilometeris": empty_list,
+        "visualTags": hdr_display_formats,
+        "audioTags": audio_formats,
+        "releaseGroup": release_group,
+        "regexScore": None,
+        "nRegexScore": None,
+        "encode": codec,
+        "audioChannels": channels,
+        "indexer": getattr(stream_data, "indexer", None) or stream_data.source,
+        "private": getattr(stream_data, "torrent_type", TorrentType.PUBLIC) != TorrentType.PUBLIC,
+        "duration": compatibility_duration,
+        "bitrate": compatibility_bitrate,
+        "infoHash": getattr(stream_data, "info_hash", None),
+        "age": age,
+        "ageHours": age_hours,
+        "message": None,
+        "proxied": response_context["proxied"],
+        "edition": None,
+        "remastered": bool(getattr(stream_data, "is_remastered", False)),
+        "repack": bool(getattr(stream_data, "is_repack", False)),
+        "uncensored": False,
+        "unrated": False,
+        "upscaled": bool(getattr(stream_data, "is_upscaled", False)),
+        "network": None,
+        "container": None,
+        "extension": None,
+        "seadex": False,
+        "seadexBest": False,
+        "provider_type": response_context["provider_type"],
+    }
+
+    service_cached = cached if has_streaming_provider else False
+    service_context = service_contexts.get(service_cached)
+    if service_context is None:
+        service_context = service_contexts[service_cached] = {**service_base, "cached": service_cached}
+
+    return _StreamEntryFields(
+        stream_data=stream_data,
+        base_context=base_context,
+        service_context=service_context,
+        quality_detail=quality_detail,
+        resolution=resolution,
+        provider_status=provider_status,
+        seeders=seeders,
+        stream_size=stream_size,
+        stream_size_display=convert_bytes_to_readable(stream_size),
+        hdr_display_formats=hdr_display_formats,
+        audio_formats=audio_formats,
+        channels=channels,
+        languages=languages,
+        uploader=uploader,
+        cached=cached,
+        geo_restriction_label=geo_restriction_label,
+    )
+
+
+def _fallback_stream_description(fields: _StreamEntryFields, size_info: str) -> str:
+    """Hardcoded description used when the user's template fails to render."""
+    seeders_info = f"👤 {fields.seeders}" if fields.seeders is not None else None
+    languages_str = f"🌐 {' + '.join(fields.languages)}" if fields.languages else None
+    source_info = f"🔗 {fields.stream_data.source}"
+    if fields.uploader:
+        source_info += f" 🧑‍💻 {fields.uploader}"
+    return "\n".join(
+        filter(
+            None,
+            [
+                fields.quality_detail,
+                " ".join(filter(None, [size_info, seeders_info])),
+                languages_str,
+                source_info,
+            ],
+        )
+    )
+
+
 def _build_stream_entries(
     filtered_streams: list[AnyStreamData],
     user_data: UserData,
@@ -757,10 +1073,68 @@ def _build_stream_entries(
     addon_name: str,
     base_proxy_url_template: str,
 ) -> list[Stream] | list[RichStream]:
-    """Build Stremio stream entries for a single provider from filtered streams."""
-    stream_list = []
+    """Build Stremio stream entries for a single provider from filtered streams.
+
+    Runs in two stages: template contexts are built for every stream and episode
+    variant (sharing the per-response values), then the name and description
+    templates are rendered for the whole batch at once.
+    """
     stream_template = user_data.stream_template or StreamTemplate()
 
+    # Per-response values, resolved once instead of per stream
+    if is_youtube:
+        stream_type = "youtube"
+    elif is_http:
+        stream_type = "http"
+    elif is_telegram:
+        stream_type = "telegram"
+    elif is_usenet:
+        stream_type = "usenet"
+    else:
+        stream_type = "torrent"
+
+    if current_provider:
+        service_name = current_provider.service
+        service_short_name = STREAMING_PROVIDERS_SHORT_NAMES.get(current_provider.service, streaming_provider_name)
+    elif is_telegram:
+        service_name = "telegram"
+        service_short_name = "TG"
+    elif is_http:
+        service_name = "http"
+        service_short_name = "WEB"
+    elif is_youtube:
+        service_name = "youtube"
+        service_short_name = "YT"
+    else:
+        service_name = "p2p"
+        service_short_name = "P2P"
+
+    response_context = {
+        "type": stream_type,
+        "provider_type": (
+            "direct"
+            if (is_telegram or is_http or is_youtube)
+            else ("debrid" if current_provider is not None else "p2p")
+        ),
+        "proxied": bool(
+            current_provider
+            and user_data.mediaflow_config
+            and user_data.mediaflow_config.proxy_url
+            and user_data.mediaflow_config.api_password
+            and current_provider.use_mediaflow
+        ),
+        # One shared (read-only) list for the always-empty AIOStreams fields
+        "empty_list": [],
+    }
+    service_base = {"name": service_name, "shortName": service_short_name}
+    service_contexts: dict = {}
+    addon_context = {"name": addon_name}
+    binge_group_prefix = f"{settings.addon_name.replace(' ', '-')}-"
+    telegram_url_prefix = f"{settings.host_url}/streaming_provider/{secret_str}/telegram"
+    episode_path = f"/{season}/{episode}"
+
+    # Stage 1: resolve URLs and build template contexts for every entry
+    pending: list[_PendingStreamEntry] = []
     for stream_data in filtered_streams:
         # Get episode file variants for series content
         # Torrent/Usenet have get_episode_files(); Telegram/HTTP use direct attributes
@@ -775,6 +1149,7 @@ def _build_stream_entries(
         if is_series and not episode_variants:
             continue
 
+        fields = None
         for episode_data in episode_variants:
             if episode_data:
                 file_name = episode_data.filename
@@ -797,78 +1172,13 @@ def _build_stream_entries(
             # make sure file_name is basename
             file_name = basename(file_name) if file_name else None
 
-            # Compute quality_detail - use getattr for attributes not present on all stream types
-            hdr_display_formats = [
-                h for h in (getattr(stream_data, "filtered_hdr_formats", None) or []) if h != "Unknown"
-            ]
-            audio_formats = getattr(stream_data, "audio_formats", []) or []
-            quality_detail = " ".join(
-                filter(
-                    None,
-                    [
-                        f"🎨 {'|'.join(hdr_display_formats)}" if hdr_display_formats else None,
-                        f"📺 {stream_data.quality}" if stream_data.quality else None,
-                        f"🎞️ {stream_data.codec}" if stream_data.codec else None,
-                        f"🎵 {'|'.join(audio_formats)}" if audio_formats else None,
-                    ],
-                )
-            )
-
-            resolution = stream_data.resolution.upper() if stream_data.resolution else "N/A"
-            # Only show cache status when there's a debrid provider
-            if has_streaming_provider:
-                streaming_provider_status = "⚡️" if getattr(stream_data, "cached", False) else "⏳"
-            else:
-                streaming_provider_status = ""  # P2P mode - no cache status
-            # seeders is torrent-specific; usenet has grabs; telegram/http have neither
-            seeders = getattr(stream_data, "seeders", None)
-            seeders_info = f"👤 {seeders}" if seeders is not None else None
-            stream_size = stream_data.size or 0
-            if episode_data and episode_data.size:
-                file_size = episode_data.size
-                size_info = f"{convert_bytes_to_readable(file_size)} / {convert_bytes_to_readable(stream_size)}"
-            else:
-                file_size = stream_size
-                size_info = convert_bytes_to_readable(file_size)
-
-            # Language names for display
-            languages = getattr(stream_data, "languages", []) or []
-            display_languages = list(languages)
-            # Language flags for template
-            language_flags = list(
-                filter(
-                    None,
-                    [const.LANGUAGE_COUNTRY_FLAGS.get(lang) for lang in languages],
-                )
-            )
-
-            languages_str = f"🌐 {' + '.join(display_languages)}" if display_languages else None
-            source_info = f"🔗 {stream_data.source}"
-            uploader = getattr(stream_data, "uploader", None)
-            if uploader:
-                source_info += f" 🧑‍💻 {uploader}"
-
-            description = "\n".join(
-                filter(
-                    None,
-                    [
-                        quality_detail,
-                        " ".join(filter(None, [size_info, seeders_info])),
-                        languages_str,
-                        source_info,
-                    ],
-                )
-            )
-
             # Build the stream URL
             stream_url = None
             nzb_direct_url = None
             info_hash = None
             file_idx = None
             sources = None
-            stream_id = None
 
-            # Handle Telegram streams differently
             if is_youtube:
                 # YouTube: use ytId field — no URL needed
                 stream_id = stream_data.video_id
@@ -883,7 +1193,7 @@ def _build_stream_entries(
                 if chat_id and msg_id:
                     # Telegram streams don't need debrid provider - direct playback
                     # Route is: /streaming_provider/{secret_str}/telegram/{chat_id}/{message_id}
-                    stream_url = f"{settings.host_url}/streaming_provider/{secret_str}/telegram/{chat_id}/{msg_id}"
+                    stream_url = f"{telegram_url_prefix}/{chat_id}/{msg_id}"
                     stream_id = f"{chat_id}:{msg_id}"
                 else:
                     # Skip if missing required fields
@@ -903,7 +1213,7 @@ def _build_stream_entries(
                 elif has_streaming_provider:
                     stream_url = base_proxy_url_template.format(stream_id)
                     if episode_data:
-                        stream_url += f"/{season}/{episode}"
+                        stream_url += episode_path
                     if file_name:
                         stream_url += f"/{quote(file_name, safe='')}"
                     # Mark addon playback URLs so backend can apply per-provider MediaFlow toggle only here.
@@ -917,7 +1227,7 @@ def _build_stream_entries(
                 if has_streaming_provider:
                     stream_url = base_proxy_url_template.format(stream_id)
                     if episode_data:
-                        stream_url += f"/{season}/{episode}"
+                        stream_url += episode_path
                     if file_name:
                         stream_url += f"/{quote(file_name, safe='')}"
                     # Mark addon playback URLs so backend can apply per-provider MediaFlow toggle only here.
@@ -928,23 +1238,18 @@ def _build_stream_entries(
                     announce_list = getattr(stream_data, "announce_list", None) or TRACKERS
                     sources = [f"tracker:{tracker}" for tracker in announce_list] + [f"dht:{stream_data.info_hash}"]
 
-            # Build context for template rendering
-            if is_youtube:
-                stream_type = "youtube"
-            elif is_http:
-                stream_type = "http"
-            elif is_telegram:
-                stream_type = "telegram"
-            elif is_usenet:
-                stream_type = "usenet"
+            if fields is None:
+                fields = _build_stream_entry_fields(
+                    stream_data, has_streaming_provider, response_context, service_contexts, service_base
+                )
+
+            if episode_data and episode_data.size:
+                file_size = episode_data.size
+                size_info = f"{convert_bytes_to_readable(file_size)} / {fields.stream_size_display}"
             else:
-                stream_type = "torrent"
+                file_size = fields.stream_size
+                size_info = fields.stream_size_display
 
-            cached = getattr(stream_data, "cached", False)
-            geo_restriction_label = format_geo_restriction_label(
-                getattr(stream_data, "geo_restriction_type", None),
-                getattr(stream_data, "geo_restriction_countries", None),
-            )
             file_extension = None
             folder_name = None
             if file_name:
@@ -954,236 +1259,137 @@ def _build_stream_entries(
                 else:
                     folder_name = file_name
 
-            language_codes = [code for code in (_get_language_code(lang) for lang in display_languages) if code]
-            small_language_codes = [code.lower() for code in language_codes]
-            age, age_hours = _calculate_age_fields(getattr(stream_data, "created_at", None))
-            compatibility_year = _extract_year_from_text(stream_data.name)
-            compatibility_season = (
+            # Single-variant streams (movies, most series hits) reuse the base context directly
+            stream_context = fields.base_context if len(episode_variants) == 1 else fields.base_context.copy()
+            stream_context["filename"] = file_name
+            stream_context["size"] = file_size
+            stream_context["season"] = (
                 getattr(episode_data, "season_number", None)
                 if episode_data is not None
                 else (season if is_series else None)
             )
-            compatibility_episode = (
+            stream_context["episode"] = (
                 getattr(episode_data, "episode_number", None)
                 if episode_data is not None
                 else (episode if is_series else None)
             )
-            compatibility_duration = getattr(stream_data, "duration_seconds", None) or getattr(
-                stream_data, "duration", None
-            )
-            compatibility_bitrate = getattr(stream_data, "bitrate", None)
-            if compatibility_bitrate is None:
-                bitrate_kbps = getattr(stream_data, "bitrate_kbps", None)
-                if bitrate_kbps is not None:
-                    compatibility_bitrate = bitrate_kbps * 1000
-            provider_type = (
-                "direct"
-                if (is_telegram or is_http or is_youtube)
-                else ("debrid" if current_provider is not None else "p2p")
-            )
-            stream_is_private = getattr(stream_data, "torrent_type", TorrentType.PUBLIC) != TorrentType.PUBLIC
-            mediaflow_proxied = bool(
-                current_provider
-                and user_data.mediaflow_config
-                and user_data.mediaflow_config.proxy_url
-                and user_data.mediaflow_config.api_password
-                and current_provider.use_mediaflow
-            )
-            stream_context = {
-                "name": stream_data.name,
-                "filename": file_name,
-                "type": stream_type,
-                "resolution": resolution,
-                "quality": getattr(stream_data, "quality", None),
-                "codec": getattr(stream_data, "codec", None),
-                "bit_depth": getattr(stream_data, "bit_depth", None),
-                "audio_formats": list(audio_formats),
-                "channels": list(getattr(stream_data, "channels", []) or []),
-                "hdr_formats": list(hdr_display_formats),
-                "languages": display_languages,
-                "language_flags": language_flags,
-                "size": file_size,
-                "seeders": seeders,
-                "source": stream_data.source,
-                "release_group": getattr(stream_data, "release_group", None),
-                "uploader": uploader,
-                "cached": cached,
-                "geo_restriction": geo_restriction_label,
-                # AIOStreams compatibility fields (best-effort)
-                "title": stream_data.name,
-                "year": compatibility_year,
-                "season": compatibility_season,
-                "episode": compatibility_episode,
-                "folderName": folder_name,
-                "folderSize": stream_size,
-                "library": False,
-                "languageEmojis": list(language_flags),
-                "languageCodes": language_codes,
-                "smallLanguageCodes": small_language_codes,
-                "uLanguages": [],
-                "uLanguageEmojis": [],
-                "uLanguageCodes": [],
-                "uSmallLanguageCodes": [],
-                "wedontknowwhatakilometeris": list(language_flags),
-                "uWedontknowwhatakilometeris": [],
-                "visualTags": list(hdr_display_formats),
-                "audioTags": list(audio_formats),
-                "releaseGroup": getattr(stream_data, "release_group", None),
-                "regexScore": None,
-                "nRegexScore": None,
-                "encode": getattr(stream_data, "codec", None),
-                "audioChannels": list(getattr(stream_data, "channels", []) or []),
-                "indexer": getattr(stream_data, "indexer", None) or stream_data.source,
-                "private": stream_is_private,
-                "duration": compatibility_duration,
-                "bitrate": compatibility_bitrate,
-                "infoHash": getattr(stream_data, "info_hash", None),
-                "age": age,
-                "ageHours": age_hours,
-                "message": None,
-                "proxied": mediaflow_proxied,
-                "edition": None,
-                "remastered": bool(getattr(stream_data, "is_remastered", False)),
-                "repack": bool(getattr(stream_data, "is_repack", False)),
-                "uncensored": False,
-                "unrated": False,
-                "upscaled": bool(getattr(stream_data, "is_upscaled", False)),
-                "network": None,
-                "container": file_extension,
-                "extension": file_extension,
-                "seadex": False,
-                "seadexBest": False,
-                "provider_type": provider_type,
-            }
-            if current_provider:
-                service_name = current_provider.service
-                service_short_name = STREAMING_PROVIDERS_SHORT_NAMES.get(
-                    current_provider.service, streaming_provider_name
-                )
-            elif is_telegram:
-                service_name = "telegram"
-                service_short_name = "TG"
-            elif is_http:
-                service_name = "http"
-                service_short_name = "WEB"
-            elif is_youtube:
-                service_name = "youtube"
-                service_short_name = "YT"
-            else:
-                service_name = "p2p"
-                service_short_name = "P2P"
-
-            service_context = {
-                "name": service_name,
-                "shortName": service_short_name,
-                "cached": cached if has_streaming_provider else False,
-            }
-            addon_context = {"name": addon_name}
-
-            try:
-                stream_name = render_stream_template(
-                    stream_template.title,
-                    stream_context,
-                    service=service_context,
-                    addon=addon_context,
+            stream_context["folderName"] = folder_name
+            stream_context["container"] = file_extension
+            stream_context["extension"] = file_extension
+
+            pending.append(
+                _PendingStreamEntry(
+                    fields=fields,
+                    context={"stream": stream_context, "service": fields.service_context, "addon": addon_context},
+                    file_name=file_name,
+                    file_size=file_size,
+                    size_info=size_info,
+                    stream_id=stream_id,
+                    stream_url=stream_url,
+                    nzb_direct_url=nzb_direct_url,
+                    info_hash=info_hash,
+                    file_idx=file_idx,
+                    sources=sources,
                 )
-                description = render_stream_template(
-                    stream_template.description,
-                    stream_context,
-                    service=service_context,
-                    addon=addon_context,
-                )
-            except Exception as e:
-                # Fall back to hardcoded format if template fails
-                logging.warning(f"Template rendering failed: {e}")
-                if has_streaming_provider:
-                    if is_usenet:
-                        stream_name = (
-                            f"{addon_name} 📰 {streaming_provider_name} {resolution} {streaming_provider_status}"
-                        )
-                    else:
-                        stream_name = (
-                            f"{addon_name} 🧲 {streaming_provider_name} {resolution} {streaming_provider_status}"
-                        )
-                else:
-                    stream_name = f"{addon_name} {resolution}"
-
-            # Geo-restricted YouTube streams should be clearly labeled so users
-            # in other countries can understand why playback may fail.
-            if is_youtube and geo_restriction_label:
-                if geo_restriction_label not in stream_name:
-                    stream_name = f"{stream_name} | {geo_restriction_label}"
-                if geo_restriction_label not in description:
-                    description = f"{geo_restriction_label}\n{description}" if description else geo_restriction_label
-
-            # Create the Stremio Stream object
-            stremio_stream = Stream(
-                name=stream_name,
-                description=description,
-                url=stream_url,
-                nzbUrl=nzb_direct_url,
-                ytId=stream_data.video_id if is_youtube else None,
-                infoHash=info_hash,
-                fileIdx=file_idx,
-                sources=sources,
-                behaviorHints=StreamBehaviorHints(
-                    bingeGroup=f"{settings.addon_name.replace(' ', '-')}-{quality_detail}-{resolution}",
-                    filename=file_name or stream_data.name,
-                    videoSize=file_size or None,
-                ),
             )
 
-            if return_rich:
-                # Create rich metadata for frontend
-                # Determine appropriate seeders/grabs metric per stream type
+    # Stage 2: render both templates for every entry in one pass
+    rendered = render_stream_templates_batch(
+        stream_template.title, stream_template.description, [entry.context for entry in pending]
+    )
+
+    stream_list = []
+    for entry, rendered_entry in zip(pending, rendered):
+        fields = entry.fields
+        stream_data = fields.stream_data
+        if rendered_entry is not None:
+            stream_name, description = rendered_entry
+        else:
+            # Fall back to hardcoded format if template fails
+            description = _fallback_stream_description(fields, entry.size_info)
+            if has_streaming_provider:
                 if is_usenet:
-                    rich_seeders = getattr(stream_data, "grabs", 0) or 0
+                    stream_name = (
+                        f"{addon_name} 📰 {streaming_provider_name} {fields.resolution} {fields.provider_status}"
+                    )
                 else:
-                    rich_seeders = seeders or 0
-                video_height, video_width = _resolution_to_dimensions(stream_data.resolution)
-                rich_metadata = RichStreamMetadata(
-                    id=stream_id,
-                    info_hash=stream_id,  # For Usenet this is nzb_guid, for Telegram chat:msg
-                    name=stream_data.name,
-                    resolution=stream_data.resolution,
-                    quality=getattr(stream_data, "quality", None),
-                    codec=getattr(stream_data, "codec", None),
-                    bit_depth=getattr(stream_data, "bit_depth", None),
-                    audio_formats=list(audio_formats),
-                    channels=list(getattr(stream_data, "channels", []) or []),
-                    hdr_formats=list(hdr_display_formats),
-                    is_remastered=bool(getattr(stream_data, "is_remastered", False)),
-                    is_upscaled=bool(getattr(stream_data, "is_upscaled", False)),
-                    is_proper=bool(getattr(stream_data, "is_proper", False)),
-                    is_repack=bool(getattr(stream_data, "is_repack", False)),
-                    is_extended=bool(getattr(stream_data, "is_extended", False)),
-                    is_complete=bool(getattr(stream_data, "is_complete", False)),
-                    is_dubbed=bool(getattr(stream_data, "is_dubbed", False)),
-                    is_subbed=bool(getattr(stream_data, "is_subbed", False)),
-                    source=stream_data.source or "Unknown",
-                    languages=list(languages),
-                    size=file_size,
-                    size_display=size_info.replace("💾 ", "") if size_info else None,
-                    seeders=rich_seeders,
-                    uploader=uploader or getattr(stream_data, "poster", None),
-                    uploaded_at=stream_data.created_at.isoformat() if stream_data.created_at else None,
-                    cached=cached,
-                    stream_type=stream_type,
-                    provider_name=(
-                        current_provider.service
-                        if current_provider
-                        else (
-                            "telegram" if is_telegram else ("http" if is_http else ("youtube" if is_youtube else "p2p"))
-                        )
-                    ),
-                    provider_short_name=streaming_provider_name,
-                    filename=file_name or stream_data.name,
-                    video_width=video_width,
-                    video_height=video_height,
-                )
-                stream_list.append(RichStream(stream=stremio_stream, metadata=rich_metadata))
+                    stream_name = (
+                        f"{addon_name} 🧲 {streaming_provider_name} {fields.resolution} {fields.provider_status}"
+                    )
             else:
-                stream_list.append(stremio_stream)
+                stream_name = f"{addon_name} {fields.resolution}"
+
+        # Geo-restricted YouTube streams should be clearly labeled so users
+        # in other countries can understand why playback may fail.
+        geo_restriction_label = fields.geo_restriction_label
+        if is_youtube and geo_restriction_label:
+            if geo_restriction_label not in stream_name:
+                stream_name = f"{stream_name} | {geo_restriction_label}"
+            if geo_restriction_label not in description:
+                description = f"{geo_restriction_label}\n{description}" if description else geo_restriction_label
+
+        # Create the Stremio Stream object
+        stremio_stream = Stream(
+            name=stream_name,
+            description=description,
+            url=entry.stream_url,
+            nzbUrl=entry.nzb_direct_url,
+            ytId=stream_data.video_id if is_youtube else None,
+            infoHash=entry.info_hash,
+            fileIdx=entry.file_idx,
+            sources=entry.sources,
+            behaviorHints=StreamBehaviorHints(
+                bingeGroup=f"{binge_group_prefix}{fields.quality_detail}-{fields.resolution}",
+                filename=entry.file_name or stream_data.name,
+                videoSize=entry.file_size or None,
+            ),
+        )
+
+        if return_rich:
+            # Create rich metadata for frontend
+            # Determine appropriate seeders/grabs metric per stream type
+            if is_usenet:
+                rich_seeders = getattr(stream_data, "grabs", 0) or 0
+            else:
+                rich_seeders = fields.seeders or 0
+            video_height, video_width = _resolution_to_dimensions(stream_data.resolution)
+            rich_metadata = RichStreamMetadata(
+                id=entry.stream_id,
+                info_hash=entry.stream_id,  # For Usenet this is nzb_guid, for Telegram chat:msg
+                name=stream_data.name,
+                resolution=stream_data.resolution,
+                quality=getattr(stream_data, "quality", None),
+                codec=getattr(stream_data, "codec", None),
+                bit_depth=getattr(stream_data, "bit_depth", None),
+                audio_formats=fields.audio_formats,
+                channels=fields.channels,
+                hdr_formats=fields.hdr_display_formats,
+                is_remastered=bool(getattr(stream_data, "is_remastered", False)),
+                is_upscaled=bool(getattr(stream_data, "is_upscaled", False)),
+                is_proper=bool(getattr(stream_data, "is_proper", False)),
+                is_repack=bool(getattr(stream_data, "is_repack", False)),
+                is_extended=bool(getattr(stream_data, "is_extended", False)),
+                is_complete=bool(getattr(stream_data, "is_complete", False)),
+                is_dubbed=bool(getattr(stream_data, "is_dubbed", False)),
+                is_subbed=bool(getattr(stream_data, "is_subbed", False)),
+                source=stream_data.source or "Unknown",
+                languages=fields.languages,
+                size=entry.file_size,
+                size_display=entry.size_info.replace("💾 ", "") if entry.size_info else None,
+                seeders=rich_seeders,
+                uploader=fields.uploader or getattr(stream_data, "poster", None),
+                uploaded_at=stream_data.created_at.isoformat() if stream_data.created_at else None,
+                cached=fields.cached,
+                stream_type=stream_type,
+                provider_name=service_name,
+                provider_short_name=streaming_provider_name,
+                filename=entry.file_name or stream_data.name,
+                video_width=video_width,
+                video_height=video_height,
+            )
+            stream_list.append(RichStream(stream=stremio_stream, metadata=rich_metadata))
+        else:
+            stream_list.append(stremio_stream)
 
     return stream_list
 
@@ -1453,7 +1659,6 @@ async def generate_manifest(user_data: UserData, genres: dict) -> dict:
         return {}
 
 
-@functools.lru_cache(maxsize=1024)
 def is_contain_18_plus_keywords(title: str) -> bool:
     """
     Check if the title contains 18+ keywords to filter out adult content.
@@ -1461,34 +1666,15 @@ def is_contain_18_plus_keywords(title: str) -> bool:
     if not settings.adult_content_filter_in_torrent_title:
         return False
 
-    return ADULT_PARSER.parse(title).get("adult", False)
+    return detect_adult_title(title)
 
 
-# Shared blocklist / allowlist for filtering non-video torrent titles.
-# Used by both Scrapy spiders and indexer scrapers.
-# fmt: off
-NON_VIDEO_BLOCKLIST_KEYWORDS = [
-    ".exe", ".zip", ".rar", ".iso", ".bin", ".tar", ".7z", ".pdf", ".xyz",
-    ".epub", ".mobi", ".azw3", ".doc", ".docx", ".txt", ".rtf",
-    ".flac", ".mp3", ".m4a", ".wv", ".ape",
-    "[flac", "(flac",  # common music release tagging, e.g. (2026)[Flac 24-48]
-    "setup", "install", "crack", "patch", "trainer", "readme",
-    "manual", "keygen", "license", "tutorial", "ebook", "software", "book",
-    "repack", "fitgirl",
-]
-
-VIDEO_ALLOWLIST_KEYWORDS = [
-    "mkv", "mp4", "avi", ".webm", ".mov", ".flv", "webdl", "web-dl", "webrip", "bluray",
-    "brrip", "bdrip", "dvdrip", "hdtv", "hdcam", "hdrip", "1080p", "720p", "480p", "360p",
-    "2160p", "4k", "x264", "x265", "hevc", "h264", "h265", "aac", "xvid", "movie", "series", "season",
-]
-# fmt: on
-
-
-def is_non_video_title(title: str) -> bool:
-    """Return True if the title looks like a game, application, or other non-video content."""
-    lower = title.lower()
-    return any(kw in lower for kw in NON_VIDEO_BLOCKLIST_KEYWORDS)
+def _is_adult_stream(stream: AnyStreamData) -> bool:
+    """Use the adult flag persisted at ingest, parsing the name only for unflagged streams."""
+    is_adult = getattr(stream, "is_adult", None)
+    if is_adult is None:
+        return is_contain_18_plus_keywords(stream.name)
+    return is_adult
 
 
 def calculate_max_similarity_ratio(torrent_title: str, title: str, aka_titles: list[str] | None = None) -> int:
@@ -1624,6 +1810,41 @@ def render_stream_template(
     return engine_render_template(template, context)
 
 
+def render_stream_templates_batch(
+    title_template: str,
+    description_template: str,
+    contexts: list[dict],
+) -> list[tuple[str, str] | None]:
+    """
+    Render the title and description templates for a whole response in one call.
+
+    Both templates are looked up in the template cache once rather than per stream.
+
+    Args:
+        title_template: Stream name template
+        description_template: Stream description template
+        contexts: Prebuilt render contexts with stream, service and addon entries
+
+    Returns:
+        A (name, description) pair per context, or None where rendering failed
+    """
+    try:
+        render_title = get_compiled_template(title_template).render
+        render_description = get_compiled_template(description_template).render
+    except Exception as e:
+        logging.warning(f"Template rendering failed: {e}")
+        return [None] * len(contexts)
+
+    rendered: list[tuple[str, str] | None] = []
+    for context in contexts:
+        try:
+            rendered.append((render_title(context), render_description(context)))
+        except Exception as e:
+            logging.warning(f"Template rendering failed: {e}")
+            rendered.append(None)
+    return rendered
+
+
 def format_stream_for_stremio(
     stream: Any,
     user_data: Optional["UserData"] = None,
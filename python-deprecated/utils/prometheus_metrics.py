@@ -77,6 +77,159 @@ DB_POOL_ERRORS_TOTAL = Counter(
 )
 
 
+# ---------------------------------------------------------------------------
+# Debrid HTTP connection pool metrics (labeled by provider id)
+# ---------------------------------------------------------------------------
+
+DEBRID_HTTP_CONNECTIONS_CREATED_TOTAL = Counter(
+    "debrid_http_connections_created_total",
+    "New debrid API connections opened (each pays a TCP/TLS handshake)",
+    ["provider"],
+)
+
+DEBRID_HTTP_CONNECTIONS_REUSED_TOTAL = Counter(
+    "debrid_http_connections_reused_total",
+    "Debrid API requests served on a pooled keep-alive connection",
+    ["provider"],
+)
+
+
+# ---------------------------------------------------------------------------
+# Stream template compile cache metrics
+# ---------------------------------------------------------------------------
+
+TEMPLATE_CACHE_HITS_TOTAL = Counter(
+    "template_cache_hits_total",
+    "Compiled stream template cache hits",
+)
+
+TEMPLATE_CACHE_MISSES_TOTAL = Counter(
+    "template_cache_misses_total",
+    "Compiled stream template cache misses (template compiled)",
+)
+
+TEMPLATE_CACHE_EVICTIONS_TOTAL = Counter(
+    "template_cache_evictions_total",
+    "Compiled stream templates evicted by the LRU size/byte limits",
+)
+
+TEMPLATE_CACHE_ENTRIES = Gauge(
+    "template_cache_entries",
+    "Compiled stream templates currently cached",
+)
+
+TEMPLATE_CACHE_BYTES = Gauge(
+    "template_cache_bytes",
+    "Template source bytes held by the compiled template cache",
+)
+
+# ---------------------------------------------------------------------------
+# Stream payload cache tiers (in-process L1 in front of Redis)
+# ---------------------------------------------------------------------------
+
+STREAM_CACHE_LOOKUPS_TOTAL = Counter(
+    "stream_cache_lookups_total",
+    "Stream payload cache lookups by cache (stream_data, media_ids), tier (l1, redis) and result (hit, miss)",
+    ["cache", "tier", "result"],
+)
+
+STREAM_L1_CACHE_EVICTIONS_TOTAL = Counter(
+    "stream_l1_cache_evictions_total",
+    "In-process stream cache entries evicted by the LRU size/byte limits",
+)
+
+STREAM_L1_CACHE_ENTRIES = Gauge(
+    "stream_l1_cache_entries",
+    "Decoded payloads currently held by the in-process stream cache",
+)
+
+STREAM_L1_CACHE_BYTES = Gauge(
+    "stream_l1_cache_bytes",
+    "Estimated (serialized JSON) bytes held by the in-process stream cache",
+)
+
+STREAM_CACHE_FILLS_TOTAL = Counter(
+    "stream_cache_fills_total",
+    "Stream cache misses by how they were filled: db (this request queried Postgres), "
+    "local (joined an in-flight fill in this worker), remote (read the fill of another worker's lease)",
+    ["source"],
+)
+
+# ---------------------------------------------------------------------------
+# Stale-while-revalidate response caches (utils/swr_cache.py)
+# ---------------------------------------------------------------------------
+
+STALE_CACHE_SERVED_TOTAL = Counter(
+    "stale_cache_served_total",
+    "Cache hits served past their soft expiry, by cache (stream_data, meta, catalog)",
+    ["cache"],
+)
+
+STALE_CACHE_REFRESHES_TOTAL = Counter(
+    "stale_cache_refreshes_total",
+    "Background refreshes of soft-expired cache entries by cache and result (ok, error, skipped)",
+    ["cache", "result"],
+)
+
+# ---------------------------------------------------------------------------
+# Debrid negative cache (workers/providers/negative_cache.py)
+# ---------------------------------------------------------------------------
+
+DEBRID_NEGATIVE_CACHE_LOOKUPS_TOTAL = Counter(
+    "debrid_negative_cache_lookups_total",
+    "Info hashes checked against the negative cache by scope (remote, provider) and result (skipped, checked)",
+    ["scope", "result"],
+)
+
+DEBRID_NEGATIVE_CACHE_AUDITS_TOTAL = Counter(
+    "debrid_negative_cache_audits_total",
+    "Sampled negative cache positives looked up anyway, by scope and result (confirmed, false_positive)",
+    ["scope", "result"],
+)
+
+DEBRID_NEGATIVE_CACHE_ESTIMATED_FPR = Gauge(
+    "debrid_negative_cache_estimated_fpr",
+    "Estimated false-positive rate of the current negative cache partition",
+    ["scope", "service"],
+)
+
+# ---------------------------------------------------------------------------
+# Exception tracker (utils/exception_tracker.py)
+# ---------------------------------------------------------------------------
+
+EXCEPTION_TRACKER_DROPPED_TOTAL = Counter(
+    "exception_tracker_dropped_total",
+    "Exception occurrences not recorded in Redis, by reason (queue_full, flush_error)",
+    ["reason"],
+)
+
+
+# ---------------------------------------------------------------------------
+# PTT title parse cache (utils/ptt_cache.py)
+# ---------------------------------------------------------------------------
+
+PTT_PARSE_CACHE_LOOKUPS_TOTAL = Counter(
+    "ptt_parse_cache_lookups_total",
+    "Title parse cache lookups by tier (memory, disk, redis) and result (hit, miss)",
+    ["tier", "result"],
+)
+
+PTT_PARSE_CACHE_ENTRIES = Gauge(
+    "ptt_parse_cache_entries",
+    "Parse results held by the in-process title parse cache",
+)
+
+# ---------------------------------------------------------------------------
+# Bulk torrent stream inserts (db/crud/stream_bulk_ingest.py)
+# ---------------------------------------------------------------------------
+
+STREAM_BULK_INSERT_STAGE_SECONDS = Histogram(
+    "stream_bulk_insert_stage_seconds",
+    "Duration of bulk torrent stream insert stages (stage, streams, links, files)",
+    ["stage"],
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0],
+)
+
 # ---------------------------------------------------------------------------
 # Recording helpers
 # ---------------------------------------------------------------------------
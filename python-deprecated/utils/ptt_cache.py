@@ -0,0 +1,219 @@
+"""
+Memoized PTT title parsing shared by scrapers, workers and API import paths.
+
+The same release names reach ``PTT.parse_title`` from many scrapers and on every
+re-scrape, and a parse costs far more than a dictionary lookup. ``parse_title_cached``
+keeps results in a bounded per-process LRU and, optionally, in a second tier shared
+between processes (``ptt_parse_cache_tier``):
+
+- ``disk``: an SQLite file per host (``ptt_parse_cache_disk_path``), cheap to read from
+  any thread, bounded to ``ptt_parse_cache_disk_max_entries`` rows.
+- ``redis``: ``ptt:{digest}`` keys with ``ptt_parse_cache_redis_ttl_seconds``. Lookups use the
+  sync client, so this tier is skipped on threads running an event loop and only serves
+  worker threads, Scrapy pipelines and scripts.
+
+Results are stored as compact orjson bytes and decoded per call, so callers get a
+fresh dict they are free to mutate. Keys include the installed parsett version, so
+upgrading the parser does not serve results of the old one.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from functools import cache
+from importlib import metadata
+
+import orjson
+import PTT
+from redis.exceptions import RedisError
+
+from db.config import settings
+from db.redis_database import REDIS_SYNC_CLIENT
+from utils.prometheus_metrics import PTT_PARSE_CACHE_ENTRIES, PTT_PARSE_CACHE_LOOKUPS_TOTAL
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "ptt:"
+# Rows written between trims of the disk tier back to its size limit
+_DISK_TRIM_EVERY = 1024
+
+
+def _parser_version() -> str:
+    try:
+        return metadata.version("parsett")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+_KEY_SALT = f"{_parser_version()}\x00".encode()
+
+
+def _cache_key(title: str, translate_langs: bool) -> bytes:
+    return hashlib.blake2b(
+        _KEY_SALT + (b"1\x00" if translate_langs else b"0\x00") + title.encode(), digest_size=16
+    ).digest()
+
+
+class ParsedTitleCache:
+    """Per-process LRU of serialized parse results keyed by title digest."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: bytes) -> bytes | None:
+        with self._lock:
+            blob = self._entries.get(key)
+            if blob is not None:
+                self._entries.move_to_end(key)
+        PTT_PARSE_CACHE_LOOKUPS_TOTAL.labels(tier="memory", result="miss" if blob is None else "hit").inc()
+        return blob
+
+    def put(self, key: bytes, blob: bytes) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = blob
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            PTT_PARSE_CACHE_ENTRIES.set(len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            PTT_PARSE_CACHE_ENTRIES.set(0)
+
+
+class DiskTier:
+    """SQLite-backed second tier shared by the processes of one host."""
+
+    name = "disk"
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread and process: sqlite3 connections are not fork- or thread-safe
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=0.1, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute("CREATE TABLE IF NOT EXISTS parsed (key BLOB PRIMARY KEY, value BLOB NOT NULL)")
+            self._local.conn, self._local.pid, self._local.writes = conn, os.getpid(), 0
+        return conn
+
+    def get(self, key: bytes) -> bytes | None:
+        try:
+            row = self._connection().execute("SELECT value FROM parsed WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as exc:
+            logger.debug("PTT disk cache read failed: %s", exc)
+            return None
+        return row[0] if row else None
+
+    def set(self, key: bytes, blob: bytes) -> None:
+        try:
+            conn = self._connection()
+            conn.execute("INSERT OR REPLACE INTO parsed (key, value) VALUES (?, ?)", (key, blob))
+            self._local.writes += 1
+            if self._local.writes % _DISK_TRIM_EVERY == 0:
+                # Rowids grow with inserts, so this drops the oldest rows past the limit
+                conn.execute(
+                    "DELETE FROM parsed WHERE rowid <= (SELECT MAX(rowid) FROM parsed) - ?", (self.max_entries,)
+                )
+        except sqlite3.Error as exc:
+            logger.debug("PTT disk cache write failed: %s", exc)
+
+
+class RedisTier:
+    """Redis-backed second tier; only consulted off the event loop (the client is blocking)."""
+
+    name = "redis"
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def _usable() -> bool:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return True
+        return False
+
+    def get(self, key: bytes) -> bytes | None:
+        if not self._usable():
+            return None
+        try:
+            return REDIS_SYNC_CLIENT.get(f"{REDIS_KEY_PREFIX}{key.hex()}")
+        except RedisError as exc:
+            logger.debug("PTT Redis cache read failed: %s", exc)
+            return None
+
+    def set(self, key: bytes, blob: bytes) -> None:
+        if not self._usable():
+            return
+        try:
+            REDIS_SYNC_CLIENT.set(f"{REDIS_KEY_PREFIX}{key.hex()}", blob, ex=self.ttl_seconds)
+        except RedisError as exc:
+            logger.debug("PTT Redis cache write failed: %s", exc)
+
+
+@cache
+def _second_tier() -> DiskTier | RedisTier | None:
+    if settings.ptt_parse_cache_tier == "disk":
+        return DiskTier(settings.ptt_parse_cache_disk_path, settings.ptt_parse_cache_disk_max_entries)
+    if settings.ptt_parse_cache_tier == "redis":
+        return RedisTier(settings.ptt_parse_cache_redis_ttl_seconds)
+    return None
+
+
+_memory_cache = ParsedTitleCache(settings.ptt_parse_cache_max_entries)
+
+
+def parse_title_blob(title: str, translate_langs: bool = False) -> bytes:
+    """Serialized ``PTT.parse_title`` result through the cache tiers."""
+    key = _cache_key(title, translate_langs)
+    blob = _memory_cache.get(key)
+    if blob is None:
+        tier = _second_tier()
+        if tier is not None:
+            blob = tier.get(key)
+            PTT_PARSE_CACHE_LOOKUPS_TOTAL.labels(tier=tier.name, result="miss" if blob is None else "hit").inc()
+        if blob is None:
+            blob = orjson.dumps(PTT.parse_title(title, translate_langs), default=str)
+            if tier is not None:
+                tier.set(key, blob)
+        _memory_cache.put(key, blob)
+    return blob
+
+
+def parse_title_cached(title: str, translate_langs: bool = False) -> dict:
+    """``PTT.parse_title`` through the parse cache; returns a new dict on every call."""
+    return orjson.loads(parse_title_blob(title, translate_langs))
+
+
+def peek_parsed_title(title: str, translate_langs: bool = False) -> bytes | None:
+    """Serialized result from the in-process tier only, without parsing on a miss."""
+    return _memory_cache.get(_cache_key(title, translate_langs))
+
+
+def remember_parsed_title(title: str, translate_langs: bool, blob: bytes) -> None:
+    """Seed the in-process tier with a result parsed elsewhere (e.g. in utils/ptt_pool.py)."""
+    _memory_cache.put(_cache_key(title, translate_langs), blob)
+
+
+def clear_parse_cache() -> None:
+    """Drop the in-process tier (the shared tier is left alone)."""
+    _memory_cache.clear()
@@ -0,0 +1,178 @@
+"""
+Batched title parsing in a process pool for bulk ingest paths.
+
+DMM hashlist commits, feed scrapes and PTT backfills parse thousands of titles at a
+time. ``PTT.parse_title`` and the adult parser are pure-Python regex work, so running
+them inline stalls every other coroutine of the worker and uses one core.
+``parse_titles_batch`` deduplicates the titles, ships them in chunks of
+``ptt_parse_pool_chunk_size`` to a per-process ``ProcessPoolExecutor`` and returns the
+results in input order. The event loop only awaits the chunks and decodes results,
+so its lag stays bounded whatever the batch size.
+
+Pool processes are spawned (not forked from a process holding an event loop and
+connection pools) and warmed on start so the first chunk does not pay for importing
+and compiling the parsers. Each keeps its own parse cache (utils/ptt_cache.py),
+including the shared second tier, and parsed results are seeded into the calling
+process's LRU so follow-up ``parse_title_cached`` calls for the same titles hit.
+Batches smaller than ``ptt_parse_pool_min_batch`` are parsed inline, where IPC would
+cost more than it saves.
+
+``run_in_parse_pool`` lends the same processes to other CPU-bound ingest steps, such
+as decoding DMM hashlist payloads, so a worker does not keep a second pool around.
+Worker and API shutdown hooks call ``shutdown_parse_pool`` to stop the processes.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+import orjson
+
+from db.config import settings
+from utils import ptt_cache, title_classifier
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Result of one title in a chunk: serialized parse (None if parsing failed) and adult flag
+_ChunkResult = tuple[bytes | None, bool]
+
+_pool: ProcessPoolExecutor | None = None
+_pool_pid: int | None = None
+_pool_workers = 0
+
+
+@dataclass(slots=True)
+class ParsedTitle:
+    """Parse result of one title; ``parsed`` is empty if PTT failed on it."""
+
+    parsed: dict = field(default_factory=dict)
+    is_adult: bool = False
+
+
+def _warm_worker() -> None:
+    # Exercise both parsers once so their patterns are compiled before the first chunk
+    ptt_cache.parse_title_blob("Warm.Up.2024.S01E01.1080p.WEB-DL.x264-GRP", True)
+    title_classifier.detect_adult_title("Warm.Up.2024.1080p")
+
+
+def _parse_chunk(titles: list[str], translate_langs: bool, check_adult: bool) -> list[_ChunkResult]:
+    results: list[_ChunkResult] = []
+    for title in titles:
+        try:
+            blob = ptt_cache.parse_title_blob(title, translate_langs)
+        except Exception as exc:
+            logger.debug("PTT failed to parse %r: %s", title, exc)
+            blob = None
+        try:
+            is_adult = check_adult and title_classifier.detect_adult_title(title)
+        except Exception as exc:
+            logger.debug("Adult parser failed on %r: %s", title, exc)
+            is_adult = False
+        results.append((blob, is_adult))
+    return results
+
+
+def _pool_size() -> int:
+    if settings.ptt_parse_pool_workers:
+        return settings.ptt_parse_pool_workers
+    return max(1, min(4, (os.cpu_count() or 2) - 1))
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool, _pool_pid, _pool_workers
+    if _pool is None or _pool_pid != os.getpid():
+        _pool_workers = _pool_size()
+        _pool = ProcessPoolExecutor(
+            max_workers=_pool_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker,
+        )
+        _pool_pid = os.getpid()
+    return _pool
+
+
+def shutdown_parse_pool() -> None:
+    """Stop the pool processes (they are restarted on the next batch)."""
+    global _pool
+    if _pool is not None and _pool_pid == os.getpid():
+        _pool.shutdown(wait=False, cancel_futures=True)
+    _pool = None
+
+
+async def run_in_parse_pool(func: Callable[..., T], *args: Any) -> T:
+    """Run ``func(*args)`` in a pool process; inline when ``ptt_parse_pool_enabled`` is off.
+
+    ``func`` must be a module-level function importable without side effects, since
+    pool processes are spawned and import it by reference.
+    """
+    global _pool
+    if not settings.ptt_parse_pool_enabled:
+        return func(*args)
+    pool = _get_pool()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+    except BrokenProcessPool:
+        # A pool process died (e.g. OOM-killed); start a new pool for the next call
+        logger.warning("Parse pool broke; running %s inline", func.__name__)
+        if _pool is pool:
+            _pool = None
+        return func(*args)
+
+
+async def _run_chunk(
+    chunk: list[str], translate_langs: bool, check_adult: bool, limiter: asyncio.Semaphore
+) -> list[_ChunkResult]:
+    async with limiter:
+        return await run_in_parse_pool(_parse_chunk, chunk, translate_langs, check_adult)
+
+
+async def parse_titles_batch(
+    titles: Sequence[str], translate_langs: bool = False, *, check_adult: bool = False
+) -> list[ParsedTitle]:
+    """Parse many titles off the event loop; results are in input order.
+
+    ``check_adult`` also runs the adult parser (``is_adult`` is False otherwise, and
+    always when ``adult_content_filter_in_torrent_title`` is off, matching
+    ``is_contain_18_plus_keywords``).
+    """
+    check_adult = check_adult and settings.adult_content_filter_in_torrent_title
+    unique_titles = list(dict.fromkeys(titles))
+
+    # Without an adult check, titles already in this process's LRU need no round trip
+    known: dict[str, _ChunkResult] = {}
+    if not check_adult:
+        for title in unique_titles:
+            blob = ptt_cache.peek_parsed_title(title, translate_langs)
+            if blob is not None:
+                known[title] = (blob, False)
+    pending = [title for title in unique_titles if title not in known]
+
+    if not settings.ptt_parse_pool_enabled or len(pending) < settings.ptt_parse_pool_min_batch:
+        known.update(zip(pending, _parse_chunk(pending, translate_langs, check_adult)))
+    elif pending:
+        chunk_size = settings.ptt_parse_pool_chunk_size
+        chunks = [pending[offset : offset + chunk_size] for offset in range(0, len(pending), chunk_size)]
+        _get_pool()
+        # Keep at most two chunks per pool process in flight
+        limiter = asyncio.Semaphore(2 * _pool_workers)
+        chunk_results = await asyncio.gather(
+            *(_run_chunk(chunk, translate_langs, check_adult, limiter) for chunk in chunks)
+        )
+        for chunk, results in zip(chunks, chunk_results):
+            for title, (blob, is_adult) in zip(chunk, results):
+                if blob is not None:
+                    ptt_cache.remember_parsed_title(title, translate_langs, blob)
+                known[title] = (blob, is_adult)
+
+    return [
+        ParsedTitle(parsed=orjson.loads(blob) if blob is not None else {}, is_adult=is_adult)
+        for blob, is_adult in (known[title] for title in titles)
+    ]
@@ -0,0 +1,108 @@
+"""
+Asyncio-native GCRA (generic cell rate algorithm) rate limiting.
+
+``acquire`` reserves the next slot and awaits until it opens, so callers never block the
+event loop. Limiters come in two flavours:
+
+- ``LocalRateLimiter``: per-process budget, no I/O.
+- ``RedisRateLimiter``: budget shared by every worker through a single Redis key, with the
+  reservation done atomically by a Lua script against the Redis clock. The key includes the
+  budget, so limiters sharing a name but not a budget keep separate state. Falls back to the
+  local limiter if Redis is unavailable.
+"""
+
+import asyncio
+import logging
+import math
+import time
+
+from db.config import settings
+from db.redis_database import REDIS_ASYNC_CLIENT
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_KEY_PREFIX = "rate_limit:scraper:"
+
+# Reserve the next slot for KEYS[1] (theoretical arrival time in ms, GCRA). ARGV[1] is the
+# emission interval and ARGV[2] the burst tolerance, both in ms. Returns the wait in ms.
+_GCRA_RESERVE_SCRIPT = """
+local clock = redis.call('TIME')
+local now = clock[1] * 1000 + math.floor(clock[2] / 1000)
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+local wait = tat - tolerance - now
+if wait < 0 then
+    wait = 0
+end
+local new_tat = tat + interval
+redis.call('SET', KEYS[1], new_tat, 'PX', new_tat - now + interval)
+return wait
+"""
+
+
+class LocalRateLimiter:
+    """Per-process GCRA limiter allowing ``calls`` per ``period`` seconds (bursts up to ``calls``)."""
+
+    def __init__(self, calls: int, period: float):
+        self.emission_interval = period / calls
+        self.tolerance = period - self.emission_interval
+        self._tat = 0.0
+
+    def reserve(self) -> float:
+        """Reserve the next slot and return how long the caller must wait for it."""
+        # No await between read and write: reservations are atomic within the event loop.
+        now = time.monotonic()
+        tat = max(self._tat, now)
+        self._tat = tat + self.emission_interval
+        return max(0.0, tat - self.tolerance - now)
+
+    async def acquire(self) -> float:
+        """Wait for the next slot; returns the time spent waiting in seconds."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+class RedisRateLimiter:
+    """GCRA limiter whose budget is shared across processes through Redis."""
+
+    def __init__(self, key: str, calls: int, period: float):
+        # One GCRA state per budget: a shared TAT advanced with different intervals enforces neither
+        self.key = f"{RATE_LIMIT_KEY_PREFIX}{key}:{calls}:{period:g}"
+        self.local = LocalRateLimiter(calls, period)
+        self._interval_ms = max(1, math.ceil(self.local.emission_interval * 1000))
+        self._tolerance_ms = math.floor(self.local.tolerance * 1000)
+
+    async def acquire(self) -> float:
+        """Wait for the next shared slot; returns the time spent waiting in seconds."""
+        wait_ms = await REDIS_ASYNC_CLIENT.eval(
+            _GCRA_RESERVE_SCRIPT, 1, self.key, self._interval_ms, self._tolerance_ms
+        )
+        if wait_ms is None:
+            logger.warning("Redis rate limiter unavailable for %s, using local budget", self.key)
+            return await self.local.acquire()
+        wait = int(wait_ms) / 1000
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+_limiters: dict[tuple[str, int, float], LocalRateLimiter | RedisRateLimiter] = {}
+
+
+def get_rate_limiter(key: str, calls: int, period: float) -> LocalRateLimiter | RedisRateLimiter:
+    """Return the process-wide limiter for ``key`` using the configured backend."""
+    limiter_key = (key, calls, period)
+    limiter = _limiters.get(limiter_key)
+    if limiter is None:
+        if settings.scraper_rate_limit_backend == "redis":
+            limiter = RedisRateLimiter(key, calls, period)
+        else:
+            limiter = LocalRateLimiter(calls, period)
+        _limiters[limiter_key] = limiter
+    return limiter
@@ -2,7 +2,8 @@
 
 Captures per-request timing via middleware and stores both per-endpoint
 aggregated statistics and a rolling window of recent individual requests
-for the admin dashboard.
+for the admin dashboard. Requests are aggregated in memory per worker and
+flushed to Redis in one pipelined batch every few seconds.
 
 Credential safety:
     - Path params ``secret_str`` / ``existing_secret_str`` are masked.
@@ -21,10 +22,13 @@ Redis keys used:
     req_metrics:uv:{method}:{route}      -- HyperLogLog of per-endpoint unique visitors
 """
 
+import asyncio
 import hashlib
 import logging
 import math
 import uuid
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 
 from db.config import settings
@@ -69,6 +73,158 @@ def _hash_ip(ip: str) -> str:
 # Recording (called from middleware)
 # ============================================
 
+# Merge a flushed batch's min/max into the endpoint hash without a read round trip
+_MERGE_MIN_MAX_SCRIPT = """
+local current = redis.call('HMGET', KEYS[1], 'min_time', 'max_time')
+if not current[1] or tonumber(ARGV[1]) < tonumber(current[1]) then
+    redis.call('HSET', KEYS[1], 'min_time', ARGV[1])
+end
+if not current[2] or tonumber(ARGV[2]) > tonumber(current[2]) then
+    redis.call('HSET', KEYS[1], 'max_time', ARGV[2])
+end
+return 1
+"""
+
+
+@dataclass(slots=True)
+class _EndpointBucket:
+    """Per-endpoint stats accumulated between flushes."""
+
+    method: str
+    route: str
+    total_requests: int = 0
+    total_time: float = 0.0
+    error_count: int = 0
+    min_time: float = float("inf")
+    max_time: float = 0.0
+    last_seen: str = ""
+    last_seen_ts: float = 0.0
+    status_counts: dict[str, int] = field(default_factory=dict)
+    # Latency sorted-set members ("time:uuid_suffix") with their timestamps
+    latency_samples: deque[tuple[str, float]] = field(default_factory=deque)
+    hashed_ips: set[str] = field(default_factory=set)
+
+
+class RequestMetricsBuffer:
+    """In-memory, per-worker aggregate of request metrics.
+
+    ``record_request`` only updates this buffer; ``flush_request_metrics`` writes
+    the accumulated counters, latency samples, visitor hashes and recent requests
+    to Redis in one pipelined batch. The Redis layout is unchanged, so the admin
+    dashboards read the same aggregates. Latency samples per endpoint are capped
+    at the configured latency window (older ones would be trimmed from the sorted
+    set anyway), and the recent-request log at ``request_metrics_max_recent``.
+    """
+
+    def __init__(self):
+        self.endpoints: dict[str, _EndpointBucket] = {}
+        self.global_ips: set[str] = set()
+        self.recent: deque[tuple[str, dict[str, str], float]] = deque(maxlen=settings.request_metrics_max_recent)
+
+    def __len__(self) -> int:
+        return len(self.endpoints)
+
+    def add(
+        self,
+        method: str,
+        path: str,
+        route: str,
+        status_code: int,
+        process_time: float,
+        hashed_ip: str | None,
+        request_id: str,
+        now: datetime,
+    ) -> None:
+        endpoint_key = f"{method}:{route}"
+        bucket = self.endpoints.get(endpoint_key)
+        if bucket is None:
+            bucket = self.endpoints[endpoint_key] = _EndpointBucket(
+                method,
+                route,
+                latency_samples=deque(maxlen=settings.request_metrics_latency_window),
+            )
+
+        now_iso = now.isoformat()
+        now_ts = now.timestamp()
+        bucket.total_requests += 1
+        bucket.total_time += process_time
+        status_class = f"status_{status_code // 100}xx"
+        bucket.status_counts[status_class] = bucket.status_counts.get(status_class, 0) + 1
+        if status_code >= 400:
+            bucket.error_count += 1
+        bucket.min_time = min(bucket.min_time, process_time)
+        bucket.max_time = max(bucket.max_time, process_time)
+        bucket.last_seen = now_iso
+        bucket.last_seen_ts = now_ts
+        bucket.latency_samples.append((f"{process_time:.6f}:{uuid.uuid4().hex[:8]}", now_ts))
+
+        if hashed_ip:
+            bucket.hashed_ips.add(hashed_ip)
+            self.global_ips.add(hashed_ip)
+
+        self.recent.append(
+            (
+                request_id,
+                {
+                    "method": method,
+                    "path": path,
+                    "route_template": route,
+                    "status_code": str(status_code),
+                    "process_time": f"{process_time:.6f}",
+                    "timestamp": now_iso,
+                    "request_id": request_id,
+                },
+                now_ts,
+            )
+        )
+
+    def queue_writes(self, pipe) -> None:
+        """Queue this buffer's Redis writes on a pipeline."""
+        ttl = settings.request_metrics_ttl
+
+        for endpoint_key, bucket in self.endpoints.items():
+            agg_key = f"{_AGG_PREFIX}{endpoint_key}"
+            pipe.hincrby(agg_key, "total_requests", bucket.total_requests)
+            pipe.hincrbyfloat(agg_key, "total_time", bucket.total_time)
+            for status_class, count in bucket.status_counts.items():
+                pipe.hincrby(agg_key, status_class, count)
+            if bucket.error_count:
+                pipe.hincrby(agg_key, "error_count", bucket.error_count)
+            pipe.hset(agg_key, "last_seen", bucket.last_seen)
+            pipe.hsetnx(agg_key, "method", bucket.method)
+            pipe.hsetnx(agg_key, "route", bucket.route)
+            pipe.eval(_MERGE_MIN_MAX_SCRIPT, 1, agg_key, str(bucket.min_time), str(bucket.max_time))
+            pipe.expire(agg_key, ttl)
+
+            latency_key = f"{_LATENCY_PREFIX}{endpoint_key}"
+            pipe.zadd(latency_key, dict(bucket.latency_samples))
+            pipe.zremrangebyrank(latency_key, 0, -(settings.request_metrics_latency_window + 1))
+            pipe.expire(latency_key, ttl)
+
+            if bucket.hashed_ips:
+                uv_ep_key = f"{_UV_PREFIX}{endpoint_key}"
+                pipe.pfadd(uv_ep_key, *bucket.hashed_ips)
+                pipe.expire(uv_ep_key, ttl)
+
+        if self.endpoints:
+            pipe.zadd(_ENDPOINTS_INDEX, {key: bucket.last_seen_ts for key, bucket in self.endpoints.items()})
+            pipe.expire(_ENDPOINTS_INDEX, ttl)
+
+        if self.global_ips:
+            pipe.pfadd(_UV_GLOBAL, *self.global_ips)
+            pipe.expire(_UV_GLOBAL, ttl)
+
+        if self.recent:
+            for request_id, fields, _ in self.recent:
+                req_key = f"{_REQ_PREFIX}{request_id}"
+                pipe.hset(req_key, mapping=fields)
+                pipe.expire(req_key, settings.request_metrics_recent_ttl)
+            pipe.zadd(_RECENT_INDEX, {request_id: ts for request_id, _, ts in self.recent})
+            pipe.expire(_RECENT_INDEX, ttl)
+
+
+request_metrics_buffer = RequestMetricsBuffer()
+
 
 async def record_request(
     method: str,
@@ -78,7 +234,9 @@ async def record_request(
     process_time: float,
     client_ip: str | None = None,
 ) -> None:
-    """Record a single API request into Redis.
+    """Record a single API request into this worker's metrics buffer.
+
+    Nothing is written to Redis here; see ``flush_request_metrics``.
 
     Args:
         method: HTTP method (GET, POST, etc.)
@@ -96,107 +254,65 @@ async def record_request(
     if any(path.startswith(p) for p in _SKIP_PATH_PREFIXES):
         return
 
-    route = route_template or path
-    endpoint_key = f"{method}:{route}"
-    now = datetime.now(timezone.utc)
-    now_iso = now.isoformat()
-    now_ts = now.timestamp()
-
     try:
-        # --- 1. Per-endpoint aggregated stats ---
-        agg_key = f"{_AGG_PREFIX}{endpoint_key}"
-
-        await REDIS_ASYNC_CLIENT.hincrby(agg_key, "total_requests", 1)
-        await REDIS_ASYNC_CLIENT.hincrbyfloat(agg_key, "total_time", process_time)
-        await REDIS_ASYNC_CLIENT.hset(agg_key, "last_seen", now_iso)
-        await REDIS_ASYNC_CLIENT.expire(agg_key, settings.request_metrics_ttl)
-
-        # Status class counters
-        status_class = f"status_{status_code // 100}xx"
-        await REDIS_ASYNC_CLIENT.hincrby(agg_key, status_class, 1)
-
-        if status_code >= 400:
-            await REDIS_ASYNC_CLIENT.hincrby(agg_key, "error_count", 1)
-
-        # Update min/max times (requires read-before-write)
-        existing = await REDIS_ASYNC_CLIENT.hmget(agg_key, ["min_time", "max_time"])
-        min_time = float(existing[0]) if existing[0] else float("inf")
-        max_time = float(existing[1]) if existing[1] else 0.0
-
-        update_fields = {}
-        if process_time < min_time:
-            update_fields["min_time"] = str(process_time)
-        if process_time > max_time:
-            update_fields["max_time"] = str(process_time)
-        if update_fields:
-            await REDIS_ASYNC_CLIENT.hset(agg_key, mapping=update_fields)
-
-        # Ensure route template is stored for display
-        await REDIS_ASYNC_CLIENT.hsetnx(agg_key, "method", method)
-        await REDIS_ASYNC_CLIENT.hsetnx(agg_key, "route", route)
-
-        # --- 2. Per-endpoint latency distribution ---
-        latency_key = f"{_LATENCY_PREFIX}{endpoint_key}"
-        # Use timestamp as score, process_time as member (encoded with unique suffix)
-        latency_member = f"{process_time:.6f}:{uuid.uuid4().hex[:8]}"
-        await REDIS_ASYNC_CLIENT.zadd(latency_key, {latency_member: now_ts})
-        # Cap to the configured window size
-        await REDIS_ASYNC_CLIENT.zremrangebyrank(latency_key, 0, -(settings.request_metrics_latency_window + 1))
-        await REDIS_ASYNC_CLIENT.expire(latency_key, settings.request_metrics_ttl)
-
-        # --- 3. Unique visitor tracking (HyperLogLog with hashed IP) ---
-        if client_ip:
-            hashed_ip = _hash_ip(client_ip)
-            # Global unique visitors
-            await REDIS_ASYNC_CLIENT.pfadd(_UV_GLOBAL, hashed_ip)
-            await REDIS_ASYNC_CLIENT.expire(_UV_GLOBAL, settings.request_metrics_ttl)
-            # Per-endpoint unique visitors
-            uv_ep_key = f"{_UV_PREFIX}{endpoint_key}"
-            await REDIS_ASYNC_CLIENT.pfadd(uv_ep_key, hashed_ip)
-            await REDIS_ASYNC_CLIENT.expire(uv_ep_key, settings.request_metrics_ttl)
-
-        # --- 4. Track endpoint in the endpoints index ---
-        await REDIS_ASYNC_CLIENT.zadd(_ENDPOINTS_INDEX, {endpoint_key: now_ts})
-        await REDIS_ASYNC_CLIENT.expire(_ENDPOINTS_INDEX, settings.request_metrics_ttl)
-
-        # --- 5. Recent individual request log ---
         # Reuse the correlation ID set by RequestIdMiddleware when available so
         # the Redis entry and log lines share the same ID for cross-referencing.
         request_id = REQUEST_ID_VAR.get(None) or uuid.uuid4().hex
-        req_key = f"{_REQ_PREFIX}{request_id}"
-
-        await REDIS_ASYNC_CLIENT.hset(
-            req_key,
-            mapping={
-                "method": method,
-                "path": path,
-                "route_template": route,
-                "status_code": str(status_code),
-                "process_time": f"{process_time:.6f}",
-                "timestamp": now_iso,
-                "request_id": request_id,
-            },
+        request_metrics_buffer.add(
+            method=method,
+            path=path,
+            route=route_template or path,
+            status_code=status_code,
+            process_time=process_time,
+            hashed_ip=_hash_ip(client_ip) if client_ip else None,
+            request_id=request_id,
+            now=datetime.now(timezone.utc),
         )
-        await REDIS_ASYNC_CLIENT.expire(req_key, settings.request_metrics_recent_ttl)
-        await REDIS_ASYNC_CLIENT.zadd(_RECENT_INDEX, {request_id: now_ts})
-        await REDIS_ASYNC_CLIENT.expire(_RECENT_INDEX, settings.request_metrics_ttl)
-
-        # Enforce max recent entries
-        total_recent = await REDIS_ASYNC_CLIENT.zcard(_RECENT_INDEX)
-        if total_recent and total_recent > settings.request_metrics_max_recent:
-            excess = total_recent - settings.request_metrics_max_recent
-            oldest = await REDIS_ASYNC_CLIENT.zrange(_RECENT_INDEX, 0, excess - 1)
-            if oldest:
-                for rid_raw in oldest:
-                    rid = rid_raw if isinstance(rid_raw, str) else rid_raw.decode()
-                    await REDIS_ASYNC_CLIENT.delete(f"{_REQ_PREFIX}{rid}")
-                await REDIS_ASYNC_CLIENT.zremrangebyrank(_RECENT_INDEX, 0, excess - 1)
-
     except Exception:
         # Never disrupt the request pipeline
         _logger.debug("Failed to record request metrics", exc_info=True)
 
 
+async def flush_request_metrics() -> None:
+    """Write the buffered request metrics to Redis in one pipelined batch.
+
+    The buffer is swapped out before the write, so requests recorded while the
+    batch is in flight land in the next one. A failed batch is dropped.
+    """
+    global request_metrics_buffer
+
+    if not request_metrics_buffer.endpoints and not request_metrics_buffer.recent:
+        return
+    buffer, request_metrics_buffer = request_metrics_buffer, RequestMetricsBuffer()
+
+    try:
+        pipe = REDIS_ASYNC_CLIENT.pipeline(transaction=False)
+        buffer.queue_writes(pipe)
+        await pipe.execute()
+        if buffer.recent:
+            await _trim_recent_requests()
+    except Exception:
+        _logger.debug("Failed to flush request metrics", exc_info=True)
+
+
+async def _trim_recent_requests() -> None:
+    """Drop the oldest recent-request entries (index members and their hashes) beyond the cap."""
+    oldest = await REDIS_ASYNC_CLIENT.zrange(_RECENT_INDEX, 0, -(settings.request_metrics_max_recent + 1))
+    if not oldest:
+        return
+    pipe = REDIS_ASYNC_CLIENT.pipeline(transaction=False)
+    pipe.delete(*(f"{_REQ_PREFIX}{rid if isinstance(rid, str) else rid.decode()}" for rid in oldest))
+    pipe.zrem(_RECENT_INDEX, *oldest)
+    await pipe.execute()
+
+
+async def run_request_metrics_flusher() -> None:
+    """Flush buffered request metrics every ``request_metrics_flush_interval`` seconds."""
+    while True:
+        await asyncio.sleep(settings.request_metrics_flush_interval)
+        await flush_request_metrics()
+
+
 # ============================================
 # Query functions (used by admin API)
 # ============================================
@@ -0,0 +1,215 @@
+"""
+Versioned codec registry for stream cache blobs (``stream_data:*``).
+
+Blobs written by a registered codec start with ``\\x01MFc`` followed by one byte for the
+codec id and one for the serializer id, so any worker can decode any codec regardless of
+what it is configured to write. The default combination (zlib + JSON) and "plain" JSON keep
+writing the pre-registry formats (``\\x01MFsc1`` + zlib, raw JSON) for rolling deploys;
+stream_services still reads every older format.
+
+``zstd``, ``lz4`` and ``msgpack`` are optional dependencies (the ``stream-cache-codecs``
+extra). A codec whose library is missing is not registered: writers fall back to zlib and
+its blobs read as unreadable (evicted and refetched) on that worker. The zstd codec uses a trained dictionary when
+``stream_raw_redis_cache_zstd_dict_path`` points to one (see
+scripts/train_stream_cache_dictionary.py); zstd frames record the dictionary id, so a blob
+written with another dictionary fails to decode instead of decoding to garbage.
+"""
+
+import logging
+import threading
+import zlib
+from functools import cache
+from typing import Any
+
+import orjson
+
+from db.config import settings
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+CODEC_MAGIC = b"\x01MFc"
+CODEC_HEADER_SIZE = len(CODEC_MAGIC) + 2
+LEGACY_ZLIB_MAGIC = b"\x01MFsc1"
+
+_SERIALIZER_IDS = {"json": 0, "msgpack": 1}
+
+
+class StreamCacheCodec:
+    """A compression scheme for serialized stream cache payloads."""
+
+    name: str
+    codec_id: int
+    # Prefix written instead of the registry header for JSON payloads (pre-registry format)
+    legacy_prefix: bytes | None = None
+
+    def compress(self, raw: bytes) -> bytes:
+        raise NotImplementedError
+
+    def decompress(self, body: bytes) -> bytes:
+        raise NotImplementedError
+
+
+class PlainCodec(StreamCacheCodec):
+    name = "plain"
+    codec_id = 0
+    legacy_prefix = b""
+
+    def compress(self, raw: bytes) -> bytes:
+        return raw
+
+    def decompress(self, body: bytes) -> bytes:
+        return body
+
+
+class ZlibCodec(StreamCacheCodec):
+    name = "zlib"
+    codec_id = 1
+    legacy_prefix = LEGACY_ZLIB_MAGIC
+
+    def compress(self, raw: bytes) -> bytes:
+        # Level 1: fastest compression; cache blobs are short-lived so ratio matters less than CPU cost
+        return zlib.compress(raw, 1)
+
+    def decompress(self, body: bytes) -> bytes:
+        return zlib.decompress(body)
+
+
+class Lz4Codec(StreamCacheCodec):
+    name = "lz4"
+    codec_id = 2
+
+    def compress(self, raw: bytes) -> bytes:
+        return lz4_frame.compress(raw)
+
+    def decompress(self, body: bytes) -> bytes:
+        return lz4_frame.decompress(body)
+
+
+class ZstdCodec(StreamCacheCodec):
+    name = "zstd"
+    codec_id = 3
+
+    def __init__(self, level: int, dictionary: "zstandard.ZstdCompressionDict | None" = None):
+        self.level = level
+        self.dictionary = dictionary
+        if dictionary is not None:
+            dictionary.precompute_compress(level=level)
+        # zstandard contexts are not thread-safe; keep one pair per thread
+        self._contexts = threading.local()
+
+    def _context(self) -> tuple["zstandard.ZstdCompressor", "zstandard.ZstdDecompressor"]:
+        contexts = getattr(self._contexts, "pair", None)
+        if contexts is None:
+            dict_kwargs = {"dict_data": self.dictionary} if self.dictionary is not None else {}
+            contexts = self._contexts.pair = (
+                zstandard.ZstdCompressor(level=self.level, **dict_kwargs),
+                zstandard.ZstdDecompressor(**dict_kwargs),
+            )
+        return contexts
+
+    def compress(self, raw: bytes) -> bytes:
+        return self._context()[0].compress(raw)
+
+    def decompress(self, body: bytes) -> bytes:
+        return self._context()[1].decompress(body)
+
+
+def dumps_payload(data: Any, serializer: str) -> bytes:
+    if serializer == "msgpack":
+        return msgpack.packb(data, default=str)
+    return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS, default=str)
+
+
+def loads_payload(raw: bytes, serializer: str) -> Any:
+    if serializer == "msgpack":
+        return msgpack.unpackb(raw, strict_map_key=False)
+    return orjson.loads(raw)
+
+
+def load_zstd_dictionary(path: str) -> "zstandard.ZstdCompressionDict":
+    with open(path, "rb") as dict_file:
+        return zstandard.ZstdCompressionDict(dict_file.read())
+
+
+@cache
+def codec_registry() -> dict[int, StreamCacheCodec]:
+    """Codecs available in this process, keyed by codec id (built once from settings)."""
+    codecs: list[StreamCacheCodec] = [PlainCodec(), ZlibCodec()]
+    if lz4_frame is not None:
+        codecs.append(Lz4Codec())
+    if zstandard is not None:
+        dictionary = None
+        if settings.stream_raw_redis_cache_zstd_dict_path:
+            try:
+                dictionary = load_zstd_dictionary(settings.stream_raw_redis_cache_zstd_dict_path)
+            except OSError as exc:
+                logger.warning("Could not load stream cache zstd dictionary: %s", exc)
+        codecs.append(ZstdCodec(settings.stream_raw_redis_cache_zstd_level, dictionary))
+    return {codec.codec_id: codec for codec in codecs}
+
+
+def _codec_by_name(name: str) -> StreamCacheCodec | None:
+    return next((codec for codec in codec_registry().values() if codec.name == name), None)
+
+
+@cache
+def _active_codec() -> tuple[StreamCacheCodec, str]:
+    name = settings.stream_raw_redis_cache_codec
+    if name == "zlib" and not settings.stream_raw_redis_cache_zlib_compress:
+        name = "plain"
+    codec = _codec_by_name(name)
+    if codec is None:
+        logger.warning("Stream cache codec %r is not available; falling back to zlib", name)
+        codec = _codec_by_name("zlib")
+    serializer = settings.stream_raw_redis_cache_serializer
+    if serializer == "msgpack" and msgpack is None:
+        logger.warning("msgpack is not installed; stream cache payloads stay JSON")
+        serializer = "json"
+    return codec, serializer
+
+
+def encode_payload(
+    data: Any,
+    codec: StreamCacheCodec | None = None,
+    serializer: str | None = None,
+) -> tuple[bytes, int]:
+    """Serialize and compress a payload; returns ``(blob, serialized_size)``.
+
+    Defaults to the codec and serializer selected in settings.
+    """
+    if codec is None:
+        codec, default_serializer = _active_codec()
+        serializer = serializer or default_serializer
+    serializer = serializer or "json"
+    raw = dumps_payload(data, serializer)
+    if codec.legacy_prefix is not None and serializer == "json":
+        return codec.legacy_prefix + codec.compress(raw), len(raw)
+    return CODEC_MAGIC + bytes((codec.codec_id, _SERIALIZER_IDS[serializer])) + codec.compress(raw), len(raw)
+
+
+def decode_payload(blob: bytes) -> tuple[Any, int]:
+    """Decode a blob carrying the registry header; returns ``(payload, serialized_size)``.
+
+    Raises on an unknown or unavailable codec and on corrupt data.
+    """
+    codec = codec_registry().get(blob[len(CODEC_MAGIC)])
+    if codec is None:
+        raise ValueError(f"unknown stream cache codec id {blob[len(CODEC_MAGIC)]}")
+    raw = codec.decompress(blob[CODEC_HEADER_SIZE:])
+    serializer = "msgpack" if blob[len(CODEC_MAGIC) + 1] == _SERIALIZER_IDS["msgpack"] else "json"
+    return loads_payload(raw, serializer), len(raw)
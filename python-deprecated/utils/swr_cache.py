@@ -0,0 +1,106 @@
+"""
+Stale-while-revalidate helpers for Redis-backed response caches.
+
+A cached value carries a soft-expiry timestamp in a small header in front of the
+payload, while the Redis key itself lives until the hard TTL. Readers past the soft
+expiry still serve the payload and call ``schedule_stale_refresh``, which rebuilds the
+entry in a background task. A short Redis lease ensures only one worker refreshes a
+given key at a time.
+
+Values written before the header existed are returned as-is and treated as fresh.
+"""
+
+import asyncio
+import logging
+import struct
+import time
+from collections.abc import Awaitable, Callable
+
+from db.config import settings
+from db.redis_database import REDIS_ASYNC_CLIENT
+from utils.prometheus_metrics import STALE_CACHE_REFRESHES_TOTAL, STALE_CACHE_SERVED_TOTAL
+
+logger = logging.getLogger(__name__)
+
+STALE_REFRESH_LEASE_PREFIX = "swr_refresh:"
+
+_SWR_MAGIC = b"\x01SWR"
+# Soft expiry as Unix time (seconds, float); wall clock so every node agrees.
+_SOFT_EXPIRY = struct.Struct(">d")
+_HEADER_SIZE = len(_SWR_MAGIC) + _SOFT_EXPIRY.size
+
+# Keys refreshing in this worker, and strong references to their tasks.
+_refreshing_keys: set[str] = set()
+_refresh_tasks: set[asyncio.Task] = set()
+
+
+def wrap_with_soft_expiry(payload: bytes | str, soft_ttl: float) -> bytes:
+    """Prefix a cache payload with its soft-expiry timestamp."""
+    if isinstance(payload, str):
+        payload = payload.encode()
+    return _SWR_MAGIC + _SOFT_EXPIRY.pack(time.time() + soft_ttl) + payload
+
+
+def soft_expiry_of(blob: bytes | memoryview | str | None) -> float | None:
+    """Soft-expiry timestamp of a cached value, or None for values without the header."""
+    if not isinstance(blob, (bytes, memoryview)) or len(blob) < _HEADER_SIZE:
+        return None
+    if bytes(blob[: len(_SWR_MAGIC)]) != _SWR_MAGIC:
+        return None
+    return _SOFT_EXPIRY.unpack_from(blob, len(_SWR_MAGIC))[0]
+
+
+def split_soft_expiry(blob: bytes | memoryview | str | None) -> tuple[bytes | memoryview | str | None, float | None]:
+    """Return ``(payload, soft_expires_at)`` for a cached value."""
+    soft_expires_at = soft_expiry_of(blob)
+    if soft_expires_at is None:
+        return blob, None
+    return blob[_HEADER_SIZE:], soft_expires_at
+
+
+def is_stale(soft_expires_at: float | None) -> bool:
+    return soft_expires_at is not None and soft_expires_at <= time.time()
+
+
+async def set_with_soft_expiry(key: str, payload: bytes | str, soft_ttl: int, hard_ttl: int) -> None:
+    """Store a payload that turns stale after ``soft_ttl`` and is dropped after ``hard_ttl``."""
+    await REDIS_ASYNC_CLIENT.set(key, wrap_with_soft_expiry(payload, soft_ttl), ex=max(soft_ttl, hard_ttl))
+
+
+def schedule_stale_refresh(cache: str, key: str, refresh: Callable[[], Awaitable[None]]) -> None:
+    """Count a stale hit for ``cache`` and refresh ``key`` in the background unless already refreshing."""
+    STALE_CACHE_SERVED_TOTAL.labels(cache=cache).inc()
+    if key in _refreshing_keys:
+        return
+    _refreshing_keys.add(key)
+    task = asyncio.create_task(_run_refresh(cache, key, refresh))
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
+
+
+async def _run_refresh(cache: str, key: str, refresh: Callable[[], Awaitable[None]]) -> None:
+    lease_key = f"{STALE_REFRESH_LEASE_PREFIX}{key}"
+    try:
+        try:
+            acquired = await REDIS_ASYNC_CLIENT.set(lease_key, "1", ex=settings.stale_refresh_lease_seconds, nx=True)
+        except Exception as exc:
+            logger.debug("Stale refresh lease failed for %s: %s", key, exc)
+            acquired = True
+        if not acquired:
+            STALE_CACHE_REFRESHES_TOTAL.labels(cache=cache, result="skipped").inc()
+            return
+        try:
+            await refresh()
+        except Exception as exc:
+            STALE_CACHE_REFRESHES_TOTAL.labels(cache=cache, result="error").inc()
+            logger.warning("Background refresh of %s failed: %s", key, exc)
+            # Let the next stale hit retry; on success the lease simply expires, which also
+            # stops requests that read the old value a moment earlier from refreshing again
+            try:
+                await REDIS_ASYNC_CLIENT.delete(lease_key)
+            except Exception:
+                pass
+        else:
+            STALE_CACHE_REFRESHES_TOTAL.labels(cache=cache, result="ok").inc()
+    finally:
+        _refreshing_keys.discard(key)
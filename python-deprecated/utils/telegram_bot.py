@@ -15,7 +15,6 @@ from typing import Any
 from urllib.parse import unquote, urlparse
 
 import aiohttp
-import PTT
 import pytz
 from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
@@ -48,6 +47,7 @@ from db.models.streams import (
 )
 from db.models.providers import MediaImage, MetadataProvider
 from reference.routers.content.anonymous_utils import normalize_anonymous_display_name, resolve_uploader_identity
+from utils.ptt_cache import parse_title_cached
 from utils.sports_parser import (
     SPORTS_CATEGORIES,
     detect_sports_category,
@@ -2459,7 +2459,7 @@ class TelegramContentBot:
         search_year = None
 
         try:
-            parsed = PTT.parse_title(file_name, True)
+            parsed = parse_title_cached(file_name, True)
             search_title = parsed.get("title")
             search_year = parsed.get("year")
         except Exception as e:
@@ -2568,7 +2568,7 @@ class TelegramContentBot:
             parsed = {}
             search_title = None
             try:
-                parsed = PTT.parse_title(file_name, True)
+                parsed = parse_title_cached(file_name, True)
                 search_title = parsed.get("title")
             except Exception:
                 search_title = file_name
@@ -2617,7 +2617,7 @@ class TelegramContentBot:
             parsed = {}
             search_title = None
             try:
-                parsed = PTT.parse_title(nzb_name, True)
+                parsed = parse_title_cached(nzb_name, True)
                 search_title = parsed.get("title")
             except Exception:
                 search_title = nzb_name
@@ -5353,7 +5353,7 @@ class TelegramContentBot:
 
         if file_name:
             try:
-                parsed = PTT.parse_title(file_name, True)
+                parsed = parse_title_cached(file_name, True)
                 search_title = parsed.get("title")
                 search_year = parsed.get("year")
                 # Determine media type from parsed data
@@ -5667,7 +5667,7 @@ class TelegramContentBot:
                     return True
 
             # Parse filename for quality attributes
-            parsed = PTT.parse_title(content["file_name"], True)
+            parsed = parse_title_cached(content["file_name"], True)
             selected_languages = self._normalize_language_values(
                 content.get("languages")
             ) or self._normalize_language_values(parsed.get("languages"))
@@ -6510,7 +6510,7 @@ class TelegramContentBot:
                         content_info["needs_linking"] = False
                         try:
                             if content_info.get("file_name"):
-                                parsed = PTT.parse_title(content_info["file_name"], True)
+                                parsed = parse_title_cached(content_info["file_name"], True)
                                 title = parsed.get("title", "Unknown")
                                 year = parsed.get("year", "")
                             else:
@@ -1,6 +1,5 @@
 import logging
 
-import PTT
 from sqlalchemy.exc import IntegrityError
 
 from db import crud
@@ -14,6 +13,7 @@ from workers.scrapers.non_torrent_background_scraper import (
     _tmp_external_id,
 )
 from workers.scrapers.telegram import telegram_scraper
+from utils.ptt_cache import parse_title_cached
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +25,7 @@ def _infer_media_type(file_name: str | None) -> str:
     if not file_name:
         return "movie"
     try:
-        parsed = PTT.parse_title(file_name, True)
+        parsed = parse_title_cached(file_name, True)
         if parsed.get("seasons") or parsed.get("episodes"):
             return "series"
     except Exception:
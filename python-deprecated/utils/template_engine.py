@@ -40,11 +40,24 @@ Logical operators:
     {if cond1 or cond2}...{/if}
 """
 
+import hashlib
+import operator
 import re
 import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from typing import Any, Callable, List, Optional, Tuple
 
+from utils.prometheus_metrics import (
+    TEMPLATE_CACHE_BYTES,
+    TEMPLATE_CACHE_ENTRIES,
+    TEMPLATE_CACHE_EVICTIONS_TOTAL,
+    TEMPLATE_CACHE_HITS_TOTAL,
+    TEMPLATE_CACHE_MISSES_TOTAL,
+)
+
 logger = logging.getLogger(__name__)
 
 # =============================================================================
@@ -55,6 +68,10 @@ MAX_TEMPLATE_LENGTH = 10_000
 MAX_RECURSION_DEPTH = 10
 MAX_MODIFIERS_CHAIN = 10
 
+# Compiled template cache bounds (user-submitted templates can be arbitrary)
+TEMPLATE_CACHE_MAX_ENTRIES = 512
+TEMPLATE_CACHE_MAX_BYTES = 4 * 1024 * 1024  # Measured as UTF-8 template source size
+
 # Forbidden path segments - block access to Python internals
 FORBIDDEN_PATHS = frozenset(
     {
@@ -643,17 +660,254 @@ class ConditionEvaluator:
 
     def _is_truthy(self, value: Any) -> bool:
         """Check if a value is truthy."""
-        if value is None:
+        return _is_truthy(value)
+
+
+def _is_truthy(value: Any) -> bool:
+    """Template truthiness: None, blank strings, empty lists and zero are false."""
+    if value is None:
+        return False
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        return bool(value.strip())
+    if isinstance(value, list):
+        return len(value) > 0
+    if isinstance(value, (int, float)):
+        return value != 0
+    return bool(value)
+
+
+# =============================================================================
+# CLOSURE COMPILER
+# =============================================================================
+# Lowers the AST into nested closures once per template so rendering is plain
+# function calls: conditions are split, operators located, literals parsed and
+# paths validated at compile time. Semantics mirror ConditionEvaluator and the
+# interpreted CompiledTemplate path exactly.
+
+RenderFn = Callable[[dict], str]
+ConditionFn = Callable[[dict], bool]
+
+_AND_SPLIT_PATTERN = re.compile(r"\s+and\s+", re.IGNORECASE)
+_OR_SPLIT_PATTERN = re.compile(r"\s+or\s+", re.IGNORECASE)
+
+_STRING_COMPARATORS: dict[str, Callable[[str, str], bool]] = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    "~": operator.contains,
+    "$": str.startswith,
+    "^": str.endswith,
+}
+
+_NUMERIC_COMPARATORS: dict[str, Callable[[float, float], bool]] = {
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+}
+
+
+def _compile_lookup(path: str) -> Callable[[dict], Any]:
+    """Compile a dotted path into a context lookup returning None when missing."""
+    parts = tuple(path.split("."))
+    if any(part in FORBIDDEN_PATHS or part.startswith("_") for part in parts):
+        logger.warning(f"Blocked access to forbidden path: {path}")
+        return lambda context: None
+
+    if len(parts) == 1:
+        (key,) = parts
+        return lambda context: context.get(key)
+
+    if len(parts) == 2:
+        first, second = parts
+
+        def lookup_pair(context: dict) -> Any:
+            value = context.get(first)
+            return value.get(second) if isinstance(value, dict) else None
+
+        return lookup_pair
+
+    def lookup(context: dict) -> Any:
+        value = context
+        for part in parts:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(part)
+        return value
+
+    return lookup
+
+
+def _compile_operand(expr: str) -> tuple[bool, Any]:
+    """Compile a condition operand; returns (is_constant, value or getter)."""
+    expr = expr.strip()
+
+    if (expr.startswith('"') and expr.endswith('"')) or (expr.startswith("'") and expr.endswith("'")):
+        return True, expr[1:-1]
+
+    try:
+        if "." in expr and not any(c.isalpha() for c in expr):
+            return True, float(expr)
+        elif expr.isdigit() or (expr.startswith("-") and expr[1:].isdigit()):
+            return True, int(expr)
+    except ValueError:
+        pass
+
+    if expr.lower() == "true":
+        return True, True
+    if expr.lower() == "false":
+        return True, False
+
+    if "." in expr:
+        return False, _compile_lookup(expr)
+
+    # Bare names resolve from the context when present, otherwise act as literal strings.
+    return False, lambda context: context[expr] if expr in context else expr
+
+
+def _lower_str(value: Any) -> str:
+    return str(value).lower() if value is not None else ""
+
+
+def _compile_comparison(left: str, op: str, right: str) -> ConditionFn:
+    left_is_constant, left_value = _compile_operand(left)
+    right_is_constant, right_value = _compile_operand(right)
+    get_left = (lambda context: left_value) if left_is_constant else left_value
+    get_right = (lambda context: right_value) if right_is_constant else right_value
+
+    if op in _STRING_COMPARATORS:
+        compare_str = _STRING_COMPARATORS[op]
+        if right_is_constant:
+            right_str = _lower_str(right_value)
+            return lambda context: compare_str(_lower_str(get_left(context)), right_str)
+        return lambda context: compare_str(_lower_str(get_left(context)), _lower_str(get_right(context)))
+
+    compare_num = _NUMERIC_COMPARATORS[op]
+
+    def compare(context: dict) -> bool:
+        left_val = get_left(context)
+        right_val = get_right(context)
+        try:
+            left_num = float(left_val) if left_val is not None else 0
+            right_num = float(right_val) if right_val is not None else 0
+        except (ValueError, TypeError):
             return False
-        if isinstance(value, bool):
-            return value
-        if isinstance(value, str):
-            return bool(value.strip())
-        if isinstance(value, list):
-            return len(value) > 0
-        if isinstance(value, (int, float)):
-            return value != 0
-        return bool(value)
+        return compare_num(left_num, right_num)
+
+    return compare
+
+
+def _compile_condition(condition: str) -> ConditionFn:
+    """Compile a condition string into a predicate over the render context."""
+    condition = condition.strip()
+
+    and_parts = _AND_SPLIT_PATTERN.split(condition)
+    if len(and_parts) > 1:
+        and_checks = tuple(_compile_condition(part) for part in and_parts)
+        return lambda context: all(check(context) for check in and_checks)
+
+    or_parts = _OR_SPLIT_PATTERN.split(condition)
+    if len(or_parts) > 1:
+        or_checks = tuple(_compile_condition(part) for part in or_parts)
+        return lambda context: any(check(context) for check in or_checks)
+
+    if condition.startswith("not "):
+        negated = _compile_condition(condition[4:])
+        return lambda context: not negated(context)
+
+    for op in ConditionEvaluator.OPERATORS:
+        if op in condition:
+            left, right = condition.split(op, 1)
+            return _compile_comparison(left.strip(), op, right.strip())
+
+    is_constant, value = _compile_operand(condition)
+    if is_constant:
+        truthy = _is_truthy(value)
+        return lambda context: truthy
+    return lambda context: _is_truthy(value(context))
+
+
+def _stringify(value: Any) -> str:
+    """Convert a final variable value to its rendered string."""
+    if isinstance(value, list):
+        return ", ".join(str(x) for x in value)
+    if isinstance(value, bool):
+        return ""  # Don't render booleans as "True"/"False"
+    return str(value) if value is not None else ""
+
+
+def _compile_variable(node: VariableNode) -> RenderFn:
+    lookup = _compile_lookup(node.path)
+    modifiers: list[tuple[Callable, Optional[str]]] = []
+    for mod_name, mod_arg in node.modifiers:
+        mod_name_lower = mod_name.lower()
+        if mod_name_lower in MODIFIERS_WITH_ARGS:
+            modifiers.append((MODIFIERS_WITH_ARGS[mod_name_lower], mod_arg or ""))
+        elif mod_name_lower in MODIFIERS:
+            modifiers.append((MODIFIERS[mod_name_lower], mod_arg))
+        # Unknown modifier - skip
+
+    if not modifiers:
+
+        def render_plain(context: dict) -> str:
+            value = lookup(context)
+            return "" if value is None else _stringify(value)
+
+        return render_plain
+
+    compiled_modifiers = tuple(modifiers)
+
+    def render_modified(context: dict) -> str:
+        value = lookup(context)
+        if value is None:
+            return ""
+        for modifier, arg in compiled_modifiers:
+            value = modifier(value, arg)
+        return _stringify(value)
+
+    return render_modified
+
+
+def _compile_if(node: IfNode) -> RenderFn:
+    branches = ((_compile_condition(node.condition), _compile_nodes(node.true_branch)),) + tuple(
+        (_compile_condition(branch.condition), _compile_nodes(branch.body)) for branch in node.elif_branches
+    )
+    render_else = _compile_nodes(node.false_branch)
+
+    def render_if(context: dict) -> str:
+        for condition, render_body in branches:
+            if condition(context):
+                return render_body(context)
+        return render_else(context)
+
+    return render_if
+
+
+def _compile_nodes(nodes: List[ASTNode]) -> RenderFn:
+    """Compile a node list into one render function (adjacent text is merged)."""
+    parts: list[str | RenderFn] = []
+    for node in nodes:
+        if isinstance(node, TextNode):
+            if parts and isinstance(parts[-1], str):
+                parts[-1] += node.text
+            else:
+                parts.append(node.text)
+        elif isinstance(node, VariableNode):
+            parts.append(_compile_variable(node))
+        elif isinstance(node, IfNode):
+            parts.append(_compile_if(node))
+
+    if not parts:
+        return lambda context: ""
+    if len(parts) == 1:
+        (only,) = parts
+        if isinstance(only, str):
+            return lambda context: only
+        return only
+
+    compiled_parts = tuple(parts)
+    return lambda context: "".join([part if part.__class__ is str else part(context) for part in compiled_parts])
 
 
 # =============================================================================
@@ -662,14 +916,28 @@ class ConditionEvaluator:
 
 
 class CompiledTemplate:
-    """Pre-compiled template for fast rendering."""
+    """Pre-compiled template for fast rendering.
+
+    ``render`` runs the closures built by ``_compile_nodes``. ``render_interpreted`` walks the
+    AST with ``ConditionEvaluator`` and is kept as the reference path for parity tests and
+    benchmarks.
+    """
 
     def __init__(self, ast: List[ASTNode]):
         self.ast = ast
         self.evaluator = ConditionEvaluator()
+        self._render_body = _compile_nodes(ast)
 
     def render(self, context: dict) -> str:
         """Render the template with given context."""
+        output = self._render_body(context)
+        # Clean up empty lines, as in _render_nodes
+        if "\n" not in output:
+            return output if output.strip() else ""
+        return "\n".join([line for line in output.split("\n") if line.strip()])
+
+    def render_interpreted(self, context: dict) -> str:
+        """Render by walking the AST and parsing conditions on every call."""
         return self._render_nodes(self.ast, context)
 
     def _render_nodes(self, nodes: List[ASTNode], context: dict) -> str:
@@ -757,8 +1025,59 @@ class CompiledTemplate:
 # PUBLIC API
 # =============================================================================
 
+
+class TemplateCache:
+    """LRU of compiled templates keyed by a digest of the source, bounded by count and source bytes."""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: OrderedDict[bytes, tuple[CompiledTemplate, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, template: str) -> CompiledTemplate:
+        """Return the compiled template, compiling and inserting it on a miss."""
+        encoded = template.encode()
+        key = hashlib.blake2b(encoded, digest_size=16).digest()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                TEMPLATE_CACHE_HITS_TOTAL.inc()
+                return entry[0]
+
+        TEMPLATE_CACHE_MISSES_TOTAL.inc()
+        compiled = compile_template(template)
+        size = len(encoded)
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (compiled, size)
+                self.total_bytes += size
+                self._evict()
+        return compiled
+
+    def _evict(self) -> None:
+        while self._entries and (len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.total_bytes -= size
+            TEMPLATE_CACHE_EVICTIONS_TOTAL.inc()
+        TEMPLATE_CACHE_ENTRIES.set(len(self._entries))
+        TEMPLATE_CACHE_BYTES.set(self.total_bytes)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+            TEMPLATE_CACHE_ENTRIES.set(0)
+            TEMPLATE_CACHE_BYTES.set(0)
+
+
 # Template cache
-_template_cache: dict[str, CompiledTemplate] = {}
+_template_cache = TemplateCache(TEMPLATE_CACHE_MAX_ENTRIES, TEMPLATE_CACHE_MAX_BYTES)
 
 
 def compile_template(template: str) -> CompiledTemplate:
@@ -777,9 +1096,7 @@ def compile_template(template: str) -> CompiledTemplate:
 
 def get_compiled_template(template: str) -> CompiledTemplate:
     """Get or create a compiled template (cached)."""
-    if template not in _template_cache:
-        _template_cache[template] = compile_template(template)
-    return _template_cache[template]
+    return _template_cache.get(template)
 
 
 def render_template(template: str, context: dict) -> str:
@@ -793,6 +1110,13 @@ def clear_cache():
     _template_cache.clear()
 
 
+def prewarm_template_cache(templates: Iterable[str]) -> None:
+    """Compile built-in templates ahead of the first request."""
+    for template in templates:
+        if template:
+            get_compiled_template(template)
+
+
 # =============================================================================
 # SYNTAX CONVERTER (AIOStreams -> MediaFusion Simplified)
 # =============================================================================
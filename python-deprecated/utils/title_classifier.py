@@ -0,0 +1,79 @@
+"""
+Title classification shared by ingest (persisted stream flags) and scrapers.
+
+Keyword lists are matched with one compiled regex alternation per list instead of
+a Python-level ``any(keyword in title ...)`` loop, so a title is scanned once in C
+whatever the list size. The adult check runs the PTT adult parser.
+
+``classify_stream_title`` is evaluated once when a stream is stored; the result is
+persisted on ``Stream.is_adult`` / ``Stream.is_non_video`` and carried in the stream
+cache payload, so request-time filters only fall back to parsing for streams stored
+before the flags existed (see scripts/backfill_stream_title_flags.py).
+"""
+
+import functools
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from utils.runtime_const import ADULT_PARSER
+
+# Shared blocklist / allowlist for filtering non-video torrent titles.
+# Used by both Scrapy spiders and indexer scrapers.
+# fmt: off
+NON_VIDEO_BLOCKLIST_KEYWORDS = [
+    ".exe", ".zip", ".rar", ".iso", ".bin", ".tar", ".7z", ".pdf", ".xyz",
+    ".epub", ".mobi", ".azw3", ".doc", ".docx", ".txt", ".rtf",
+    ".flac", ".mp3", ".m4a", ".wv", ".ape",
+    "[flac", "(flac",  # common music release tagging, e.g. (2026)[Flac 24-48]
+    "setup", "install", "crack", "patch", "trainer", "readme",
+    "manual", "keygen", "license", "tutorial", "ebook", "software", "book",
+    "repack", "fitgirl",
+]
+
+VIDEO_ALLOWLIST_KEYWORDS = [
+    "mkv", "mp4", "avi", ".webm", ".mov", ".flv", "webdl", "web-dl", "webrip", "bluray",
+    "brrip", "bdrip", "dvdrip", "hdtv", "hdcam", "hdrip", "1080p", "720p", "480p", "360p",
+    "2160p", "4k", "x264", "x265", "hevc", "h264", "h265", "aac", "xvid", "movie", "series", "season",
+]
+# fmt: on
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_keywords(keywords: tuple[str, ...]) -> re.Pattern:
+    # Longest first so overlapping keywords don't shadow each other
+    alternation = "|".join(re.escape(keyword.lower()) for keyword in sorted(set(keywords), key=len, reverse=True))
+    return re.compile(alternation or r"(?!)", re.IGNORECASE)
+
+
+def keyword_pattern(keywords: Iterable[str]) -> re.Pattern:
+    """Case-insensitive substring matcher for any of ``keywords`` (compiled once per list)."""
+    return _compile_keywords(tuple(keywords))
+
+
+def contains_keyword(text: str, keywords: Iterable[str]) -> bool:
+    """Same result as ``any(keyword.lower() in text.lower() for keyword in keywords)``."""
+    return keyword_pattern(keywords).search(text) is not None
+
+
+def is_non_video_title(title: str) -> bool:
+    """Return True if the title looks like a game, application, or other non-video content."""
+    return keyword_pattern(NON_VIDEO_BLOCKLIST_KEYWORDS).search(title) is not None
+
+
+@functools.lru_cache(maxsize=4096)
+def detect_adult_title(title: str) -> bool:
+    """Whether the adult parser flags the title (regardless of the filter setting)."""
+    return bool(ADULT_PARSER.parse(title).get("adult", False))
+
+
+@dataclass(slots=True, frozen=True)
+class StreamTitleFlags:
+    is_adult: bool
+    is_non_video: bool
+
+
+def classify_stream_title(title: str) -> StreamTitleFlags:
+    """Classify a stream name once, for persisting on the stream row."""
+    title = title or ""
+    return StreamTitleFlags(is_adult=detect_adult_title(title), is_non_video=is_non_video_title(title))
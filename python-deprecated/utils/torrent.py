@@ -14,7 +14,6 @@ from urllib.parse import parse_qs, quote, urlsplit
 import anyio
 import bencodepy
 import httpx
-import PTT
 from anyio import (
     CapacityLimiter,
     create_memory_object_stream,
@@ -29,6 +28,7 @@ from db.config import settings
 from db.redis_database import REDIS_ASYNC_CLIENT
 from utils.lock import acquire_redis_lock, release_redis_lock
 from utils.parser import is_contain_18_plus_keywords
+from utils.ptt_cache import parse_title_cached
 from utils.runtime_const import TRACKERS
 from utils.validation_helper import is_video_file
 
@@ -153,7 +153,7 @@ def extract_torrent_metadata(
         if parsed_data:
             metadata.update(parsed_data)
         else:
-            metadata.update(PTT.parse_title(torrent_name, True))
+            metadata.update(parse_title_cached(torrent_name, True))
 
         if is_contain_18_plus_keywords(torrent_name):
             logging.warning(f"Torrent name contains 18+ keywords: {torrent_name}. Skipping")
@@ -187,7 +187,7 @@ def extract_torrent_metadata(
             if "sample" in filename.lower():
                 logging.warning(f"Skipping sample file: {filename}")
                 continue
-            episode_parsed_data = PTT.parse_title(filename)
+            episode_parsed_data = parse_title_cached(filename)
             seasons.update(episode_parsed_data.get("seasons", []))
             episodes.update(episode_parsed_data.get("episodes", []))
             season_number = episode_parsed_data["seasons"][0] if episode_parsed_data.get("seasons") else None
@@ -1,5 +1,7 @@
 import asyncio
 import logging
+import zlib
+from collections import defaultdict
 from datetime import UTC, datetime, timedelta
 from urllib.parse import urljoin
 
@@ -10,10 +12,22 @@ from db.config import settings
 from db.redis_database import REDIS_ASYNC_CLIENT
 from db.schemas import StreamingProvider
 from utils.crypto import get_text_hash
+from workers.providers.negative_cache import check_recently_uncached, record_lookup_results
 
 # Constants
 CACHE_KEY_PREFIX = "debrid_cache:"
 EXPIRY_DAYS = 7
+EXPIRY_SECONDS = EXPIRY_DAYS * 24 * 60 * 60
+
+# Cached info hashes are spread over SHARD_COUNT hashes per service,
+# debrid_cache:{service}:{shard}, with the expiry timestamp as the field value.
+# On Redis 7.4+ each field also carries a native TTL (HEXPIRE), so Redis drops
+# expired entries itself. debrid_cache:{service} is the pre-sharding layout; it
+# is still read and is drained into the shards by cleanup_expired_cache.
+SHARD_COUNT = 256
+CACHE_INDEX_PREFIX = "debrid_cache_index:"
+CACHE_SERVICES_KEY = f"{CACHE_INDEX_PREFIX}services"
+CACHE_CLEANUP_CURSOR_PREFIX = f"{CACHE_INDEX_PREFIX}cleanup_cursor:"
 
 # Cache check marker constants
 CACHE_CHECK_PREFIX = "debrid_checked:"
@@ -24,6 +38,62 @@ CACHE_CHECK_TTL = 1800  # 30 minutes
 GLOBAL_CACHE_CHECK_PROVIDERS = {"torbox", "stremthru", "offcloud", "premiumize"}
 
 
+def get_cache_shard(info_hash: str) -> str:
+    """Shard suffix for an info hash (stable across processes)."""
+    return f"{zlib.crc32(info_hash.lower().encode()) % SHARD_COUNT:02x}"
+
+
+def get_shard_key(service: str, shard: str) -> str:
+    return f"{CACHE_KEY_PREFIX}{service}:{shard}"
+
+
+def get_legacy_cache_key(service: str) -> str:
+    return f"{CACHE_KEY_PREFIX}{service}"
+
+
+def group_by_shard(service: str, info_hashes) -> dict[str, list[str]]:
+    """Group info hashes by the shard key that stores them."""
+    groups: dict[str, list[str]] = defaultdict(list)
+    for info_hash in info_hashes:
+        groups[get_shard_key(service, get_cache_shard(info_hash))].append(info_hash)
+    return groups
+
+
+_hash_field_ttl_supported: bool | None = None
+
+
+async def supports_hash_field_ttl() -> bool:
+    """Whether the Redis server supports per-field hash TTLs (HEXPIRE, Redis 7.4+)."""
+    global _hash_field_ttl_supported
+    if _hash_field_ttl_supported is None:
+        info = await REDIS_ASYNC_CLIENT.info("server")
+        version = info.get("redis_version") if info else None
+        if not version:
+            # Unknown (e.g. Redis unavailable); use the timestamp-only layout and check again later
+            return False
+        try:
+            _hash_field_ttl_supported = tuple(int(part) for part in str(version).split(".")[:2]) >= (7, 4)
+        except ValueError:
+            _hash_field_ttl_supported = False
+    return _hash_field_ttl_supported
+
+
+def _queue_shard_writes(pipe, service: str, entries: dict[str, int], field_ttl: bool) -> None:
+    """Queue writes of ``info_hash -> expiry timestamp`` entries into their shards."""
+    now = int(datetime.now(tz=UTC).timestamp())
+    for shard_key, hashes in group_by_shard(service, entries).items():
+        pipe.hset(shard_key, mapping={info_hash: entries[info_hash] for info_hash in hashes})
+        if field_ttl:
+            by_expiry: dict[int, list[str]] = defaultdict(list)
+            for info_hash in hashes:
+                by_expiry[entries[info_hash]].append(info_hash)
+            for expiry, fields in by_expiry.items():
+                pipe.hexpire(shard_key, max(expiry - now, 1), *fields)
+        # Every field expires within EXPIRY_DAYS of the last write, so the shard can too
+        pipe.expire(shard_key, EXPIRY_SECONDS)
+    pipe.sadd(CACHE_SERVICES_KEY, service)
+
+
 def _log_background_submission_result(task: asyncio.Task) -> None:
     """Log submit_cached_hashes failures for fire-and-forget sync tasks."""
     try:
@@ -44,6 +114,14 @@ def get_cache_service_name(streaming_provider: StreamingProvider):
     return streaming_provider.service
 
 
+def is_global_cache_check_provider(streaming_provider: StreamingProvider) -> bool:
+    """
+    Whether the provider's cache check reflects service-wide availability
+    rather than the user's own torrent list.
+    """
+    return get_cache_service_name(streaming_provider) in GLOBAL_CACHE_CHECK_PROVIDERS
+
+
 def get_provider_user_hash(streaming_provider: StreamingProvider) -> str:
     """
     Hash the user's credentials to build a cache key that identifies this user
@@ -69,7 +147,7 @@ def _build_cache_check_key(streaming_provider: StreamingProvider, media_id: str)
         debrid_checked:{service}:{user_hash}:{media_id}
     """
     service = get_cache_service_name(streaming_provider)
-    if service in GLOBAL_CACHE_CHECK_PROVIDERS:
+    if is_global_cache_check_provider(streaming_provider):
         return f"{CACHE_CHECK_PREFIX}{service}:{media_id}"
     user_hash = get_provider_user_hash(streaming_provider)
     return f"{CACHE_CHECK_PREFIX}{service}:{user_hash}:{media_id}"
@@ -118,14 +196,15 @@ async def store_cached_info_hashes(
 
     try:
         # Store in local Redis
-        cache_key = f"{CACHE_KEY_PREFIX}{service}"
         timestamp = int((datetime.now(tz=UTC) + timedelta(days=EXPIRY_DAYS)).timestamp())
 
         # Create mapping of info_hash to expiry timestamp
         cache_data = dict.fromkeys(info_hashes, timestamp)
 
-        # Store all hashes with their expiry timestamps in one operation
-        await REDIS_ASYNC_CLIENT.hset(cache_key, mapping=cache_data)
+        # Store all hashes into their shards in one round trip
+        pipe = REDIS_ASYNC_CLIENT.pipeline(transaction=False)
+        _queue_shard_writes(pipe, service, cache_data, await supports_hash_field_ttl())
+        await pipe.execute()
 
         # Submit to MediaFusion
         if settings.sync_debrid_cache_streams:
@@ -154,19 +233,31 @@ async def get_cached_status(streaming_provider: StreamingProvider, info_hashes:
     service = get_cache_service_name(streaming_provider)
 
     try:
-        # First check local Redis cache
-        cache_key = f"{CACHE_KEY_PREFIX}{service}"
+        # First check local Redis cache: one HMGET per shard, plus the legacy hash,
+        # in a single round trip
         current_time = int(datetime.now(tz=UTC).timestamp())
+        legacy_key = get_legacy_cache_key(service)
+        shard_groups = group_by_shard(service, info_hashes)
+
+        pipe = REDIS_ASYNC_CLIENT.pipeline(transaction=False)
+        for shard_key, hashes in shard_groups.items():
+            pipe.hmget(shard_key, hashes)
+        pipe.hmget(legacy_key, info_hashes)
+        *shard_replies, legacy_timestamps = await pipe.execute()
 
-        # Get all timestamps in one operation
-        timestamps = await REDIS_ASYNC_CLIENT.hmget(cache_key, info_hashes)
+        timestamps: dict[str, bytes | None] = dict(zip(info_hashes, legacy_timestamps))
+        for hashes, shard_timestamps in zip(shard_groups.values(), shard_replies):
+            for info_hash, timestamp_bytes in zip(hashes, shard_timestamps):
+                if timestamp_bytes is not None:
+                    timestamps[info_hash] = timestamp_bytes
 
         # Process results and identify which hashes need MediaFusion check
         result = {}
         expired_hashes = []
         mediafusion_check_needed = []
 
-        for info_hash, timestamp_bytes in zip(info_hashes, timestamps):
+        for info_hash in info_hashes:
+            timestamp_bytes = timestamps.get(info_hash)
             if timestamp_bytes is None:
                 mediafusion_check_needed.append(info_hash)
                 continue
@@ -182,16 +273,26 @@ async def get_cached_status(streaming_provider: StreamingProvider, info_hashes:
                 expired_hashes.append(info_hash)
                 mediafusion_check_needed.append(info_hash)
 
-        # Clean up expired entries if any found
+        # Clean up expired entries if any found (only possible without field TTLs)
         if expired_hashes:
-            await REDIS_ASYNC_CLIENT.hdel(cache_key, *expired_hashes)
+            pipe = REDIS_ASYNC_CLIENT.pipeline(transaction=False)
+            for shard_key, hashes in group_by_shard(service, expired_hashes).items():
+                pipe.hdel(shard_key, *hashes)
+            pipe.hdel(legacy_key, *expired_hashes)
+            await pipe.execute()
 
         # Check MediaFusion for any hashes not found in Redis or expired
         if mediafusion_check_needed and settings.sync_debrid_cache_streams:
-            mediafusion_results = await mediafusion_client.fetch_cache_status(
-                streaming_provider, mediafusion_check_needed
-            )
-            result.update(mediafusion_results)
+            # Skip hashes MediaFusion recently reported as uncached
+            negative = await check_recently_uncached("remote", service, mediafusion_check_needed)
+            result.update(dict.fromkeys(negative.skipped, False))
+            remote_check_needed = [hash_ for hash_ in mediafusion_check_needed if hash_ not in negative.skipped]
+            if remote_check_needed:
+                mediafusion_results = await mediafusion_client.fetch_cache_status(
+                    streaming_provider, remote_check_needed
+                )
+                result.update(mediafusion_results)
+                await record_lookup_results("remote", service, mediafusion_results, negative.audited)
         else:
             # If MediaFusion isn't available, mark all uncached hashes as False
             for hash_ in mediafusion_check_needed:
@@ -204,50 +305,117 @@ async def get_cached_status(streaming_provider: StreamingProvider, info_hashes:
         return dict.fromkeys(info_hashes, False)
 
 
+async def _delete_expired_fields(key: str, current_time: int) -> int:
+    """HSCAN one hash and delete its expired fields; returns the number deleted."""
+    cursor = 0
+    expired_hashes = []
+    deleted = 0
+
+    while True:
+        cursor, data = await REDIS_ASYNC_CLIENT.hscan(
+            key,
+            cursor,
+            count=1000,  # Process in chunks of 1000
+        )
+
+        # Check for expired entries in this chunk
+        for hash_, timestamp_bytes in data.items():
+            try:
+                if int(timestamp_bytes) <= current_time:
+                    expired_hashes.append(hash_)
+            except (ValueError, TypeError):
+                expired_hashes.append(hash_)
+
+        # Delete expired entries if we have accumulated enough or reached the end
+        if expired_hashes and (len(expired_hashes) >= 1000 or cursor == 0):
+            await REDIS_ASYNC_CLIENT.hdel(key, *expired_hashes)
+            deleted += len(expired_hashes)
+            expired_hashes = []
+
+        # Exit if we've processed all entries
+        if cursor == 0:
+            return deleted
+
+
 async def cleanup_service_cache(service: str) -> None:
     """
-    Cleanup expired entries for a service.
-    Uses efficient HSCAN to handle large hash maps.
+    Cleanup expired entries for a service, a bounded number of shards per run.
+
+    Resumes from the shard where the previous run stopped. Not needed when Redis
+    expires hash fields itself (Redis 7.4+).
 
     Args:
         service: The debrid service name
     """
     try:
-        cache_key = f"{CACHE_KEY_PREFIX}{service}"
         current_time = int(datetime.now(tz=UTC).timestamp())
-        cursor = 0
-        expired_hashes = []
+        cursor_key = f"{CACHE_CLEANUP_CURSOR_PREFIX}{service}"
+        start = int(await REDIS_ASYNC_CLIENT.get(cursor_key) or 0) % SHARD_COUNT
+        shard_count = min(settings.debrid_cache_cleanup_shards_per_run, SHARD_COUNT)
 
-        while True:
-            cursor, data = await REDIS_ASYNC_CLIENT.hscan(
-                cache_key,
-                cursor,
-                count=1000,  # Process in chunks of 1000
-            )
-
-            # Check for expired entries in this chunk
-            for hash_, timestamp_bytes in data.items():
-                try:
-                    if int(timestamp_bytes) <= current_time:
-                        expired_hashes.append(hash_)
-                except (ValueError, TypeError):
-                    expired_hashes.append(hash_)
+        expired_count = 0
+        for offset in range(shard_count):
+            shard = f"{(start + offset) % SHARD_COUNT:02x}"
+            expired_count += await _delete_expired_fields(get_shard_key(service, shard), current_time)
 
-            # Delete expired entries if we have accumulated enough or reached the end
-            if expired_hashes and (len(expired_hashes) >= 1000 or cursor == 0):
-                await REDIS_ASYNC_CLIENT.hdel(cache_key, *expired_hashes)
-                expired_count = len(expired_hashes)
-                expired_hashes = []
-                logging.info(f"Cleaned up {expired_count} expired entries for {service}")
-
-            # Exit if we've processed all entries
-            if cursor == 0:
-                break
+        await REDIS_ASYNC_CLIENT.set(cursor_key, (start + shard_count) % SHARD_COUNT)
+        logging.info(f"Cleaned up {expired_count} expired entries in {shard_count} shards for {service}")
 
     except Exception as e:
         logging.error(f"Error during cache cleanup for {service}: {e}")
 
 
+async def migrate_legacy_service_cache(service: str, max_fields: int | None = None) -> int:
+    """
+    Move unexpired entries from the pre-sharding hash into the shards.
+
+    Migrated (and expired) fields are deleted from the legacy hash, so repeated
+    calls make progress and the legacy key disappears once drained.
+
+    Args:
+        service: The debrid service name
+        max_fields: Stop after roughly this many legacy fields (None for all)
+
+    Returns:
+        Number of legacy fields processed.
+    """
+    legacy_key = get_legacy_cache_key(service)
+    if not await REDIS_ASYNC_CLIENT.exists(legacy_key):
+        return 0
+
+    field_ttl = await supports_hash_field_ttl()
+    current_time = int(datetime.now(tz=UTC).timestamp())
+    processed = 0
+    cursor = 0
+
+    while True:
+        cursor, data = await REDIS_ASYNC_CLIENT.hscan(legacy_key, cursor, count=1000)
+        live_entries = {}
+        for hash_, timestamp_bytes in data.items():
+            info_hash = hash_.decode() if isinstance(hash_, bytes) else hash_
+            try:
+                expiry_time = int(timestamp_bytes)
+            except (ValueError, TypeError):
+                continue
+            if expiry_time > current_time:
+                live_entries[info_hash] = expiry_time
+
+        if data:
+            pipe = REDIS_ASYNC_CLIENT.pipeline(transaction=False)
+            if live_entries:
+                _queue_shard_writes(pipe, service, live_entries, field_ttl)
+            pipe.hdel(legacy_key, *data.keys())
+            await pipe.execute()
+            processed += len(data)
+
+        if cursor == 0 or (max_fields is not None and processed >= max_fields):
+            break
+
+    if processed:
+        logging.info(f"Migrated {processed} legacy debrid cache entries for {service}")
+    return processed
+
+
 @actor(
     time_limit=5 * 60 * 1000,  # 5 minutes
     priority=2,
@@ -255,14 +423,17 @@ async def cleanup_service_cache(service: str) -> None:
 )
 async def cleanup_expired_cache(**kwargs):
     """
-    Cleanup expired entries for all services.
+    Cleanup expired entries for all services and drain legacy caches into shards.
     """
     try:
-        services = await REDIS_ASYNC_CLIENT.keys(f"{CACHE_KEY_PREFIX}*")
+        services = await REDIS_ASYNC_CLIENT.smembers(CACHE_SERVICES_KEY)
+        field_ttl = await supports_hash_field_ttl()
         for service in services:
-            service_name = service.decode("utf-8").replace(CACHE_KEY_PREFIX, "")
-            logging.info(f"Cleaning up cache for {service_name}")
-            await cleanup_service_cache(service_name)
+            service_name = service.decode("utf-8") if isinstance(service, bytes) else service
+            await migrate_legacy_service_cache(service_name, settings.debrid_cache_migration_batch_size)
+            if not field_ttl:
+                logging.info(f"Cleaning up cache for {service_name}")
+                await cleanup_service_cache(service_name)
     except Exception as e:
         logging.error(f"Error during cache cleanup: {e}")
 
@@ -8,10 +8,11 @@ from contextlib import AsyncContextDecorator
 
 import aiohttp
 from aiohttp import ClientResponse, ClientTimeout, ContentTypeError, FormData
-from aiohttp_socks import ProxyConnector, ProxyError
+from aiohttp_socks import ProxyError
 
 from db.config import settings
 from workers.providers.exceptions import ProviderException
+from workers.providers.http_pool import DEFAULT_TIMEOUT, get_shared_session
 
 logger = logging.getLogger(__name__)
 
@@ -24,27 +25,16 @@ class DebridClient(AsyncContextDecorator):
         self.token = token
         self.is_private_token = False
         self.headers: dict[str, str] = {}
-        self._session: aiohttp.ClientSession | None = None
-        self._timeout = ClientTimeout(total=15)  # Stremio timeout is 20s
+        self._timeout: ClientTimeout = DEFAULT_TIMEOUT
 
     @property
     def session(self) -> aiohttp.ClientSession:
-        if self._session is None:
-            connector = aiohttp.TCPConnector(ttl_dns_cache=300)
-            proxy_url = settings.requests_proxy_url_for_debrid_provider(self.__class__.debrid_proxy_provider_id)
-            if proxy_url:
-                connector = ProxyConnector.from_url(proxy_url)
-            self._session = aiohttp.ClientSession(timeout=self._timeout, connector=connector)
-        return self._session
+        """Borrow the process-wide pooled session for this provider (never closed by the client)."""
+        provider_id = self.__class__.debrid_proxy_provider_id
+        return get_shared_session(provider_id, settings.requests_proxy_url_for_debrid_provider(provider_id))
 
     async def __aenter__(self):
-        try:
-            await self.initialize_headers()
-        except ProviderException as error:
-            if self._session:
-                await self._session.close()
-                self._session = None
-            raise error
+        await self.initialize_headers()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -57,10 +47,6 @@ class DebridClient(AsyncContextDecorator):
             except ProviderException:
                 pass
 
-        if self._session:
-            await self._session.close()
-            self._session = None
-
     async def _make_request(
         self,
         method: str,
@@ -75,7 +61,7 @@ class DebridClient(AsyncContextDecorator):
     ) -> dict | list | str:
         try:
             async with self.session.request(
-                method, url, data=data, json=json, params=params, headers=self.headers
+                method, url, data=data, json=json, params=params, headers=self.headers, timeout=self._timeout
             ) as response:
                 await self._check_response_status(response, is_expected_to_fail)
                 return await self._parse_response(response, is_return_none, is_expected_to_fail, is_http_response)
@@ -0,0 +1,117 @@
+"""
+Process-wide pooled aiohttp sessions for debrid provider clients.
+
+``DebridClient`` instances are short-lived (one per cache check or playback request), so
+owning a session each meant a fresh TCP + TLS handshake for every request. Clients borrow
+a shared session keyed by event loop, provider and proxy URL instead; the connector keeps
+connections alive and caps connections per host. Sessions never store cookies, since one
+session serves many users' tokens.
+
+aiohttp speaks HTTP/1.1 only, so keep-alive reuse is what saves the handshakes here.
+
+Sessions must be closed on the loop that owns them: the API lifespan and the worker
+shutdown hook call ``close_shared_sessions``, and code that runs a task in its own
+short-lived loop uses ``run_with_shared_sessions`` instead of ``asyncio.run``.
+"""
+
+import asyncio
+import logging
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+import aiohttp
+from aiohttp import ClientTimeout
+from aiohttp_socks import ProxyConnector
+
+from db.config import settings
+from utils.prometheus_metrics import DEBRID_HTTP_CONNECTIONS_CREATED_TOTAL, DEBRID_HTTP_CONNECTIONS_REUSED_TOTAL
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = ClientTimeout(total=15)  # Stremio timeout is 20s
+
+T = TypeVar("T")
+
+_sessions: dict[tuple[int, str, str | None], tuple[asyncio.AbstractEventLoop, aiohttp.ClientSession]] = {}
+
+
+def _build_trace_config(provider_label: str) -> aiohttp.TraceConfig:
+    """Count new (handshaking) vs reused pooled connections for ``provider_label``."""
+    created = DEBRID_HTTP_CONNECTIONS_CREATED_TOTAL.labels(provider=provider_label)
+    reused = DEBRID_HTTP_CONNECTIONS_REUSED_TOTAL.labels(provider=provider_label)
+
+    async def _on_connection_create_end(_session, _ctx, _params):
+        created.inc()
+
+    async def _on_connection_reuseconn(_session, _ctx, _params):
+        reused.inc()
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_connection_create_end.append(_on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(_on_connection_reuseconn)
+    return trace_config
+
+
+def _build_connector(proxy_url: str | None) -> aiohttp.TCPConnector:
+    connector_options = {
+        "limit": settings.debrid_http_pool_limit,
+        "limit_per_host": settings.debrid_http_pool_limit_per_host,
+        "keepalive_timeout": settings.debrid_http_keepalive_timeout,
+        "ttl_dns_cache": 300,
+    }
+    if proxy_url:
+        return ProxyConnector.from_url(proxy_url, **connector_options)
+    return aiohttp.TCPConnector(**connector_options)
+
+
+def _prune_closed_loops() -> None:
+    """Drop sessions whose event loop has closed.
+
+    Their sockets can no longer be closed from here, so this is only a safety net and
+    logged as a leak: the owning loop should have run ``close_shared_sessions``.
+    """
+    for key, (loop, session) in list(_sessions.items()):
+        if loop.is_closed():
+            del _sessions[key]
+            if not session.closed:
+                logger.warning("Pooled debrid session for %s outlived its event loop without being closed", key[1])
+
+
+def get_shared_session(provider_id: str, proxy_url: str | None) -> aiohttp.ClientSession:
+    """Return the pooled session for ``provider_id``/``proxy_url`` on the running event loop."""
+    loop = asyncio.get_running_loop()
+    key = (id(loop), provider_id, proxy_url)
+    entry = _sessions.get(key)
+    if entry is not None and entry[0] is loop and not entry[1].closed:
+        return entry[1]
+
+    _prune_closed_loops()
+    session = aiohttp.ClientSession(
+        connector=_build_connector(proxy_url),
+        timeout=DEFAULT_TIMEOUT,
+        cookie_jar=aiohttp.DummyCookieJar(),
+        trace_configs=[_build_trace_config(provider_id or "unknown")],
+    )
+    _sessions[key] = (loop, session)
+    return session
+
+
+async def close_shared_sessions() -> None:
+    """Close every pooled session owned by the running event loop."""
+    loop = asyncio.get_running_loop()
+    for key, (session_loop, session) in list(_sessions.items()):
+        if session_loop is loop:
+            del _sessions[key]
+            await session.close()
+
+
+def run_with_shared_sessions(coro: Coroutine[Any, Any, T]) -> T:
+    """``asyncio.run`` that closes the pooled sessions ``coro`` opened before its loop ends."""
+
+    async def _run() -> T:
+        try:
+            return await coro
+        finally:
+            await close_shared_sessions()
+
+    return asyncio.run(_run())
@@ -0,0 +1,158 @@
+"""
+Time-partitioned Bloom filters of info hashes recently confirmed as not cached.
+
+Most hashes a debrid cache lookup misses on stay uncached, so asking MediaFusion
+(``remote`` scope) or a global-cache provider (``provider`` scope) about them on
+every request is wasted work. Hashes a lookup reported as uncached are added to a
+per-service Bloom filter stored as a Redis bitmap, and are skipped by later
+lookups for roughly ``debrid_negative_cache_window_seconds``.
+
+The window is split into ``debrid_negative_cache_partitions`` bitmaps, one per time
+bucket; a hash is skipped if any live bucket contains it and whole buckets expire,
+so entries age out without deletes. A positive check may be a false positive (a
+hash never recorded) or stale (the hash became cached since); both only hide
+a cached stream until the entry ages out. A small sample of positives
+(``debrid_negative_cache_audit_rate``) is looked up anyway to measure this.
+
+Redis keys used:
+    debrid_uncached:{scope}:{service}:{bucket}    -- Bloom filter bitmap
+    debrid_uncached:{scope}:{service}:{bucket}:n  -- insert counter for the FPR estimate
+"""
+
+import hashlib
+import logging
+import math
+import random
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from db.config import settings
+from db.redis_database import REDIS_ASYNC_CLIENT
+from utils.prometheus_metrics import (
+    DEBRID_NEGATIVE_CACHE_AUDITS_TOTAL,
+    DEBRID_NEGATIVE_CACHE_ESTIMATED_FPR,
+    DEBRID_NEGATIVE_CACHE_LOOKUPS_TOTAL,
+)
+
+logger = logging.getLogger(__name__)
+
+NEGATIVE_CACHE_PREFIX = "debrid_uncached:"
+
+
+@dataclass(slots=True)
+class NegativeCacheCheck:
+    """Outcome of checking info hashes against the negative cache."""
+
+    # Recently confirmed uncached; callers skip looking these up
+    skipped: set[str] = field(default_factory=set)
+    # Filter positives sampled for a lookup anyway; pass back to record_lookup_results
+    audited: set[str] = field(default_factory=set)
+
+
+def _partition_seconds() -> int:
+    return max(settings.debrid_negative_cache_window_seconds // settings.debrid_negative_cache_partitions, 1)
+
+
+def _live_keys(scope: str, service: str) -> list[str]:
+    """Filter keys for the current bucket first, then the older buckets in the window."""
+    current = int(time.time()) // _partition_seconds()
+    return [
+        f"{NEGATIVE_CACHE_PREFIX}{scope}:{service}:{bucket}"
+        for bucket in range(current, current - settings.debrid_negative_cache_partitions, -1)
+    ]
+
+
+def _bit_positions(info_hash: str) -> list[int]:
+    """Bloom filter bit offsets for an info hash (Kirsch-Mitzenmacher double hashing)."""
+    digest = hashlib.blake2b(info_hash.lower().encode(), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], "big")
+    h2 = int.from_bytes(digest[8:], "big") | 1
+    bits = settings.debrid_negative_cache_bits
+    return [(h1 + i * h2) % bits for i in range(settings.debrid_negative_cache_hashes)]
+
+
+def estimated_false_positive_rate(inserted: int) -> float:
+    """Expected false-positive rate of one partition after ``inserted`` insertions."""
+    hashes = settings.debrid_negative_cache_hashes
+    return (1 - math.exp(-hashes * inserted / settings.debrid_negative_cache_bits)) ** hashes
+
+
+async def check_recently_uncached(scope: str, service: str, info_hashes: list[str]) -> NegativeCacheCheck:
+    """Find which info hashes were recently confirmed uncached for a service.
+
+    All live partitions are read with one BITFIELD per partition in a single round
+    trip. Returns an empty result (nothing skipped) if the cache is disabled or
+    Redis fails.
+    """
+    check = NegativeCacheCheck()
+    if not settings.debrid_negative_cache_enabled or not info_hashes:
+        return check
+
+    positions = [_bit_positions(info_hash) for info_hash in info_hashes]
+    get_args = [arg for hash_positions in positions for offset in hash_positions for arg in ("GET", "u1", offset)]
+    try:
+        pipe = REDIS_ASYNC_CLIENT.pipeline(transaction=False)
+        for key in _live_keys(scope, service):
+            pipe.execute_command("BITFIELD", key, *get_args)
+        partitions = await pipe.execute()
+    except Exception as exc:
+        logger.debug("Negative cache check failed for %s/%s: %s", scope, service, exc)
+        return check
+
+    hashes = settings.debrid_negative_cache_hashes
+    for index, info_hash in enumerate(info_hashes):
+        window = slice(index * hashes, (index + 1) * hashes)
+        if any(all(bits[window]) for bits in partitions):
+            if random.random() < settings.debrid_negative_cache_audit_rate:
+                check.audited.add(info_hash)
+            else:
+                check.skipped.add(info_hash)
+
+    DEBRID_NEGATIVE_CACHE_LOOKUPS_TOTAL.labels(scope=scope, result="skipped").inc(len(check.skipped))
+    DEBRID_NEGATIVE_CACHE_LOOKUPS_TOTAL.labels(scope=scope, result="checked").inc(len(info_hashes) - len(check.skipped))
+    return check
+
+
+async def record_uncached(scope: str, service: str, info_hashes: Iterable[str]) -> None:
+    """Add info hashes confirmed uncached to the current partition."""
+    info_hashes = list(info_hashes)
+    if not settings.debrid_negative_cache_enabled or not info_hashes:
+        return
+
+    key = _live_keys(scope, service)[0]
+    ttl = settings.debrid_negative_cache_window_seconds + _partition_seconds()
+    set_args = [
+        arg for info_hash in info_hashes for offset in _bit_positions(info_hash) for arg in ("SET", "u1", offset, 1)
+    ]
+    try:
+        pipe = REDIS_ASYNC_CLIENT.pipeline(transaction=False)
+        pipe.execute_command("BITFIELD", key, *set_args)
+        pipe.expire(key, ttl)
+        pipe.incrby(f"{key}:n", len(info_hashes))
+        pipe.expire(f"{key}:n", ttl)
+        _, _, inserted, _ = await pipe.execute()
+    except Exception as exc:
+        logger.debug("Negative cache update failed for %s/%s: %s", scope, service, exc)
+        return
+    DEBRID_NEGATIVE_CACHE_ESTIMATED_FPR.labels(scope=scope, service=service).set(
+        estimated_false_positive_rate(int(inserted))
+    )
+
+
+async def record_lookup_results(
+    scope: str,
+    service: str,
+    statuses: dict[str, bool | None],
+    audited: set[str] | None = None,
+) -> None:
+    """Record the uncached hashes of a lookup and the outcome of audited positives.
+
+    Only hashes with an explicit ``False`` are recorded; hashes the lookup did not
+    answer for (missing or ``None``, e.g. a failed provider call) are left alone.
+    """
+    for info_hash in audited or ():
+        if statuses.get(info_hash) is not None:
+            result = "false_positive" if statuses[info_hash] else "confirmed"
+            DEBRID_NEGATIVE_CACHE_AUDITS_TOTAL.labels(scope=scope, result=result).inc()
+    await record_uncached(scope, service, (info_hash for info_hash, cached in statuses.items() if cached is False))
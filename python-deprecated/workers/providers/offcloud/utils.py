@@ -92,8 +92,7 @@ async def update_oc_cache_status(streams: list[TorrentStreamData], streaming_pro
             instant_availability_data = await oc_client.get_torrent_instant_availability(
                 [stream.info_hash for stream in streams]
             )
-            if not instant_availability_data:
-                return
+            # An empty answer means none are cached; failures raise and leave them unanswered
             for stream in streams:
                 stream.cached = stream.info_hash in instant_availability_data
     except ProviderException:
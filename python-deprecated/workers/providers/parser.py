@@ -8,7 +8,6 @@ from re import Pattern
 from typing import Any, TypedDict
 
 import dateparser
-import PTT
 
 from db.crud.scraper_helpers import get_series_data_by_id
 from db.crud.streams import get_torrent_by_info_hash, update_stream_files, update_torrent_stream
@@ -19,6 +18,7 @@ from db.schemas.media import UsenetStreamData
 from workers.providers.exceptions import ProviderException
 from utils.lock import acquire_redis_lock
 from utils.notification_registry import send_file_annotation_request
+from utils.ptt_cache import parse_title_cached
 from utils.runtime_const import DATE_STR_REGEX
 from utils.validation_helper import is_video_file
 
@@ -219,7 +219,7 @@ class TorrentFileProcessor:
     ) -> tuple[int | None, int | None]:
         """Parse season and episode information from filename and torrent title."""
         # First try from filename with PTT
-        parsed_data = PTT.parse_title(file_info.filename)
+        parsed_data = parse_title_cached(file_info.filename)
         seasons = parsed_data.get("seasons", [])
         episodes = parsed_data.get("episodes", [])
 
@@ -231,7 +231,7 @@ class TorrentFileProcessor:
             return default_season, episodes[0]
 
         # If no season/episode found, try from torrent title
-        title_parsed = PTT.parse_title(torrent_title)
+        title_parsed = parse_title_cached(torrent_title)
         title_seasons = title_parsed.get("seasons", [])
         title_episodes = title_parsed.get("episodes", [])
 
@@ -794,7 +794,7 @@ class UsenetFileProcessor:
     ) -> tuple[int | None, int | None]:
         """Parse season and episode information from filename."""
         # First try from filename with PTT
-        parsed_data = PTT.parse_title(file_info.filename)
+        parsed_data = parse_title_cached(file_info.filename)
         seasons = parsed_data.get("seasons", [])
         episodes = parsed_data.get("episodes", [])
 
@@ -806,7 +806,7 @@ class UsenetFileProcessor:
             return default_season, episodes[0]
 
         # Try from title
-        title_parsed = PTT.parse_title(title)
+        title_parsed = parse_title_cached(title)
         title_seasons = title_parsed.get("seasons", [])
         title_episodes = title_parsed.get("episodes", [])
 
@@ -78,8 +78,7 @@ async def update_chunk_cache_status(torbox_client: Torbox, streams_chunk: list[T
         instant_availability_data = (
             await torbox_client.get_torrent_instant_availability([stream.info_hash for stream in streams_chunk]) or []
         )
-        if not instant_availability_data:
-            return
+        # An empty answer means none of the chunk is cached; failures raise and leave it unanswered
         for stream in streams_chunk:
             stream.cached = bool(stream.info_hash in instant_availability_data)
     except ProviderException as e:
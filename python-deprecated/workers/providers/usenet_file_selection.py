@@ -16,10 +16,10 @@ from datetime import date, datetime
 from typing import Any
 
 import dateparser
-import PTT
 
 from workers.providers.exceptions import ProviderException
 from workers.providers.parser import fallback_parse_season_episode
+from utils.ptt_cache import parse_title_cached
 from utils.runtime_const import DATE_STR_REGEX
 
 USENET_VIDEO_EXTENSIONS: frozenset[str] = frozenset(
@@ -83,7 +83,7 @@ def extract_air_date_from_label(label: str) -> str | None:
     if not text:
         return None
 
-    parsed = PTT.parse_title(text)
+    parsed = parse_title_cached(text)
     raw_date = parsed.get("date")
     normalized = _normalize_calendar_date(raw_date)
     if normalized:
@@ -114,7 +114,7 @@ def usenet_label_matches_season_episode(label: str, season: int, episode: int) -
     if not text:
         return False
 
-    parsed = PTT.parse_title(text)
+    parsed = parse_title_cached(text)
     seasons = parsed.get("seasons") or []
     episodes = parsed.get("episodes") or []
     if seasons and episodes:
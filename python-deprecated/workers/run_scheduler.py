@@ -10,6 +10,7 @@ from db import database
 from db.config import settings
 from utils.exception_tracker import install_exception_handler
 from utils.torrent import init_best_trackers
+from workers.providers.http_pool import close_shared_sessions
 from workers.scheduler import setup_scheduler
 
 logging.basicConfig(
@@ -38,6 +39,7 @@ async def main() -> None:
 
     await stop
     scheduler.shutdown(wait=False)
+    await close_shared_sessions()
     await database.close()
     logger.info("Scheduler stopped")
 
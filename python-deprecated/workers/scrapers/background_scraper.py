@@ -130,7 +130,6 @@ class BackgroundSearchWorker:
 
         for item in pending_movies:
             meta_id = item["key"]
-            await self.manager.mark_as_processing(meta_id)
 
             try:
 
@@ -213,7 +212,7 @@ class BackgroundSearchWorker:
                     return
                 logger.exception(f"Error processing movie {meta_id}: {e}")
             finally:
-                await self.manager.mark_as_completed(meta_id, self.manager.movie_hash_key)
+                await self.manager.mark_as_completed(meta_id, self.manager.movie_queue_key)
 
     async def process_series_batch(self):
         """Process a batch of pending series episodes with complete scraping"""
@@ -232,6 +231,7 @@ class BackgroundSearchWorker:
                     "Skipping invalid series background-search key %r (expected meta_id:season:episode)",
                     key,
                 )
+                await self.manager.remove_from_queue(key, self.manager.series_queue_key)
                 continue
             meta_id, season_raw, episode_raw = parts
             try:
@@ -242,8 +242,8 @@ class BackgroundSearchWorker:
                     "Skipping series background-search key %r: invalid season or episode",
                     key,
                 )
+                await self.manager.remove_from_queue(key, self.manager.series_queue_key)
                 continue
-            await self.manager.mark_as_processing(key)
 
             try:
 
@@ -348,7 +348,7 @@ class BackgroundSearchWorker:
                     return
                 logger.exception(f"Error processing series {meta_id} S{season}E{episode}: {e}")
             finally:
-                await self.manager.mark_as_completed(key, self.manager.series_hash_key)
+                await self.manager.mark_as_completed(key, self.manager.series_queue_key)
 
 
 async def _run_background_search_async():
@@ -13,8 +13,6 @@ from typing import Any, Literal
 from urllib.parse import urljoin, urlsplit
 
 import httpx
-import PTT
-from ratelimit import limits, sleep_and_retry
 from sqlalchemy.exc import IntegrityError
 from sqlmodel.ext.asyncio.session import AsyncSession
 from tenacity import retry, stop_after_attempt, wait_exponential
@@ -31,12 +29,10 @@ from db.schemas import MetadataData, StreamFileData, TorrentStreamData, UserData
 from workers.scrapers import torrent_info
 from workers.scrapers.imdb_data import get_episode_by_date
 from utils.network import CircuitBreaker, batch_process_with_circuit_breaker
-from utils.parser import (
-    NON_VIDEO_BLOCKLIST_KEYWORDS,
-    VIDEO_ALLOWLIST_KEYWORDS,
-    calculate_max_similarity_ratio,
-    is_contain_18_plus_keywords,
-)
+from utils.ptt_cache import parse_title_cached
+from utils.rate_limiter import get_rate_limiter
+from utils.parser import calculate_max_similarity_ratio, is_contain_18_plus_keywords
+from utils.title_classifier import NON_VIDEO_BLOCKLIST_KEYWORDS, VIDEO_ALLOWLIST_KEYWORDS, contains_keyword
 from utils.torrent import extract_torrent_metadata, info_hashes_to_torrent_metadata, is_probable_torrent_bytes
 
 # Redis key constants for scraper metrics storage
@@ -80,6 +76,10 @@ class ScraperMetrics:
     source_stats: Counter = field(default_factory=Counter)
     skip_scraping: bool = False
     indexer_stats: dict[str, dict[str, Any]] = field(default_factory=dict)
+    rate_limit_acquires: int = 0
+    rate_limit_waits: int = 0
+    rate_limit_wait_seconds: float = 0.0
+    rate_limit_max_wait_seconds: float = 0.0
 
     def start(self):
         """Reset and start new metrics collection"""
@@ -92,6 +92,10 @@ class ScraperMetrics:
         self.quality_stats.clear()
         self.source_stats.clear()
         self.skip_scraping = False
+        self.rate_limit_acquires = 0
+        self.rate_limit_waits = 0
+        self.rate_limit_wait_seconds = 0.0
+        self.rate_limit_max_wait_seconds = 0.0
 
     def stop(self):
         """Stop metrics collection and record end time"""
@@ -126,6 +130,23 @@ class ScraperMetrics:
         """Skip scraping the item"""
         self.skip_scraping = True
 
+    def record_rate_limit_wait(self, seconds: float):
+        """Record time spent waiting for a rate limit slot"""
+        self.rate_limit_acquires += 1
+        if seconds > 0:
+            self.rate_limit_waits += 1
+            self.rate_limit_wait_seconds += seconds
+            self.rate_limit_max_wait_seconds = max(self.rate_limit_max_wait_seconds, seconds)
+
+    def get_rate_limit_summary(self) -> dict:
+        """Summarize rate limiter waits"""
+        return {
+            "acquires": self.rate_limit_acquires,
+            "waits": self.rate_limit_waits,
+            "total_wait_seconds": round(self.rate_limit_wait_seconds, 3),
+            "max_wait_seconds": round(self.rate_limit_max_wait_seconds, 3),
+        }
+
     def record_indexer_success(self, indexer_name: str, results_count: int):
         """Record successful results from an indexer"""
         if indexer_name not in self.indexer_stats:
@@ -169,6 +190,7 @@ class ScraperMetrics:
             "skip_reasons": dict(self.skip_reasons),
             "quality_distribution": dict(self.quality_stats),
             "source_distribution": dict(self.source_stats),
+            "rate_limit": self.get_rate_limit_summary(),
         }
 
     def format_summary(self) -> str:
@@ -215,6 +237,18 @@ class ScraperMetrics:
             ]
         )
 
+        # Rate Limiting
+        if self.rate_limit_waits:
+            lines.extend(
+                [
+                    "Rate Limiting:",
+                    f"  ├─ Waits      : {self.rate_limit_waits}/{self.rate_limit_acquires}",
+                    f"  ├─ Total Wait : {self.rate_limit_wait_seconds:.2f} seconds",
+                    f"  └─ Max Wait   : {self.rate_limit_max_wait_seconds:.2f} seconds",
+                    "",
+                ]
+            )
+
         # Error Distribution
         if self.error_counts:
             lines.append("Error Distribution:")
@@ -309,6 +343,7 @@ class ScraperMetrics:
             "quality_distribution": dict(self.quality_stats),
             "source_distribution": dict(self.source_stats),
             "indexer_stats": indexer_stats_serializable,
+            "rate_limit": self.get_rate_limit_summary(),
             "formatted_summary": self.format_summary(),
         }
 
@@ -379,6 +414,9 @@ class ScraperMetrics:
             agg_stats["total_items_skipped"] += summary["total_items"]["skipped"]
             agg_stats["total_errors"] += summary["total_items"]["errors"]
             agg_stats["total_duration_seconds"] += summary["duration_seconds"]
+            agg_stats["total_rate_limit_wait_seconds"] = (
+                agg_stats.get("total_rate_limit_wait_seconds", 0) + summary["rate_limit"]["total_wait_seconds"]
+            )
             agg_stats["last_run"] = summary["timestamp"]
 
             # Track run outcomes
@@ -616,15 +654,18 @@ class BaseScraper(abc.ABC):
     def rate_limit(calls: int, period: timedelta):
         """
         Decorator for rate limiting method calls.
+        Waits asynchronously for a slot in the scraper's budget (shared across workers
+        when ``scraper_rate_limit_backend`` is "redis") and records the wait in metrics.
         :param calls: Number of calls allowed in the period
         :param period: Time period for the rate limit
         """
 
         def decorator(func):
-            @sleep_and_retry
-            @limits(calls=calls, period=period.total_seconds())
             @wraps(func)
             async def wrapper(self, *args, **kwargs):
+                limiter = get_rate_limiter(self.cache_key_prefix, calls, period.total_seconds())
+                waited = await limiter.acquire()
+                self.metrics.record_rate_limit_wait(waited)
                 return await func(self, *args, **kwargs)
 
             return wrapper
@@ -712,7 +753,7 @@ class BaseScraper(abc.ABC):
     @staticmethod
     def parse_title_data(title: str) -> dict:
         """Parse torrent title using PTT"""
-        parsed = PTT.parse_title(title, True)
+        parsed = parse_title_cached(title, True)
         return {"torrent_name": title, **parsed}
 
     def validate_title_and_year(
@@ -1197,72 +1238,148 @@ class BaseScraper(abc.ABC):
             return None
 
 
+# Atomically claim up to ARGV[2] due items (score <= ARGV[1]) from the due-time ZSET in KEYS[1].
+# Each claimed item is leased until ARGV[3]: its due score is pushed to the lease expiry so other
+# workers skip it, and the lease is recorded in KEYS[2]. Returns a flat [member, due_score, ...] list.
+_CLAIM_DUE_ITEMS_SCRIPT = """
+local items = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'WITHSCORES', 'LIMIT', 0, tonumber(ARGV[2]))
+for i = 1, #items, 2 do
+    redis.call('ZADD', KEYS[1], ARGV[3], items[i])
+    redis.call('ZADD', KEYS[2], ARGV[3], items[i])
+end
+return items
+"""
+
+# Enqueue ARGV[2] as due at ARGV[1] unless it is currently leased. Existing entries are only
+# moved earlier (ZADD LT), so a re-request never postpones an item that is already due.
+_ENQUEUE_ITEM_SCRIPT = """
+local lease = redis.call('ZSCORE', KEYS[2], ARGV[2])
+if lease and tonumber(lease) > tonumber(ARGV[1]) then
+    return 0
+end
+return redis.call('ZADD', KEYS[1], 'LT', ARGV[1], ARGV[2])
+"""
+
+
 class BackgroundScraperManager:
+    """
+    Background search queue backed by one due-time sorted set per item type.
+
+    Members are movie meta ids or ``meta_id:season:episode`` keys, scored by the timestamp
+    at which they are next due for a search. Workers atomically claim a batch of due items,
+    which leases them for ``lease_seconds``; completing an item reschedules it
+    ``background_search_interval_hours`` later. Leases that expire (e.g. a crashed worker)
+    are reclaimed by ``cleanup_stale_processing``.
+    """
+
     def __init__(self):
-        self.movie_hash_key = "background_search:movies"
-        self.series_hash_key = "background_search:series"
-        self.processing_set_key = "background_search:processing"
+        self.movie_queue_key = "background_search:movies:due"
+        self.series_queue_key = "background_search:series:due"
+        self.lease_keys = {
+            self.movie_queue_key: "background_search:movies:leases",
+            self.series_queue_key: "background_search:series:leases",
+        }
+        # Hash-based queue layout used before the sorted-set queue; migrated on cleanup.
+        self.legacy_hash_keys = {
+            self.movie_queue_key: "background_search:movies",
+            self.series_queue_key: "background_search:series",
+        }
+        self.legacy_processing_set_key = "background_search:processing"
         self.batch_size = 10  # Number of items to process in each batch
+        self.lease_seconds = 3600  # How long a claimed item stays hidden from other workers
+
+    def _queue_key(self, item_type: str) -> str:
+        return self.movie_queue_key if item_type == "movie" else self.series_queue_key
+
+    async def _enqueue(self, queue_key: str, item_key: str) -> None:
+        await REDIS_ASYNC_CLIENT.eval(
+            _ENQUEUE_ITEM_SCRIPT, 2, queue_key, self.lease_keys[queue_key], time.time(), item_key
+        )
 
     async def add_movie_to_queue(self, meta_id: str) -> None:
         """Add a movie to the background search queue"""
-        await REDIS_ASYNC_CLIENT.hset(
-            self.movie_hash_key,
-            meta_id,
-            json.dumps({"last_scrape": None, "added_at": datetime.now().timestamp()}),
-        )
+        await self._enqueue(self.movie_queue_key, meta_id)
 
     async def add_series_to_queue(self, meta_id: str, season: int, episode: int) -> None:
         """Add a series episode to the background search queue"""
-        key = f"{meta_id}:{season}:{episode}"
-        await REDIS_ASYNC_CLIENT.hset(
-            self.series_hash_key,
-            key,
-            json.dumps({"last_scrape": None, "added_at": datetime.now().timestamp()}),
-        )
+        await self._enqueue(self.series_queue_key, f"{meta_id}:{season}:{episode}")
 
     async def get_pending_items(self, item_type: str) -> list[dict]:
-        """Get items that need to be scraped"""
-        hash_key = self.movie_hash_key if item_type == "movie" else self.series_hash_key
-        cutoff_time = datetime.now() - timedelta(hours=settings.background_search_interval_hours)
-
-        # Get all items
-        all_items = await REDIS_ASYNC_CLIENT.hgetall(hash_key)
-        pending_items = []
-
-        for item_key, item_data in all_items.items():
-            data = json.loads(item_data)
-            last_scrape = data.get("last_scrape")
-
-            # Check if item needs scraping
-            if not last_scrape or datetime.fromtimestamp(last_scrape) < cutoff_time:
-                # Check if not currently processing
-                if not await REDIS_ASYNC_CLIENT.sismember(self.processing_set_key, item_key):
-                    pending_items.append({"key": item_key.decode("utf-8"), "data": data})
-
-        return pending_items[: self.batch_size]
-
-    async def mark_as_processing(self, item_key: str) -> None:
-        """Mark an item as currently being processed"""
-        await REDIS_ASYNC_CLIENT.sadd(self.processing_set_key, item_key)
-
-    async def mark_as_completed(self, item_key: str, hash_key: str) -> None:
-        """Mark an item as completed and update last scrape time"""
-        # Update last scrape time
-        item_data = await REDIS_ASYNC_CLIENT.hget(hash_key, item_key)
-        if item_data:
-            data = json.loads(item_data)
-            data["last_scrape"] = datetime.now().timestamp()
-            await REDIS_ASYNC_CLIENT.hset(hash_key, item_key, json.dumps(data))
-
-        # Remove from processing set
-        await REDIS_ASYNC_CLIENT.srem(self.processing_set_key, item_key)
+        """Claim and lease a batch of items that are due for scraping"""
+        queue_key = self._queue_key(item_type)
+        now = time.time()
+        claimed = await REDIS_ASYNC_CLIENT.eval(
+            _CLAIM_DUE_ITEMS_SCRIPT,
+            2,
+            queue_key,
+            self.lease_keys[queue_key],
+            now,
+            self.batch_size,
+            now + self.lease_seconds,
+        )
+        if not claimed:
+            return []
+        return [
+            {"key": claimed[i].decode("utf-8"), "data": {"due_at": float(claimed[i + 1])}}
+            for i in range(0, len(claimed), 2)
+        ]
+
+    async def peek_pending_items(self, item_type: str) -> list[dict]:
+        """Return a batch of due items without claiming them"""
+        items = await REDIS_ASYNC_CLIENT.zrangebyscore(
+            self._queue_key(item_type), "-inf", time.time(), start=0, num=self.batch_size, withscores=True
+        )
+        return [{"key": key.decode("utf-8"), "data": {"due_at": score}} for key, score in items]
+
+    async def mark_as_completed(self, item_key: str, queue_key: str) -> None:
+        """Release the lease on an item and schedule its next search"""
+        next_due = time.time() + settings.background_search_interval_hours * 3600
+        await REDIS_ASYNC_CLIENT.zadd(queue_key, {item_key: next_due}, xx=True)
+        await REDIS_ASYNC_CLIENT.zrem(self.lease_keys[queue_key], item_key)
+
+    async def remove_from_queue(self, item_key: str, queue_key: str) -> None:
+        """Drop an item (e.g. a malformed key) from the queue entirely"""
+        await REDIS_ASYNC_CLIENT.zrem(queue_key, item_key)
+        await REDIS_ASYNC_CLIENT.zrem(self.lease_keys[queue_key], item_key)
+
+    async def cleanup_stale_processing(self) -> None:
+        """Reclaim expired leases and migrate any legacy hash-based queue"""
+        await self._migrate_legacy_queues()
+        now = time.time()
+        for queue_key, lease_key in self.lease_keys.items():
+            # Expired items are already due again: their due score was set to the lease expiry.
+            reclaimed = await REDIS_ASYNC_CLIENT.zremrangebyscore(lease_key, "-inf", now)
+            if reclaimed:
+                logging.getLogger(__name__).info(
+                    "Reclaimed %s expired background search leases from %s", reclaimed, queue_key
+                )
 
-    async def cleanup_stale_processing(self, max_processing_time: int = 3600) -> None:
-        """Clean up items stuck in processing state"""
-        processing_items = await REDIS_ASYNC_CLIENT.smembers(self.processing_set_key)
-        for item_key in processing_items:
-            await REDIS_ASYNC_CLIENT.srem(self.processing_set_key, item_key)
+    async def _migrate_legacy_queues(self) -> None:
+        """Move entries from the old JSON-hash queue into the due-time sorted sets"""
+        interval_seconds = settings.background_search_interval_hours * 3600
+        for queue_key, legacy_key in self.legacy_hash_keys.items():
+            if not await REDIS_ASYNC_CLIENT.exists(legacy_key):
+                continue
+            migrated = 0
+            cursor = 0
+            while True:
+                cursor, entries = await REDIS_ASYNC_CLIENT.hscan(legacy_key, cursor, count=1000)
+                mapping = {}
+                for item_key, item_data in entries.items():
+                    try:
+                        last_scrape = json.loads(item_data).get("last_scrape")
+                    except (TypeError, ValueError):
+                        last_scrape = None
+                    mapping[item_key] = last_scrape + interval_seconds if last_scrape else 0
+                if mapping:
+                    migrated += await REDIS_ASYNC_CLIENT.zadd(queue_key, mapping, nx=True)
+                if cursor == 0:
+                    break
+            await REDIS_ASYNC_CLIENT.delete(legacy_key)
+            logging.getLogger(__name__).info(
+                "Migrated %s background search items from %s to %s", migrated, legacy_key, queue_key
+            )
+        await REDIS_ASYNC_CLIENT.delete(self.legacy_processing_set_key)
 
 
 class MaxProcessLimitReached(Exception):
@@ -1936,12 +2053,12 @@ class IndexerBaseScraper(BaseScraper, abc.ABC):
         )
 
         if any([category_id in category_ids for category_id in IndexerBaseScraper.OTHER_CATEGORY_IDS]):
-            title = self.get_title(indexer_data).lower()
+            title = self.get_title(indexer_data)
 
             if is_filter_with_blocklist:
-                return not any(keyword in title for keyword in self.blocklist_keywords)
+                return not contains_keyword(title, self.blocklist_keywords)
             else:
-                return any(keyword in title for keyword in self.allowlist_keywords)
+                return contains_keyword(title, self.allowlist_keywords)
 
         return True
 
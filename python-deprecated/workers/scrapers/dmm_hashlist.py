@@ -6,7 +6,6 @@ from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import Any
 
-import PTT
 import httpx
 
 from workers.task_queue import actor
@@ -18,8 +17,9 @@ from db.enums import MediaType
 from db.redis_database import REDIS_ASYNC_CLIENT
 from db.schemas import StreamFileData, TorrentStreamData
 from workers.scrapers.scraper_tasks import meta_fetcher
-from utils.parser import calculate_max_similarity_ratio, is_contain_18_plus_keywords
+from utils.parser import calculate_max_similarity_ratio
 from utils.lzstring import decompress_from_encoded_uri_component
+from utils.ptt_pool import parse_titles_batch, run_in_parse_pool
 from utils.wrappers import minimum_run_interval
 
 logger = logging.getLogger(__name__)
@@ -61,6 +61,8 @@ DEFAULT_FULL_INGEST_MAX_ITERATIONS = 200
 DMM_METADATA_MIN_SIMILARITY = 87
 DMM_METADATA_SEARCH_TIMEOUT_SECONDS = 8
 DMM_METADATA_RESOLVE_CONCURRENCY = 8
+# Smaller payloads decode faster inline than the round trip to the parse pool takes
+DMM_POOL_DECODE_MIN_CHARS = 16_384
 
 
 def _decode_redis_value(value: bytes | str | None) -> str | None:
@@ -99,7 +101,19 @@ class HashlistTorrentEntry:
 
 def decode_hashlist_payload(encoded_payload: str) -> list[HashlistTorrentEntry]:
     """Decode DMM hashlist payload and normalize torrent rows."""
-    decoded_json = decompress_from_encoded_uri_component(encoded_payload)
+    return parse_hashlist_rows(decompress_from_encoded_uri_component(encoded_payload))
+
+
+async def decode_hashlist_payload_in_pool(encoded_payload: str) -> list[HashlistTorrentEntry]:
+    """Like `decode_hashlist_payload`, with the LZ-String decoding run in the parse pool."""
+    if len(encoded_payload) < DMM_POOL_DECODE_MIN_CHARS:
+        return decode_hashlist_payload(encoded_payload)
+    decoded_json = await run_in_parse_pool(decompress_from_encoded_uri_component, encoded_payload)
+    return parse_hashlist_rows(decoded_json)
+
+
+def parse_hashlist_rows(decoded_json: str) -> list[HashlistTorrentEntry]:
+    """Normalize torrent rows of a decompressed DMM hashlist payload."""
     if not decoded_json:
         return []
 
@@ -423,7 +437,7 @@ class DMMHashlistScraper:
                 continue
 
             try:
-                entries = decode_hashlist_payload(encoded_payload)
+                entries = await decode_hashlist_payload_in_pool(encoded_payload)
             except Exception as exc:
                 logger.warning("Failed to decode DMM payload for %s: %s", file_path, exc)
                 continue
@@ -453,12 +467,14 @@ class DMMHashlistScraper:
         skipped_adult = 0
         skipped_sports = 0
 
-        for entry in unique_entries:
-            if is_contain_18_plus_keywords(entry.filename):
+        # Parse the whole commit in the process pool instead of on the event loop
+        parsed_titles = await parse_titles_batch([entry.filename for entry in unique_entries], True, check_adult=True)
+        for entry, parsed_title_result in zip(unique_entries, parsed_titles):
+            if parsed_title_result.is_adult:
                 skipped_adult += 1
                 continue
 
-            parsed = PTT.parse_title(entry.filename, True)
+            parsed = parsed_title_result.parsed
             parsed_title = parsed.get("title") or entry.filename
             parsed_year = parsed.get("year")
             media_type = "series" if parsed.get("seasons") or parsed.get("episodes") else "movie"
@@ -11,13 +11,13 @@ import re
 from collections.abc import AsyncGenerator
 from datetime import datetime
 
-import PTT
 
 from db.schemas import MetadataData, StreamFileData, UserData
 from db.schemas.media import UsenetStreamData
 from workers.scrapers.base_scraper import BaseScraper, ScraperMetrics
 from workers.providers.easynews.client import Easynews
 from utils.parser import calculate_max_similarity_ratio, is_contain_18_plus_keywords
+from utils.ptt_cache import parse_title_cached
 from utils.runtime_const import EASYNEWS_SEARCH_TTL
 from utils.url_safety import sanitize_nzb_url
 
@@ -252,7 +252,7 @@ class EasynewsScraper(BaseScraper):
                 return None
 
             # Parse title with PTT (same model as other Usenet/torrent scrapers)
-            parsed = PTT.parse_title(filename, True)
+            parsed = parse_title_cached(filename, True)
 
             if _ptt_tags_sample(parsed):
                 self.metrics.record_skip("Sample (PTT extras)")
@@ -15,6 +15,7 @@ from workers.scrapers.prowlarr import ProwlarrScraper
 from utils.crypto import get_text_hash
 from utils.network import CircuitBreaker, batch_process_with_circuit_breaker
 from utils.parser import is_contain_18_plus_keywords
+from utils.ptt_pool import parse_titles_batch
 from utils.wrappers import minimum_run_interval
 
 logger = logging.getLogger(__name__)
@@ -67,6 +68,12 @@ class FeedScraper(ABC):
 
             logger.info(f"Total items scraped from all chunks: {len(all_results)}")
 
+            # Parse every title in the process pool up front; per-item processing then
+            # hits the parse cache instead of running PTT on the event loop
+            titles = [self.scraper.get_title(item) or "" for item in all_results]
+            parsed_titles = await parse_titles_batch(titles, True, check_adult=True)
+            adult_titles = {title for title, parsed in zip(titles, parsed_titles) if parsed.is_adult}
+
             # Process items with circuit breaker
             circuit_breaker = CircuitBreaker(failure_threshold=5, recovery_timeout=30, half_open_attempts=3)
 
@@ -79,6 +86,7 @@ class FeedScraper(ABC):
                 retry_exceptions=[httpx.HTTPStatusError],
                 scraper=self.scraper,
                 processed_info_hashes=processed_info_hashes,
+                adult_titles=adult_titles,
             ):
                 if processed_item:
                     await self.mark_item_as_processed(processed_item)
@@ -117,7 +125,11 @@ class FeedScraper(ABC):
             logger.exception(f"Error fetching from {self.name} chunk {chunk}: {error}")
 
     async def process_feed_item(
-        self, item: dict, scraper: IndexerBaseScraper, processed_info_hashes: set
+        self,
+        item: dict,
+        scraper: IndexerBaseScraper,
+        processed_info_hashes: set,
+        adult_titles: set[str] | None = None,
     ) -> str | None:
         """Process a single feed item"""
         try:
@@ -131,7 +143,7 @@ class FeedScraper(ABC):
 
             parsed_title_data = scraper.parse_title_data(title)
 
-            if not self.validate_item(title, parsed_title_data, scraper):
+            if not self.validate_item(title, parsed_title_data, scraper, adult_titles):
                 return item_id
 
             media_type = self.get_media_type(item, parsed_title_data, scraper)
@@ -164,10 +176,17 @@ class FeedScraper(ABC):
             logger.exception(f"Error processing {self.name} feed item: {e}")
             return None
 
-    def validate_item(self, title: str, parsed_title_data: dict, scraper: IndexerBaseScraper) -> bool:
+    def validate_item(
+        self,
+        title: str,
+        parsed_title_data: dict,
+        scraper: IndexerBaseScraper,
+        adult_titles: set[str] | None = None,
+    ) -> bool:
         """Validate feed item"""
 
-        if is_contain_18_plus_keywords(title):
+        is_adult = title in adult_titles if adult_titles is not None else is_contain_18_plus_keywords(title)
+        if is_adult:
             logger.info(f"Skipping adult content: {title}")
             scraper.metrics.record_skip("Adult Content")
             return False
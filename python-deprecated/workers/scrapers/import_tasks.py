@@ -5,7 +5,6 @@ These tasks handle large imports asynchronously to avoid HTTP timeouts.
 Progress and status are tracked in Redis for client polling.
 """
 
-import asyncio
 import json
 import logging
 from datetime import datetime
@@ -14,6 +13,7 @@ from urllib.parse import urlparse
 import pytz
 from sqlmodel import select
 
+from workers.providers.http_pool import run_with_shared_sessions
 from workers.task_queue import actor
 from db import database
 from db.enums import IPTVSourceType
@@ -518,7 +518,7 @@ async def _process_xtream_import(
 )
 def run_m3u_import(**kwargs):
     """Dramatiq actor for M3U import."""
-    asyncio.run(_process_m3u_import(**kwargs))
+    run_with_shared_sessions(_process_m3u_import(**kwargs))
 
 
 @actor(
@@ -529,7 +529,7 @@ def run_m3u_import(**kwargs):
 )
 def run_xtream_import(**kwargs):
     """Dramatiq actor for Xtream import."""
-    asyncio.run(_process_xtream_import(**kwargs))
+    run_with_shared_sessions(_process_xtream_import(**kwargs))
 
 
 # ============================================
@@ -845,7 +845,7 @@ async def _process_xtream_sync(
 )
 def run_m3u_sync(**kwargs):
     """Dramatiq actor for M3U sync."""
-    asyncio.run(_process_m3u_sync(**kwargs))
+    run_with_shared_sessions(_process_m3u_sync(**kwargs))
 
 
 @actor(
@@ -856,4 +856,4 @@ def run_m3u_sync(**kwargs):
 )
 def run_xtream_sync(**kwargs):
     """Dramatiq actor for Xtream sync."""
-    asyncio.run(_process_xtream_sync(**kwargs))
+    run_with_shared_sessions(_process_xtream_sync(**kwargs))
@@ -2,7 +2,6 @@ from datetime import timedelta
 from typing import Any
 
 import httpx
-import PTT
 
 from db.config import settings
 from db.schemas import MetadataData, TorrentStreamData, UserData
@@ -10,6 +9,7 @@ from workers.scrapers.stremio_addons import StremioScraper
 from utils import const
 from utils.crypto import crypto_utils
 from utils.parser import convert_size_to_bytes
+from utils.ptt_cache import parse_title_cached
 from utils.runtime_const import MEDIAFUSION_SEARCH_TTL
 
 
@@ -74,7 +74,7 @@ class MediafusionScraper(StremioScraper):
     def parse_stream_title(self, stream: dict) -> tuple[dict, bool]:
         description = stream["description"].splitlines()
         torrent_name = description[0].removeprefix("📂 ").split(" ┈➤ ")[0]
-        metadata = PTT.parse_title(torrent_name, True)
+        metadata = parse_title_cached(torrent_name, True)
         source = stream["name"].split()[0].title()
         info_hash = stream.get("infoHash")
         if not info_hash:
@@ -18,13 +18,13 @@ from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 from xml.etree import ElementTree as ET
 
 import httpx
-import PTT
 
 from db.schemas import MetadataData, StreamFileData, UserData
 from db.schemas.config import NewznabIndexerConfig
 from db.schemas.media import UsenetStreamData
 from workers.scrapers.base_scraper import BaseScraper, ScraperMetrics
 from utils.parser import calculate_max_similarity_ratio, is_contain_18_plus_keywords
+from utils.ptt_cache import parse_title_cached
 from utils.runtime_const import NEWZNAB_SEARCH_TTL
 from utils.url_safety import sanitize_nzb_url
 from utils.zyclops import submit_nzb_to_zyclops
@@ -570,7 +570,7 @@ class NewznabScraper(BaseScraper):
                 return None
 
             # Parse title with PTT
-            parsed = PTT.parse_title(title, True)
+            parsed = parse_title_cached(title, True)
 
             # Validate title similarity
             max_ratio = calculate_max_similarity_ratio(parsed.get("title", ""), metadata.title, metadata.aka_titles)
@@ -9,7 +9,6 @@ from typing import Any, TypeVar
 from urllib.parse import urlparse
 
 import httpx
-import PTT
 import yt_dlp
 from sqlalchemy.exc import IntegrityError
 from sqlmodel import select
@@ -25,6 +24,7 @@ from workers.scrapers.base_scraper import BackgroundScraperManager
 from workers.scrapers.telegram import telegram_scraper
 from utils.config import config_manager
 from utils.parser import is_contain_18_plus_keywords
+from utils.ptt_cache import parse_title_cached
 from utils.youtube import analyze_youtube_video
 
 logger = logging.getLogger(__name__)
@@ -432,7 +432,7 @@ async def _resolve_metadata(
 
 def _parse_title_data(title: str) -> dict[str, Any]:
     try:
-        return PTT.parse_title(title, True) or {}
+        return parse_title_cached(title, True) or {}
     except Exception:
         return {}
 
@@ -621,8 +621,8 @@ def _resolve_youtube_language_profiles(youtube_config: dict[str, Any]) -> list[d
 
 async def _load_youtube_background_targets(youtube_config: dict[str, Any]) -> list[dict[str, Any]]:
     manager = BackgroundScraperManager()
-    pending_movies = await manager.get_pending_items("movie")
-    pending_series = await manager.get_pending_items("series")
+    pending_movies = await manager.peek_pending_items("movie")
+    pending_series = await manager.peek_pending_items("series")
     if not pending_movies and not pending_series:
         return []
 
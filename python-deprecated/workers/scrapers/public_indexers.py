@@ -8,7 +8,6 @@ from collections.abc import AsyncGenerator
 from datetime import timedelta
 from urllib.parse import parse_qs, quote_plus, unquote, urljoin, urlsplit
 
-import PTT
 from parsel import Selector
 from scrapling.fetchers import AsyncFetcher
 
@@ -22,6 +21,7 @@ from workers.scrapers.public_indexer_registry import (
 )
 from workers.scrapers.source_health import SourceHealthSnapshot, get_source_health, record_source_outcome
 from utils.parser import convert_size_to_bytes, is_contain_18_plus_keywords
+from utils.ptt_cache import parse_title_cached
 from utils.runtime_const import PUBLIC_INDEXERS_SEARCH_TTL
 from utils.torrent import parse_magnet
 
@@ -609,12 +609,12 @@ class PublicIndexerScraper(BaseScraper):
             self.metrics.record_skip("Adult content")
             return None
 
-        parsed_data = PTT.parse_title(title, True)
+        parsed_data = parse_title_cached(title, True)
         is_title_valid = self.validate_title_and_year(parsed_data, metadata, catalog_type, title)
         if not is_title_valid and detail_href:
             fallback_title = self._title_from_detail_href(detail_href)
             if fallback_title and fallback_title != title:
-                fallback_parsed_data = PTT.parse_title(fallback_title, True)
+                fallback_parsed_data = parse_title_cached(fallback_title, True)
                 is_fallback_valid = self.validate_title_and_year(
                     fallback_parsed_data,
                     metadata,
@@ -629,7 +629,7 @@ class PublicIndexerScraper(BaseScraper):
                     and self._detail_slug_starts_with_title(detail_href, metadata.title)
                 ):
                     heuristic_title = f"{metadata.title} {metadata.year}" if metadata.year else metadata.title
-                    heuristic_parsed_data = PTT.parse_title(heuristic_title, True)
+                    heuristic_parsed_data = parse_title_cached(heuristic_title, True)
                     is_heuristic_valid = self.validate_title_and_year(
                         heuristic_parsed_data,
                         metadata,
@@ -839,7 +839,7 @@ class PublicIndexerScraper(BaseScraper):
                 if resolution:
                     title = f"{title} {resolution}p"
 
-                parsed_data = PTT.parse_title(title, True)
+                parsed_data = parse_title_cached(title, True)
                 if catalog_type == "series" and not self._validate_series(
                     parsed_data,
                     season,
@@ -935,7 +935,7 @@ class PublicIndexerScraper(BaseScraper):
                 self.metrics.record_skip("Adult content")
                 continue
 
-            parsed_data = PTT.parse_title(title, True)
+            parsed_data = parse_title_cached(title, True)
             if not self.validate_title_and_year(parsed_data, metadata, catalog_type, title):
                 continue
             if catalog_type == "series" and not self._validate_series(
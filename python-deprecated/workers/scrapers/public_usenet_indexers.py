@@ -14,7 +14,6 @@ from collections.abc import AsyncGenerator
 from datetime import datetime, timedelta, timezone
 from urllib.parse import quote_plus, urlencode
 
-import PTT
 from parsel import Selector
 
 from db.config import settings
@@ -27,6 +26,7 @@ from workers.scrapers.public_usenet_indexer_registry import (
 )
 from workers.scrapers.source_health import SourceHealthSnapshot, get_source_health, record_source_outcome
 from utils.parser import is_contain_18_plus_keywords
+from utils.ptt_cache import parse_title_cached
 from utils.runtime_const import PUBLIC_USENET_INDEXERS_SEARCH_TTL
 from utils.url_safety import sanitize_nzb_url
 
@@ -555,7 +555,7 @@ class PublicUsenetIndexerScraper(PublicIndexerScraper):
             self.metrics.record_skip("Adult content")
             return None
 
-        parsed_data = PTT.parse_title(title, True)
+        parsed_data = parse_title_cached(title, True)
         if not self.validate_title_and_year(parsed_data, metadata, catalog_type, title):
             return None
         if catalog_type == "series" and not self._validate_series(
@@ -774,7 +774,7 @@ class PublicUsenetIndexerScraper(PublicIndexerScraper):
             self.metrics.record_skip("Adult content")
             return None
 
-        parsed_data = PTT.parse_title(title, True)
+        parsed_data = parse_title_cached(title, True)
         if not self.validate_title_and_year(parsed_data, metadata, catalog_type, title):
             return None
         if catalog_type == "series" and not self._validate_series(
@@ -33,6 +33,8 @@ from utils.parser import (
     convert_size_to_bytes,
     is_contain_18_plus_keywords,
 )
+from utils.ptt_pool import parse_titles_batch
+from utils.title_classifier import contains_keyword
 from utils.sports_parser import (
     GENERAL_SPORTS_KEYWORDS,
     detect_sports_category,
@@ -128,8 +130,7 @@ class RssScraper(BaseScraper):
 
     def contains_blocklist_keywords(self, title: str, description: str = "") -> bool:
         """Check if title or description contains blocklist keywords"""
-        content = f"{title} {description}".lower()
-        return any(keyword.lower() in content for keyword in self.blocklist_keywords)
+        return contains_keyword(f"{title} {description}", self.blocklist_keywords)
 
     @staticmethod
     def _is_anime_content(title: str, parsed_data: dict, catalogs: list[str]) -> bool:
@@ -173,6 +174,13 @@ class RssScraper(BaseScraper):
             items_found = len(items)
             self.metrics.record_found_items(items_found)
 
+            # Parse every title in the process pool up front; per-item processing then
+            # hits the parse cache instead of running PTT on the event loop
+            title_pattern = RSSParsingPatterns(**(feed.parsing_patterns or {})).title
+            titles = [self.extract_value(item, title_pattern) or "" for item in items]
+            parsed_titles = await parse_titles_batch(titles, True, check_adult=True)
+            adult_titles = {title for title, parsed in zip(titles, parsed_titles) if parsed.is_adult}
+
             # Process items with circuit breaker
             circuit_breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=10, half_open_attempts=2)
             processed_info_hashes = set()
@@ -188,6 +196,7 @@ class RssScraper(BaseScraper):
                 feed=feed,
                 feed_id=feed_id,
                 processed_info_hashes=processed_info_hashes,
+                adult_titles=adult_titles,
             ):
                 if processed_item:
                     if isinstance(processed_item, TorrentStreamData):
@@ -406,7 +415,12 @@ class RssScraper(BaseScraper):
             return None
 
     async def process_feed_item(
-        self, item: dict, feed: RSSFeed, feed_id: str, processed_info_hashes: set
+        self,
+        item: dict,
+        feed: RSSFeed,
+        feed_id: str,
+        processed_info_hashes: set,
+        adult_titles: set[str] | None = None,
     ) -> TorrentStreamData | str | None:
         """Process a single RSS feed item"""
         try:
@@ -418,7 +432,8 @@ class RssScraper(BaseScraper):
                 return None
 
             # Skip adult content
-            if is_contain_18_plus_keywords(title):
+            is_adult = title in adult_titles if adult_titles is not None else is_contain_18_plus_keywords(title)
+            if is_adult:
                 self.logger.info(f"Skipping adult content: {title}")
                 self.metrics.record_skip("Adult content")
                 return {"skip_reason": "Adult content"}
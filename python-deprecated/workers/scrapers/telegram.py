@@ -31,7 +31,6 @@ from datetime import datetime
 from functools import wraps
 from typing import Any
 
-import PTT
 
 from db import crud
 from db.config import settings
@@ -40,6 +39,7 @@ from db.redis_database import REDIS_ASYNC_CLIENT
 from db.schemas import MetadataData, UserData
 from db.schemas.media import TelegramStreamData
 from utils.parser import calculate_max_similarity_ratio, is_contain_18_plus_keywords
+from utils.ptt_cache import parse_title_cached
 from utils.runtime_const import TELEGRAM_SEARCH_TTL
 
 # Optional dependency - Telethon for Telegram scraping
@@ -727,7 +727,7 @@ class TelegramScraper:
     def _parse_filename(filename: str) -> dict:
         """Parse filename using PTT for metadata extraction."""
         try:
-            parsed = PTT.parse_title(filename, True)
+            parsed = parse_title_cached(filename, True)
             return {"filename": filename, **parsed}
         except Exception:
             return {"filename": filename, "title": filename}
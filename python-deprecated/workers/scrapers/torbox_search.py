@@ -10,12 +10,12 @@ API Documentation: https://search-api.torbox.app/openapi.json
 import asyncio
 import logging
 
-import PTT
 import httpx
 
 from db.schemas import MetadataData, StreamFileData, TorrentStreamData, UserData, UsenetStreamData
 from workers.scrapers.base_scraper import BaseScraper
 from utils.parser import calculate_max_similarity_ratio, is_contain_18_plus_keywords
+from utils.ptt_cache import parse_title_cached
 from utils.runtime_const import TORBOX_SEARCH_TTL
 from utils.url_safety import sanitize_nzb_url
 
@@ -391,7 +391,7 @@ class TorBoxSearchScraper(BaseScraper):
             return None
 
         # Parse title
-        parsed = PTT.parse_title(raw_title, True)
+        parsed = parse_title_cached(raw_title, True)
 
         # Validate title match if metadata provided
         if metadata:
@@ -518,7 +518,7 @@ class TorBoxSearchScraper(BaseScraper):
             return None
 
         # Parse title
-        parsed = PTT.parse_title(raw_title, True)
+        parsed = parse_title_cached(raw_title, True)
 
         # Validate title match if metadata provided
         if metadata:
@@ -3,7 +3,6 @@ from datetime import timedelta
 from typing import Any
 
 import httpx
-import PTT
 
 from db.config import settings
 from db.schemas import MetadataData, TorrentStreamData, UserData
@@ -12,6 +11,7 @@ from utils import const
 from utils.parser import (
     convert_size_to_bytes,
 )
+from utils.ptt_cache import parse_title_cached
 from utils.runtime_const import TORRENTIO_SEARCH_TTL
 
 SUPPORTED_DEBRID_SERVICE = {
@@ -131,7 +131,7 @@ class TorrentioScraper(StremioScraper):
             if not descriptions or not str(descriptions).strip():
                 return None, False
             torrent_name = str(descriptions).splitlines()[0]
-            metadata = PTT.parse_title(torrent_name, True)
+            metadata = parse_title_cached(torrent_name, True)
             name_raw = stream.get("name")
             if not name_raw or not str(name_raw).strip():
                 return None, False
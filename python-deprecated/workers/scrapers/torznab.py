@@ -14,7 +14,6 @@ from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 from xml.etree import ElementTree
 
 import httpx
-import PTT
 
 from db.config import settings
 from db.enums import TorrentType
@@ -23,6 +22,7 @@ from db.schemas.config import TorznabEndpointConfig
 from workers.scrapers.base_scraper import BaseScraper
 from utils.network import CircuitBreaker
 from utils.parser import convert_size_to_bytes, is_contain_18_plus_keywords
+from utils.ptt_cache import parse_title_cached
 from utils.runtime_const import TORZNAB_SEARCH_TTL
 
 
@@ -391,7 +391,7 @@ class TorznabScraper(BaseScraper):
         processed_info_hashes.add(info_hash)
 
         # Parse title with PTT
-        parsed_data = PTT.parse_title(title, True)
+        parsed_data = parse_title_cached(title, True)
 
         # Validate title and year
         if not self.validate_title_and_year(parsed_data, metadata, catalog_type, title, expected_ratio=70):
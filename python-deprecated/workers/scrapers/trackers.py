@@ -1,52 +1,109 @@
+import asyncio
 import logging
-from datetime import datetime, timedelta
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
 
-from pyasynctracker import batch_scrape_info_hashes, find_max_seeders
-from sqlalchemy.orm import selectinload
-from sqlmodel import select
+from pyasynctracker import find_max_seeders, scrape_info_hashes
 
 from workers.task_queue import actor
 from db import crud
+from db.config import settings
 from db.database import get_background_session
-from db.models import TorrentStream
+from db.redis_database import REDIS_ASYNC_CLIENT
+from utils.lock import acquire_redis_lock, release_redis_lock
 from utils.runtime_const import TRACKERS
 
+# Last TorrentStream.id processed by the refresh; the next run resumes after it.
+SEEDER_REFRESH_CURSOR_KEY = "seeder_refresh:cursor"
+# Held for a whole run so cron ticks and self-enqueued runs never share the cursor.
+SEEDER_REFRESH_LOCK_KEY = "seeder_refresh:lock"
+SEEDER_REFRESH_STALE_AFTER = timedelta(days=7)
+# Stop taking new pages well before the actor's 10 minute time limit.
+SEEDER_REFRESH_RUN_SECONDS = 8 * 60
+SEEDER_REFRESH_LOCK_SECONDS = 10 * 60
+TRACKER_SCRAPE_CONCURRENCY = 20
+TRACKER_SCRAPE_TIMEOUT = 30
 
-@actor(time_limit=10 * 60 * 1000, priority=5, max_retries=3)
-async def update_torrent_seeders(page=0, page_size=25, *args, **kwargs):
-    offset = page * page_size
-
-    async with get_background_session() as session:
-        query = (
-            select(TorrentStream)
-            .options(selectinload(TorrentStream.trackers))
-            .where(TorrentStream.seeders.is_(None))
-            .where(TorrentStream.updated_at < datetime.now() - timedelta(days=7))
-            .offset(offset)
-            .limit(page_size)
-        )
 
-        result = await session.exec(query)
-        torrents = result.all()
+def group_info_hashes_by_tracker(torrents: list[tuple[int, str, list[str]]]) -> dict[str, list[str]]:
+    """Map each tracker URL to every info hash of the page announced on it."""
+    tracker_hashes: dict[str, list[str]] = defaultdict(list)
+    for _, info_hash, tracker_urls in torrents:
+        for url in tracker_urls or TRACKERS:
+            tracker_hashes[url].append(info_hash)
+    return tracker_hashes
+
+
+async def scrape_seeders_by_tracker(tracker_hashes: dict[str, list[str]]) -> dict[str, int]:
+    """Scrape each tracker once for all of its info hashes and return the max seeders per hash.
+
+    UDP scrapes pack ~70 hashes per packet after a single connect, so one request per
+    tracker replaces one request per (tracker, torrent) pair.
+    """
+    semaphore = asyncio.Semaphore(TRACKER_SCRAPE_CONCURRENCY)
+
+    async def scrape(url: str, info_hashes: list[str]) -> dict[str, list[dict]]:
+        async with semaphore:
+            return await scrape_info_hashes(info_hashes, [url], TRACKER_SCRAPE_TIMEOUT)
+
+    aggregated: dict[str, list[dict]] = defaultdict(list)
+    for results in await asyncio.gather(*(scrape(url, hashes) for url, hashes in tracker_hashes.items())):
+        for info_hash, tracker_results in results.items():
+            aggregated[info_hash.lower()].extend(tracker_results)
+    return find_max_seeders(aggregated)
 
-    if not torrents:
-        logging.info(f"No torrents to update on page {page}")
-        return
 
-    data_list = []
-    for torrent in torrents:
-        urls = [t.url for t in torrent.trackers] if torrent.trackers else TRACKERS
-        data_list.append((torrent.info_hash, urls))
+async def refresh_seeder_pages(batch_size: int) -> bool:
+    """Refresh pages from the stored cursor until the deadline; return True once all are done."""
+    cursor = int(await REDIS_ASYNC_CLIENT.get(SEEDER_REFRESH_CURSOR_KEY) or 0)
+    stale_before = datetime.now(timezone.utc) - SEEDER_REFRESH_STALE_AFTER
+    deadline = time.monotonic() + SEEDER_REFRESH_RUN_SECONDS
 
-    results = await batch_scrape_info_hashes(data_list, timeout=30)
-    max_seeders_data = find_max_seeders(results)
+    while time.monotonic() < deadline:
+        async with get_background_session() as session:
+            torrents = await crud.get_torrents_for_seeder_refresh(session, cursor, batch_size, stale_before)
 
-    async with get_background_session() as session:
-        for info_hash, max_seeders in max_seeders_data.items():
-            await crud.update_torrent_seeders(session, info_hash, max_seeders)
-            logging.info(f"Updating seeders for torrent {info_hash} with max seeders: {max_seeders}")
-        await session.commit()
+        if not torrents:
+            logging.info(f"Seeder refresh complete after torrent id {cursor}")
+            await REDIS_ASYNC_CLIENT.delete(SEEDER_REFRESH_CURSOR_KEY)
+            return True
+
+        tracker_hashes = group_info_hashes_by_tracker(torrents)
+        max_seeders_data = await scrape_seeders_by_tracker(tracker_hashes)
+        torrent_ids = {info_hash.lower(): torrent_id for torrent_id, info_hash, _ in torrents}
+        seeders_by_id = {
+            torrent_ids[info_hash]: seeders
+            for info_hash, seeders in max_seeders_data.items()
+            if info_hash in torrent_ids
+        }
+
+        async with get_background_session() as session:
+            updated = await crud.bulk_update_torrent_seeders(session, seeders_by_id)
+            await session.commit()
+
+        cursor = torrents[-1][0]
+        await REDIS_ASYNC_CLIENT.set(SEEDER_REFRESH_CURSOR_KEY, cursor)
+        logging.info(
+            f"Updated seeders for {updated}/{len(torrents)} torrents via {len(tracker_hashes)} trackers "
+            f"(cursor at torrent id {cursor})"
+        )
+    return False
+
+
+@actor(time_limit=10 * 60 * 1000, priority=5, max_retries=3)
+async def update_torrent_seeders(*args, batch_size: int | None = None, **kwargs):
+    """Refresh seeders for torrents without them, resuming from the cursor stored in Redis."""
+    batch_size = batch_size or settings.update_seeders_batch_size
+    acquired, lock = await acquire_redis_lock(SEEDER_REFRESH_LOCK_KEY, timeout=SEEDER_REFRESH_LOCK_SECONDS)
+    if not acquired:
+        logging.info("Seeder refresh already running, skipping this run")
+        return
 
-    logging.info(f"Updated {len(max_seeders_data)} torrents")
+    try:
+        finished = await refresh_seeder_pages(batch_size)
+    finally:
+        await release_redis_lock(lock)
 
-    await update_torrent_seeders.async_send_with_options(args=(page + 1, page_size), delay=60000)
+    if not finished:
+        await update_torrent_seeders.async_send_with_options(kwargs={"batch_size": batch_size}, delay=60000)
@@ -2,7 +2,6 @@ import asyncio
 from datetime import timedelta
 from typing import Any
 
-import PTT
 from httpx import Response
 from tenacity import RetryError
 
@@ -12,6 +11,7 @@ from workers.scrapers.base_scraper import BaseScraper, ScraperError
 from utils.parser import (
     is_contain_18_plus_keywords,
 )
+from utils.ptt_cache import parse_title_cached
 from utils.runtime_const import ZILEAN_SEARCH_TTL
 
 
@@ -133,7 +133,7 @@ class ZileanScraper(BaseScraper):
                     self.logger.warning(f"Stream contains 18+ keywords: {stream['raw_title']}")
                     return None
 
-                torrent_data = PTT.parse_title(stream["raw_title"], True)
+                torrent_data = parse_title_cached(stream["raw_title"], True)
                 if not self.validate_title_and_year(
                     torrent_data,
                     metadata,
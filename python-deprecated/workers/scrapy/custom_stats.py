@@ -12,10 +12,18 @@ class RedisStatsCollector(StatsCollector):
         super().__init__(crawler)
         crawler.signals.connect(self.spider_closed, signal=signals.spider_closed)
         self.redis_client = REDIS_SYNC_CLIENT
+        self.close_reason = None
 
     def spider_closed(self, spider, reason):
-        # Access the stats dictionary
-        stats = self.get_stats()
+        # Pipelines are still draining their queues while this signal is handled,
+        # so the stats are saved from close_spider() once they have finished.
+        self.close_reason = reason
+
+    def _persist_stats(self, stats, spider=None):
+        # Older Scrapy releases still pass the spider here
+        spider = spider or self._crawler.spider
+        if spider is None:
+            return
 
         # Extract the required stats
         item_dropped_count = stats.get("item_dropped_count", 0)
@@ -31,8 +39,10 @@ class RedisStatsCollector(StatsCollector):
             "log_count_error": log_count_error,
             "log_count_info": log_count_info,
             "log_count_warning": log_count_warning,
-            "close_reason": reason,
+            "close_reason": self.close_reason,
         }
+        # Store pipeline batch counters and peak throughput
+        stats_data.update({key: value for key, value in stats.items() if key.startswith("store_pipeline/")})
 
         # Save the stats to Redis
         self.save_stats(spider.name, stats_data)
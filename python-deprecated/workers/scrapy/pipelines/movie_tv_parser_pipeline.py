@@ -1,10 +1,10 @@
 import logging
 
-import PTT
 from scrapy.exceptions import DropItem
 
 from workers.scrapers.scraper_tasks import meta_fetcher
 from utils.const import QUALITY_GROUPS
+from utils.ptt_cache import parse_title_cached
 from utils.sports_parser import detect_sports_category
 
 logger = logging.getLogger(__name__)
@@ -17,7 +17,7 @@ class MovieTVParserPipeline:
         data = item.copy()
         title = data["torrent_title"]
         if "title" not in data:
-            data.update(PTT.parse_title(title, True))
+            data.update(parse_title_cached(title, True))
 
         if not data.get("title"):
             raise DropItem(f"Title not parsed: {title}")
@@ -1,12 +1,14 @@
 import asyncio
 import hashlib
 import logging
+import time
 
 from scrapy import signals
 from scrapy.exceptions import DropItem
 from sqlmodel import select
 
 from db import crud
+from db.crud.stream_cache import invalidate_media_stream_cache
 from db.database import get_async_session_context
 from db.enums import MediaType
 from db.models import Media
@@ -22,10 +24,47 @@ def _ensure_catalog_list(item: dict) -> list[str]:
     return list(catalogs)
 
 
+async def _apply_provider_metadata(session, media_id: int, item: dict, media_type: str) -> None:
+    """Apply full provider metadata (description, cast, crew, genres, certification, etc.)
+    if available from MetadataSearchPipeline, so no separate "Refresh All" step is needed.
+
+    Runs in a savepoint: a failure only discards the metadata, not the media or the
+    rest of the batch.
+    """
+    provider_metadata = item.get("_provider_metadata")
+    if not provider_metadata:
+        return
+    try:
+        async with session.begin_nested():
+            # update_provider_metadata creates MediaExternalID rows and
+            # ProviderMetadata records for each provider (IMDB, TMDB, etc.)
+            for provider_name, data in provider_metadata.items():
+                if data:
+                    await crud.update_provider_metadata(session, media_id, provider_name, data)
+            # apply_multi_provider_metadata updates the canonical Media fields
+            # (description, cast, crew, genres, images, etc.)
+            await crud.apply_multi_provider_metadata(session, media_id, provider_metadata, media_type)
+        logging.info("Applied full metadata for %s %s", media_type, item["title"])
+    except Exception as e:
+        logging.warning("Failed to apply full metadata for %s: %s", item["title"], e)
+
+
 class QueueBasedPipeline:
+    """Buffers items in a queue and processes them off the item pipeline path.
+
+    The queue is drained in micro-batches of up to ``batch_size`` items, waiting at
+    most ``batch_max_wait`` seconds for a batch to fill (``STORE_PIPELINE_BATCH_SIZE``
+    and ``STORE_PIPELINE_BATCH_MAX_WAIT`` in the Scrapy settings). Batch sizes and the
+    peak items per second are recorded under ``store_pipeline/<PipelineName>/`` in the
+    crawler stats.
+    """
+
     def __init__(self):
         self.queue = asyncio.Queue()
         self.processing_task = None
+        self.batch_size = 1
+        self.batch_max_wait = 0.0
+        self.stats = None
 
     async def init(self):
         self.processing_task = asyncio.create_task(self.process_queue())
@@ -37,6 +76,9 @@ class QueueBasedPipeline:
     @classmethod
     def from_crawler(cls, crawler):
         p = cls()
+        p.batch_size = max(1, crawler.settings.getint("STORE_PIPELINE_BATCH_SIZE", 1))
+        p.batch_max_wait = max(0.0, crawler.settings.getfloat("STORE_PIPELINE_BATCH_MAX_WAIT", 0.0))
+        p.stats = crawler.stats
         crawler.signals.connect(p.init, signal=signals.spider_opened)
         crawler.signals.connect(p.close, signal=signals.spider_closed)
         return p
@@ -47,21 +89,75 @@ class QueueBasedPipeline:
         return item
 
     async def process_queue(self):
-        logging.info("Starting processing queue")
+        logging.info("Starting processing queue (batch size %s, max wait %ss)", self.batch_size, self.batch_max_wait)
         while True:
-            item = await self.queue.get()
+            batch = await self.next_batch()
+            started = time.perf_counter()
+            try:
+                failed = await self.process_batch(batch)
+            except Exception as e:
+                logging.error(f"Error processing batch of {len(batch)} items: {e}", exc_info=True)
+                failed = len(batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+            self.record_batch_stats(len(batch), failed, time.perf_counter() - started)
+
+    async def next_batch(self) -> list:
+        """Wait for one item, then collect more until the batch is full or the wait runs out."""
+        batch = [await self.queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.batch_max_wait
+        while len(batch) < self.batch_size:
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except TimeoutError:
+                break
+        return batch
+
+    async def process_batch(self, items: list) -> int:
+        """Process a batch item by item; returns the number of failed items."""
+        failed = 0
+        for item in items:
             try:
                 await self.parse_item(item)
             except Exception as e:
+                failed += 1
                 logging.error(f"Error processing item: {e}", exc_info=True)
-            finally:
-                self.queue.task_done()
+        return failed
+
+    def record_batch_stats(self, size: int, failed: int, elapsed: float) -> None:
+        if self.stats is None:
+            return
+        prefix = f"store_pipeline/{type(self).__name__}"
+        self.stats.inc_value(f"{prefix}/batches")
+        self.stats.inc_value(f"{prefix}/items", size)
+        self.stats.inc_value(f"{prefix}/items_failed", failed)
+        self.stats.inc_value(f"{prefix}/seconds", round(elapsed, 3))
+        self.stats.max_value(f"{prefix}/max_batch_size", size)
+        if elapsed > 0:
+            self.stats.max_value(f"{prefix}/peak_items_per_second", round(size / elapsed, 1))
 
     async def parse_item(self, item):
         raise NotImplementedError
 
 
-class EventSeriesStorePipeline(QueueBasedPipeline):
+class TorrentStoreBatchPipeline(QueueBasedPipeline):
+    """Stores torrent items a micro-batch at a time.
+
+    A batch shares one session: media is resolved once per distinct title, each item
+    is prepared in its own savepoint, all new streams go through a single
+    ``store_new_torrent_streams`` call and the batch is committed once. A failing item
+    only rolls back its own savepoint; if the combined store fails, the streams are
+    stored one by one so the rest of the batch still lands.
+    """
+
     def __init__(self):
         super().__init__()
         self.redis = REDIS_ASYNC_CLIENT
@@ -70,7 +166,85 @@ class EventSeriesStorePipeline(QueueBasedPipeline):
         await super().close()
         await self.redis.aclose()
 
-    async def parse_item(self, item):
+    async def prepare_stream(self, session, item, media_ids: dict) -> dict | None:
+        """Resolve the item's media and return its stream data, or None to skip the item.
+
+        ``media_ids`` maps media lookup keys to media ids for the current batch.
+        """
+        raise NotImplementedError
+
+    async def mark_scraped(self, item) -> None:
+        """Called after the commit for every item that produced stream data."""
+
+    async def process_batch(self, items: list) -> int:
+        failed = 0
+        prepared: list[tuple[dict, dict | None]] = []
+        media_ids: dict = {}
+        invalidated_media_ids: set[int] = set()
+
+        async with get_async_session_context() as session:
+            for item in items:
+                known_media_keys = set(media_ids)
+                try:
+                    async with session.begin_nested():
+                        stream_data = await self.prepare_stream(session, item, media_ids)
+                except Exception as e:
+                    failed += 1
+                    # Media created in the rolled back savepoint is gone again
+                    for media_key in media_ids.keys() - known_media_keys:
+                        del media_ids[media_key]
+                    logging.error(f"Error processing item: {e}", exc_info=not isinstance(e, DropItem))
+                    continue
+                prepared.append((item, stream_data))
+
+            new_streams = [stream_data for _, stream_data in prepared if stream_data]
+            stored = 0
+            if new_streams:
+                try:
+                    async with session.begin_nested():
+                        stored = await crud.store_new_torrent_streams(
+                            session, new_streams, deferred_cache_invalidation=invalidated_media_ids
+                        )
+                except Exception as e:
+                    logging.warning("Batch store of %s streams failed, storing one by one: %s", len(new_streams), e)
+                    stored, prepared, item_failures = await self._store_one_by_one(
+                        session, prepared, invalidated_media_ids
+                    )
+                    failed += item_failures
+
+            await session.commit()
+
+        if invalidated_media_ids:
+            await asyncio.gather(*(invalidate_media_stream_cache(media_id) for media_id in invalidated_media_ids))
+        if stored:
+            logging.info("Added %s torrent streams from a batch of %s items", stored, len(items))
+        for item, stream_data in prepared:
+            if stream_data:
+                await self.mark_scraped(item)
+        return failed
+
+    @staticmethod
+    async def _store_one_by_one(session, prepared, invalidated_media_ids):
+        stored = 0
+        failed = 0
+        kept = []
+        for item, stream_data in prepared:
+            if stream_data:
+                try:
+                    async with session.begin_nested():
+                        stored += await crud.store_new_torrent_streams(
+                            session, [stream_data], deferred_cache_invalidation=invalidated_media_ids
+                        )
+                except Exception as e:
+                    failed += 1
+                    logging.error(f"Error storing torrent stream {item.get('torrent_name')}: {e}", exc_info=True)
+                    continue
+            kept.append((item, stream_data))
+        return stored, kept, failed
+
+
+class EventSeriesStorePipeline(TorrentStoreBatchPipeline):
+    async def prepare_stream(self, session, item, media_ids):
         if "title" not in item:
             logging.warning("title not found in item.")
             raise DropItem("title not found in item.")
@@ -78,11 +252,11 @@ class EventSeriesStorePipeline(QueueBasedPipeline):
             logging.warning("year not found in item.")
             raise DropItem("year not found in item.")
 
-        async with get_async_session_context() as session:
-            title_key = f"{item['title']}_{item['year']}"
-            prefix = item.get("catalog", ["event"])[0]
-            stable_id = f"{prefix}:{hashlib.md5(title_key.encode()).hexdigest()[:16]}"
+        title_key = f"{item['title']}_{item['year']}"
+        prefix = item.get("catalog", ["event"])[0]
+        stable_id = f"{prefix}:{hashlib.md5(title_key.encode()).hexdigest()[:16]}"
 
+        if stable_id not in media_ids:
             metadata = {
                 "id": stable_id,
                 "title": item["title"],
@@ -98,74 +272,60 @@ class EventSeriesStorePipeline(QueueBasedPipeline):
             if not series_result:
                 raise DropItem(f"Failed to create series metadata for: {item['title']}")
 
-            meta_id = stable_id
-            logging.info("Using series %s with id %s (db pk %s)", item["title"], meta_id, series_result.id)
-
-            # Check if torrent stream exists
-            existing_stream = await crud.get_stream_by_info_hash(session, item["info_hash"])
-
-            if not existing_stream:
-                # Prepare episode files (items may be dicts or StreamFileData objects)
-                episode_files = []
-                if item.get("episodes"):
-                    for ep in item["episodes"]:
-                        if isinstance(ep, dict):
-                            episode_files.append(
-                                {
-                                    "season_number": ep.get("season_number", 1),
-                                    "episode_number": ep.get("episode_number", 1),
-                                    "filename": ep.get("filename"),
-                                    "size": ep.get("size"),
-                                    "file_index": ep.get("file_index"),
-                                    "episode_title": ep.get("episode_title"),
-                                }
-                            )
-                        else:
-                            episode_files.append(
-                                {
-                                    "season_number": getattr(ep, "season_number", 1),
-                                    "episode_number": getattr(ep, "episode_number", 1),
-                                    "filename": getattr(ep, "filename", ""),
-                                    "size": getattr(ep, "size", 0),
-                                    "file_index": getattr(ep, "file_index", 0),
-                                    "episode_title": getattr(ep, "episode_title", None),
-                                }
-                            )
-
-                # Create torrent stream
-                stream_data = {
-                    "id": item["info_hash"],
-                    "meta_id": meta_id,
-                    "torrent_name": item["torrent_name"],
-                    "announce_urls": item.get("announce_list", []),
-                    "size": item["total_size"],
-                    "languages": item.get("languages", []),
-                    "resolution": item.get("resolution"),
-                    "codec": item.get("codec"),
-                    "quality": item.get("quality"),
-                    "audio": item.get("audio"),
-                    "hdr": item.get("hdr"),
-                    "source": item["source"],
-                    "uploader": item.get("uploader"),
-                    "catalogs": _ensure_catalog_list(item),
-                    "created_at": item.get("created_at"),
-                    "seeders": item.get("seeders"),
-                    "files": episode_files,
-                }
-
-                await crud.store_new_torrent_streams(session, [stream_data])
-                logging.info(
-                    "Added torrent stream %s for series %s",
-                    item["torrent_name"],
-                    item["title"],
-                )
-
-            await session.commit()
+            logging.info("Using series %s with id %s (db pk %s)", item["title"], stable_id, series_result.id)
+            media_ids[stable_id] = series_result.id
+
+        # Prepare episode files (items may be dicts or StreamFileData objects)
+        episode_files = []
+        if item.get("episodes"):
+            for ep in item["episodes"]:
+                if isinstance(ep, dict):
+                    episode_files.append(
+                        {
+                            "season_number": ep.get("season_number", 1),
+                            "episode_number": ep.get("episode_number", 1),
+                            "filename": ep.get("filename"),
+                            "size": ep.get("size"),
+                            "file_index": ep.get("file_index"),
+                            "episode_title": ep.get("episode_title"),
+                        }
+                    )
+                else:
+                    episode_files.append(
+                        {
+                            "season_number": getattr(ep, "season_number", 1),
+                            "episode_number": getattr(ep, "episode_number", 1),
+                            "filename": getattr(ep, "filename", ""),
+                            "size": getattr(ep, "size", 0),
+                            "file_index": getattr(ep, "file_index", 0),
+                            "episode_title": getattr(ep, "episode_title", None),
+                        }
+                    )
+
+        # Existing info hashes are skipped by store_new_torrent_streams
+        return {
+            "id": item["info_hash"],
+            "meta_id": stable_id,
+            "torrent_name": item["torrent_name"],
+            "announce_urls": item.get("announce_list", []),
+            "size": item["total_size"],
+            "languages": item.get("languages", []),
+            "resolution": item.get("resolution"),
+            "codec": item.get("codec"),
+            "quality": item.get("quality"),
+            "audio": item.get("audio"),
+            "hdr": item.get("hdr"),
+            "source": item["source"],
+            "uploader": item.get("uploader"),
+            "catalogs": _ensure_catalog_list(item),
+            "created_at": item.get("created_at"),
+            "seeders": item.get("seeders"),
+            "files": episode_files,
+        }
 
+    async def mark_scraped(self, item):
         await self.redis.sadd(item["scraped_info_hash_key"], item["info_hash"])
 
-        return item
-
 
 class TVStorePipeline(QueueBasedPipeline):
     async def parse_item(self, item):
@@ -180,19 +340,14 @@ class TVStorePipeline(QueueBasedPipeline):
         return item
 
 
-class MovieStorePipeline(QueueBasedPipeline):
+class MovieStorePipeline(TorrentStoreBatchPipeline):
     def __init__(self):
         super().__init__()
-        self.redis = REDIS_ASYNC_CLIENT
         # Cache of (title_lower, year) -> media_id for items without external IDs.
         # Prevents duplicate media creation when multiple torrents for the same
         # movie are processed concurrently in the queue.
         self._title_media_cache: dict[tuple[str, int | None], int] = {}
 
-    async def close(self):
-        await super().close()
-        await self.redis.aclose()
-
     async def _get_or_create_media(self, session, item):
         """Get or create media, handling items with or without external IDs."""
         imdb_id = item.get("imdb_id")
@@ -246,90 +401,53 @@ class MovieStorePipeline(QueueBasedPipeline):
             self._title_media_cache[cache_key] = media.id
         return media
 
-    async def parse_item(self, item):
+    async def prepare_stream(self, session, item, media_ids):
         if "title" not in item:
-            return item
+            return None
 
         if item.get("type") != "movie":
-            return item
+            return None
 
-        async with get_async_session_context() as session:
+        media_key = item.get("imdb_id") or (item["title"].lower(), item.get("year"))
+        if media_key not in media_ids:
             media = await self._get_or_create_media(session, item)
 
             if not media:
                 raise DropItem(f"Failed to create movie metadata for: {item['title']}")
 
-            meta_id = f"mf:{media.id}"
-            logging.info("Using movie %s with id %s", item["title"], meta_id)
-
-            # Apply full provider metadata (description, cast, crew, genres,
-            # certification, etc.) if available from MetadataSearchPipeline.
-            # This avoids needing a separate "Refresh All" step later.
-            provider_metadata = item.get("_provider_metadata")
-            if provider_metadata:
-                try:
-                    # update_provider_metadata creates MediaExternalID rows and
-                    # ProviderMetadata records for each provider (IMDB, TMDB, etc.)
-                    for provider_name, data in provider_metadata.items():
-                        if data:
-                            await crud.update_provider_metadata(session, media.id, provider_name, data)
-                    # apply_multi_provider_metadata updates the canonical Media fields
-                    # (description, cast, crew, genres, images, etc.)
-                    await crud.apply_multi_provider_metadata(session, media.id, provider_metadata, "movie")
-                    logging.info("Applied full metadata for movie %s", item["title"])
-                except Exception as e:
-                    logging.warning("Failed to apply full metadata for %s: %s", item["title"], e)
-                    try:
-                        await session.rollback()
-                    except Exception:
-                        pass
-
-            # Check if torrent stream already exists
-            existing_stream = await crud.get_stream_by_info_hash(session, item["info_hash"])
-            if existing_stream:
-                logging.info("Torrent stream already exists: %s", item["torrent_name"])
-                await session.commit()
-                return item
-
-            stream_data = {
-                "id": item["info_hash"],
-                "meta_id": meta_id,
-                "torrent_name": item["torrent_name"],
-                "announce_urls": item.get("announce_list", []),
-                "size": item.get("total_size", 0),
-                "total_size": item.get("total_size", 0),
-                "languages": item.get("languages", []),
-                "resolution": item.get("resolution"),
-                "codec": item.get("codec"),
-                "quality": item.get("quality"),
-                "audio": item.get("audio"),
-                "hdr": item.get("hdr"),
-                "source": item.get("source", ""),
-                "uploader": item.get("uploader"),
-                "catalogs": _ensure_catalog_list(item),
-                "created_at": item.get("created_at"),
-                "seeders": item.get("seeders"),
-                "torrent_file": item.get("torrent_file"),
-                "files": item.get("file_data", []),
-            }
-
-            await crud.store_new_torrent_streams(session, [stream_data])
-            await session.commit()
-            logging.info("Added torrent stream %s for movie %s", item["torrent_name"], item["title"])
-
-        return item
+            media_ids[media_key] = media.id
+            logging.info("Using movie %s with id mf:%s", item["title"], media.id)
+            await _apply_provider_metadata(session, media.id, item, "movie")
+
+        # Existing info hashes are skipped by store_new_torrent_streams
+        return {
+            "id": item["info_hash"],
+            "meta_id": f"mf:{media_ids[media_key]}",
+            "torrent_name": item["torrent_name"],
+            "announce_urls": item.get("announce_list", []),
+            "size": item.get("total_size", 0),
+            "total_size": item.get("total_size", 0),
+            "languages": item.get("languages", []),
+            "resolution": item.get("resolution"),
+            "codec": item.get("codec"),
+            "quality": item.get("quality"),
+            "audio": item.get("audio"),
+            "hdr": item.get("hdr"),
+            "source": item.get("source", ""),
+            "uploader": item.get("uploader"),
+            "catalogs": _ensure_catalog_list(item),
+            "created_at": item.get("created_at"),
+            "seeders": item.get("seeders"),
+            "torrent_file": item.get("torrent_file"),
+            "files": item.get("file_data", []),
+        }
 
 
-class SeriesStorePipeline(QueueBasedPipeline):
+class SeriesStorePipeline(TorrentStoreBatchPipeline):
     def __init__(self):
         super().__init__()
-        self.redis = REDIS_ASYNC_CLIENT
         self._title_media_cache: dict[tuple[str, int | None], int] = {}
 
-    async def close(self):
-        await super().close()
-        await self.redis.aclose()
-
     async def _get_or_create_media(self, session, item):
         """Get or create media, handling items with or without external IDs."""
         imdb_id = item.get("imdb_id")
@@ -377,77 +495,52 @@ class SeriesStorePipeline(QueueBasedPipeline):
             self._title_media_cache[cache_key] = media.id
         return media
 
-    async def parse_item(self, item):
+    async def prepare_stream(self, session, item, media_ids):
         if "title" not in item:
-            return item
+            return None
 
         if item.get("type") != "series":
-            return item
+            return None
 
-        async with get_async_session_context() as session:
+        media_key = item.get("imdb_id") or (item["title"].lower(), item.get("year"))
+        if media_key not in media_ids:
             media = await self._get_or_create_media(session, item)
 
             if not media:
                 raise DropItem(f"Failed to create series metadata for: {item['title']}")
 
-            meta_id = f"mf:{media.id}"
-            logging.info("Using series %s with id %s", item["title"], meta_id)
-
-            # Apply full provider metadata (description, cast, crew, genres,
-            # certification, etc.) if available from MetadataSearchPipeline.
-            provider_metadata = item.get("_provider_metadata")
-            if provider_metadata:
-                try:
-                    for provider_name, data in provider_metadata.items():
-                        if data:
-                            await crud.update_provider_metadata(session, media.id, provider_name, data)
-                    await crud.apply_multi_provider_metadata(session, media.id, provider_metadata, "series")
-                    logging.info("Applied full metadata for series %s", item["title"])
-                except Exception as e:
-                    logging.warning("Failed to apply full metadata for %s: %s", item["title"], e)
-                    try:
-                        await session.rollback()
-                    except Exception:
-                        pass
-
-            # Check if torrent stream already exists
-            existing_stream = await crud.get_stream_by_info_hash(session, item["info_hash"])
-            if existing_stream:
-                logging.info("Torrent stream already exists: %s", item["torrent_name"])
-                await session.commit()
-                return item
-
-            stream_data = {
-                "id": item["info_hash"],
-                "meta_id": meta_id,
-                "torrent_name": item["torrent_name"],
-                "announce_urls": item.get("announce_list", []),
-                "size": item.get("total_size", 0),
-                "total_size": item.get("total_size", 0),
-                "languages": item.get("languages", []),
-                "resolution": item.get("resolution"),
-                "codec": item.get("codec"),
-                "quality": item.get("quality"),
-                "audio": item.get("audio"),
-                "hdr": item.get("hdr"),
-                "source": item.get("source", ""),
-                "uploader": item.get("uploader"),
-                "catalogs": _ensure_catalog_list(item),
-                "created_at": item.get("created_at"),
-                "seeders": item.get("seeders"),
-                "torrent_file": item.get("torrent_file"),
-                "files": item.get("file_data", []),
-                "season": item.get("seasons", [None])[0] if item.get("seasons") else None,
-                "episode": item.get("episodes", [None])[0] if item.get("episodes") else None,
-            }
-
-            await crud.store_new_torrent_streams(session, [stream_data])
-            await session.commit()
-            logging.info("Added torrent stream %s for series %s", item["torrent_name"], item["title"])
+            media_ids[media_key] = media.id
+            logging.info("Using series %s with id mf:%s", item["title"], media.id)
+            await _apply_provider_metadata(session, media.id, item, "series")
+
+        # Existing info hashes are skipped by store_new_torrent_streams
+        return {
+            "id": item["info_hash"],
+            "meta_id": f"mf:{media_ids[media_key]}",
+            "torrent_name": item["torrent_name"],
+            "announce_urls": item.get("announce_list", []),
+            "size": item.get("total_size", 0),
+            "total_size": item.get("total_size", 0),
+            "languages": item.get("languages", []),
+            "resolution": item.get("resolution"),
+            "codec": item.get("codec"),
+            "quality": item.get("quality"),
+            "audio": item.get("audio"),
+            "hdr": item.get("hdr"),
+            "source": item.get("source", ""),
+            "uploader": item.get("uploader"),
+            "catalogs": _ensure_catalog_list(item),
+            "created_at": item.get("created_at"),
+            "seeders": item.get("seeders"),
+            "torrent_file": item.get("torrent_file"),
+            "files": item.get("file_data", []),
+            "season": item.get("seasons", [None])[0] if item.get("seasons") else None,
+            "episode": item.get("episodes", [None])[0] if item.get("episodes") else None,
+        }
 
+    async def mark_scraped(self, item):
         if "scraped_info_hash_key" in item:
             await self.redis.sadd(item["scraped_info_hash_key"], item["info_hash"])
-        return item
 
 
 class LiveEventStorePipeline(QueueBasedPipeline):
@@ -69,6 +69,11 @@ EXTENSIONS = {
     "workers.scrapy.extensions.CloseSpiderExtended": 100,
 }
 
+# Queue-based store pipelines write items in micro-batches: up to this many items
+# share one database session and commit, waiting at most this many seconds to fill.
+STORE_PIPELINE_BATCH_SIZE = 50
+STORE_PIPELINE_BATCH_MAX_WAIT = 1.0
+
 # Configure item pipelines
 # See https://docs.scrapy.org/en/latest/topics/item-pipeline.html
 # ITEM_PIPELINES = {
@@ -5,7 +5,6 @@ from copy import deepcopy
 from datetime import datetime
 from urllib.parse import quote_plus, unquote
 
-import PTT
 import scrapy
 
 from db import crud
@@ -13,6 +12,7 @@ from db.database import get_async_session_context
 from db.redis_database import REDIS_ASYNC_CLIENT
 from utils.config import config_manager
 from utils.parser import convert_size_to_bytes, is_non_video_title
+from utils.ptt_cache import parse_title_cached
 from utils.validation_helper import is_video_file
 from utils.runtime_const import SPORTS_ARTIFACTS
 from utils.torrent import parse_magnet
@@ -353,7 +353,7 @@ class ExtToSpider(scrapy.Spider):
                 continue
 
             try:
-                parsed_data = PTT.parse_title(file_name)
+                parsed_data = parse_title_cached(file_name)
                 file_data.append(
                     {
                         "filename": file_name,
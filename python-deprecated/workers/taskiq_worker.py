@@ -6,6 +6,7 @@ from db import database
 from db.config import settings
 from utils import torrent
 from utils.exception_tracker import install_exception_handler
+from utils.ptt_pool import shutdown_parse_pool
 
 from workers.scrapy import task as scrapy_task  # noqa: F401
 from workers.scrapers import (  # noqa: F401
@@ -20,6 +21,7 @@ from workers.scrapers import (  # noqa: F401
     tv,
 )
 from workers.providers import cache_helpers  # noqa: F401
+from workers.providers.http_pool import close_shared_sessions
 
 from workers.task_queue import get_worker_broker
 
@@ -38,6 +40,8 @@ async def worker_startup() -> None:
 
 
 async def worker_shutdown() -> None:
+    await close_shared_sessions()
+    shutdown_parse_pool()
     await database.close()
 
 